@@ -10,6 +10,9 @@ from frappe.utils import flt, fmt_money, get_link_to_form, getdate
 from pypika import Order
 
 import erpnext
+from erpnext.accounts.doctype.bank_reconciliation_tool.bank_reconciliation_tool import (
+	update_candidate_index_for_voucher,
+)
 
 form_grid_templates = {"journal_entries": "templates/form_grid/bank_reconciliation_grid.html"}
 
@@ -120,6 +123,7 @@ class BankClearance(Document):
 					# using db_set to trigger notification
 					payment_entry = frappe.get_doc(d.payment_document, d.payment_entry)
 					payment_entry.db_set("clearance_date", d.clearance_date)
+					update_candidate_index_for_voucher(d.payment_document, d.payment_entry)
 
 				clearance_date_updated = True
 
@@ -8,7 +8,7 @@ import frappe
 from frappe import _
 from frappe.model.document import Document
 from frappe.query_builder.custom import ConstantColumn
-from frappe.utils import cint, flt
+from frappe.utils import add_months, cint, create_batch, cstr, flt, get_first_day, get_last_day, getdate
 
 from erpnext import get_default_cost_center
 from erpnext.accounts.doctype.bank_transaction.bank_transaction import get_total_allocated_amount
@@ -20,6 +20,12 @@ from erpnext.accounts.report.bank_reconciliation_statement.bank_reconciliation_s
 from erpnext.accounts.utils import get_account_currency, get_balance_on
 from erpnext.setup.utils import get_exchange_rate
 
+DEFAULT_MATCHING_QUERIES = (
+	"erpnext.accounts.doctype.bank_reconciliation_tool.bank_reconciliation_tool.get_matching_queries"
+)
+CANDIDATE_INDEX_EXPIRY = 3600
+CANDIDATE_INDEX_BUILT = "__built__"
+
 
 class BankReconciliationTool(Document):
 	# begin: auto-generated types
@@ -404,16 +410,37 @@ def start_auto_reconcile(
 	bank_transactions, from_date, to_date, filter_by_reference_date, from_reference_date, to_reference_date
 ):
 	reconciled, partially_reconciled = set(), set()
+
+	# other apps can add their own matching queries, which can only be run per transaction
+	use_matcher = frappe.get_hooks("get_matching_queries") == [DEFAULT_MATCHING_QUERIES]
+	matchers = {}
+
 	for transaction in bank_transactions:
-		linked_payments = get_linked_payments(
-			transaction.name,
-			["payment_entry", "journal_entry"],
-			from_date,
-			to_date,
-			filter_by_reference_date,
-			from_reference_date,
-			to_reference_date,
-		)
+		matcher = None
+		if use_matcher:
+			if transaction.bank_account not in matchers:
+				matchers[transaction.bank_account] = BankReconciliationMatcher(
+					frappe.db.get_value("Bank Account", transaction.bank_account, "account"),
+					from_date,
+					to_date,
+					filter_by_reference_date,
+					from_reference_date,
+					to_reference_date,
+				)
+				matchers[transaction.bank_account].load_allocations(bank_transactions)
+
+			matcher = matchers[transaction.bank_account]
+			linked_payments = matcher.get_linked_payments(transaction)
+		else:
+			linked_payments = get_linked_payments(
+				transaction.name,
+				["payment_entry", "journal_entry"],
+				from_date,
+				to_date,
+				filter_by_reference_date,
+				from_reference_date,
+				to_reference_date,
+			)
 
 		if not linked_payments:
 			continue
@@ -430,6 +457,8 @@ def start_auto_reconcile(
 		)
 
 		updated_transaction = reconcile_vouchers(transaction.name, json.dumps(vouchers))
+		if matcher:
+			matcher.update_allocations(updated_transaction, vouchers)
 
 		if updated_transaction.status == "Reconciled":
 			reconciled.add(updated_transaction.name)
@@ -443,6 +472,436 @@ def start_auto_reconcile(
 	frappe.flags.auto_reconcile_vouchers = False
 
 
+class BankReconciliationMatcher:
+	"""Ranks the Payment Entries and Journal Entries of a bank account matching a bank transaction.
+
+	Vouchers are read from the `BankReconciliationCandidateIndex` of the account and ranked in memory the
+	same way as `get_pe_matching_query` and `get_je_matching_query` do. The Bank Reconciliation Tool
+	looks up all vouchers or those of the same amount, auto reconciliation those with the same reference
+	number, keeping track of the allocations it makes.
+	"""
+
+	def __init__(
+		self,
+		gl_account,
+		from_date=None,
+		to_date=None,
+		filter_by_reference_date=None,
+		from_reference_date=None,
+		to_reference_date=None,
+	):
+		self.gl_account = gl_account
+		if cint(filter_by_reference_date):
+			self.date_field, self.from_date, self.to_date = (
+				"reference_date",
+				from_reference_date,
+				to_reference_date,
+			)
+		else:
+			self.date_field, self.from_date, self.to_date = "posting_date", from_date, to_date
+
+		self.index = BankReconciliationCandidateIndex(gl_account, self.date_field)
+		self.allocated_amounts = {}
+		self.cleared_vouchers = set()
+
+	def get_candidates(self, transaction, exact_match=False, by_reference=False):
+		if by_reference:
+			reference = get_reference_key(transaction.reference_number)
+			if not reference:
+				return []
+			lookup = ("reference", reference)
+		elif exact_match:
+			lookup = ("amount", flt(transaction.unallocated_amount))
+		else:
+			lookup = None
+
+		rows = [
+			row
+			for row in self.index.get_candidates(self.from_date, self.to_date, lookup)
+			if (row.doctype, row.name) not in self.cleared_vouchers
+		]
+		return sorted(rows, key=lambda row: (row.doctype != "Payment Entry", getdate(row[self.date_field])))
+
+	def get_matching_vouchers(self, transaction, document_types, exact_match=False, by_reference=False):
+		"""Returns ranked Payment Entries and Journal Entries matching the transaction."""
+		is_deposit = transaction.deposit > 0.0
+		unallocated_amount = flt(transaction.unallocated_amount)
+
+		payment_type = "Receive" if is_deposit else "Pay"
+		account_field, currency_field = (
+			("paid_to", "paid_to_account_currency")
+			if is_deposit
+			else ("paid_from", "paid_from_account_currency")
+		)
+		amount_field = "debit_in_account_currency" if is_deposit else "credit_in_account_currency"
+
+		def get_reference_rank(row):
+			# reference numbers are compared like the database does, where NULL matches nothing
+			return cint(
+				row.reference_no is not None
+				and transaction.reference_number is not None
+				and get_reference_key(row.reference_no) == get_reference_key(transaction.reference_number)
+			)
+
+		matching_vouchers = []
+		for row in self.get_candidates(transaction, exact_match, by_reference):
+			if row.doctype == "Payment Entry":
+				amount_rank = cint(flt(row.paid_amount) == unallocated_amount)
+				if (
+					"payment_entry" not in document_types
+					or row.payment_type not in (payment_type, "Internal Transfer")
+					or row[account_field] != self.gl_account
+					or (exact_match and not amount_rank)
+				):
+					continue
+
+				rank = 1 + get_reference_rank(row) + amount_rank + self.get_party_rank(row, transaction)
+				matching_vouchers.append(
+					self.get_voucher(row, row.base_paid_amount_after_tax, rank, row[currency_field])
+				)
+			else:
+				amount_rank = cint(flt(row[amount_field]) == unallocated_amount)
+				if (
+					"journal_entry" not in document_types
+					or not flt(row[amount_field]) > 0.0
+					or (exact_match and not amount_rank)
+				):
+					continue
+
+				rank = 1 + get_reference_rank(row) + amount_rank
+				matching_vouchers.append(self.get_voucher(row, row[amount_field], rank, row.currency))
+
+		return sorted(matching_vouchers, key=lambda x: x["rank"], reverse=True)
+
+	def get_linked_payments(self, transaction):
+		"""Returns vouchers with the reference number of the transaction, net of existing allocations."""
+		return self.get_matching_vouchers(
+			transaction, ["payment_entry", "journal_entry"], exact_match=False, by_reference=True
+		)
+
+	def get_voucher(self, row, paid_amount, rank, currency):
+		return frappe._dict(
+			{
+				"rank": rank,
+				"doctype": row.doctype,
+				"name": row.name,
+				"paid_amount": flt(paid_amount) - self.allocated_amounts.get((row.doctype, row.name), 0.0),
+				"reference_no": row.reference_no,
+				"reference_date": row.reference_date,
+				"party": row.party,
+				"party_type": row.party_type,
+				"posting_date": row.posting_date,
+				"currency": currency,
+			}
+		)
+
+	@staticmethod
+	def get_party_rank(row, transaction):
+		return cint(
+			bool(row.party)
+			and row.party_type == transaction.party_type
+			and get_reference_key(row.party) == get_reference_key(transaction.party)
+		)
+
+	def load_allocations(self, bank_transactions):
+		"""Loads the amounts already allocated to the vouchers with the reference number of any transaction."""
+		references = {get_reference_key(transaction.reference_number) for transaction in bank_transactions}
+		vouchers = {
+			(row.doctype, row.name)
+			for row in self.index.get_candidates(self.from_date, self.to_date)
+			if get_reference_key(row.reference_no) in references
+		}
+
+		for docs in create_batch(list(vouchers), 1000):
+			for voucher, allocations in get_total_allocated_amount(docs).items():
+				for allocation in allocations:
+					if allocation["gl_account"] == self.gl_account:
+						self.allocated_amounts[voucher] = flt(allocation["total"])
+
+	def update_allocations(self, transaction, vouchers):
+		"""Adds the allocations made by the reconciled transaction and drops the vouchers it cleared."""
+		matched = {(voucher["payment_doctype"], voucher["payment_name"]) for voucher in vouchers}
+
+		for row in transaction.payment_entries:
+			voucher = (row.payment_document, row.payment_entry)
+			if voucher in matched:
+				self.allocated_amounts[voucher] = self.allocated_amounts.get(voucher, 0.0) + flt(
+					row.allocated_amount
+				)
+
+		for doctype in ("Payment Entry", "Journal Entry"):
+			names = [name for voucher_type, name in matched if voucher_type == doctype]
+			if names:
+				cleared = frappe.get_all(
+					doctype, filters={"name": ("in", names), "clearance_date": ("is", "set")}, pluck="name"
+				)
+				self.cleared_vouchers.update((doctype, name) for name in cleared)
+
+
+class BankReconciliationCandidateIndex:
+	"""Unreconciled Payment Entries and Journal Entries of a bank account, cached in monthly buckets.
+
+	A bucket holds the candidate rows of the vouchers dated in one month, by posting or reference date,
+	and the vouchers of each amount and reference number in it. A lookup reads only the buckets of its
+	date range and, by amount or reference, only the vouchers with that amount or reference. Vouchers are
+	re-indexed after commit when they are submitted, cancelled or cleared, see `update_candidate_index`.
+	"""
+
+	def __init__(self, gl_account, date_field="posting_date"):
+		self.gl_account = gl_account
+		self.date_field = date_field
+
+	def get_candidates(self, from_date, to_date, lookup=None):
+		"""Returns candidate rows dated in the range, only those of the (kind, value) lookup if given."""
+		if not (from_date and to_date):
+			return []
+
+		from_date, to_date = getdate(from_date), getdate(to_date)
+		buckets = {}
+		month = get_first_day(from_date)
+		while month <= to_date:
+			buckets[month] = get_candidate_bucket_key(self.gl_account, self.date_field, month)
+			month = add_months(month, 1)
+
+		self.build(
+			{
+				month: bucket
+				for month, bucket in buckets.items()
+				if not frappe.cache().hexists(bucket, CANDIDATE_INDEX_BUILT)
+			}
+		)
+
+		rows = []
+		for bucket in buckets.values():
+			if lookup:
+				for voucher in frappe.cache().smembers(get_candidate_lookup_key(bucket, *lookup)):
+					rows.extend(frappe.cache().hget(bucket, frappe.safe_decode(voucher)) or [])
+			else:
+				for voucher, voucher_rows in frappe.cache().hgetall(bucket).items():
+					if frappe.safe_decode(voucher) != CANDIDATE_INDEX_BUILT:
+						rows.extend(voucher_rows)
+
+		return [
+			row
+			for row in rows
+			if row[self.date_field] and from_date <= getdate(row[self.date_field]) <= to_date
+		]
+
+	def build(self, buckets):
+		"""Caches the candidates of the given months with a single query per voucher type."""
+		if not buckets:
+			return
+
+		# buckets read from a transaction that is rolled back may hold vouchers that do not exist
+		frappe.db.after_rollback.add(lambda: clear_candidate_buckets(buckets.values()))
+		version = get_candidate_index_version(self.gl_account)
+
+		date_range = (self.date_field, min(buckets), get_last_day(max(buckets)))
+		candidates = {}
+		for doctype in ("Payment Entry", "Journal Entry"):
+			for row in get_candidate_rows(doctype, self.gl_account, date_range):
+				bucket = buckets.get(get_first_day(row[self.date_field]))
+				if bucket:
+					candidates.setdefault(bucket, {}).setdefault(
+						get_voucher_key(doctype, row.name), []
+					).append(row)
+
+		for bucket in buckets.values():
+			for voucher, rows in candidates.get(bucket, {}).items():
+				add_candidate_rows(bucket, voucher, rows)
+
+			frappe.cache().hset(bucket, CANDIDATE_INDEX_BUILT, True)
+			set_candidate_cache_expiry(bucket)
+
+		# vouchers re-indexed while the buckets were built may be missing, they are built again on next use
+		if get_candidate_index_version(self.gl_account) != version:
+			clear_candidate_buckets(buckets.values())
+
+
+def get_unreconciled_payment_entries_query(gl_account):
+	pe = frappe.qb.DocType("Payment Entry")
+	return (
+		frappe.qb.from_(pe)
+		.select(
+			pe.name,
+			pe.payment_type,
+			pe.paid_from,
+			pe.paid_to,
+			pe.paid_amount,
+			pe.base_paid_amount_after_tax,
+			pe.reference_no,
+			pe.reference_date,
+			pe.party,
+			pe.party_type,
+			pe.posting_date,
+			pe.paid_from_account_currency,
+			pe.paid_to_account_currency,
+		)
+		.where(pe.docstatus == 1)
+		.where(pe.payment_type.isin(["Receive", "Pay", "Internal Transfer"]))
+		.where(pe.clearance_date.isnull())
+		.where((pe.paid_from == gl_account) | (pe.paid_to == gl_account))
+		.where(pe.paid_amount > 0.0)
+	)
+
+
+def get_unreconciled_journal_entries_query(gl_account):
+	je = frappe.qb.DocType("Journal Entry")
+	jea = frappe.qb.DocType("Journal Entry Account")
+	return (
+		frappe.qb.from_(jea)
+		.join(je)
+		.on(jea.parent == je.name)
+		.select(
+			je.name,
+			jea.debit_in_account_currency,
+			jea.credit_in_account_currency,
+			je.cheque_no.as_("reference_no"),
+			je.cheque_date.as_("reference_date"),
+			je.pay_to_recd_from.as_("party"),
+			jea.party_type,
+			je.posting_date,
+			jea.account_currency.as_("currency"),
+		)
+		.where(je.docstatus == 1)
+		.where(je.voucher_type != "Opening Entry")
+		.where(je.clearance_date.isnull())
+		.where(jea.account == gl_account)
+		.where((jea.debit_in_account_currency > 0.0) | (jea.credit_in_account_currency > 0.0))
+	)
+
+
+def get_candidates_query(doctype, gl_account, date_range):
+	date_field, from_date, to_date = date_range
+	if doctype == "Payment Entry":
+		dt = frappe.qb.DocType("Payment Entry")
+		query = get_unreconciled_payment_entries_query(gl_account)
+	else:
+		dt = frappe.qb.DocType("Journal Entry")
+		query = get_unreconciled_journal_entries_query(gl_account)
+		if date_field == "reference_date":
+			date_field = "cheque_date"
+
+	return query.where(dt[date_field].between(from_date, to_date))
+
+
+def get_candidate_rows(doctype, gl_account, date_range, name=None):
+	query = get_candidates_query(doctype, gl_account, date_range)
+	if name:
+		query = query.where(frappe.qb.DocType(doctype).name == name)
+
+	rows = query.run(as_dict=True)
+	for row in rows:
+		row.doctype = doctype
+
+	return rows
+
+
+def add_candidate_rows(bucket, voucher, rows):
+	frappe.cache().hset(bucket, voucher, rows)
+
+	lookups = set()
+	for row in rows:
+		if row.doctype == "Payment Entry":
+			lookups.add(("amount", flt(row.paid_amount)))
+		else:
+			lookups.update(
+				("amount", flt(amount))
+				for amount in (row.debit_in_account_currency, row.credit_in_account_currency)
+				if flt(amount)
+			)
+
+		if reference := get_reference_key(row.reference_no):
+			lookups.add(("reference", reference))
+
+	# lookups expire with their bucket, vouchers left in them once removed from the bucket are skipped
+	ttl = frappe.cache().ttl(frappe.cache().make_key(bucket))
+	for lookup in lookups:
+		lookup_key = get_candidate_lookup_key(bucket, *lookup)
+		frappe.cache().sadd(lookup_key, voucher)
+		set_candidate_cache_expiry(lookup_key, ttl if ttl > 0 else CANDIDATE_INDEX_EXPIRY)
+
+
+def get_candidate_bucket_key(gl_account, date_field, date):
+	return f"bank_reconciliation_candidates|{gl_account}|{date_field}|{getdate(date):%Y-%m}"
+
+
+def get_candidate_lookup_key(bucket, kind, value):
+	return f"{bucket}|{kind}|{value}"
+
+
+def get_candidate_version_key(gl_account):
+	return f"bank_reconciliation_candidates_version|{gl_account}"
+
+
+def get_candidate_index_version(gl_account):
+	return cint(frappe.cache().get(frappe.cache().make_key(get_candidate_version_key(gl_account))))
+
+
+def set_candidate_cache_expiry(key, expiry=CANDIDATE_INDEX_EXPIRY):
+	frappe.cache().expire(frappe.cache().make_key(key), expiry)
+
+
+def get_voucher_key(doctype, name):
+	return f"{doctype}|{name}"
+
+
+def update_candidate_index(doc, method=None):
+	"""Re-indexes the cached candidates of a submitted, updated or cancelled Payment Entry or Journal Entry."""
+	update_candidate_index_for_voucher(doc.doctype, doc.name)
+
+
+def update_candidate_index_for_voucher(doctype, name):
+	"""Re-indexes the cached candidates of the voucher once the transaction is committed."""
+	if doctype in ("Payment Entry", "Journal Entry"):
+		frappe.db.after_commit.add(lambda: reindex_candidate_voucher(doctype, name))
+
+
+def reindex_candidate_voucher(doctype, name):
+	"""Replaces the rows of the voucher in the cached buckets of its posting and reference dates."""
+	if doctype == "Payment Entry":
+		voucher = frappe.db.get_value(
+			doctype, name, ["posting_date", "reference_date", "paid_from", "paid_to"], as_dict=True
+		)
+		accounts = {voucher.paid_from, voucher.paid_to} if voucher else set()
+	else:
+		voucher = frappe.db.get_value(
+			doctype, name, ["posting_date", "cheque_date as reference_date"], as_dict=True
+		)
+		accounts = set(frappe.get_all("Journal Entry Account", filters={"parent": name}, pluck="account"))
+
+	for gl_account in accounts:
+		# buckets being built now are discarded, as they may have been read before the voucher changed
+		version_key = frappe.cache().make_key(get_candidate_version_key(gl_account))
+		frappe.cache().incr(version_key)
+		frappe.cache().expire(version_key, CANDIDATE_INDEX_EXPIRY)
+
+		for date_field in ("posting_date", "reference_date"):
+			if not voucher[date_field]:
+				continue
+
+			bucket = get_candidate_bucket_key(gl_account, date_field, voucher[date_field])
+			if not frappe.cache().hexists(bucket, CANDIDATE_INDEX_BUILT):
+				continue
+
+			date = getdate(voucher[date_field])
+			rows = get_candidate_rows(doctype, gl_account, (date_field, date, date), name)
+			if rows:
+				add_candidate_rows(bucket, get_voucher_key(doctype, name), rows)
+			else:
+				frappe.cache().hdel(bucket, get_voucher_key(doctype, name))
+
+
+def clear_candidate_buckets(buckets):
+	for bucket in buckets:
+		frappe.cache().delete_value(bucket)
+
+
+def get_reference_key(value):
+	# reference numbers are compared case insensitively and ignoring trailing spaces, like the database does
+	return cstr(value).rstrip().casefold()
+
+
 def get_auto_reconcile_message(partially_reconciled, reconciled):
 	"""Returns alert message and indicator for auto reconciliation depending on result state."""
 	alert_message, indicator = "", "blue"
@@ -551,6 +1010,30 @@ def check_matching(
 		}
 	)
 
+	matching_vouchers = []
+
+	# other apps can add their own matching queries, which are run against the database
+	if frappe.get_hooks("get_matching_queries") == [DEFAULT_MATCHING_QUERIES]:
+		indexed_types = {"payment_entry", "journal_entry"}
+		document_types = frappe.parse_json(document_types)
+		if indexed_types.intersection(document_types):
+			matching_vouchers.extend(
+				BankReconciliationMatcher(
+					bank_account,
+					from_date,
+					to_date,
+					filter_by_reference_date,
+					from_reference_date,
+					to_reference_date,
+				).get_matching_vouchers(
+					transaction,
+					document_types,
+					exact_match,
+					by_reference=frappe.flags.auto_reconcile_vouchers is True,
+				)
+			)
+			document_types = [d for d in document_types if d not in indexed_types]
+
 	queries = get_queries(
 		bank_account,
 		company,
@@ -565,7 +1048,6 @@ def check_matching(
 		common_filters,
 	)
 
-	matching_vouchers = []
 	for query in queries:
 		matching_vouchers.extend(query.run(as_dict=True))
 
@@ -8,8 +8,12 @@ from frappe.tests.utils import FrappeTestCase
 from frappe.utils import add_days, today
 
 from erpnext.accounts.doctype.bank_reconciliation_tool.bank_reconciliation_tool import (
+	BankReconciliationMatcher,
 	auto_reconcile_vouchers,
 	get_bank_transactions,
+	get_je_matching_query,
+	get_linked_payments,
+	get_pe_matching_query,
 )
 from erpnext.accounts.doctype.payment_entry.test_payment_entry import create_payment_entry
 from erpnext.accounts.test.accounts_mixin import AccountsTestMixin
@@ -98,3 +102,147 @@ class TestBankReconciliationTool(AccountsTestMixin, FrappeTestCase):
 		# assert API output post reconciliation
 		transactions = get_bank_transactions(self.bank_account, from_date, to_date)
 		self.assertEqual(len(transactions), 0)
+
+	def test_auto_reconcile_matcher_matches_linked_payments(self):
+		from_date = add_days(today(), -1)
+		to_date = today()
+		for paid_amount in (100, 60):
+			payment = create_payment_entry(
+				company=self.company,
+				posting_date=from_date,
+				payment_type="Receive",
+				party_type="Customer",
+				party=self.customer,
+				paid_from=self.debit_to,
+				paid_to=self.bank,
+				paid_amount=paid_amount,
+			)
+			payment.reference_no = "456"
+			payment.save().submit()
+
+		frappe.get_doc(
+			{
+				"doctype": "Bank Transaction",
+				"date": to_date,
+				"deposit": 100,
+				"bank_account": self.bank_account,
+				"reference_number": "456",
+				"currency": "INR",
+			}
+		).save().submit()
+
+		transactions = get_bank_transactions(self.bank_account, from_date, to_date)
+		matcher = BankReconciliationMatcher(self.bank, from_date, to_date)
+		matcher.load_allocations(transactions)
+
+		frappe.flags.auto_reconcile_vouchers = True
+		try:
+			for transaction in transactions:
+				expected = get_linked_payments(
+					transaction.name, ["payment_entry", "journal_entry"], from_date, to_date
+				)
+				matched = matcher.get_linked_payments(transaction)
+
+				self.assertEqual(len(matched), 2)
+				self.assertEqual(
+					[(d.doctype, d.name, d.rank, d.paid_amount) for d in matched],
+					[(d.doctype, d.name, d.rank, d.paid_amount) for d in expected],
+				)
+		finally:
+			frappe.flags.auto_reconcile_vouchers = False
+
+	def test_candidate_index_matches_matching_queries(self):
+		from_date = add_days(today(), -1)
+		to_date = today()
+		for paid_amount, reference_no in ((100, "789"), (100, "790"), (40, "789")):
+			payment = create_payment_entry(
+				company=self.company,
+				posting_date=from_date,
+				payment_type="Receive",
+				party_type="Customer",
+				party=self.customer,
+				paid_from=self.debit_to,
+				paid_to=self.bank,
+				paid_amount=paid_amount,
+			)
+			payment.reference_no = reference_no
+			payment.save().submit()
+
+		transaction = frappe.get_doc(
+			{
+				"doctype": "Bank Transaction",
+				"date": to_date,
+				"deposit": 100,
+				"bank_account": self.bank_account,
+				"reference_number": "789",
+				"currency": "INR",
+			}
+		)
+		transaction.save().submit()
+
+		matcher = BankReconciliationMatcher(self.bank, from_date, to_date)
+		common_filters = frappe._dict({"bank_account": self.bank})
+		for exact_match in (False, True):
+			expected = get_pe_matching_query(
+				exact_match, "paid_to", transaction, from_date, to_date, None, None, None, common_filters
+			).run(as_dict=True)
+			expected += get_je_matching_query(
+				exact_match, transaction, from_date, to_date, None, None, None, common_filters
+			).run(as_dict=True)
+
+			matched = matcher.get_matching_vouchers(
+				transaction, ["payment_entry", "journal_entry"], exact_match
+			)
+			self.assertEqual(len(matched), 2 if exact_match else 3)
+			self.assertEqual(
+				sorted((d.doctype, d.name, d.rank, d.paid_amount) for d in matched),
+				sorted((d.doctype, d.name, d.rank, d.paid_amount) for d in expected),
+			)
+
+	def test_candidate_index_is_updated_per_voucher(self):
+		from_date = add_days(today(), -1)
+		to_date = today()
+		transaction = frappe.get_doc(
+			{
+				"doctype": "Bank Transaction",
+				"date": to_date,
+				"deposit": 100,
+				"bank_account": self.bank_account,
+				"reference_number": "901",
+				"currency": "INR",
+			}
+		)
+		transaction.save().submit()
+
+		matcher = BankReconciliationMatcher(self.bank, from_date, to_date)
+
+		def get_matched_vouchers(exact_match=False):
+			return {
+				d.name for d in matcher.get_matching_vouchers(transaction, ["payment_entry"], exact_match)
+			}
+
+		# builds the cached candidates of the date range
+		before = get_matched_vouchers()
+
+		payment = create_payment_entry(
+			company=self.company,
+			posting_date=from_date,
+			payment_type="Receive",
+			party_type="Customer",
+			party=self.customer,
+			paid_from=self.debit_to,
+			paid_to=self.bank,
+			paid_amount=100,
+		)
+		payment.reference_no = "901"
+		payment.save().submit()
+
+		# vouchers are re-indexed once committed
+		self.assertEqual(get_matched_vouchers(), before)
+		frappe.db.after_commit.run()
+		self.assertEqual(get_matched_vouchers(), before | {payment.name})
+		self.assertIn(payment.name, get_matched_vouchers(exact_match=True))
+
+		payment.cancel()
+		frappe.db.after_commit.run()
+		self.assertEqual(get_matched_vouchers(), before)
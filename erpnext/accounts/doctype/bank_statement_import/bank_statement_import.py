@@ -3,7 +3,9 @@
 
 
 import csv
+import datetime
 import json
+import os
 import re
 
 import frappe
@@ -11,6 +13,8 @@ import openpyxl
 from frappe import _
 from frappe.core.doctype.data_import.data_import import DataImport
 from frappe.core.doctype.data_import.importer import Importer, ImportFile
+from frappe.query_builder import Case
+from frappe.utils import cint, cstr, flt, get_user_date_format, getdate, now
 from frappe.utils.background_jobs import enqueue
 from frappe.utils.xlsxutils import ILLEGAL_CHARACTERS_RE, handle_html
 from openpyxl.styles import Font
@@ -18,6 +22,53 @@ from openpyxl.utils import get_column_letter
 
 INVALID_VALUES = ("", None)
 
+# files read row by row and inserted in batches, others go through the generic data importer
+STREAMING_IMPORT_EXTENSIONS = ("csv", "xlsx")
+IMPORT_BATCH_SIZE = 1000
+COMPUTED_FIELDS = (
+	"naming_series",
+	"status",
+	"bank_account",
+	"company",
+	"allocated_amount",
+	"unallocated_amount",
+)
+# formats tried on a sample of the dates in the file, the one matching all of them is used
+DATE_FORMAT_SAMPLE_SIZE = 100
+DATE_FORMATS = [
+	*(
+		sep.join(parts)
+		for sep in ("-", "/", ".")
+		for parts in (
+			("%d", "%m", "%Y"),
+			("%m", "%d", "%Y"),
+			("%Y", "%m", "%d"),
+			("%d", "%m", "%y"),
+			("%m", "%d", "%y"),
+		)
+	),
+	"%Y%m%d",
+	"%d %b %Y",
+	"%d %B %Y",
+	"%b %d, %Y",
+	"%B %d, %Y",
+]
+DATE_FORMATS += [
+	f"{date_format} {time_format}" for date_format in DATE_FORMATS for time_format in ("%H:%M:%S", "%H:%M")
+]
+IMPORTABLE_FIELDTYPES = (
+	"Data",
+	"Date",
+	"Currency",
+	"Float",
+	"Int",
+	"Check",
+	"Link",
+	"Dynamic Link",
+	"Small Text",
+	"Select",
+)
+
 
 class BankStatementImport(DataImport):
 	# begin: auto-generated types
@@ -145,6 +196,20 @@ def start_import(data_import, bank_account, import_file_path, google_sheets_url,
 	update_mapping_db(bank, template_options)
 
 	data_import = frappe.get_doc("Bank Statement Import", data_import)
+
+	if import_file_path and get_file_extension(import_file_path) in STREAMING_IMPORT_EXTENSIONS:
+		try:
+			BankTransactionImporter(
+				data_import, bank_account, import_file_path, template_options
+			).import_data()
+		except Exception:
+			frappe.db.rollback()
+			data_import.db_set("status", "Error")
+			data_import.log_error("Bank Statement Import failed")
+
+		frappe.publish_realtime("data_import_refresh", {"data_import": data_import.name})
+		return
+
 	file = import_file_path if import_file_path else google_sheets_url
 
 	import_file = ImportFile("Bank Transaction", file=file, import_type="Insert New Records")
@@ -171,6 +236,307 @@ def start_import(data_import, bank_account, import_file_path, google_sheets_url,
 	frappe.publish_realtime("data_import_refresh", {"data_import": data_import.name})
 
 
+class BankTransactionImporter:
+	"""Streams rows of a CSV or XLSX bank statement and inserts them as Bank Transactions in batches.
+
+	Each row is validated as a document, then the valid rows of a batch are inserted together and,
+	if required, submitted with a single update. A batch is committed together with its Data Import
+	Logs, which are written per row like the generic importer does.
+	"""
+
+	def __init__(self, data_import, bank_account, import_file_path, template_options):
+		self.data_import = data_import
+		self.bank_account = bank_account
+		self.file_path = frappe.get_doc("File", {"file_url": import_file_path}).get_full_path()
+		self.column_to_field_map = json.loads(template_options or "{}").get("column_to_field_map") or {}
+
+		self.meta = frappe.get_meta("Bank Transaction")
+		self.company = frappe.db.get_value("Bank Account", bank_account, "company")
+		self.submit = data_import.submit_after_import
+		self.match_party = self.submit and frappe.db.get_single_value(
+			"Accounts Settings", "enable_party_matching"
+		)
+		self.date_format = None
+
+		self.log_index = 0
+		self.imported, self.failed = 0, 0
+
+	def import_data(self):
+		frappe.flags.in_import = True
+		try:
+			rows = enumerate(self.read_rows(), start=1)
+			_row_number, header = next(rows, (None, None))
+			if not header:
+				frappe.throw(_("Import file is empty"))
+
+			self.columns = self.get_columns(header)
+
+			batch = []
+			for row_number, row in rows:
+				if all(v in INVALID_VALUES for v in row):
+					continue
+
+				batch.append((row_number, row))
+				if len(batch) >= IMPORT_BATCH_SIZE:
+					self.import_batch(batch)
+					batch = []
+
+			if batch:
+				self.import_batch(batch)
+		finally:
+			frappe.flags.in_import = False
+
+		if not self.failed:
+			status = "Success"
+		elif self.imported:
+			status = "Partial Success"
+		else:
+			status = "Error"
+
+		self.data_import.db_set("status", status)
+
+	def read_rows(self):
+		"""Yields the rows of the file one by one, without loading it whole."""
+		if get_file_extension(self.file_path) == "csv":
+			with open(self.file_path, newline="", encoding="utf-8-sig") as f:
+				delimiters = (
+					self.data_import.custom_delimiters and self.data_import.delimiter_options
+				) or ","
+				try:
+					dialect = csv.Sniffer().sniff(f.read(64 * 1024), delimiters=delimiters)
+				except csv.Error:
+					dialect = csv.excel
+				f.seek(0)
+
+				yield from csv.reader(f, dialect)
+		else:
+			workbook = openpyxl.load_workbook(self.file_path, read_only=True, data_only=True)
+			try:
+				for row in workbook.active.iter_rows(values_only=True):
+					yield list(row)
+			finally:
+				workbook.close()
+
+	def get_columns(self, header):
+		"""Returns the Bank Transaction field of each column, guessed from its label when not mapped."""
+		fields_by_label = {}
+		for df in self.meta.fields:
+			if df.fieldtype in IMPORTABLE_FIELDTYPES:
+				fields_by_label[df.fieldname.lower()] = df
+				fields_by_label[cstr(df.label).lower()] = df
+
+		columns = []
+		for i, label in enumerate(header):
+			fieldname = self.column_to_field_map.get(str(i)) or self.column_to_field_map.get(cstr(label))
+			if fieldname == "Don't Import":
+				columns.append(None)
+				continue
+
+			df = self.meta.get_field(fieldname) if fieldname else None
+			columns.append(df or fields_by_label.get(cstr(label).strip().lower()))
+
+		if not any(columns):
+			frappe.throw(_("None of the columns could be mapped to a Bank Transaction field"))
+
+		return columns
+
+	def import_batch(self, batch):
+		if not self.date_format:
+			self.set_date_format(batch)
+
+		logs, docs = [], []
+		for row_number, row in batch:
+			try:
+				doc = self.get_bank_transaction(row)
+				self.validate_bank_transaction(doc)
+			except Exception as e:
+				logs.append(
+					self.get_log(
+						row_number, success=False, messages=[str(e)], exception=frappe.get_traceback()
+					)
+				)
+			else:
+				logs.append(self.get_log(row_number, success=True, docname=doc.name))
+				docs.append(doc)
+
+		self.bulk_insert_bank_transactions(docs)
+		self.bulk_insert_logs(logs)
+		frappe.db.commit()
+
+		self.imported += len(docs)
+		self.failed += len(logs) - len(docs)
+
+		frappe.publish_realtime(
+			"data_import_progress",
+			{"current": self.imported + self.failed, "data_import": self.data_import.name},
+			user=frappe.session.user,
+		)
+
+	def set_date_format(self, batch):
+		"""Sets the format of the dates in the file, guessed from the first rows of the file."""
+		sample = []
+		for _row_number, row in batch:
+			for df, value in zip(self.columns, row, strict=False):
+				if df and df.fieldtype == "Date" and isinstance(value, str) and value.strip():
+					sample.append(value.strip())
+
+			if len(sample) >= DATE_FORMAT_SAMPLE_SIZE:
+				break
+
+		if sample:
+			self.date_format = get_date_format(sample)
+
+	def get_bank_transaction(self, row):
+		doc = frappe.new_doc("Bank Transaction")
+		doc.update({"bank_account": self.bank_account, "company": self.company})
+
+		for df, value in zip(self.columns, row, strict=False):
+			if not df or df.fieldname in COMPUTED_FIELDS or value in INVALID_VALUES:
+				continue
+
+			doc.set(df.fieldname, self.parse_value(df, value))
+
+		return doc
+
+	def validate_bank_transaction(self, doc):
+		"""Runs the validations of `Document.insert` and names the document, without writing it."""
+		doc.set_user_and_timestamp()
+		doc.run_method("before_insert")
+		doc.run_before_save_methods()
+		doc._validate_links()
+		doc._validate()
+
+		if self.match_party:
+			doc.auto_set_party()
+
+		doc.set_new_name()
+
+	def bulk_insert_bank_transactions(self, docs):
+		if not docs:
+			return
+
+		rows = [doc.get_valid_dict(convert_dates_to_str=True) for doc in docs]
+		fields = list(rows[0])
+		frappe.db.bulk_insert(
+			"Bank Transaction", fields=fields, values=[[row[f] for f in fields] for row in rows]
+		)
+
+		if self.submit:
+			bank_transaction = frappe.qb.DocType("Bank Transaction")
+			(
+				frappe.qb.update(bank_transaction)
+				.set(bank_transaction.docstatus, 1)
+				.set(
+					bank_transaction.status,
+					Case().when(bank_transaction.unallocated_amount > 0, "Unreconciled").else_("Reconciled"),
+				)
+				.where(bank_transaction.name.isin([doc.name for doc in docs]))
+			).run()
+
+	def parse_value(self, df, value):
+		if df.fieldtype == "Date":
+			if isinstance(value, datetime.datetime):
+				return value.date()
+			if isinstance(value, datetime.date):
+				return value
+
+			value = cstr(value).strip()
+			if self.date_format:
+				return datetime.datetime.strptime(value, self.date_format).date()
+			return getdate(value)
+
+		if df.fieldtype in ("Currency", "Float"):
+			return flt(value)
+
+		if df.fieldtype in ("Int", "Check"):
+			return cint(value)
+
+		return cstr(value).strip()
+
+	def get_log(self, row_number, success, docname=None, messages=None, exception=None):
+		self.log_index += 1
+		return {
+			"success": cint(success),
+			"docname": docname,
+			"messages": json.dumps(messages or []),
+			"exception": exception,
+			"row_indexes": json.dumps([row_number]),
+			"log_index": self.log_index,
+		}
+
+	def bulk_insert_logs(self, logs):
+		if not logs:
+			return
+
+		log_fields = ["success", "docname", "messages", "exception", "row_indexes", "log_index"]
+		fields = ["name", "creation", "modified", "owner", "modified_by", "data_import", *log_fields]
+		timestamp, user = now(), frappe.session.user
+		values = [
+			(
+				frappe.generate_hash(length=10),
+				timestamp,
+				timestamp,
+				user,
+				user,
+				self.data_import.name,
+				*[log[field] for field in log_fields],
+			)
+			for log in logs
+		]
+		frappe.db.bulk_insert("Data Import Log", fields=fields, values=values)
+
+
+def get_date_format(values):
+	"""Returns the format that parses all the given dates.
+
+	If several formats do, as with 01-02-2024, the one following the system date format is used.
+	"""
+	formats = [
+		date_format for date_format in DATE_FORMATS if all(is_date_in_format(v, date_format) for v in values)
+	]
+
+	if not formats:
+		frappe.throw(
+			_("Dates in the import file are not in a single known format, for example {0}").format(
+				frappe.bold(values[0])
+			)
+		)
+
+	if len(formats) > 1:
+		system_format = get_user_date_format().replace("dd", "%d").replace("mm", "%m").replace("yyyy", "%Y")
+		formats = [
+			date_format
+			for date_format in formats
+			if get_date_part_order(date_format) == get_date_part_order(system_format)
+		] or formats
+
+	if len({get_date_part_order(date_format) for date_format in formats}) > 1:
+		frappe.throw(
+			_(
+				"Cannot tell the day from the month in the dates of the import file, for example {0}. Please use the format {1}."
+			).format(frappe.bold(values[0]), frappe.bold(get_user_date_format()))
+		)
+
+	return formats[0]
+
+
+def is_date_in_format(value, date_format):
+	try:
+		datetime.datetime.strptime(value, date_format)
+	except ValueError:
+		return False
+
+	return True
+
+
+def get_date_part_order(date_format):
+	return re.findall(r"%[dmy]", date_format.lower().replace("%b", "%m"))
+
+
+def get_file_extension(file_path):
+	return os.path.splitext(cstr(file_path))[1].lstrip(".").lower()
+
+
 def update_mapping_db(bank, template_options):
 	bank = frappe.get_doc("Bank", bank)
 	for d in bank.bank_transaction_mapping:
@@ -1,9 +1,27 @@
 # Copyright (c) 2020, Frappe Technologies and Contributors
 # See license.txt
 
-# import frappe
-import unittest
+from unittest.mock import patch
 
+import frappe
+from frappe.tests.utils import FrappeTestCase
 
-class TestBankStatementImport(unittest.TestCase):
-	pass
+from erpnext.accounts.doctype.bank_statement_import.bank_statement_import import get_date_format
+
+
+class TestBankStatementImport(FrappeTestCase):
+	def test_date_format_from_sample(self):
+		self.assertEqual(get_date_format(["01-02-2024", "25-02-2024"]), "%d-%m-%Y")
+		self.assertEqual(get_date_format(["02/25/2024", "03/01/2024"]), "%m/%d/%Y")
+		self.assertEqual(get_date_format(["2024-02-25 10:30:00"]), "%Y-%m-%d %H:%M:%S")
+
+	def test_ambiguous_date_format_follows_system_format(self):
+		module = "erpnext.accounts.doctype.bank_statement_import.bank_statement_import"
+		with patch(f"{module}.get_user_date_format", return_value="mm-dd-yyyy"):
+			self.assertEqual(get_date_format(["01-02-2024", "03-04-2024"]), "%m-%d-%Y")
+
+		with patch(f"{module}.get_user_date_format", return_value="dd-mm-yyyy"):
+			self.assertEqual(get_date_format(["01-02-2024", "03-04-2024"]), "%d-%m-%Y")
+
+	def test_dates_in_different_formats(self):
+		self.assertRaises(frappe.ValidationError, get_date_format, ["25-02-2024", "02-25-2024"])
@@ -402,6 +402,10 @@ def get_paid_amount(payment_entry, currency, gl_bank_account):
 
 
 def set_voucher_clearance(doctype, docname, clearance_date, self):
+	from erpnext.accounts.doctype.bank_reconciliation_tool.bank_reconciliation_tool import (
+		update_candidate_index_for_voucher,
+	)
+
 	if doctype in get_doctypes_for_bank_reconciliation():
 		if (
 			doctype == "Payment Entry"
@@ -420,6 +424,7 @@ def set_voucher_clearance(doctype, docname, clearance_date, self):
 			return
 
 		frappe.db.set_value(doctype, docname, "clearance_date", clearance_date)
+		update_candidate_index_for_voucher(doctype, docname)
 
 	elif doctype == "Bank Transaction":
 		# For when a second bank transaction has fixed another, e.g. refund
@@ -7,9 +7,11 @@ from math import floor
 
 import frappe
 from dateutil.relativedelta import relativedelta
-from frappe import _
+from frappe import _, qb
 from frappe.model.document import Document
-from frappe.utils import getdate
+from frappe.query_builder import Case
+from frappe.query_builder.functions import Sum
+from frappe.utils import flt, getdate, now
 from frappe.utils.data import guess_date_format
 
 
@@ -47,79 +49,163 @@ class BisectAccountingStatements(Document):
 
 	def bfs(self, from_date: datetime, to_date: datetime):
 		# Make Root node
-		node = frappe.new_doc("Bisect Nodes")
-		node.root = None
-		node.period_from_date = from_date
-		node.period_to_date = to_date
-		node.insert()
+		node = self.make_node(from_date, to_date)
+		nodes = [node]
 
 		period_queue = deque([node])
 		while period_queue:
 			cur_node = period_queue.popleft()
-			delta = cur_node.period_to_date - cur_node.period_from_date
-			if delta.days == 0:
-				continue
-			else:
-				cur_floor = floor(delta.days / 2)
-				next_to_date = cur_node.period_from_date + relativedelta(days=+cur_floor)
-				left_node = frappe.new_doc("Bisect Nodes")
-				left_node.period_from_date = cur_node.period_from_date
-				left_node.period_to_date = next_to_date
-				left_node.root = cur_node.name
-				left_node.generated = False
-				left_node.insert()
-				cur_node.left_child = left_node.name
-				period_queue.append(left_node)
-
-				next_from_date = cur_node.period_from_date + relativedelta(days=+(cur_floor + 1))
-				right_node = frappe.new_doc("Bisect Nodes")
-				right_node.period_from_date = next_from_date
-				right_node.period_to_date = cur_node.period_to_date
-				right_node.root = cur_node.name
-				right_node.generated = False
-				right_node.insert()
-				cur_node.right_child = right_node.name
-				period_queue.append(right_node)
-
-				cur_node.save()
+			children = self.split_node(cur_node)
+			nodes.extend(children)
+			period_queue.extend(children)
+
+		return nodes
 
 	def dfs(self, from_date: datetime, to_date: datetime):
 		# Make Root node
-		node = frappe.new_doc("Bisect Nodes")
-		node.root = None
-		node.period_from_date = from_date
-		node.period_to_date = to_date
-		node.insert()
+		node = self.make_node(from_date, to_date)
+		nodes = [node]
 
 		period_stack = [node]
 		while period_stack:
 			cur_node = period_stack.pop()
-			delta = cur_node.period_to_date - cur_node.period_from_date
-			if delta.days == 0:
-				continue
+			children = self.split_node(cur_node)
+			nodes.extend(children)
+			period_stack.extend(children)
+
+		return nodes
+
+	def make_node(self, from_date: datetime, to_date: datetime, root=None):
+		return frappe._dict(
+			name=frappe.db.get_next_sequence_val("Bisect Nodes"),
+			root=root,
+			left_child=None,
+			right_child=None,
+			period_from_date=from_date,
+			period_to_date=to_date,
+		)
+
+	def split_node(self, cur_node):
+		delta = cur_node.period_to_date - cur_node.period_from_date
+		if delta.days == 0:
+			return []
+
+		cur_floor = floor(delta.days / 2)
+		next_to_date = cur_node.period_from_date + relativedelta(days=+cur_floor)
+		left_node = self.make_node(cur_node.period_from_date, next_to_date, root=cur_node.name)
+		cur_node.left_child = left_node.name
+
+		next_from_date = cur_node.period_from_date + relativedelta(days=+(cur_floor + 1))
+		right_node = self.make_node(next_from_date, cur_node.period_to_date, root=cur_node.name)
+		cur_node.right_child = right_node.name
+
+		return [left_node, right_node]
+
+	def set_node_summaries(self, nodes):
+		"""Sets summaries of single day nodes from daily balances and of other nodes as the sum of their children."""
+		daily_summaries = self.get_daily_summaries(
+			nodes[0].period_from_date.date(), nodes[0].period_to_date.date()
+		)
+		nodes_by_name = {node.name: node for node in nodes}
+
+		# children are always made after their parent
+		for node in reversed(nodes):
+			if node.left_child:
+				children = (nodes_by_name[node.left_child], nodes_by_name[node.right_child])
+				node.balance_sheet_summary = sum(child.balance_sheet_summary for child in children)
+				node.profit_loss_summary = sum(child.profit_loss_summary for child in children)
 			else:
-				cur_floor = floor(delta.days / 2)
-				next_to_date = cur_node.period_from_date + relativedelta(days=+cur_floor)
-				left_node = frappe.new_doc("Bisect Nodes")
-				left_node.period_from_date = cur_node.period_from_date
-				left_node.period_to_date = next_to_date
-				left_node.root = cur_node.name
-				left_node.generated = False
-				left_node.insert()
-				cur_node.left_child = left_node.name
-				period_stack.append(left_node)
-
-				next_from_date = cur_node.period_from_date + relativedelta(days=+(cur_floor + 1))
-				right_node = frappe.new_doc("Bisect Nodes")
-				right_node.period_from_date = next_from_date
-				right_node.period_to_date = cur_node.period_to_date
-				right_node.root = cur_node.name
-				right_node.generated = False
-				right_node.insert()
-				cur_node.right_child = right_node.name
-				period_stack.append(right_node)
-
-				cur_node.save()
+				summary = daily_summaries.get(node.period_from_date.date(), {})
+				node.balance_sheet_summary = summary.get("balance_sheet_summary", 0.0)
+				node.profit_loss_summary = summary.get("profit_loss_summary", 0.0)
+
+			node.difference = abs(node.profit_loss_summary - node.balance_sheet_summary)
+
+	def get_daily_summaries(self, from_date, to_date):
+		"""
+		Returns Balance Sheet and Profit and Loss summaries of each day, computed like the reports
+		from one grouped query on GL Entry.
+		"""
+		gle = qb.DocType("GL Entry")
+		account = qb.DocType("Account")
+		is_period_closing_voucher = (
+			Case().when(gle.voucher_type == "Period Closing Voucher", 1).else_(0).as_("is_closing_entry")
+		)
+
+		balances = (
+			qb.from_(gle)
+			.inner_join(account)
+			.on(gle.account == account.name)
+			.select(
+				gle.posting_date,
+				account.root_type,
+				is_period_closing_voucher,
+				(Sum(gle.debit) - Sum(gle.credit)).as_("balance"),
+			)
+			.where(
+				(gle.company == self.company)
+				& (gle.is_cancelled == 0)
+				& (gle.posting_date[from_date:to_date])
+				& ((gle.finance_book.isnull()) | (gle.finance_book == ""))
+			)
+			.groupby(gle.posting_date, account.root_type, is_period_closing_voucher)
+		).run(as_dict=True)
+
+		daily_summaries = {}
+		for row in balances:
+			summary = daily_summaries.setdefault(
+				getdate(row.posting_date), {"balance_sheet_summary": 0.0, "profit_loss_summary": 0.0}
+			)
+			balance = flt(row.balance)
+			if row.root_type == "Asset":
+				summary["balance_sheet_summary"] += balance
+			elif row.root_type == "Liability":
+				summary["balance_sheet_summary"] += balance
+			elif row.root_type == "Equity":
+				summary["balance_sheet_summary"] -= balance
+			elif row.root_type in ("Income", "Expense") and not row.is_closing_entry:
+				summary["profit_loss_summary"] -= balance
+
+		return daily_summaries
+
+	def insert_nodes(self, nodes):
+		user = frappe.session.user
+		fields = [
+			"name",
+			"creation",
+			"modified",
+			"owner",
+			"modified_by",
+			"root",
+			"left_child",
+			"right_child",
+			"period_from_date",
+			"period_to_date",
+			"difference",
+			"balance_sheet_summary",
+			"profit_loss_summary",
+			"generated",
+		]
+		values = [
+			(
+				node.name,
+				now(),
+				now(),
+				user,
+				user,
+				node.root,
+				node.left_child,
+				node.right_child,
+				node.period_from_date,
+				node.period_to_date,
+				node.difference,
+				node.balance_sheet_summary,
+				node.profit_loss_summary,
+				1,
+			)
+			for node in nodes
+		]
+		frappe.db.bulk_insert("Bisect Nodes", fields=fields, values=values)
 
 	@frappe.whitelist()
 	def build_tree(self):
@@ -130,18 +216,20 @@ class BisectAccountingStatements(Document):
 		from_date = datetime.datetime.strptime(self.from_date, dt_format)
 		to_date = datetime.datetime.strptime(self.to_date, dt_format)
 
-		if self.algorithm == "BFS":
-			self.bfs(from_date, to_date)
-
 		if self.algorithm == "DFS":
-			self.dfs(from_date, to_date)
+			nodes = self.dfs(from_date, to_date)
+		else:
+			nodes = self.bfs(from_date, to_date)
+
+		self.set_node_summaries(nodes)
+		self.insert_nodes(nodes)
 
 		# set root as current node
-		root = frappe.db.get_all("Bisect Nodes", filters={"root": ["is", "not set"]})[0]
-		self.get_report_summary()
+		root = nodes[0]
 		self.current_node = root.name
 		self.current_from_date = self.from_date
 		self.current_to_date = self.to_date
+		self.fetch_summary_info_from_current_node()
 		self.save()
 
 	def get_report_summary(self):
@@ -172,8 +260,8 @@ class BisectAccountingStatements(Document):
 
 	def fetch_summary_info_from_current_node(self):
 		current_node = frappe.get_doc("Bisect Nodes", self.current_node)
-		self.p_l_summary = current_node.balance_sheet_summary
-		self.b_s_summary = current_node.profit_loss_summary
+		self.p_l_summary = current_node.profit_loss_summary
+		self.b_s_summary = current_node.balance_sheet_summary
 		self.difference = abs(self.p_l_summary - self.b_s_summary)
 
 	def fetch_or_calculate(self):
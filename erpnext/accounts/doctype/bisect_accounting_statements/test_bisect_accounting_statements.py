@@ -1,9 +1,72 @@
 # Copyright (c) 2023, Frappe Technologies Pvt. Ltd. and Contributors
 # See license.txt
 
-# import frappe
+import frappe
 from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_days, getdate, today
 
+from erpnext.accounts.doctype.journal_entry.test_journal_entry import make_journal_entry
+from erpnext.accounts.test.accounts_mixin import AccountsTestMixin
 
-class TestBisectAccountingStatements(FrappeTestCase):
-	pass
+
+class TestBisectAccountingStatements(AccountsTestMixin, FrappeTestCase):
+	def setUp(self):
+		self.create_company()
+		self.clear_old_entries()
+
+	def tearDown(self):
+		frappe.db.rollback()
+
+	def test_node_summaries_are_sums_of_children(self):
+		from_date = add_days(today(), -3)
+		make_journal_entry(
+			self.cash,
+			self.income_account,
+			100,
+			cost_center=self.cost_center,
+			posting_date=from_date,
+			company=self.company,
+			submit=True,
+		)
+		make_journal_entry(
+			self.cash,
+			self.income_account,
+			50,
+			cost_center=self.cost_center,
+			posting_date=today(),
+			company=self.company,
+			submit=True,
+		)
+
+		bisect = frappe.get_doc("Bisect Accounting Statements")
+		bisect.update(
+			{
+				"company": self.company,
+				"algorithm": "BFS",
+				"from_date": str(getdate(from_date)) + " 00:00:00",
+				"to_date": str(getdate(today())) + " 00:00:00",
+			}
+		)
+		bisect.build_tree()
+
+		self.assertEqual(bisect.p_l_summary, 150)
+		self.assertEqual(bisect.b_s_summary, 150)
+		self.assertEqual(bisect.difference, 0)
+
+		nodes = frappe.get_all(
+			"Bisect Nodes",
+			fields=["name", "left_child", "right_child", "profit_loss_summary", "generated"],
+		)
+		self.assertEqual(len(nodes), 7)
+		summaries = {node.name: node.profit_loss_summary for node in nodes}
+		for node in nodes:
+			self.assertTrue(node.generated)
+			if node.left_child:
+				self.assertEqual(
+					node.profit_loss_summary, summaries[node.left_child] + summaries[node.right_child]
+				)
+
+		bisect.bisect_left()
+		self.assertEqual(bisect.p_l_summary, 100)
+		bisect.bisect_right()
+		self.assertEqual(bisect.p_l_summary, 0)
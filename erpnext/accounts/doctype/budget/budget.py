@@ -7,8 +7,10 @@ from frappe import _
 from frappe.model.document import Document
 from frappe.utils import add_months, flt, fmt_money, get_last_day, getdate
 
-from erpnext.accounts.doctype.accounting_dimension.accounting_dimension import (
-	get_accounting_dimensions,
+from erpnext.accounts.doctype.budget_consumption.budget_consumption import (
+	get_budget_dimensions,
+	get_consumed_expense,
+	rebuild_budget_consumption,
 )
 from erpnext.accounts.utils import get_fiscal_year
 
@@ -139,12 +141,58 @@ class Budget(Document):
 	def before_naming(self):
 		self.naming_series = f"{{{frappe.scrub(self.budget_against)}}}./.{self.fiscal_year}/.###"
 
+	def on_submit(self):
+		# consumption is tracked only while a budget exists, catch up with expenses booked so far
+		rebuild_budget_consumption(
+			self.company, self.fiscal_year, [d.account for d in self.accounts], self.budget_against
+		)
+
 
 def validate_expense_against_budget(args, expense_amount=0):
-	args = frappe._dict(args)
+	validate_expenses_against_budget([(args, expense_amount)])
+
+
+def validate_expenses_against_budget(lines):
+	"""
+	Validates `(args, expense_amount)` lines of a document against budgets. Lines booked against the same
+	account, item, dimensions and month are validated once with their expense amounts added up, and
+	consumed, requested and ordered amounts are looked up once for the document.
+	"""
 	if not frappe.get_all("Budget", limit=1):
 		return
 
+	dimensions = get_budget_dimensions()
+	grouped_lines = {}
+	for line_args, expense_amount in lines:
+		args = get_budget_args(line_args)
+		if not args:
+			continue
+
+		key = (
+			args.get("doctype"),
+			args.company,
+			args.fiscal_year,
+			args.account,
+			args.get("expense_account"),
+			args.get("item_code"),
+			get_last_day(args.posting_date),
+			*[args.get(d.get("fieldname")) for d in dimensions],
+		)
+		if key in grouped_lines:
+			grouped_lines[key].expense_amount += flt(expense_amount)
+		else:
+			args.expense_amount = flt(expense_amount)
+			grouped_lines[key] = args
+
+	item_codes = {args.item_code for args in grouped_lines.values() if args.get("item_code")}
+	cache = {}
+	for args in grouped_lines.values():
+		args.item_codes = item_codes
+		validate_budget_for_dimensions(args, dimensions, args.expense_amount, cache)
+
+
+def get_budget_args(args):
+	args = frappe._dict(args)
 	if args.get("company") and not args.fiscal_year:
 		args.fiscal_year = get_fiscal_year(args.get("posting_date"), company=args.get("company"))[0]
 		frappe.flags.exception_approver_role = frappe.get_cached_value(
@@ -163,18 +211,11 @@ def validate_expense_against_budget(args, expense_amount=0):
 	if not args.account:
 		return
 
-	default_dimensions = [
-		{
-			"fieldname": "project",
-			"document_type": "Project",
-		},
-		{
-			"fieldname": "cost_center",
-			"document_type": "Cost Center",
-		},
-	]
+	return args
+
 
-	for dimension in default_dimensions + get_accounting_dimensions(as_list=False):
+def validate_budget_for_dimensions(args, dimensions, expense_amount, cache):
+	for dimension in dimensions:
 		budget_against = dimension.get("fieldname")
 
 		if (
@@ -196,8 +237,18 @@ def validate_expense_against_budget(args, expense_amount=0):
 			args.budget_against_field = budget_against
 			args.budget_against_doctype = doctype
 
-			budget_records = frappe.db.sql(
-				f"""
+			key = ("budget_records", args.fiscal_year, args.account, budget_against, args.get(budget_against))
+			if key not in cache:
+				cache[key] = get_budget_records(args, condition)
+
+			if cache[key]:
+				validate_budget_records(args, cache[key], expense_amount, cache)
+
+
+def get_budget_records(args, condition):
+	budget_against = args.budget_against_field
+	return frappe.db.sql(
+		f"""
 				select
 					b.{budget_against} as budget_against, ba.budget_amount, b.monthly_distribution,
 					ifnull(b.applicable_on_material_request, 0) as for_material_request,
@@ -213,15 +264,12 @@ def validate_expense_against_budget(args, expense_amount=0):
 					and ba.account=%s and b.docstatus=1
 					{condition}
 			""",
-				(args.fiscal_year, args.account),
-				as_dict=True,
-			)  # nosec
-
-			if budget_records:
-				validate_budget_records(args, budget_records, expense_amount)
+		(args.fiscal_year, args.account),
+		as_dict=True,
+	)  # nosec
 
 
-def validate_budget_records(args, budget_records, expense_amount):
+def validate_budget_records(args, budget_records, expense_amount, cache=None):
 	for budget in budget_records:
 		if flt(budget.budget_amount):
 			yearly_action, monthly_action = get_actions(args, budget)
@@ -236,6 +284,7 @@ def validate_budget_records(args, budget_records, expense_amount):
 					yearly_action,
 					budget.budget_against,
 					expense_amount,
+					cache,
 				)
 
 			if monthly_action in ["Stop", "Warn"]:
@@ -252,13 +301,47 @@ def validate_budget_records(args, budget_records, expense_amount):
 					monthly_action,
 					budget.budget_against,
 					expense_amount,
+					cache,
 				)
 
 
-def compare_expense_with_budget(args, budget_amount, action_for, action, budget_against, amount=0):
-	args.actual_expense, args.requested_amount, args.ordered_amount = get_actual_expense(args), 0, 0
-	if not amount:
-		args.requested_amount, args.ordered_amount = get_requested_amount(args), get_ordered_amount(args)
+def compare_expense_with_budget(
+	args, budget_amount, action_for, action, budget_against, amount=0, cache=None
+):
+	if cache is None:
+		cache = {}
+
+	budget_against_value = args.get(args.budget_against_field)
+	key = (
+		"actual_expense",
+		args.company,
+		args.fiscal_year,
+		args.account,
+		args.budget_against_field,
+		budget_against_value,
+		args.get("month_end_date"),
+	)
+	if key not in cache:
+		cache[key] = get_consumed_expense(args)
+
+	args.actual_expense, args.requested_amount, args.ordered_amount = cache[key], 0, 0
+	if not amount and args.get("item_code"):
+		item_codes = list(args.get("item_codes") or [args.item_code])
+		for for_doc, fieldname in (
+			("Material Request", "requested_amount"),
+			("Purchase Order", "ordered_amount"),
+		):
+			key = (
+				fieldname,
+				args.fiscal_year,
+				args.get("expense_account"),
+				args.budget_against_field,
+				budget_against_value,
+			)
+			if key not in cache:
+				cache[key] = get_pending_amounts(args, for_doc, item_codes)
+
+			args[fieldname] = flt(cache[key].get(args.item_code))
 
 		if args.get("doctype") == "Material Request" and args.for_material_request:
 			amount = args.requested_amount + args.ordered_amount
@@ -394,35 +477,41 @@ def get_actions(args, budget):
 
 
 def get_requested_amount(args):
-	item_code = args.get("item_code")
-	condition = get_other_condition(args, "Material Request")
-
-	data = frappe.db.sql(
-		""" select ifnull((sum(child.stock_qty - child.ordered_qty) * rate), 0) as amount
-		from `tabMaterial Request Item` child, `tabMaterial Request` parent where parent.name = child.parent and
-		child.item_code = %s and parent.docstatus = 1 and child.stock_qty > child.ordered_qty and {} and
-		parent.material_request_type = 'Purchase' and parent.status != 'Stopped'""".format(condition),
-		item_code,
-		as_list=1,
+	return flt(
+		get_pending_amounts(args, "Material Request", [args.get("item_code")]).get(args.get("item_code"))
 	)
 
-	return data[0][0] if data else 0
-
 
 def get_ordered_amount(args):
-	item_code = args.get("item_code")
-	condition = get_other_condition(args, "Purchase Order")
-
-	data = frappe.db.sql(
-		f""" select ifnull(sum(child.amount - child.billed_amt), 0) as amount
-		from `tabPurchase Order Item` child, `tabPurchase Order` parent where
-		parent.name = child.parent and child.item_code = %s and parent.docstatus = 1 and child.amount > child.billed_amt
-		and parent.status != 'Closed' and {condition}""",
-		item_code,
-		as_list=1,
+	return flt(
+		get_pending_amounts(args, "Purchase Order", [args.get("item_code")]).get(args.get("item_code"))
 	)
 
-	return data[0][0] if data else 0
+
+def get_pending_amounts(args, for_doc, item_codes):
+	"""Returns item-wise amounts of open Material Requests or unbilled Purchase Orders."""
+	condition = get_other_condition(args, for_doc)
+
+	if for_doc == "Material Request":
+		data = frappe.db.sql(
+			f""" select child.item_code, ifnull((sum(child.stock_qty - child.ordered_qty) * rate), 0) as amount
+			from `tabMaterial Request Item` child, `tabMaterial Request` parent where parent.name = child.parent and
+			child.item_code in %(item_codes)s and parent.docstatus = 1 and child.stock_qty > child.ordered_qty and {condition} and
+			parent.material_request_type = 'Purchase' and parent.status != 'Stopped'
+			group by child.item_code""",
+			{"item_codes": item_codes},
+		)
+	else:
+		data = frappe.db.sql(
+			f""" select child.item_code, ifnull(sum(child.amount - child.billed_amt), 0) as amount
+			from `tabPurchase Order Item` child, `tabPurchase Order` parent where
+			parent.name = child.parent and child.item_code in %(item_codes)s and parent.docstatus = 1
+			and child.amount > child.billed_amt and parent.status != 'Closed' and {condition}
+			group by child.item_code""",
+			{"item_codes": item_codes},
+		)
+
+	return dict(data)
 
 
 def get_other_condition(args, for_doc):
@@ -0,0 +1,231 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+from collections import defaultdict
+
+import frappe
+from frappe import qb
+from frappe.model.document import Document
+from frappe.query_builder.functions import Sum
+from frappe.utils import flt, get_first_day
+
+from erpnext.accounts.doctype.accounting_dimension.accounting_dimension import (
+	get_accounting_dimensions,
+)
+from erpnext.accounts.utils import get_fiscal_year
+from erpnext.utilities.delta_rows import compact_delta_rows, insert_delta_rows
+
+
+class BudgetConsumption(Document):
+	# begin: auto-generated types
+	# This code is auto-generated. Do not modify anything in this block.
+
+	from typing import TYPE_CHECKING
+
+	if TYPE_CHECKING:
+		from frappe.types import DF
+
+		account: DF.Link
+		actual_expense: DF.Currency
+		budget_against: DF.Link
+		budget_against_value: DF.DynamicLink
+		company: DF.Link
+		fiscal_year: DF.Link
+		posting_month: DF.Date
+	# end: auto-generated types
+
+	pass
+
+
+CONSUMPTION_KEY_FIELDS = (
+	"company",
+	"fiscal_year",
+	"account",
+	"budget_against",
+	"budget_against_value",
+	"posting_month",
+)
+
+
+def on_doctype_update():
+	frappe.db.add_index(
+		"Budget Consumption",
+		["account", "budget_against", "budget_against_value", "fiscal_year", "posting_month"],
+	)
+
+
+def get_budget_dimensions() -> list[dict]:
+	"""Returns fieldname and document type of dimensions budgets can be set against."""
+	return [
+		{"fieldname": "project", "document_type": "Project"},
+		{"fieldname": "cost_center", "document_type": "Cost Center"},
+		*get_accounting_dimensions(as_list=False),
+	]
+
+
+def get_budgeted_dimensions(company, fiscal_year) -> dict:
+	"""Returns a map of account to (fieldname, document type) of dimensions with submitted budgets."""
+	fieldnames = {d.get("document_type"): d.get("fieldname") for d in get_budget_dimensions()}
+
+	budget = qb.DocType("Budget")
+	budget_account = qb.DocType("Budget Account")
+	budgets = (
+		qb.from_(budget)
+		.inner_join(budget_account)
+		.on(budget_account.parent == budget.name)
+		.select(budget_account.account, budget.budget_against)
+		.distinct()
+		.where((budget.company == company) & (budget.fiscal_year == fiscal_year) & (budget.docstatus == 1))
+	).run(as_dict=True)
+
+	budgeted_dimensions = defaultdict(list)
+	for row in budgets:
+		if fieldnames.get(row.budget_against):
+			budgeted_dimensions[row.account].append((fieldnames[row.budget_against], row.budget_against))
+
+	return budgeted_dimensions
+
+
+def insert_consumption_rows(consumption: dict) -> None:
+	"""
+	Bulk inserts consumption rows from a map of `CONSUMPTION_KEY_FIELDS` values to expense.
+
+	Consumption is append only, rows are summed by `get_consumed_expense` and merged by
+	`compact_budget_consumption`, so expense postings never lock a row shared with other postings.
+	"""
+	insert_delta_rows(
+		"Budget Consumption",
+		CONSUMPTION_KEY_FIELDS,
+		["actual_expense"],
+		{key: {"actual_expense": amount} for key, amount in consumption.items()},
+	)
+
+
+def update_budget_consumption_for_gl_entries(gl_entries, cancel=False):
+	"""
+	Updates expense consumed against budgeted dimensions from GL Entries being posted, or being cancelled
+	if `cancel`. Only accounts and dimensions with a submitted Budget in the fiscal year are tracked.
+	"""
+	if not gl_entries or not frappe.db.exists("Budget", {"docstatus": 1}):
+		return
+
+	multiplier = -1 if cancel else 1
+	consumption = defaultdict(float)
+	budgeted_dimensions = {}
+
+	for entry in gl_entries:
+		if frappe.get_cached_value("Account", entry.get("account"), "root_type") != "Expense":
+			continue
+
+		company = entry.get("company")
+		fiscal_year = (
+			entry.get("fiscal_year") or get_fiscal_year(entry.get("posting_date"), company=company)[0]
+		)
+		if (company, fiscal_year) not in budgeted_dimensions:
+			budgeted_dimensions[(company, fiscal_year)] = get_budgeted_dimensions(company, fiscal_year)
+
+		amount = (flt(entry.get("debit")) - flt(entry.get("credit"))) * multiplier
+		for fieldname, budget_against in budgeted_dimensions[(company, fiscal_year)].get(
+			entry.get("account"), []
+		):
+			if not entry.get(fieldname):
+				continue
+
+			key = (
+				company,
+				fiscal_year,
+				entry.get("account"),
+				budget_against,
+				entry.get(fieldname),
+				get_first_day(entry.get("posting_date")),
+			)
+			consumption[key] += amount
+
+	insert_consumption_rows(consumption)
+
+
+def rebuild_budget_consumption(company, fiscal_year, accounts, budget_against):
+	"""Rebuilds consumption of the accounts against a budget dimension from GL Entries."""
+	fieldnames = {d.get("document_type"): d.get("fieldname") for d in get_budget_dimensions()}
+	fieldname = fieldnames.get(budget_against)
+	if not (fieldname and accounts):
+		return
+
+	consumption = qb.DocType("Budget Consumption")
+	qb.from_(consumption).delete().where(
+		(consumption.company == company)
+		& (consumption.fiscal_year == fiscal_year)
+		& (consumption.account.isin(accounts))
+		& (consumption.budget_against == budget_against)
+	).run()
+
+	gle = qb.DocType("GL Entry")
+	ledger = (
+		qb.from_(gle)
+		.select(
+			gle.account,
+			gle[fieldname].as_("budget_against_value"),
+			gle.posting_date,
+			(Sum(gle.debit) - Sum(gle.credit)).as_("amount"),
+		)
+		.where(
+			(gle.company == company)
+			& (gle.fiscal_year == fiscal_year)
+			& (gle.account.isin(accounts))
+			& (gle.is_cancelled == 0)
+			& (gle[fieldname].isnotnull())
+			& (gle[fieldname] != "")
+		)
+		.groupby(gle.account, gle[fieldname], gle.posting_date)
+	).run(as_dict=True)
+
+	month_wise_consumption = defaultdict(float)
+	for row in ledger:
+		key = (row.account, row.budget_against_value, get_first_day(row.posting_date))
+		month_wise_consumption[key] += flt(row.amount)
+
+	insert_consumption_rows(
+		{
+			(company, fiscal_year, account, budget_against, budget_against_value, posting_month): amount
+			for (account, budget_against_value, posting_month), amount in month_wise_consumption.items()
+		}
+	)
+
+
+def compact_budget_consumption(created_before=None):
+	"""Merges the consumption rows appended by postings into one row per account, dimension and month."""
+	compact_delta_rows("Budget Consumption", CONSUMPTION_KEY_FIELDS, ["actual_expense"], created_before)
+
+
+def get_consumed_expense(args) -> float:
+	"""
+	Returns expense booked against the account and dimension value of `args` in the fiscal year, up to
+	`month_end_date` if set. For tree dimensions, expense booked against descendants is included.
+	"""
+	consumption = qb.DocType("Budget Consumption")
+	dimension = qb.DocType(args.budget_against_doctype)
+	budget_against_value = args.get(args.budget_against_field)
+
+	query = (
+		qb.from_(consumption)
+		.inner_join(dimension)
+		.on(consumption.budget_against_value == dimension.name)
+		.select(Sum(consumption.actual_expense))
+		.where(
+			(consumption.company == args.company)
+			& (consumption.fiscal_year == args.fiscal_year)
+			& (consumption.account == args.account)
+			& (consumption.budget_against == args.budget_against_doctype)
+		)
+	)
+
+	if args.get("month_end_date"):
+		query = query.where(consumption.posting_month <= args.month_end_date)
+
+	if args.is_tree:
+		lft, rgt = frappe.db.get_value(args.budget_against_doctype, budget_against_value, ["lft", "rgt"])
+		query = query.where((dimension.lft >= lft) & (dimension.rgt <= rgt))
+	else:
+		query = query.where(consumption.budget_against_value == budget_against_value)
+
+	return flt(query.run()[0][0])
@@ -0,0 +1,95 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_to_date, get_first_day, now_datetime, nowdate
+
+from erpnext.accounts.doctype.budget.budget import get_actual_expense
+from erpnext.accounts.doctype.budget.test_budget import make_budget
+from erpnext.accounts.doctype.budget_consumption.budget_consumption import (
+	compact_budget_consumption,
+	get_consumed_expense,
+	rebuild_budget_consumption,
+)
+from erpnext.accounts.doctype.journal_entry.test_journal_entry import make_journal_entry
+from erpnext.accounts.utils import get_fiscal_year
+
+
+class TestBudgetConsumption(FrappeTestCase):
+	def tearDown(self):
+		frappe.db.rollback()
+
+	def get_args(self, cost_center):
+		return frappe._dict(
+			{
+				"account": "_Test Account Cost for Goods Sold - _TC",
+				"company": "_Test Company",
+				"fiscal_year": get_fiscal_year(nowdate())[0],
+				"budget_against_field": "cost_center",
+				"budget_against_doctype": "Cost Center",
+				"cost_center": cost_center,
+				"is_tree": True,
+			}
+		)
+
+	def test_consumption_matches_general_ledger(self):
+		budget = make_budget(budget_against="Cost Center", cost_center="_Test Company - _TC")
+		frappe.db.set_value("Budget", budget.name, "action_if_annual_budget_exceeded", "Ignore")
+
+		jv = make_journal_entry(
+			"_Test Account Cost for Goods Sold - _TC",
+			"_Test Bank - _TC",
+			1500,
+			"_Test Cost Center 2 - _TC",
+			posting_date=nowdate(),
+			submit=True,
+		)
+
+		for cost_center in ("_Test Company - _TC", "_Test Cost Center 2 - _TC"):
+			args = self.get_args(cost_center)
+			self.assertEqual(get_consumed_expense(args), get_actual_expense(args))
+
+		args = self.get_args("_Test Company - _TC")
+		before_cancel = get_consumed_expense(args)
+		jv.cancel()
+		self.assertEqual(get_consumed_expense(args), before_cancel - 1500)
+		self.assertEqual(get_consumed_expense(args), get_actual_expense(args))
+
+		incremental = get_consumed_expense(args)
+		rebuild_budget_consumption(
+			"_Test Company", args.fiscal_year, [args.account], budget_against="Cost Center"
+		)
+		self.assertEqual(get_consumed_expense(args), incremental)
+
+	def test_compaction_keeps_consumed_expense(self):
+		budget = make_budget(budget_against="Cost Center", cost_center="_Test Cost Center - _TC")
+		frappe.db.set_value("Budget", budget.name, "action_if_annual_budget_exceeded", "Ignore")
+
+		for amount in (100, 250):
+			make_journal_entry(
+				"_Test Account Cost for Goods Sold - _TC",
+				"_Test Bank - _TC",
+				amount,
+				"_Test Cost Center - _TC",
+				posting_date=nowdate(),
+				submit=True,
+			)
+
+		args = self.get_args("_Test Cost Center - _TC")
+		args.is_tree = False
+		before = get_consumed_expense(args)
+
+		compact_budget_consumption(created_before=add_to_date(now_datetime(), seconds=1))
+		self.assertEqual(get_consumed_expense(args), before)
+		self.assertEqual(
+			frappe.db.count(
+				"Budget Consumption",
+				{
+					"account": args.account,
+					"budget_against_value": "_Test Cost Center - _TC",
+					"posting_month": get_first_day(nowdate()),
+				},
+			),
+			1,
+		)
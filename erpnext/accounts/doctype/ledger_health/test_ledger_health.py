@@ -107,3 +107,35 @@ class TestLedgerHealth(AccountsTestMixin, FrappeTestCase):
 		)
 		self.assertEqual(len(actual), 1)
 		self.assertEqual(expected, actual[0])
+
+	def test_incremental_health_checks(self):
+		self.create_journal()
+		run_ledger_health_checks()
+		self.assertFalse(frappe.db.get_all("Ledger Health"))
+
+		monitored_company = self.get_monitored_company()
+		self.assertTrue(monitored_company.last_checked_on)
+		self.assertTrue(monitored_company.rows_scanned)
+
+		# unchanged vouchers are not scanned again
+		run_ledger_health_checks()
+		self.assertEqual(self.get_monitored_company().rows_scanned, 0)
+
+		# manually cause debit-credit mismatch
+		gle = frappe.db.get_all(
+			"GL Entry", filters={"voucher_no": self.je.name, "account": self.income_account}
+		)[0]
+		frappe.db.set_value("GL Entry", gle.name, "credit", 8000)
+
+		run_ledger_health_checks()
+		self.assertTrue(self.get_monitored_company().rows_scanned)
+		actual = frappe.db.get_all("Ledger Health", fields=["voucher_no", "debit_credit_mismatch"])
+		self.assertEqual(actual, [{"voucher_no": self.je.name, "debit_credit_mismatch": 1}])
+
+	def get_monitored_company(self):
+		return frappe.db.get_value(
+			"Ledger Health Monitor Company",
+			{"parent": "Ledger Health Monitor", "company": self.company},
+			["last_checked_on", "rows_scanned"],
+			as_dict=True,
+		)
@@ -1,8 +1,14 @@
 # Copyright (c) 2024, Frappe Technologies Pvt. Ltd. and contributors
 # For license information, please see license.txt
 
-# import frappe
+import time
+
+import frappe
+from frappe import qb
 from frappe.model.document import Document
+from frappe.query_builder import Criterion
+from frappe.query_builder.functions import Count, Sum
+from frappe.utils import add_days, cint, flt, getdate, now
 
 
 class LedgerHealthMonitor(Document):
@@ -26,3 +32,210 @@ class LedgerHealthMonitor(Document):
 	# end: auto-generated types
 
 	pass
+
+
+class LedgerHealthChecker:
+	"""
+	Checks ledgers of a company for Debit-Credit and General-Payment Ledger mismatches.
+
+	Only vouchers with ledger entries posted or modified since the last run are examined,
+	all vouchers in the monitoring window are examined on the first run.
+	"""
+
+	def __init__(self, settings, company, last_checked_on=None, run_date=None):
+		self.settings = settings
+		self.company = company
+		self.last_checked_on = last_checked_on
+		self.run_date = run_date or now()
+		self.period_end = getdate(self.run_date)
+		self.period_start = add_days(self.period_end, -abs(settings.monitor_for_last_x_days))
+
+		self.rows_scanned = 0
+		self.time_taken = 0.0
+		self.findings = []
+
+	def run(self):
+		started_at = time.monotonic()
+
+		if self.settings.debit_credit_mismatch:
+			self.check_debit_credit_mismatch()
+
+		if self.settings.general_and_payment_ledger_mismatch:
+			self.check_general_and_payment_ledger_mismatch()
+
+		self.insert_findings()
+		self.time_taken = time.monotonic() - started_at
+
+	def get_conditions(self, ledger):
+		conditions = [
+			ledger.company == self.company,
+			ledger.posting_date[self.period_start : self.period_end],
+		]
+
+		if self.last_checked_on:
+			conditions.append(
+				Criterion.any(
+					[
+						ledger.voucher_no.isin(self.get_changed_vouchers(qb.DocType("GL Entry"))),
+						ledger.voucher_no.isin(self.get_changed_vouchers(qb.DocType("Payment Ledger Entry"))),
+					]
+				)
+			)
+
+		return Criterion.all(conditions)
+
+	def get_changed_vouchers(self, ledger):
+		return (
+			qb.from_(ledger)
+			.select(ledger.voucher_no)
+			.distinct()
+			.where(
+				(ledger.company == self.company)
+				& (ledger.posting_date[self.period_start : self.period_end])
+				& (ledger.modified > self.last_checked_on)
+			)
+		)
+
+	def check_debit_credit_mismatch(self):
+		gle = qb.DocType("GL Entry")
+		vouchers = (
+			qb.from_(gle)
+			.select(
+				gle.voucher_type,
+				gle.voucher_no,
+				Sum(gle.debit).as_("debit"),
+				Sum(gle.credit).as_("credit"),
+				Count(gle.name).as_("row_count"),
+			)
+			.where((gle.is_cancelled == 0) & self.get_conditions(gle))
+			.groupby(gle.voucher_type, gle.voucher_no)
+		).run(as_dict=True)
+
+		for voucher in vouchers:
+			self.rows_scanned += voucher.row_count
+			if voucher.debit != voucher.credit:
+				self.findings.append((voucher.voucher_type, voucher.voucher_no, "debit_credit_mismatch"))
+
+	def check_general_and_payment_ledger_mismatch(self):
+		account_types = dict(
+			frappe.get_all(
+				"Account",
+				filters={"company": self.company, "account_type": ("in", ["Receivable", "Payable"])},
+				fields=["name", "account_type"],
+				as_list=True,
+			)
+		)
+		if not account_types:
+			return
+
+		gle = qb.DocType("GL Entry")
+		gl_balances = (
+			qb.from_(gle)
+			.select(
+				gle.account,
+				gle.voucher_type,
+				gle.voucher_no,
+				gle.party_type,
+				gle.party,
+				(Sum(gle.debit) - Sum(gle.credit)).as_("outstanding"),
+				Count(gle.name).as_("row_count"),
+			)
+			.where(
+				(gle.is_cancelled == 0) & (gle.account.isin(list(account_types))) & self.get_conditions(gle)
+			)
+			.groupby(gle.account, gle.voucher_type, gle.voucher_no, gle.party_type, gle.party)
+		).run(as_dict=True)
+
+		ple = qb.DocType("Payment Ledger Entry")
+		pl_balances = (
+			qb.from_(ple)
+			.select(
+				ple.account,
+				ple.voucher_type,
+				ple.voucher_no,
+				ple.party_type,
+				ple.party,
+				Sum(ple.amount).as_("outstanding"),
+				Count(ple.name).as_("row_count"),
+			)
+			.where((ple.delinked == 0) & (ple.account.isin(list(account_types))) & self.get_conditions(ple))
+			.groupby(ple.account, ple.voucher_type, ple.voucher_no, ple.party_type, ple.party)
+		).run(as_dict=True)
+
+		def get_balance_map(rows, signed):
+			balance_map = {}
+			for row in rows:
+				self.rows_scanned += row.row_count
+				outstanding = flt(row.outstanding)
+				if signed and account_types[row.account] == "Payable":
+					outstanding = -outstanding
+
+				key = (row.account, row.voucher_type, row.voucher_no, row.party_type, row.party)
+				balance_map[key] = outstanding
+
+			return balance_map
+
+		gl_balance_map = get_balance_map(gl_balances, signed=True)
+		pl_balance_map = get_balance_map(pl_balances, signed=False)
+
+		mismatched_vouchers = {
+			(key[1], key[2])
+			for key in gl_balance_map.keys() | pl_balance_map.keys()
+			if gl_balance_map.get(key) != pl_balance_map.get(key)
+		}
+		for voucher_type, voucher_no in mismatched_vouchers:
+			self.findings.append((voucher_type, voucher_no, "general_and_payment_ledger_mismatch"))
+
+	def insert_findings(self):
+		"""Bulk inserts Ledger Health records for findings that are not already recorded."""
+		if not self.findings:
+			return
+
+		existing = set()
+		for fieldname in ("debit_credit_mismatch", "general_and_payment_ledger_mismatch"):
+			for voucher_type, voucher_no in frappe.get_all(
+				"Ledger Health",
+				filters={fieldname: 1, "voucher_no": ("in", list({x[1] for x in self.findings}))},
+				fields=["voucher_type", "voucher_no"],
+				as_list=True,
+			):
+				existing.add((voucher_type, voucher_no, fieldname))
+
+		user = frappe.session.user
+		values = []
+		for voucher_type, voucher_no, fieldname in self.findings:
+			if (voucher_type, voucher_no, fieldname) in existing:
+				continue
+
+			existing.add((voucher_type, voucher_no, fieldname))
+			values.append(
+				(
+					frappe.db.get_next_sequence_val("Ledger Health"),
+					now(),
+					now(),
+					user,
+					user,
+					voucher_type,
+					voucher_no,
+					self.run_date,
+					cint(fieldname == "debit_credit_mismatch"),
+					cint(fieldname == "general_and_payment_ledger_mismatch"),
+				)
+			)
+
+		frappe.db.bulk_insert(
+			"Ledger Health",
+			fields=[
+				"name",
+				"creation",
+				"modified",
+				"owner",
+				"modified_by",
+				"voucher_type",
+				"voucher_no",
+				"checked_on",
+				"debit_credit_mismatch",
+				"general_and_payment_ledger_mismatch",
+			],
+			values=values,
+		)
@@ -15,9 +15,12 @@ class LedgerHealthMonitorCompany(Document):
 		from frappe.types import DF
 
 		company: DF.Link | None
+		last_checked_on: DF.Datetime | None
 		parent: DF.Data
 		parentfield: DF.Data
 		parenttype: DF.Data
+		rows_scanned: DF.Int
+		time_taken: DF.Float
 	# end: auto-generated types
 
 	pass
@@ -182,3 +182,4 @@ class PaymentLedgerEntry(Document):
 def on_doctype_update():
 	frappe.db.add_index("Payment Ledger Entry", ["against_voucher_no", "against_voucher_type"])
 	frappe.db.add_index("Payment Ledger Entry", ["voucher_no", "voucher_type"])
+	frappe.db.add_index("Payment Ledger Entry", ["party_type", "party", "account", "posting_date"])
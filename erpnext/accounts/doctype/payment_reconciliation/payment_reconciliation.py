@@ -433,10 +433,20 @@ class PaymentReconciliation(Document):
 			"Company", self.company, "exchange_gain_loss_account"
 		)
 
+		# invoices and payments are sorted by posting date when fetched, so a single sweep allocates
+		# each payment to the earliest invoices that still have an outstanding amount
 		entries = []
+		invoices = args.get("invoices")
+		inv_idx = 0
 		for pay in args.get("payments"):
 			pay.update({"unreconciled_amount": pay.get("amount")})
-			for inv in args.get("invoices"):
+
+			# skip invoices settled by previous payments
+			while inv_idx < len(invoices) and invoices[inv_idx].get("outstanding_amount") == 0:
+				inv_idx += 1
+
+			while inv_idx < len(invoices):
+				inv = invoices[inv_idx]
 				if pay.get("amount") >= inv.get("outstanding_amount"):
 					res = self.get_allocated_entry(pay, inv, inv["outstanding_amount"])
 					pay["amount"] = flt(pay.get("amount")) - flt(inv.get("outstanding_amount"))
@@ -460,14 +470,13 @@ class PaymentReconciliation(Document):
 					elif exc_gain_loss_posting_date == "Reconciliation Date":
 						res.update({"gain_loss_posting_date": nowdate()})
 
+				entries.append(res)
 				if pay.get("amount") == 0:
-					entries.append(res)
 					break
-				elif inv.get("outstanding_amount") == 0:
-					entries.append(res)
-					continue
 
+				inv_idx += 1
 			else:
+				# all invoices are settled
 				break
 
 		self.set("allocation", [])
@@ -480,6 +480,35 @@ class TestPaymentReconciliation(FrappeTestCase):
 		self.assertEqual(len(pr.get("payments")), 0)
 		self.assertEqual(pr.get("invoices")[0].get("outstanding_amount"), 165)
 
+	def test_allocation_of_multiple_payments_against_multiple_invoices(self):
+		invoices = []
+		for rate, days in ((100, -2), (150, -1), (200, 0)):
+			si = self.create_sales_invoice(qty=1, rate=rate, do_not_save=True)
+			si.set_posting_time = 1
+			si.posting_date = add_days(nowdate(), days)
+			invoices.append(si.save().submit())
+		si1, si2, si3 = invoices
+		pe1 = self.create_payment_entry(amount=120).save().submit()
+		pe2 = self.create_payment_entry(amount=180).save().submit()
+
+		pr = self.create_payment_reconciliation()
+		pr.from_invoice_date = add_days(nowdate(), -2)
+		pr.get_unreconciled_entries()
+		invoices = [x.as_dict() for x in pr.get("invoices")]
+		payments = [x.as_dict() for x in pr.get("payments")]
+		pr.allocate_entries(frappe._dict({"invoices": invoices, "payments": payments}))
+
+		# invoices are settled in posting date order, payments carry over to the next invoice
+		self.assertEqual(
+			[(row.reference_name, row.invoice_number, row.allocated_amount) for row in pr.allocation],
+			[
+				(pe1.name, si1.name, 100),
+				(pe1.name, si2.name, 20),
+				(pe2.name, si2.name, 130),
+				(pe2.name, si3.name, 50),
+			],
+		)
+
 	def test_payment_against_journal(self):
 		transaction_date = nowdate()
 
@@ -9,6 +9,9 @@ from frappe.model.document import Document
 from frappe.utils import get_link_to_form
 from frappe.utils.scheduler import is_scheduler_inactive
 
+# Invoices and Payments fetched per round, a full page is followed by another round
+FETCH_PAGE_SIZE = 1000
+
 
 class ProcessPaymentReconciliation(Document):
 	# begin: auto-generated types
@@ -112,8 +115,8 @@ def get_pr_instance(doc: str):
 	for field in fields:
 		d[field] = process_payment_reconciliation.get(field)
 	pr.update(d)
-	pr.invoice_limit = 1000
-	pr.payment_limit = 1000
+	pr.invoice_limit = FETCH_PAGE_SIZE
+	pr.payment_limit = FETCH_PAGE_SIZE
 	return pr
 
 
@@ -362,9 +365,14 @@ def fetch_and_allocate(doc: str) -> None:
 								}
 							),
 						)
+				# allocations of previous pages are already reconciled
+				allocations = reconcile_log.get("allocations")
+				reconcile_log.has_more_entries = len(allocations) > reconcile_log.total_allocations and (
+					len(pr.invoices) >= FETCH_PAGE_SIZE or len(pr.payments) >= FETCH_PAGE_SIZE
+				)
 				reconcile_log.allocated = True
-				reconcile_log.total_allocations = len(reconcile_log.get("allocations"))
-				reconcile_log.reconciled_entries = 0
+				reconcile_log.total_allocations = len(allocations)
+				reconcile_log.reconciled_entries = len([x for x in allocations if x.reconciled])
 				reconcile_log.save()
 
 				# generate reconcile job name
@@ -472,9 +480,7 @@ def reconcile(doc: None | str = None) -> None:
 						)
 				finally:
 					if reconciled_entries == total_allocations:
-						frappe.db.set_value("Process Payment Reconciliation Log", log, "status", "Reconciled")
-						frappe.db.set_value("Process Payment Reconciliation Log", log, "reconciled", True)
-						frappe.db.set_value("Process Payment Reconciliation", doc, "status", "Completed")
+						complete_reconciliation(doc, log)
 					else:
 						if not (
 							frappe.db.get_value("Process Payment Reconciliation", doc, "status") == "Paused"
@@ -498,9 +504,35 @@ def reconcile(doc: None | str = None) -> None:
 									doc=doc,
 								)
 			else:
-				frappe.db.set_value("Process Payment Reconciliation Log", log, "status", "Reconciled")
-				frappe.db.set_value("Process Payment Reconciliation Log", log, "reconciled", True)
-				frappe.db.set_value("Process Payment Reconciliation", doc, "status", "Completed")
+				complete_reconciliation(doc, log)
+
+
+def complete_reconciliation(doc: str, log: str) -> None:
+	"""
+	Marks the reconciliation as completed, or fetches the next page of Invoices and Payments if the
+	last page was full. Reconciled entries are no longer outstanding, so the next fetch returns a new page.
+	"""
+	if frappe.db.get_value("Process Payment Reconciliation Log", log, "has_more_entries"):
+		frappe.db.set_value(
+			"Process Payment Reconciliation Log", log, {"allocated": False, "has_more_entries": False}
+		)
+
+		job_name = f"process_{doc}_fetch_and_allocate"
+		if not is_job_running(job_name):
+			frappe.enqueue(
+				method="erpnext.accounts.doctype.process_payment_reconciliation.process_payment_reconciliation.fetch_and_allocate",
+				queue="long",
+				timeout="3600",
+				is_async=True,
+				job_name=job_name,
+				enqueue_after_commit=True,
+				doc=doc,
+			)
+		return
+
+	frappe.db.set_value("Process Payment Reconciliation Log", log, "status", "Reconciled")
+	frappe.db.set_value("Process Payment Reconciliation Log", log, "reconciled", True)
+	frappe.db.set_value("Process Payment Reconciliation", doc, "status", "Completed")
 
 
 @frappe.whitelist()
@@ -1,9 +1,113 @@
 # Copyright (c) 2023, Frappe Technologies Pvt. Ltd. and Contributors
 # See license.txt
 
-# import frappe
+from unittest.mock import patch
+
+import frappe
 from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_days, nowdate
+
+from erpnext.accounts.doctype.payment_entry.test_payment_entry import create_payment_entry
+from erpnext.accounts.doctype.process_payment_reconciliation.process_payment_reconciliation import (
+	reconcile_based_on_filters,
+)
+from erpnext.accounts.doctype.sales_invoice.test_sales_invoice import create_sales_invoice
+from erpnext.accounts.test.accounts_mixin import AccountsTestMixin
+
+MODULE = "erpnext.accounts.doctype.process_payment_reconciliation.process_payment_reconciliation"
+
+
+class TestProcessPaymentReconciliation(AccountsTestMixin, FrappeTestCase):
+	def setUp(self):
+		self.create_company()
+		self.create_customer()
+		self.create_item()
+		self.clear_old_entries()
+
+	def tearDown(self):
+		frappe.db.rollback()
+
+	def create_sales_invoice(self, posting_date, rate=100):
+		return create_sales_invoice(
+			company=self.company,
+			customer=self.customer,
+			item_code=self.item,
+			rate=rate,
+			posting_date=posting_date,
+			cost_center=self.cost_center,
+			debit_to=self.debit_to,
+			income_account=self.income_account,
+			expense_account=self.expense_account,
+			warehouse=self.warehouse,
+			currency="INR",
+		)
+
+	def create_payment_entry(self, posting_date, amount):
+		payment = create_payment_entry(
+			company=self.company,
+			payment_type="Receive",
+			party_type="Customer",
+			party=self.customer,
+			paid_from=self.debit_to,
+			paid_to=self.bank,
+			paid_amount=amount,
+		)
+		payment.posting_date = posting_date
+		return payment.save().submit()
+
+	def run_reconciliation(self, doc):
+		"""Runs the background jobs of the reconciliation inline, in the order they are queued"""
+		queued_jobs = []
+
+		def enqueue(method, **kwargs):
+			queued_jobs.append(method)
+			frappe.get_attr(method)(doc=kwargs["doc"])
+
+		with (
+			patch(f"{MODULE}.FETCH_PAGE_SIZE", 2),
+			patch(f"{MODULE}.is_job_running", return_value=False),
+			patch("frappe.enqueue", side_effect=enqueue),
+		):
+			reconcile_based_on_filters(doc)
+
+		return queued_jobs
+
+	def test_reconciliation_in_multiple_pages(self):
+		invoices = [self.create_sales_invoice(add_days(nowdate(), -days)) for days in (3, 2, 1)]
+		# settles the first page of two invoices and carries 50 over to the third invoice
+		payment = self.create_payment_entry(add_days(nowdate(), -4), 250)
+
+		ppr = frappe.get_doc(
+			{
+				"doctype": "Process Payment Reconciliation",
+				"company": self.company,
+				"party_type": "Customer",
+				"party": self.customer,
+				"receivable_payable_account": self.debit_to,
+				"default_advance_account": self.advance_received,
+			}
+		).save()
+		ppr.submit()
+
+		queued_jobs = self.run_reconciliation(ppr.name)
+		self.assertEqual(queued_jobs.count(f"{MODULE}.fetch_and_allocate"), 2)
+
+		for invoice, outstanding_amount in zip(invoices, (0, 0, 50), strict=True):
+			invoice.reload()
+			self.assertEqual(invoice.outstanding_amount, outstanding_amount)
 
+		payment.reload()
+		self.assertEqual(payment.unallocated_amount, 0)
+		self.assertEqual(
+			[(x.reference_name, x.allocated_amount) for x in payment.references],
+			[(invoices[0].name, 100), (invoices[1].name, 100), (invoices[2].name, 50)],
+		)
 
-class TestProcessPaymentReconciliation(FrappeTestCase):
-	pass
+		log = frappe.get_doc("Process Payment Reconciliation Log", {"process_pr": ppr.name})
+		self.assertTrue(log.reconciled)
+		self.assertFalse(log.has_more_entries)
+		self.assertEqual(log.total_allocations, 3)
+		self.assertEqual(log.reconciled_entries, 3)
+		self.assertEqual(
+			frappe.db.get_value("Process Payment Reconciliation", ppr.name, "status"), "Completed"
+		)
@@ -21,6 +21,7 @@ class ProcessPaymentReconciliationLog(Document):
 		allocated: DF.Check
 		allocations: DF.Table[ProcessPaymentReconciliationLogAllocations]
 		error_log: DF.LongText | None
+		has_more_entries: DF.Check
 		process_pr: DF.Link
 		reconciled: DF.Check
 		reconciled_entries: DF.Int
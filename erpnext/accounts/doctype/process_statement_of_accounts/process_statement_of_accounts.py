@@ -3,11 +3,15 @@
 
 
 import copy
+import gzip
+import hashlib
+import json
 
 import frappe
-from frappe import _
+from frappe import _, qb
 from frappe.desk.reportview import get_match_cond
 from frappe.model.document import Document
+from frappe.query_builder.functions import Max
 from frappe.utils import add_days, add_months, format_date, getdate, today
 from frappe.utils.jinja import validate_template
 from frappe.utils.pdf import get_pdf
@@ -21,6 +25,10 @@ from erpnext.accounts.report.accounts_receivable_summary.accounts_receivable_sum
 )
 from erpnext.accounts.report.general_ledger.general_ledger import execute as get_soa
 
+STATEMENT_CACHE_EXPIRY = 60 * 60
+# number of customers whose statements are rendered and emailed by each background job
+STATEMENT_EMAIL_CHUNK_SIZE = 20
+
 
 class ProcessStatementOfAccounts(Document):
 	# begin: auto-generated types
@@ -120,19 +128,61 @@ def get_report_pdf(doc, consolidated=True):
 
 
 def get_statement_dict(doc, get_statement_dict=False):
+	if get_statement_dict:
+		return get_statements(doc, get_statement_dict=True)
+
+	cache_key = get_statement_cache_key(doc)
+	if cached_statements := frappe.cache().get_value(cache_key):
+		statement_dict = json.loads(gzip.decompress(cached_statements))
+	else:
+		statement_dict = get_statements(doc)
+		frappe.cache().set_value(
+			cache_key,
+			gzip.compress(frappe.as_json(statement_dict, indent=None).encode()),
+			expires_in_sec=STATEMENT_CACHE_EXPIRY,
+		)
+
+	css = get_print_style()
+	return {customer: wrap_statement_html(html, customer, css) for customer, html in statement_dict.items()}
+
+
+def get_statement_cache_key(doc):
+	"""Returns cache key for the statements of the document.
+
+	The key changes whenever the document is modified or a ledger entry is posted or cancelled,
+	so cached statements are never stale.
+	"""
+	ledger = qb.DocType("Payment Ledger Entry" if doc.report == "Accounts Receivable" else "GL Entry")
+	last_ledger_modified = (
+		qb.from_(ledger).select(Max(ledger.modified)).where(ledger.company == doc.company).run()[0][0]
+	)
+
+	key = frappe.as_json([doc.name, str(doc.modified), str(last_ledger_modified)])
+	return "process_statement_of_accounts:" + hashlib.sha256(key.encode()).hexdigest()
+
+
+def get_statements(doc, get_statement_dict=False):
+	"""Returns statement body HTML of each customer, or `[data, ageing]` if `get_statement_dict`.
+
+	Ageing and Accounts Receivable data are fetched for all customers at once and grouped by party.
+	"""
 	statement_dict = {}
-	ageing = ""
+	customers = [entry.customer for entry in doc.customers]
+	ageing_map = get_ageing_map(doc, customers) if doc.include_ageing else {}
+	tax_ids = dict(
+		frappe.get_all(
+			"Customer", filters={"name": ("in", customers)}, fields=["name", "tax_id"], as_list=True
+		)
+	)
+
+	if doc.report == "General Ledger":
+		customers_with_entries = get_customers_with_gl_entries(doc, customers)
+	else:
+		ar_col, ar_data = get_ar_data(doc, customers)
 
 	for entry in doc.customers:
-		if doc.include_ageing:
-			ageing = set_ageing(doc, entry)
-
-		tax_id = frappe.get_doc("Customer", entry.customer).tax_id
-		presentation_currency = (
-			get_party_account_currency("Customer", entry.customer, doc.company)
-			or doc.currency
-			or get_company_currency(doc.company)
-		)
+		ageing = ageing_map.get(entry.customer, []) if doc.include_ageing else ""
+		tax_id = tax_ids.get(entry.customer)
 
 		filters = get_common_filters(doc)
 		if doc.ignore_exchange_rate_revaluation_journals:
@@ -142,6 +192,14 @@ def get_statement_dict(doc, get_statement_dict=False):
 			filters.update({"ignore_cr_dr_notes": True})
 
 		if doc.report == "General Ledger":
+			if entry.customer not in customers_with_entries:
+				continue
+
+			presentation_currency = (
+				get_party_account_currency("Customer", entry.customer, doc.company)
+				or doc.currency
+				or get_company_currency(doc.company)
+			)
 			filters.update(get_gl_filters(doc, entry, tax_id, presentation_currency))
 			col, res = get_soa(filters)
 			for x in [0, -2, -1]:
@@ -150,8 +208,7 @@ def get_statement_dict(doc, get_statement_dict=False):
 				continue
 		else:
 			filters.update(get_ar_filters(doc, entry))
-			ar_res = get_ar_soa(filters)
-			col, res = ar_res[0], ar_res[1]
+			col, res = ar_col, ar_data.get(entry.customer)
 			if not res:
 				continue
 
@@ -162,7 +219,47 @@ def get_statement_dict(doc, get_statement_dict=False):
 	return statement_dict
 
 
-def set_ageing(doc, entry):
+def get_customers_with_gl_entries(doc, customers):
+	"""Returns customers with GL Entries in the statement period, others have no statement to send."""
+	gle = qb.DocType("GL Entry")
+	return set(
+		qb.from_(gle)
+		.select(gle.party)
+		.distinct()
+		.where(
+			(gle.company == doc.company)
+			& (gle.party_type == "Customer")
+			& (gle.party.isin(customers))
+			& (gle.posting_date[getdate(doc.from_date) : getdate(doc.to_date)])
+			& (gle.is_cancelled == 0)
+		)
+		.run(pluck=True)
+	)
+
+
+def get_ar_data(doc, customers):
+	"""Returns columns and Accounts Receivable rows of the customers, grouped by customer."""
+	filters = get_common_filters(doc)
+	if doc.ignore_exchange_rate_revaluation_journals:
+		filters.update({"ignore_err": True})
+
+	if doc.ignore_cr_dr_notes:
+		filters.update({"ignore_cr_dr_notes": True})
+
+	filters.update(get_ar_filters(doc, frappe._dict()))
+	filters.update({"party": customers, "customer_name": None})
+
+	col, res = get_ar_soa(filters)[:2]
+
+	ar_data = {}
+	for row in res:
+		ar_data.setdefault(row.party, []).append(row)
+
+	return col, ar_data
+
+
+def get_ageing_map(doc, customers):
+	"""Returns ageing summary of the customers, fetched in one report run."""
 	ageing_filters = frappe._dict(
 		{
 			"company": doc.company,
@@ -173,15 +270,17 @@ def set_ageing(doc, entry):
 			"range3": 90,
 			"range4": 120,
 			"party_type": "Customer",
-			"party": [entry.customer],
+			"party": customers,
 		}
 	)
 	col1, ageing = get_ageing(ageing_filters)
 
-	if ageing:
-		ageing[0]["ageing_based_on"] = doc.ageing_based_on
+	ageing_map = {}
+	for row in ageing:
+		row["ageing_based_on"] = doc.ageing_based_on
+		ageing_map.setdefault(row.party, []).append(row)
 
-	return ageing
+	return ageing_map
 
 
 def get_common_filters(doc):
@@ -235,7 +334,6 @@ def get_ar_filters(doc, entry):
 
 
 def get_html(doc, filters, entry, col, res, ageing):
-	base_template_path = "frappe/www/printview.html"
 	template_path = "erpnext/accounts/doctype/process_statement_of_accounts/process_statement_of_accounts_accounts_receivable.html"
 	if doc.report == "General Ledger":
 		template_path = (
@@ -266,13 +364,16 @@ def get_html(doc, filters, entry, col, res, ageing):
 			else None,
 		},
 	)
-	html = frappe.render_template(
-		base_template_path,
-		{"body": html, "css": get_print_style(), "title": "Statement For " + entry.customer},
-	)
 	return html
 
 
+def wrap_statement_html(html, customer, css=None):
+	return frappe.render_template(
+		"frappe/www/printview.html",
+		{"body": html, "css": css or get_print_style(), "title": "Statement For " + customer},
+	)
+
+
 def get_customers_based_on_territory_or_customer_group(customer_collection, collection_name):
 	fields_dict = {
 		"Customer Group": "customer_group",
@@ -451,39 +552,43 @@ def download_statements(document_name):
 @frappe.whitelist()
 def send_emails(document_name, from_scheduler=False, posting_date=None):
 	doc = frappe.get_doc("Process Statement Of Accounts", document_name)
-	report = get_report_pdf(doc, consolidated=False)
+	statement_dict = get_statement_dict(doc)
 
-	if report:
-		for customer, report_pdf in report.items():
-			context = get_context(customer, doc)
-			filename = frappe.render_template(doc.pdf_name, context)
-			attachments = [{"fname": filename + ".pdf", "fcontent": report_pdf}]
+	if statement_dict:
+		if doc.sender:
+			sender_email = frappe.db.get_value("Email Account", doc.sender, "email_id")
+		else:
+			sender_email = frappe.session.user
 
+		# emails are prepared before the statement period moves on, PDFs are rendered by the background jobs
+		emails = []
+		for customer, statement_html in statement_dict.items():
 			recipients, cc = get_recipients_and_cc(customer, doc)
 			if not recipients:
 				continue
 
-			subject = frappe.render_template(doc.subject, context)
-			message = frappe.render_template(doc.body, context)
-
-			if doc.sender:
-				sender_email = frappe.db.get_value("Email Account", doc.sender, "email_id")
-			else:
-				sender_email = frappe.session.user
+			context = get_context(customer, doc)
+			emails.append(
+				{
+					"recipients": recipients,
+					"cc": cc,
+					"subject": frappe.render_template(doc.subject, context),
+					"message": frappe.render_template(doc.body, context),
+					"filename": frappe.render_template(doc.pdf_name, context) + ".pdf",
+					"statement_html": statement_html,
+				}
+			)
 
+		for idx in range(0, len(emails), STATEMENT_EMAIL_CHUNK_SIZE):
 			frappe.enqueue(
-				queue="short",
-				method=frappe.sendmail,
-				recipients=recipients,
+				method="erpnext.accounts.doctype.process_statement_of_accounts.process_statement_of_accounts.send_statement_emails",
+				queue="long",
+				document_name=document_name,
 				sender=sender_email,
-				cc=cc,
-				subject=subject,
-				message=message,
-				now=True,
-				reference_doctype="Process Statement Of Accounts",
-				reference_name=document_name,
-				attachments=attachments,
-				expose_recipients="header",
+				orientation=doc.orientation,
+				emails=emails[idx : idx + STATEMENT_EMAIL_CHUNK_SIZE],
+				enqueue_after_commit=True,
+				now=frappe.flags.in_test,
 			)
 
 		if doc.enable_auto_email and from_scheduler:
@@ -504,6 +609,27 @@ def send_emails(document_name, from_scheduler=False, posting_date=None):
 		return False
 
 
+def send_statement_emails(document_name, sender, orientation, emails):
+	"""Background job rendering the statement PDF of each of the prepared `emails` and sending it."""
+	for email in emails:
+		frappe.sendmail(
+			recipients=email["recipients"],
+			sender=sender,
+			cc=email["cc"],
+			subject=email["subject"],
+			message=email["message"],
+			reference_doctype="Process Statement Of Accounts",
+			reference_name=document_name,
+			attachments=[
+				{
+					"fname": email["filename"],
+					"fcontent": get_pdf(email["statement_html"], {"orientation": orientation}),
+				}
+			],
+			expose_recipients="header",
+		)
+
+
 @frappe.whitelist()
 def send_auto_email():
 	selected = frappe.get_list(
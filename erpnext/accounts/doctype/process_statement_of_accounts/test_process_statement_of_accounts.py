@@ -72,6 +72,24 @@ class TestProcessStatementOfAccounts(AccountsTestMixin, FrappeTestCase):
 		)
 		self.check_ageing_summary(ageing_summary, expected_summary)
 
+	def test_process_soa_for_ar_groups_customers(self):
+		"""Tests that AR statements fetched together for all customers are split per customer"""
+		process_soa = create_process_soa(
+			name="_Test Process SOA for AR",
+			report="Accounts Receivable",
+			customers=[{"customer": "_Test Customer"}, {"customer": "Other Customer"}],
+		)
+		statement_dict = get_statement_dict(process_soa, get_statement_dict=True)
+
+		for customer in ("_Test Customer", "Other Customer"):
+			receivable_entries, ageing = statement_dict[customer]
+			self.assertEqual(len(receivable_entries), 1)
+			self.assertEqual(receivable_entries[0].party, customer)
+			self.assertEqual(len(ageing), 1)
+			self.assertEqual(ageing[0].party, customer)
+
+		self.assertEqual(statement_dict["_Test Customer"][0][0].voucher_no, self.si.name)
+
 	def test_auto_email_for_process_soa_ar(self):
 		process_soa = create_process_soa(
 			name="_Test Process SOA", enable_auto_email=1, report="Accounts Receivable"
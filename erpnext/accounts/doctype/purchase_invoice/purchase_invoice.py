@@ -940,11 +940,15 @@ class PurchaseInvoice(BuyingController):
 
 		voucher_wise_stock_value = {}
 		if self.update_stock:
-			stock_ledger_entries = frappe.get_all(
-				"Stock Ledger Entry",
-				fields=["voucher_detail_no", "stock_value_difference", "warehouse"],
-				filters={"voucher_no": self.name, "voucher_type": self.doctype, "is_cancelled": 0},
-			)
+			# entries are computed in memory for ledger previews
+			stock_ledger_entries = self.flags.preview_sl_entries
+			if stock_ledger_entries is None:
+				stock_ledger_entries = frappe.get_all(
+					"Stock Ledger Entry",
+					fields=["voucher_detail_no", "stock_value_difference", "warehouse"],
+					filters={"voucher_no": self.name, "voucher_type": self.doctype, "is_cancelled": 0},
+				)
+
 			for d in stock_ledger_entries:
 				voucher_wise_stock_value.setdefault(
 					(d.voucher_detail_no, d.warehouse), d.stock_value_difference
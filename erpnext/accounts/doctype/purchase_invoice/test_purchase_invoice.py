@@ -856,6 +856,33 @@ class TestPurchaseInvoice(FrappeTestCase, StockTestMixin):
 			self.assertEqual(expected_gl_entries[gle.account][1], gle.debit)
 			self.assertEqual(expected_gl_entries[gle.account][2], gle.credit)
 
+	def test_accounting_ledger_preview_with_update_stock(self):
+		from erpnext.controllers.stock_controller import get_gl_entries_for_preview
+
+		pi = make_purchase_invoice(
+			update_stock=1,
+			company="_Test Company with perpetual inventory",
+			supplier_warehouse="Work In Progress - TCP1",
+			warehouse="Stores - TCP1",
+			cost_center="Main - TCP1",
+			expense_account="_Test Account Cost for Goods Sold - TCP1",
+			do_not_submit=True,
+		)
+
+		pi.docstatus = 1
+		pi.flags.ledger_preview = True
+		pi.update_stock_ledger()
+		preview_gl_entries = get_gl_entries_for_preview(pi)
+
+		# stock value of the entries computed in memory is booked to the stock account
+		stock_in_hand_account = get_inventory_account(pi.company, pi.get("items")[0].warehouse)
+		self.assertEqual(
+			sum(
+				flt(d.debit) - flt(d.credit) for d in preview_gl_entries if d.account == stock_in_hand_account
+			),
+			250.0,
+		)
+
 	def test_purchase_invoice_for_is_paid_and_update_stock_gl_entry_with_perpetual_inventory(self):
 		pi = make_purchase_invoice(
 			update_stock=1,
@@ -6,8 +6,18 @@ import inspect
 import frappe
 from frappe import _, qb
 from frappe.model.document import Document
+from frappe.utils import add_to_date, cint, now_datetime
 from frappe.utils.data import comma_and
 
+from erpnext.accounts.utils import _delete_accounting_ledger_entries
+
+# number of vouchers reposted by each background job
+REPOST_CHUNK_SIZE = 100
+
+# reposts not completed within these many hours are enqueued again by the scheduler
+REPOST_RETRY_INTERVAL = 6
+MAX_REPOST_ATTEMPTS = 3
+
 
 class RepostAccountingLedger(Document):
 	# begin: auto-generated types
@@ -25,6 +35,10 @@ class RepostAccountingLedger(Document):
 		amended_from: DF.Link | None
 		company: DF.Link | None
 		delete_cancelled_entries: DF.Check
+		error_log: DF.LongText | None
+		pending_chunks: DF.Int
+		repost_attempts: DF.Int
+		status: DF.Literal["", "Queued", "In Progress", "Completed", "Failed"]
 		vouchers: DF.Table[RepostAccountingLedgerItems]
 	# end: auto-generated types
 
@@ -130,22 +144,118 @@ class RepostAccountingLedger(Document):
 
 	def on_submit(self):
 		if len(self.vouchers) > 5:
-			job_name = "repost_accounting_ledger_" + self.name
+			self.enqueue_pending_chunks()
+			frappe.msgprint(_("Repost has started in the background"))
+		else:
+			self.db_set({"status": "Queued", "pending_chunks": 1, "repost_attempts": 1})
+			start_repost(self.name)
+
+	def enqueue_pending_chunks(self):
+		"""Enqueues a background job for every chunk of vouchers that are not reposted yet."""
+		rows = [x.name for x in self.vouchers if not x.reposted]
+		chunks = range(0, len(rows), REPOST_CHUNK_SIZE)
+		self.db_set(
+			{
+				"status": "Queued",
+				"pending_chunks": len(chunks),
+				"repost_attempts": cint(self.repost_attempts) + 1,
+			}
+		)
+		for idx in chunks:
 			frappe.enqueue(
-				method="erpnext.accounts.doctype.repost_accounting_ledger.repost_accounting_ledger.start_repost",
+				method="erpnext.accounts.doctype.repost_accounting_ledger.repost_accounting_ledger.repost_in_background",
 				account_repost_doc=self.name,
-				is_async=True,
-				job_name=job_name,
+				vouchers=rows[idx : idx + REPOST_CHUNK_SIZE],
+				queue="long",
+				job_id=f"repost_accounting_ledger::{self.name}::{self.repost_attempts}::{idx // REPOST_CHUNK_SIZE}",
+				enqueue_after_commit=True,
+				now=frappe.flags.in_test,
 			)
-			frappe.msgprint(_("Repost has started in the background"))
+
+	def repost_vouchers(self, vouchers: list | None = None, commit: bool = False):
+		"""Reposts pending vouchers in chunks, or only the given rows of the vouchers table.
+
+		Reposted rows are marked, so that a failed repost resumes from the first pending chunk.
+		If `commit` is set, every chunk is committed and failures are recorded on the document.
+		"""
+		rows = [x for x in self.vouchers if not x.reposted and (not vouchers or x.name in vouchers)]
+		self.set_in_progress()
+
+		try:
+			for idx in range(0, len(rows), REPOST_CHUNK_SIZE):
+				chunk = rows[idx : idx + REPOST_CHUNK_SIZE]
+				self.repost_chunk(chunk)
+
+				item = qb.DocType("Repost Accounting Ledger Items")
+				qb.update(item).set(item.reposted, 1).where(item.name.isin([x.name for x in chunk])).run()
+				if commit:
+					frappe.db.commit()
+		except Exception:
+			if not commit:
+				raise
+
+			frappe.db.rollback()
+			self.db_set(
+				{"status": "Failed", "error_log": frappe.get_traceback(with_context=True)}, commit=True
+			)
+
+		self.complete_repost()
+		if commit:
+			frappe.db.commit()
+
+	def set_in_progress(self):
+		"""Moves a queued repost to In Progress, without overwriting the status set by another job."""
+		doc = qb.DocType("Repost Accounting Ledger")
+		(
+			qb.update(doc)
+			.set(doc.status, "In Progress")
+			.where((doc.name == self.name) & (doc.status == "Queued"))
+		).run()
+
+	def repost_chunk(self, rows):
+		docs = [frappe.get_doc(x.voucher_type, x.voucher_no) for x in rows]
+
+		if self.delete_cancelled_entries:
+			vouchers_by_type = {}
+			for doc in docs:
+				vouchers_by_type.setdefault(doc.doctype, []).append(doc.name)
+
+			for voucher_type, voucher_nos in vouchers_by_type.items():
+				_delete_accounting_ledger_entries(voucher_type, voucher_nos)
+
+		for doc in docs:
+			repost_voucher(doc, self.delete_cancelled_entries)
+
+	def complete_repost(self):
+		"""Sets the final status from the reposted flag of each voucher, once the last job has finished."""
+		doc = qb.DocType("Repost Accounting Ledger")
+		(
+			qb.update(doc)
+			.set(doc.pending_chunks, doc.pending_chunks - 1)
+			.where((doc.name == self.name) & (doc.pending_chunks > 0))
+		).run()
+
+		# the row stays locked by the update until commit, so only the last job sees no pending chunks
+		if frappe.db.get_value(self.doctype, self.name, "pending_chunks"):
+			return
+
+		if frappe.db.exists("Repost Accounting Ledger Items", {"parent": self.name, "reposted": 0}):
+			self.db_set("status", "Failed")
 		else:
-			start_repost(self.name)
+			self.db_set({"status": "Completed", "error_log": None})
 
 
 @frappe.whitelist()
 def start_repost(account_repost_doc=str) -> None:
-	from erpnext.accounts.general_ledger import make_reverse_gl_entries
+	_start_repost(account_repost_doc)
+
 
+def repost_in_background(account_repost_doc: str, vouchers: list) -> None:
+	"""Background job of a chunk of vouchers. The chunk is committed and a failure recorded on the document."""
+	_start_repost(account_repost_doc, vouchers, commit=not frappe.flags.in_test)
+
+
+def _start_repost(account_repost_doc: str, vouchers: list | None = None, commit: bool = False) -> None:
 	frappe.flags.through_repost_accounting_ledger = True
 	if account_repost_doc:
 		repost_doc = frappe.get_doc("Repost Accounting Ledger", account_repost_doc)
@@ -153,42 +263,56 @@ def start_repost(account_repost_doc=str) -> None:
 		if repost_doc.docstatus == 1:
 			# Prevent repost on invoices with deferred accounting
 			repost_doc.validate_for_deferred_accounting()
+			repost_doc.repost_vouchers(frappe.parse_json(vouchers), commit=commit)
+
+
+def retry_pending_reposts():
+	"""
+	Enqueues the pending vouchers of failed or stalled reposts again, up to MAX_REPOST_ATTEMPTS times.
+	Called hourly via hooks.py.
+	"""
+	pending_reposts = frappe.get_all(
+		"Repost Accounting Ledger",
+		filters={
+			"docstatus": 1,
+			"status": ["in", ["Queued", "In Progress", "Failed"]],
+			"repost_attempts": ["<", MAX_REPOST_ATTEMPTS],
+			"modified": ["<", add_to_date(now_datetime(), hours=-REPOST_RETRY_INTERVAL)],
+		},
+		pluck="name",
+	)
 
-			for x in repost_doc.vouchers:
-				doc = frappe.get_doc(x.voucher_type, x.voucher_no)
+	for name in pending_reposts:
+		frappe.get_doc("Repost Accounting Ledger", name).enqueue_pending_chunks()
 
-				if repost_doc.delete_cancelled_entries:
-					frappe.db.delete(
-						"GL Entry", filters={"voucher_type": doc.doctype, "voucher_no": doc.name}
-					)
-					frappe.db.delete(
-						"Payment Ledger Entry", filters={"voucher_type": doc.doctype, "voucher_no": doc.name}
-					)
 
-				if doc.doctype in ["Sales Invoice", "Purchase Invoice"]:
-					if not repost_doc.delete_cancelled_entries:
-						doc.docstatus = 2
-						doc.make_gl_entries_on_cancel()
-
-					doc.docstatus = 1
-					if doc.doctype == "Sales Invoice":
-						doc.force_set_against_income_account()
-					else:
-						doc.force_set_against_expense_account()
-					doc.make_gl_entries()
-
-				elif doc.doctype in ["Payment Entry", "Journal Entry", "Expense Claim"]:
-					if not repost_doc.delete_cancelled_entries:
-						doc.make_gl_entries(1)
-					doc.make_gl_entries()
-				elif doc.doctype in frappe.get_hooks("repost_allowed_doctypes"):
-					if hasattr(doc, "make_gl_entries") and callable(doc.make_gl_entries):
-						if not repost_doc.delete_cancelled_entries:
-							if "cancel" in inspect.getfullargspec(doc.make_gl_entries):
-								doc.make_gl_entries(cancel=1)
-							else:
-								make_reverse_gl_entries(voucher_type=doc.doctype, voucher_no=doc.name)
-						doc.make_gl_entries()
+def repost_voucher(doc, delete_cancelled_entries=False):
+	from erpnext.accounts.general_ledger import make_reverse_gl_entries
+
+	if doc.doctype in ["Sales Invoice", "Purchase Invoice"]:
+		if not delete_cancelled_entries:
+			doc.docstatus = 2
+			doc.make_gl_entries_on_cancel()
+
+		doc.docstatus = 1
+		if doc.doctype == "Sales Invoice":
+			doc.force_set_against_income_account()
+		else:
+			doc.force_set_against_expense_account()
+		doc.make_gl_entries()
+
+	elif doc.doctype in ["Payment Entry", "Journal Entry", "Expense Claim"]:
+		if not delete_cancelled_entries:
+			doc.make_gl_entries(1)
+		doc.make_gl_entries()
+	elif doc.doctype in frappe.get_hooks("repost_allowed_doctypes"):
+		if hasattr(doc, "make_gl_entries") and callable(doc.make_gl_entries):
+			if not delete_cancelled_entries:
+				if "cancel" in inspect.getfullargspec(doc.make_gl_entries):
+					doc.make_gl_entries(cancel=1)
+				else:
+					make_reverse_gl_entries(voucher_type=doc.doctype, voucher_no=doc.name)
+			doc.make_gl_entries()
 
 
 def get_allowed_types_from_settings():
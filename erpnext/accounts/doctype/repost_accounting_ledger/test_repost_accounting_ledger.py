@@ -1,6 +1,8 @@
 # Copyright (c) 2023, Frappe Technologies Pvt. Ltd. and Contributors
 # See license.txt
 
+from unittest.mock import patch
+
 import frappe
 from frappe import qb
 from frappe.query_builder.functions import Sum
@@ -9,6 +11,10 @@ from frappe.utils import add_days, nowdate, today
 
 from erpnext.accounts.doctype.payment_entry.payment_entry import get_payment_entry
 from erpnext.accounts.doctype.payment_request.payment_request import make_payment_request
+from erpnext.accounts.doctype.repost_accounting_ledger.repost_accounting_ledger import (
+	MAX_REPOST_ATTEMPTS,
+	retry_pending_reposts,
+)
 from erpnext.accounts.doctype.sales_invoice.test_sales_invoice import create_sales_invoice
 from erpnext.accounts.test.accounts_mixin import AccountsTestMixin
 from erpnext.accounts.utils import get_fiscal_year
@@ -204,6 +210,88 @@ class TestRepostAccountingLedger(AccountsTestMixin, FrappeTestCase):
 		self.assertIsNotNone(frappe.db.exists("GL Entry", {"voucher_no": si.name, "is_cancelled": 1}))
 		self.assertIsNotNone(frappe.db.exists("GL Entry", {"voucher_no": pe.name, "is_cancelled": 1}))
 
+	@patch("erpnext.accounts.doctype.repost_accounting_ledger.repost_accounting_ledger.REPOST_CHUNK_SIZE", 2)
+	def test_06_repost_in_chunks(self):
+		invoices = [
+			create_sales_invoice(
+				item=self.item,
+				company=self.company,
+				customer=self.customer,
+				debit_to=self.debit_to,
+				parent_cost_center=self.cost_center,
+				cost_center=self.cost_center,
+				rate=100,
+			)
+			for _ in range(7)
+		]
+
+		ral = frappe.new_doc("Repost Accounting Ledger")
+		ral.company = self.company
+		ral.delete_cancelled_entries = True
+		for si in invoices:
+			ral.append("vouchers", {"voucher_type": si.doctype, "voucher_no": si.name})
+		ral.save().submit()
+
+		ral.reload()
+		self.assertEqual(ral.status, "Completed")
+		self.assertEqual(ral.pending_chunks, 0)
+		self.assertTrue(all(x.reposted for x in ral.vouchers))
+		for si in invoices:
+			self.assertIsNone(frappe.db.exists("GL Entry", {"voucher_no": si.name, "is_cancelled": 1}))
+			self.assertTrue(frappe.db.exists("GL Entry", {"voucher_no": si.name, "is_cancelled": 0}))
+
+		# a job starting late does not overwrite the status recorded by another job
+		ral.db_set("status", "Failed")
+		ral.set_in_progress()
+		self.assertEqual(frappe.db.get_value(ral.doctype, ral.name, "status"), "Failed")
+
+	@patch("erpnext.accounts.doctype.repost_accounting_ledger.repost_accounting_ledger.REPOST_CHUNK_SIZE", 2)
+	def test_07_retry_pending_reposts(self):
+		invoices = [
+			create_sales_invoice(
+				item=self.item,
+				company=self.company,
+				customer=self.customer,
+				debit_to=self.debit_to,
+				parent_cost_center=self.cost_center,
+				cost_center=self.cost_center,
+				rate=100,
+			)
+			for _ in range(7)
+		]
+
+		ral = frappe.new_doc("Repost Accounting Ledger")
+		ral.company = self.company
+		ral.delete_cancelled_entries = True
+		for si in invoices:
+			ral.append("vouchers", {"voucher_type": si.doctype, "voucher_no": si.name})
+		ral.save().submit()
+
+		# a chunk of three vouchers failed in the first attempt
+		pending_rows = [x.name for x in ral.vouchers[-3:]]
+		item = qb.DocType("Repost Accounting Ledger Items")
+		qb.update(item).set(item.reposted, 0).where(item.name.isin(pending_rows)).run()
+		frappe.db.set_value(
+			ral.doctype,
+			ral.name,
+			{"status": "Failed", "modified": add_days(nowdate(), -1)},
+			update_modified=False,
+		)
+
+		retry_pending_reposts()
+
+		ral.reload()
+		self.assertEqual(ral.status, "Completed")
+		self.assertEqual(ral.repost_attempts, 2)
+		self.assertEqual(ral.pending_chunks, 0)
+		self.assertTrue(all(x.reposted for x in ral.vouchers))
+
+		# reposts are not retried once they run out of attempts
+		ral.db_set({"status": "Failed", "repost_attempts": MAX_REPOST_ATTEMPTS}, update_modified=False)
+		frappe.db.set_value(ral.doctype, ral.name, "modified", add_days(nowdate(), -1), update_modified=False)
+		retry_pending_reposts()
+		self.assertEqual(frappe.db.get_value(ral.doctype, ral.name, "status"), "Failed")
+
 
 def update_repost_settings():
 	allowed_types = ["Sales Invoice", "Purchase Invoice", "Payment Entry", "Journal Entry"]
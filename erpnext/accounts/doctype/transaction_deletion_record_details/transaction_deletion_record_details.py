@@ -17,6 +17,7 @@ class TransactionDeletionRecordDetails(Document):
 		docfield_name: DF.Data | None
 		doctype_name: DF.Link
 		done: DF.Check
+		last_deleted_name: DF.Data | None
 		no_of_docs: DF.Int
 		parent: DF.Data
 		parentfield: DF.Data
@@ -17,9 +17,15 @@ from erpnext.accounts.doctype.accounting_dimension_filter.accounting_dimension_f
 	get_dimension_filter_map,
 )
 from erpnext.accounts.doctype.accounting_period.accounting_period import ClosedAccountingPeriod
-from erpnext.accounts.doctype.budget.budget import validate_expense_against_budget
+from erpnext.accounts.doctype.budget.budget import validate_expenses_against_budget
+from erpnext.accounts.doctype.budget_consumption.budget_consumption import (
+	update_budget_consumption_for_gl_entries,
+)
 from erpnext.accounts.utils import create_payment_ledger_entry
 from erpnext.exceptions import InvalidAccountDimensionError, MandatoryAccountDimensionError
+from erpnext.setup.doctype.company_daily_summary.company_daily_summary import (
+	update_daily_summary_for_gl_entries,
+)
 
 
 def make_gl_entries(
@@ -36,7 +42,11 @@ def make_gl_entries(
 			validate_accounting_period(gl_map)
 			validate_disabled_accounts(gl_map)
 			gl_map = process_gl_map(gl_map, merge_entries, from_repost=from_repost)
-			if gl_map and len(gl_map) > 1:
+			if gl_map and len(gl_map) > 1 and frappe.flags.preview_gl_entries is not None:
+				# ledger preview, entries are collected instead of being posted
+				process_debit_credit_difference(gl_map)
+				frappe.flags.preview_gl_entries.extend(gl_map)
+			elif gl_map and len(gl_map) > 1:
 				if gl_map[0].voucher_type != "Period Closing Voucher":
 					create_payment_ledger_entry(
 						gl_map,
@@ -186,16 +196,16 @@ def process_gl_map(gl_map, merge_entries=True, precision=None, from_repost=False
 
 
 def distribute_gl_based_on_cost_center_allocation(gl_map, precision=None, from_repost=False):
+	# Validate budget against main cost center
+	if not from_repost:
+		validate_expenses_against_budget(
+			[(d, flt(d.debit, precision) - flt(d.credit, precision)) for d in gl_map]
+		)
+
 	new_gl_map = []
 	for d in gl_map:
 		cost_center = d.get("cost_center")
 
-		# Validate budget against main cost center
-		if not from_repost:
-			validate_expense_against_budget(
-				d, expense_amount=flt(d.debit, precision) - flt(d.credit, precision)
-			)
-
 		cost_center_allocation = get_cost_center_allocation_data(
 			gl_map[0]["company"], gl_map[0]["posting_date"], cost_center
 		)
@@ -241,6 +251,7 @@ def get_cost_center_allocation_data(company, posting_date, cost_center):
 
 def merge_similar_entries(gl_map, precision=None):
 	merged_gl_map = []
+	merged_entries = {}
 	accounting_dimensions = get_accounting_dimensions()
 	merge_properties = get_merge_properties(accounting_dimensions)
 
@@ -252,7 +263,7 @@ def merge_similar_entries(gl_map, precision=None):
 		entry.merge_key = get_merge_key(entry, merge_properties)
 		# if there is already an entry in this account then just add it
 		# to that entry
-		same_head = check_if_in_list(entry, merged_gl_map)
+		same_head = merged_entries.get(entry.merge_key)
 		if same_head:
 			same_head.debit = flt(same_head.debit) + flt(entry.debit)
 			same_head.debit_in_account_currency = flt(same_head.debit_in_account_currency) + flt(
@@ -270,6 +281,7 @@ def merge_similar_entries(gl_map, precision=None):
 			)
 		else:
 			merged_gl_map.append(entry)
+			merged_entries[entry.merge_key] = entry
 
 	company = gl_map[0].company if gl_map else erpnext.get_default_company()
 	company_currency = erpnext.get_company_currency(company)
@@ -279,12 +291,14 @@ def merge_similar_entries(gl_map, precision=None):
 
 	# filter zero debit and credit entries
 	merged_gl_map = filter(
-		lambda x: flt(x.debit, precision) != 0
-		or flt(x.credit, precision) != 0
-		or (
-			x.voucher_type == "Journal Entry"
-			and frappe.get_cached_value("Journal Entry", x.voucher_no, "voucher_type")
-			== "Exchange Gain Or Loss"
+		lambda x: (
+			flt(x.debit, precision) != 0
+			or flt(x.credit, precision) != 0
+			or (
+				x.voucher_type == "Journal Entry"
+				and frappe.get_cached_value("Journal Entry", x.voucher_no, "voucher_type")
+				== "Exchange Gain Or Loss"
+			)
 		),
 		merged_gl_map,
 	)
@@ -319,12 +333,6 @@ def get_merge_key(entry, merge_properties):
 	return tuple(merge_key)
 
 
-def check_if_in_list(gle, gl_map):
-	for e in gl_map:
-		if e.merge_key == gle.merge_key:
-			return e
-
-
 def toggle_debit_credit_if_negative(gl_map):
 	debit_credit_field_map = {
 		"debit": "credit",
@@ -385,6 +393,12 @@ def save_entries(gl_map, adv_adj, update_outstanding, from_repost=False):
 		validate_allowed_dimensions(entry, dimension_filter_map)
 		make_entry(entry, adv_adj, update_outstanding, from_repost)
 
+	update_daily_summary_for_gl_entries(gl_map)
+	update_budget_consumption_for_gl_entries(gl_map)
+
+	if not from_repost and gl_map and gl_map[0]["voucher_type"] != "Period Closing Voucher":
+		validate_expenses_against_budget([(entry, 0) for entry in gl_map])
+
 
 def make_entry(args, adv_adj, update_outstanding, from_repost=False):
 	gle = frappe.new_doc("GL Entry")
@@ -396,9 +410,6 @@ def make_entry(args, adv_adj, update_outstanding, from_repost=False):
 	gle.flags.notify_update = False
 	gle.submit()
 
-	if not from_repost and gle.voucher_type != "Period Closing Voucher":
-		validate_expense_against_budget(args)
-
 
 def validate_cwip_accounts(gl_map):
 	"""Validate that CWIP account are not used in Journal Entry"""
@@ -694,6 +705,11 @@ def make_reverse_gl_entries(
 			if not immutable_ledger_enabled:
 				set_as_cancel(gl_entries[0]["voucher_type"], gl_entries[0]["voucher_no"])
 
+		if not immutable_ledger_enabled:
+			update_daily_summary_for_gl_entries(gl_entries, cancel=True)
+			update_budget_consumption_for_gl_entries(gl_entries, cancel=True)
+
+		reverse_gl_entries = []
 		for entry in gl_entries:
 			new_gle = copy.deepcopy(entry)
 			new_gle["name"] = None
@@ -721,6 +737,15 @@ def make_reverse_gl_entries(
 
 			if new_gle["debit"] or new_gle["credit"]:
 				make_entry(new_gle, adv_adj, "Yes")
+				reverse_gl_entries.append(new_gle)
+
+		if immutable_ledger_enabled:
+			# reverse entries are posted as active entries on the cancellation date
+			update_daily_summary_for_gl_entries(reverse_gl_entries)
+			update_budget_consumption_for_gl_entries(reverse_gl_entries)
+
+		if reverse_gl_entries and reverse_gl_entries[0]["voucher_type"] != "Period Closing Voucher":
+			validate_expenses_against_budget([(entry, 0) for entry in reverse_gl_entries])
 
 
 def check_freezing_date(posting_date, adv_adj=False):
@@ -6,7 +6,7 @@ from collections import OrderedDict
 import frappe
 from frappe import _, qb, scrub
 from frappe.query_builder import Order
-from frappe.utils import cint, flt, formatdate
+from frappe.utils import cint, create_batch, flt, formatdate
 
 from erpnext.accounts.doctype.accounting_dimension.accounting_dimension import (
 	get_accounting_dimensions,
@@ -462,8 +462,10 @@ def get_column_names():
 class GrossProfitGenerator:
 	def __init__(self, filters=None):
 		self.sle = {}
+		self.items_with_sle_loaded = set()
 		self.data = []
 		self.average_buying_rate = {}
+		self.last_purchase_rate = {}
 		self.filters = frappe._dict(filters)
 		self.load_invoice_items()
 		self.get_delivery_notes()
@@ -473,6 +475,7 @@ class GrossProfitGenerator:
 			self.group_items_by_invoice()
 
 		self.load_non_stock_items()
+		self.load_stock_ledger_entries(self.get_stock_items_in_invoices())
 		self.get_returned_invoice_items()
 		self.process()
 
@@ -690,20 +693,15 @@ class GrossProfitGenerator:
 		return flt(buying_amount, self.currency_precision)
 
 	def calculate_buying_amount_from_sle(self, row, my_sle, parenttype, parent, item_row, item_code):
-		for i, sle in enumerate(my_sle):
-			# find the stock valution rate from stock ledger entry
-			if (
-				sle.voucher_type == parenttype
-				and parent == sle.voucher_no
-				and sle.voucher_detail_no == item_row
-			):
-				previous_stock_value = len(my_sle) > i + 1 and flt(my_sle[i + 1].stock_value) or 0.0
-
-				if previous_stock_value:
-					return abs(previous_stock_value - flt(sle.stock_value)) * flt(row.qty) / abs(flt(sle.qty))
-				else:
-					return flt(row.qty) * self.get_average_buying_rate(row, item_code)
-		return 0.0
+		# find the stock valution rate from stock ledger entry
+		sle = (my_sle or {}).get((parenttype, parent, item_row))
+		if not sle:
+			return 0.0
+
+		if sle.previous_stock_value:
+			return abs(sle.previous_stock_value - flt(sle.stock_value)) * flt(row.qty) / abs(flt(sle.qty))
+		else:
+			return flt(row.qty) * self.get_average_buying_rate(row, item_code)
 
 	def get_buying_amount(self, row, item_code):
 		# IMP NOTE
@@ -789,6 +787,13 @@ class GrossProfitGenerator:
 		return self.average_buying_rate[key]
 
 	def get_last_purchase_rate(self, item_code, row):
+		key = (item_code, row.project, row.cost_center)
+		if key not in self.last_purchase_rate:
+			self.last_purchase_rate[key] = self.fetch_last_purchase_rate(item_code, row)
+
+		return self.last_purchase_rate[key]
+
+	def fetch_last_purchase_rate(self, item_code, row):
 		purchase_invoice = frappe.qb.DocType("Purchase Invoice")
 		purchase_invoice_item = frappe.qb.DocType("Purchase Invoice Item")
 
@@ -1051,10 +1056,54 @@ class GrossProfitGenerator:
 		)
 
 	def get_stock_ledger_entries(self, item_code, warehouse):
+		"""
+		Returns stock ledger entries of the report's Sales Invoices and Delivery Notes for the item and
+		warehouse keyed by (voucher_type, voucher_no, voucher_detail_no), each with the stock value before
+		it. Returns an empty list if there are none.
+		"""
 		if item_code and warehouse:
-			if (item_code, warehouse) not in self.sle:
-				sle = qb.DocType("Stock Ledger Entry")
-				res = (
+			if item_code not in self.items_with_sle_loaded:
+				self.load_stock_ledger_entries([item_code])
+
+			return self.sle.get((item_code, warehouse), [])
+
+		return []
+
+	def get_stock_items_in_invoices(self):
+		item_codes = set()
+		for row in self.si_list:
+			if row.item_code:
+				item_codes.add(row.item_code)
+
+			for parenttype, parent in (("Sales Invoice", row.parent), ("Delivery Note", row.delivery_note)):
+				for packed_items in self.product_bundles.get(parenttype, {}).get(parent, {}).values():
+					item_codes.update(d.item_code for d in packed_items)
+
+		non_stock_items = set(self.non_stock_items)
+		return [d for d in item_codes if d not in non_stock_items]
+
+	def get_stock_vouchers(self):
+		"""Returns names of the Sales Invoices and Delivery Notes whose stock ledger entries value the rows."""
+		vouchers = set()
+		for row in self.si_list:
+			vouchers.update(d for d in (row.parent, row.invoice, row.delivery_note) if d)
+
+		vouchers.update(d.delivery_note for d in self.delivery_notes.values())
+		return list(vouchers)
+
+	def load_stock_ledger_entries(self, item_codes):
+		"""
+		Loads stock ledger entries of the items posted by the report's Sales Invoices and Delivery Notes in
+		one go, instead of one query per item and warehouse. The stock value before an entry is derived from
+		its stock value difference, so entries of other vouchers are not needed.
+		"""
+		if not hasattr(self, "stock_vouchers"):
+			self.stock_vouchers = self.get_stock_vouchers()
+
+		sle = qb.DocType("Stock Ledger Entry")
+		for item_codes_chunk in create_batch(list(item_codes), 500):
+			for vouchers_chunk in create_batch(self.stock_vouchers, 1000):
+				entries = (
 					qb.from_(sle)
 					.select(
 						sle.item_code,
@@ -1062,24 +1111,25 @@ class GrossProfitGenerator:
 						sle.voucher_no,
 						sle.voucher_detail_no,
 						sle.stock_value,
+						(sle.stock_value - sle.stock_value_difference).as_("previous_stock_value"),
 						sle.warehouse,
 						sle.actual_qty.as_("qty"),
 					)
 					.where(
 						(sle.company == self.filters.company)
-						& (sle.item_code == item_code)
-						& (sle.warehouse == warehouse)
+						& (sle.item_code.isin(item_codes_chunk))
+						& (sle.voucher_type.isin(["Sales Invoice", "Delivery Note"]))
+						& (sle.voucher_no.isin(vouchers_chunk))
 						& (sle.is_cancelled == 0)
 					)
-					.orderby(sle.item_code)
-					.orderby(sle.warehouse, sle.posting_datetime, sle.creation, order=Order.desc)
-					.run(as_dict=True)
-				)
+					.orderby(sle.posting_datetime, sle.creation, order=Order.desc)
+				).run(as_dict=True)
 
-				self.sle[(item_code, warehouse)] = res
+				for entry in entries:
+					voucher_key = (entry.voucher_type, entry.voucher_no, entry.voucher_detail_no)
+					self.sle.setdefault((entry.item_code, entry.warehouse), {}).setdefault(voucher_key, entry)
 
-			return self.sle[(item_code, warehouse)]
-		return []
+			self.items_with_sle_loaded.update(item_codes_chunk)
 
 	def load_product_bundle(self):
 		self.product_bundles = {}
@@ -635,3 +635,54 @@ class TestGrossProfit(FrappeTestCase):
 		self.assertEqual(total.buying_amount, 0.0)
 		self.assertEqual(total.gross_profit, 100.0)
 		self.assertEqual(total.get("gross_profit_%"), 100.0)
+
+	def receive_stock(self, item_code, warehouse, rates):
+		for rate in rates:
+			make_stock_entry(
+				company=self.company, item_code=item_code, target=warehouse, qty=1, basic_rate=rate
+			)
+
+	def get_invoice_rows(self, sales_invoice):
+		filters = frappe._dict(
+			company=self.company,
+			from_date=nowdate(),
+			to_date=nowdate(),
+			group_by="Invoice",
+			sales_invoice=sales_invoice,
+		)
+		_, data = execute(filters=filters)
+		return [x for x in data if x.parent_invoice == sales_invoice]
+
+	def test_buying_amount_of_invoice_updating_stock(self):
+		self.receive_stock(self.item, self.warehouse, [100, 200])
+		# stock in other warehouses does not change the valuation of the invoice's warehouse
+		self.receive_stock(self.item, self.finished_warehouse, [900])
+
+		sinv = self.create_sales_invoice(qty=1, rate=300, do_not_submit=True)
+		sinv.update_stock = 1
+		sinv.save().submit()
+
+		rows = self.get_invoice_rows(sinv.name)
+		self.assertEqual(rows[0].buying_amount, 150.0)
+
+	def test_buying_amount_of_invoice_made_from_delivery_note(self):
+		self.receive_stock(self.item, self.warehouse, [100, 300])
+
+		dnote = self.create_delivery_note(qty=1, rate=400)
+		sinv = make_sales_invoice(dnote.name).save().submit()
+		self.assertTrue(sinv.items[0].dn_detail)
+
+		rows = self.get_invoice_rows(sinv.name)
+		self.assertEqual(rows[0].buying_amount, 200.0)
+
+	def test_buying_amount_of_bundle(self):
+		self.receive_stock(self.item, self.warehouse, [100])
+		self.receive_stock(self.item2, self.finished_warehouse, [250])
+
+		dnote = self.create_delivery_note(item=self.bundle, qty=1, rate=500, do_not_submit=True)
+		dnote.packed_items[1].warehouse = self.finished_warehouse
+		dnote = dnote.submit()
+		sinv = make_sales_invoice(dnote.name).save().submit()
+
+		bundle_row = next(x for x in self.get_invoice_rows(sinv.name) if x.item_code == self.bundle)
+		self.assertEqual(bundle_row.buying_amount, 350.0)
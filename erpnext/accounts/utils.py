@@ -1453,18 +1453,42 @@ def repost_gle_for_stock_vouchers(
 
 
 def _delete_pl_entries(voucher_type, voucher_no):
+	voucher_nos = voucher_no if isinstance(voucher_no, list) else [voucher_no]
 	ple = qb.DocType("Payment Ledger Entry")
-	qb.from_(ple).delete().where((ple.voucher_type == voucher_type) & (ple.voucher_no == voucher_no)).run()
+	qb.from_(ple).delete().where(
+		(ple.voucher_type == voucher_type) & (ple.voucher_no.isin(voucher_nos))
+	).run()
 
 
 def _delete_gl_entries(voucher_type, voucher_no):
+	from erpnext.accounts.doctype.budget_consumption.budget_consumption import (
+		update_budget_consumption_for_gl_entries,
+	)
+	from erpnext.setup.doctype.company_daily_summary.company_daily_summary import (
+		update_daily_summary_for_gl_entries,
+	)
+
+	voucher_nos = voucher_no if isinstance(voucher_no, list) else [voucher_no]
 	gle = qb.DocType("GL Entry")
-	qb.from_(gle).delete().where((gle.voucher_type == voucher_type) & (gle.voucher_no == voucher_no)).run()
+	active_gl_entries = (
+		qb.from_(gle)
+		.select("*")
+		.where(
+			(gle.voucher_type == voucher_type) & (gle.voucher_no.isin(voucher_nos)) & (gle.is_cancelled == 0)
+		)
+		.run(as_dict=True)
+	)
+	update_daily_summary_for_gl_entries(active_gl_entries, cancel=True)
+	update_budget_consumption_for_gl_entries(active_gl_entries, cancel=True)
+
+	qb.from_(gle).delete().where(
+		(gle.voucher_type == voucher_type) & (gle.voucher_no.isin(voucher_nos))
+	).run()
 
 
 def _delete_accounting_ledger_entries(voucher_type, voucher_no):
 	"""
-	Remove entries from both General and Payment Ledger for specified Voucher
+	Remove entries from both General and Payment Ledger for specified Voucher, or list of Vouchers
 	"""
 	_delete_gl_entries(voucher_type, voucher_no)
 	_delete_pl_entries(voucher_type, voucher_no)
@@ -2221,44 +2245,28 @@ def get_party_types_from_account_type(account_type):
 
 
 def run_ledger_health_checks():
+	"""Checks ledgers of the monitored companies, only vouchers posted or modified since the last run are examined."""
+	from erpnext.accounts.doctype.ledger_health_monitor.ledger_health_monitor import LedgerHealthChecker
+
 	health_monitor_settings = frappe.get_doc("Ledger Health Monitor")
 	if health_monitor_settings.enable_health_monitor:
-		period_end = getdate()
-		period_start = add_days(period_end, -abs(health_monitor_settings.monitor_for_last_x_days))
-
 		run_date = get_datetime()
 
-		# Debit-Credit mismatch report
-		if health_monitor_settings.debit_credit_mismatch:
-			for x in health_monitor_settings.companies:
-				filters = {"company": x.company, "from_date": period_start, "to_date": period_end}
-				voucher_wise = frappe.get_doc("Report", "Voucher-wise Balance")
-				res = voucher_wise.execute_script_report(filters=filters)
-				for x in res[1]:
-					doc = frappe.new_doc("Ledger Health")
-					doc.voucher_type = x.voucher_type
-					doc.voucher_no = x.voucher_no
-					doc.debit_credit_mismatch = True
-					doc.checked_on = run_date
-					doc.save()
-
-		# General Ledger and Payment Ledger discrepancy
-		if health_monitor_settings.general_and_payment_ledger_mismatch:
-			for x in health_monitor_settings.companies:
-				filters = {
-					"company": x.company,
-					"period_start_date": period_start,
-					"period_end_date": period_end,
-				}
-				gl_pl_comparison = frappe.get_doc("Report", "General and Payment Ledger Comparison")
-				res = gl_pl_comparison.execute_script_report(filters=filters)
-				for x in res[1]:
-					doc = frappe.new_doc("Ledger Health")
-					doc.voucher_type = x.voucher_type
-					doc.voucher_no = x.voucher_no
-					doc.general_and_payment_ledger_mismatch = True
-					doc.checked_on = run_date
-					doc.save()
+		for row in health_monitor_settings.companies:
+			checker = LedgerHealthChecker(
+				health_monitor_settings, row.company, last_checked_on=row.last_checked_on, run_date=run_date
+			)
+			checker.run()
+			frappe.db.set_value(
+				row.doctype,
+				row.name,
+				{
+					"last_checked_on": run_date,
+					"rows_scanned": checker.rows_scanned,
+					"time_taken": checker.time_taken,
+				},
+				update_modified=False,
+			)
 
 
 def sync_auto_reconcile_config(auto_reconciliation_job_trigger: int = 15):
@@ -4,11 +4,12 @@
 
 import frappe
 from frappe import _
-from frappe.query_builder import Order
+from frappe.query_builder import Case, Order
 from frappe.query_builder.functions import Max, Min
 from frappe.utils import (
 	add_months,
 	cint,
+	create_batch,
 	flt,
 	get_last_day,
 	get_link_to_form,
@@ -17,6 +18,7 @@ from frappe.utils import (
 	nowdate,
 	today,
 )
+from frappe.utils.background_jobs import is_job_enqueued
 from frappe.utils.user import get_users_with_role
 
 import erpnext
@@ -32,6 +34,9 @@ from erpnext.assets.doctype.asset_depreciation_schedule.asset_depreciation_sched
 	make_new_active_asset_depr_schedules_and_cancel_current_ones,
 )
 
+# maximum number of assets booked in a single consolidated depreciation entry
+DEPRECIATION_ENTRY_BATCH_SIZE = 500
+
 
 def post_depreciation_entries(date=None):
 	# Return if automatic booking of asset depreciation is disabled
@@ -43,6 +48,10 @@ def post_depreciation_entries(date=None):
 	if not date:
 		date = today()
 
+	if cint(frappe.db.get_single_value("Accounts Settings", "post_consolidated_depreciation_entries")):
+		enqueue_consolidated_depreciation_entries(date)
+		return
+
 	failed_asset_names = []
 	error_log_names = []
 
@@ -136,6 +145,239 @@ def get_depreciable_asset_depr_schedules_data(date):
 	return res
 
 
+def enqueue_consolidated_depreciation_entries(date):
+	"""Books consolidated depreciation entries of each company in a separate background job."""
+	for company in frappe.get_all("Company", pluck="name"):
+		job_id = f"consolidated_depreciation_entries::{company}::{date}"
+		if not is_job_enqueued(job_id):
+			frappe.enqueue(
+				post_consolidated_depreciation_entries,
+				queue="long",
+				timeout=10000,
+				job_id=job_id,
+				company=company,
+				date=date,
+				now=frappe.flags.in_test,
+			)
+
+
+def post_consolidated_depreciation_entries(company, date):
+	"""Books due depreciation of the company's assets in a Journal Entry per asset category, cost center,
+	finance book and posting date, with one row per asset."""
+	failed_asset_names = []
+	error_log_names = []
+
+	accounting_dimensions = get_checks_for_pl_and_bs_accounts()
+	schedule_rows = get_due_depreciation_schedule_rows(company, date, accounting_dimensions)
+	if not schedule_rows:
+		return
+
+	depreciation_cost_center, depreciation_series = frappe.get_cached_value(
+		"Company", company, ["depreciation_cost_center", "series_for_depreciation_entry"]
+	)
+
+	grouped_schedule_rows = {}
+	for row in schedule_rows:
+		row.cost_center = row.cost_center or depreciation_cost_center
+		key = (row.asset_category, row.cost_center, row.finance_book, row.schedule_date)
+		grouped_schedule_rows.setdefault(key, []).append(row)
+
+	credit_and_debit_accounts_for_asset_category = {}
+
+	for (asset_category, cost_center, finance_book, posting_date), rows in grouped_schedule_rows.items():
+		for batch in create_batch(rows, DEPRECIATION_ENTRY_BATCH_SIZE):
+			try:
+				if asset_category not in credit_and_debit_accounts_for_asset_category:
+					credit_and_debit_accounts_for_asset_category[asset_category] = (
+						get_credit_and_debit_accounts_for_asset_category_and_company(asset_category, company)
+					)
+
+				make_consolidated_depreciation_entry(
+					batch,
+					company,
+					finance_book,
+					posting_date,
+					cost_center,
+					depreciation_series,
+					credit_and_debit_accounts_for_asset_category[asset_category],
+					accounting_dimensions,
+				)
+				frappe.db.commit()
+			except Exception:
+				frappe.db.rollback()
+
+				# book the batch asset-wise so that one faulty asset does not hold back the rest
+				for row in batch:
+					try:
+						make_depreciation_entry_for_schedule_row(
+							row, date, depreciation_series, accounting_dimensions
+						)
+						frappe.db.commit()
+					except Exception as e:
+						frappe.db.rollback()
+						failed_asset_names.append(row.asset)
+						error_log = frappe.log_error(e)
+						error_log_names.append(error_log.name)
+
+	if failed_asset_names:
+		set_depr_entry_posting_status_for_failed_assets(failed_asset_names)
+		notify_depr_entry_posting_error(failed_asset_names, error_log_names)
+
+	frappe.db.commit()
+
+
+def get_due_depreciation_schedule_rows(company, date, accounting_dimensions):
+	a = frappe.qb.DocType("Asset")
+	afb = frappe.qb.DocType("Asset Finance Book")
+	ads = frappe.qb.DocType("Asset Depreciation Schedule")
+	ds = frappe.qb.DocType("Depreciation Schedule")
+
+	query = (
+		frappe.qb.from_(ds)
+		.join(ads)
+		.on(ads.name == ds.parent)
+		.join(a)
+		.on(ads.asset == a.name)
+		.join(afb)
+		.on((afb.parent == a.name) & (afb.parenttype == "Asset") & (afb.idx == ads.finance_book_id))
+		.select(
+			ds.name,
+			ds.schedule_date,
+			ds.depreciation_amount,
+			ads.name.as_("asset_depr_schedule"),
+			ads.finance_book,
+			afb.name.as_("asset_finance_book"),
+			a.name.as_("asset"),
+			a.asset_category,
+			a.cost_center,
+			*[a[dimension["fieldname"]] for dimension in accounting_dimensions],
+		)
+		.where(a.company == company)
+		.where(a.calculate_depreciation == 1)
+		.where(a.docstatus == 1)
+		.where(ads.docstatus == 1)
+		.where(a.status.isin(["Submitted", "Partially Depreciated"]))
+		.where(ds.journal_entry.isnull())
+		.where(ds.schedule_date <= date)
+		.orderby(ds.schedule_date)
+		.orderby(a.creation, order=Order.desc)
+		.orderby(ds.idx)
+	)
+
+	acc_frozen_upto = get_acc_frozen_upto()
+	if acc_frozen_upto:
+		query = query.where(ds.schedule_date > acc_frozen_upto)
+
+	return query.run(as_dict=True)
+
+
+def make_consolidated_depreciation_entry(
+	schedule_rows,
+	company,
+	finance_book,
+	posting_date,
+	depreciation_cost_center,
+	depreciation_series,
+	credit_and_debit_accounts,
+	accounting_dimensions,
+):
+	credit_account, debit_account = credit_and_debit_accounts
+	total_depreciation_amount = sum(flt(row.depreciation_amount) for row in schedule_rows)
+
+	je = frappe.new_doc("Journal Entry")
+	je.voucher_type = "Depreciation Entry"
+	je.naming_series = depreciation_series
+	je.posting_date = posting_date
+	je.company = company
+	je.finance_book = finance_book
+	je.remark = f"Depreciation Entry against {len(schedule_rows)} assets worth {total_depreciation_amount}"
+
+	for row in schedule_rows:
+		credit_entry, debit_entry = get_depreciation_entry_rows(
+			row.asset,
+			row,
+			row.depreciation_amount,
+			depreciation_cost_center,
+			credit_account,
+			debit_account,
+			accounting_dimensions,
+		)
+		je.append("accounts", credit_entry)
+		je.append("accounts", debit_entry)
+
+	je.flags.ignore_permissions = True
+	je.flags.planned_depr_entry = True
+	je.save()
+
+	ds = frappe.qb.DocType("Depreciation Schedule")
+	(
+		frappe.qb.update(ds)
+		.set(ds.journal_entry, je.name)
+		.where(ds.name.isin([row.name for row in schedule_rows]))
+	).run()
+
+	asset_names = list({row.asset for row in schedule_rows})
+
+	if not je.meta.get_workflow():
+		je.submit()
+
+		afb = frappe.qb.DocType("Asset Finance Book")
+		value_after_depreciation = Case()
+		for row in schedule_rows:
+			value_after_depreciation = value_after_depreciation.when(
+				afb.name == row.asset_finance_book,
+				afb.value_after_depreciation - flt(row.depreciation_amount),
+			)
+
+		(
+			frappe.qb.update(afb)
+			.set(afb.value_after_depreciation, value_after_depreciation.else_(afb.value_after_depreciation))
+			.where(afb.name.isin([row.asset_finance_book for row in schedule_rows]))
+		).run()
+
+	for asset_name in asset_names:
+		frappe.get_doc("Asset", asset_name).set_status()
+
+	asset = frappe.qb.DocType("Asset")
+	(
+		frappe.qb.update(asset)
+		.set(asset.depr_entry_posting_status, "Successful")
+		.where(asset.name.isin(asset_names))
+	).run()
+
+	return je
+
+
+def make_depreciation_entry_for_schedule_row(schedule_row, date, depreciation_series, accounting_dimensions):
+	asset_depr_schedule_doc = frappe.get_doc("Asset Depreciation Schedule", schedule_row.asset_depr_schedule)
+	asset = frappe.get_doc("Asset", schedule_row.asset)
+
+	credit_account, debit_account = get_credit_and_debit_accounts_for_asset_category_and_company(
+		asset.asset_category, asset.company
+	)
+
+	depr_schedule = next(
+		d for d in asset_depr_schedule_doc.get("depreciation_schedule") if d.name == schedule_row.name
+	)
+
+	_make_journal_entry_for_depreciation(
+		asset_depr_schedule_doc,
+		asset,
+		date,
+		depr_schedule,
+		None,
+		None,
+		schedule_row.cost_center,
+		depreciation_series,
+		credit_account,
+		debit_account,
+		accounting_dimensions,
+	)
+
+	asset.set_status()
+	asset.db_set("depr_entry_posting_status", "Successful")
+
+
 def make_depreciation_entry_for_all_asset_depr_schedules(asset_doc, date=None):
 	for row in asset_doc.get("finance_books"):
 		asset_depr_schedule_name = get_asset_depr_schedule_name(asset_doc.name, "Active", row.finance_book)
@@ -279,19 +521,58 @@ def _make_journal_entry_for_depreciation(
 	je.finance_book = asset_depr_schedule_doc.finance_book
 	je.remark = f"Depreciation Entry against {asset.name} worth {depr_schedule.depreciation_amount}"
 
+	credit_entry, debit_entry = get_depreciation_entry_rows(
+		asset.name,
+		asset,
+		depr_schedule.depreciation_amount,
+		depreciation_cost_center,
+		credit_account,
+		debit_account,
+		accounting_dimensions,
+	)
+
+	je.append("accounts", credit_entry)
+	je.append("accounts", debit_entry)
+
+	je.flags.ignore_permissions = True
+	je.flags.planned_depr_entry = True
+	je.save()
+
+	depr_schedule.db_set("journal_entry", je.name)
+
+	if not je.meta.get_workflow():
+		je.submit()
+		asset.reload()
+		idx = cint(asset_depr_schedule_doc.finance_book_id)
+		row = asset.get("finance_books")[idx - 1]
+		row.value_after_depreciation -= depr_schedule.depreciation_amount
+		row.db_update()
+
+
+def get_depreciation_entry_rows(
+	asset_name,
+	asset,
+	depreciation_amount,
+	depreciation_cost_center,
+	credit_account,
+	debit_account,
+	accounting_dimensions,
+):
+	"""Returns the credit and debit rows of a depreciation entry, `asset` being the Asset or any
+	mapping of its accounting dimensions."""
 	credit_entry = {
 		"account": credit_account,
-		"credit_in_account_currency": depr_schedule.depreciation_amount,
+		"credit_in_account_currency": depreciation_amount,
 		"reference_type": "Asset",
-		"reference_name": asset.name,
+		"reference_name": asset_name,
 		"cost_center": depreciation_cost_center,
 	}
 
 	debit_entry = {
 		"account": debit_account,
-		"debit_in_account_currency": depr_schedule.depreciation_amount,
+		"debit_in_account_currency": depreciation_amount,
 		"reference_type": "Asset",
-		"reference_name": asset.name,
+		"reference_name": asset_name,
 		"cost_center": depreciation_cost_center,
 	}
 
@@ -312,22 +593,7 @@ def _make_journal_entry_for_depreciation(
 				}
 			)
 
-	je.append("accounts", credit_entry)
-	je.append("accounts", debit_entry)
-
-	je.flags.ignore_permissions = True
-	je.flags.planned_depr_entry = True
-	je.save()
-
-	depr_schedule.db_set("journal_entry", je.name)
-
-	if not je.meta.get_workflow():
-		je.submit()
-		asset.reload()
-		idx = cint(asset_depr_schedule_doc.finance_book_id)
-		row = asset.get("finance_books")[idx - 1]
-		row.value_after_depreciation -= depr_schedule.depreciation_amount
-		row.db_update()
+	return credit_entry, debit_entry
 
 
 def get_depreciation_accounts(asset_category, company):
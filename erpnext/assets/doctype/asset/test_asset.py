@@ -1227,6 +1227,49 @@ class TestDepreciationBasics(AssetSetup):
 		self.assertFalse(depr_schedule[1].journal_entry)
 		self.assertFalse(depr_schedule[2].journal_entry)
 
+	def test_post_consolidated_depreciation_entries(self):
+		"""Tests if due depreciation of assets sharing the accounts and posting date is booked in a single entry."""
+
+		assets = [
+			create_asset(
+				item_code="Macbook Pro",
+				calculate_depreciation=1,
+				available_for_use_date="2019-12-31",
+				depreciation_start_date="2020-12-31",
+				frequency_of_depreciation=12,
+				total_number_of_depreciations=3,
+				expected_value_after_useful_life=10000,
+				submit=1,
+			)
+			for _ in range(2)
+		]
+
+		frappe.db.set_single_value("Accounts Settings", "post_consolidated_depreciation_entries", 1)
+		try:
+			post_depreciation_entries(date="2021-06-01")
+		finally:
+			frappe.db.set_single_value("Accounts Settings", "post_consolidated_depreciation_entries", 0)
+
+		journal_entries = set()
+		for asset in assets:
+			asset.load_from_db()
+			depr_schedule = get_depr_schedule(asset.name, "Active")
+
+			self.assertTrue(depr_schedule[0].journal_entry)
+			self.assertFalse(depr_schedule[1].journal_entry)
+			self.assertEqual(asset.status, "Partially Depreciated")
+			self.assertEqual(
+				asset.finance_books[0].value_after_depreciation,
+				asset.gross_purchase_amount - depr_schedule[0].depreciation_amount,
+			)
+			journal_entries.add(depr_schedule[0].journal_entry)
+
+		self.assertEqual(len(journal_entries), 1)
+
+		je = frappe.get_doc("Journal Entry", journal_entries.pop())
+		self.assertEqual(je.docstatus, 1)
+		self.assertTrue({asset.name for asset in assets}.issubset({d.reference_name for d in je.accounts}))
+
 	def test_depr_entry_posting_when_depr_expense_account_is_an_expense_account(self):
 		"""Tests if the Depreciation Expense Account gets debited and the Accumulated Depreciation Account gets credited when the former's an Expense Account."""
 
@@ -26,7 +26,7 @@ from erpnext.manufacturing.doctype.blanket_order.blanket_order import (
 )
 from erpnext.setup.doctype.item_group.item_group import get_item_group_defaults
 from erpnext.stock.doctype.item.item import get_item_defaults, get_last_purchase_details
-from erpnext.stock.stock_balance import get_ordered_qty, update_bin_qty
+from erpnext.stock.stock_balance import get_ordered_qty, update_bins_qty
 from erpnext.stock.utils import get_bin
 from erpnext.subcontracting.doctype.subcontracting_bom.subcontracting_bom import (
 	get_subcontracting_boms_for_finished_goods,
@@ -419,8 +419,12 @@ class PurchaseOrder(BuyingController):
 				and not d.delivered_by_supplier
 			):
 				item_wh_list.append([d.item_code, d.warehouse])
-		for item_code, warehouse in item_wh_list:
-			update_bin_qty(item_code, warehouse, {"ordered_qty": get_ordered_qty(item_code, warehouse)})
+		update_bins_qty(
+			{
+				(item_code, warehouse): {"ordered_qty": get_ordered_qty(item_code, warehouse)}
+				for item_code, warehouse in item_wh_list
+			}
+		)
 
 	def check_modified_date(self):
 		mod_db = frappe.db.sql("select modified from `tabPurchase Order` where name = %s", self.name)
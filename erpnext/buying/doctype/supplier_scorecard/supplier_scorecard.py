@@ -3,6 +3,7 @@
 
 
 import time
+from collections import defaultdict
 from datetime import timedelta
 
 import frappe
@@ -11,7 +12,9 @@ from frappe.model.document import Document
 from frappe.utils import add_days, add_years, get_last_day, getdate, nowdate
 
 from erpnext.buying.doctype.supplier_scorecard_period.supplier_scorecard_period import (
+	calculate_weighted_score,
 	make_supplier_scorecard,
+	set_variable_values,
 )
 
 
@@ -89,34 +92,26 @@ class SupplierScorecard(Document):
 			throw(_("Criteria weights must add up to 100%"))
 
 	def calculate_total_score(self):
-		scorecards = frappe.db.sql(
-			"""
-			SELECT
-				scp.name
-			FROM
-				`tabSupplier Scorecard Period` scp
-			WHERE
-				scp.scorecard = %(sc)s
-				AND scp.docstatus = 1
-			ORDER BY
-				scp.end_date DESC""",
-			{"sc": self.name},
-			as_dict=1,
+		scorecards = frappe.get_all(
+			"Supplier Scorecard Period",
+			filters={"scorecard": self.name, "docstatus": 1},
+			fields=["name", "total_score"],
+			order_by="end_date desc",
 		)
+		variables = get_period_variables([scp.name for scp in scorecards])
 
 		period = 0
 		total_score = 0
 		total_max_score = 0
 		for scp in scorecards:
-			my_sc = frappe.get_doc("Supplier Scorecard Period", scp.name)
 			my_scp_weight = self.weighting_function
 			my_scp_weight = my_scp_weight.replace("{period_number}", str(period))
 
 			my_scp_maxweight = my_scp_weight.replace("{total_score}", "100")
-			my_scp_weight = my_scp_weight.replace("{total_score}", str(my_sc.total_score))
+			my_scp_weight = my_scp_weight.replace("{total_score}", str(scp.total_score))
 
-			max_score = my_sc.calculate_weighted_score(my_scp_maxweight)
-			score = my_sc.calculate_weighted_score(my_scp_weight)
+			max_score = calculate_weighted_score(my_scp_maxweight, variables.get(scp.name, []))
+			score = calculate_weighted_score(my_scp_weight, variables.get(scp.name, []))
 
 			total_score += score
 			total_max_score += max_score
@@ -181,79 +176,237 @@ def daterange(start_date, end_date):
 
 
 def refresh_scorecards():
-	scorecards = frappe.db.sql(
-		"""
-		SELECT
-			sc.name
-		FROM
-			`tabSupplier Scorecard` sc""",
-		{},
-		as_dict=1,
+	scorecards = frappe.get_all("Supplier Scorecard", fields=["name", "supplier", "period"])
+	supplier_creation = dict(
+		frappe.get_all(
+			"Supplier",
+			filters={"name": ("in", list({sc.supplier for sc in scorecards}))},
+			fields=["name", "creation"],
+			as_list=True,
+		)
 	)
-	for sc in scorecards:
-		# Check to see if any new scorecard periods are created
-		if make_all_scorecards(sc.name) > 0:
-			# Save the scorecard to update the score and standings
-			frappe.get_doc("Supplier Scorecard", sc.name).save()
+
+	for scorecard in update_scorecard_periods(scorecards, supplier_creation):
+		# Save the scorecard to update the score and standings
+		frappe.get_doc("Supplier Scorecard", scorecard).save()
 
 
 @frappe.whitelist()
 def make_all_scorecards(docname):
 	sc = frappe.get_doc("Supplier Scorecard", docname)
-	supplier = frappe.get_doc("Supplier", sc.supplier)
+	supplier_creation = {sc.supplier: frappe.db.get_value("Supplier", sc.supplier, "creation")}
+	period_cards = update_scorecard_periods([sc], supplier_creation).get(docname, [])
 
-	start_date = getdate(supplier.creation)
-	end_date = get_scorecard_date(sc.period, start_date)
-	todays = getdate(nowdate())
+	if period_cards:
+		frappe.msgprint(
+			_("Created {0} scorecards for {1} between:").format(len(period_cards), sc.supplier)
+			+ " "
+			+ str(min(getdate(d.start_date) for d in period_cards))
+			+ " - "
+			+ str(getdate(period_cards[-1].end_date))
+		)
+	return len(period_cards)
 
-	scp_count = 0
-	first_start_date = todays
-	last_end_date = todays
 
-	while (start_date < todays) and (end_date <= todays):
+def update_scorecard_periods(scorecards, supplier_creation):
+	"""
+	Submits the closed periods missing for the scorecards and recomputes their open period, which is kept
+	as a draft until it closes. Returns the submitted periods of each scorecard.
+	"""
+	scorecard_periods = get_scorecard_periods([sc.name for sc in scorecards])
+	draft_periods = get_draft_periods([sc.name for sc in scorecards])
+
+	period_cards = []
+	for sc in scorecards:
+		if sc.supplier not in supplier_creation:
+			continue
+
+		for start_date, end_date in get_missing_periods(
+			sc.period,
+			getdate(supplier_creation[sc.supplier]),
+			scorecard_periods.get(sc.name, []),
+			include_open=True,
+		):
+			if draft := draft_periods.get((sc.name, start_date, end_date)):
+				period_card = frappe.get_doc("Supplier Scorecard Period", draft)
+			else:
+				period_card = make_supplier_scorecard(sc.name, None)
+				period_card.start_date = start_date
+				period_card.end_date = end_date
+
+			period_cards.append((sc.name, period_card))
+
+	set_variable_values([period_card for _scorecard, period_card in period_cards])
+
+	today = getdate(nowdate())
+	submitted = defaultdict(list)
+	for scorecard, period_card in period_cards:
+		period_card.flags.ignore_permissions = True
+		period_card.save()
+
+		if getdate(period_card.end_date) <= today:
+			period_card.submit()
+			submitted[scorecard].append(period_card)
+
+	return submitted
+
+
+def update_scorecard_periods_on_change(doc, method=None):
+	"""Recalculates the submitted scorecard periods affected by a submitted or cancelled buying document."""
+	changes = get_scorecard_changes(doc)
+	if changes and frappe.db.exists("Supplier Scorecard", {"supplier": ("in", list(changes))}):
+		frappe.enqueue(
+			"erpnext.buying.doctype.supplier_scorecard.supplier_scorecard.recalculate_scorecard_periods",
+			changes=changes,
+			enqueue_after_commit=True,
+		)
+
+
+def get_scorecard_changes(doc):
+	"""Returns the (from date, to date) of each supplier whose scorecard variables the document changes."""
+	if doc.doctype == "Purchase Order":
+		suppliers = [doc.supplier]
+		dates = [doc.transaction_date, *(d.schedule_date for d in doc.items)]
+	elif doc.doctype == "Purchase Receipt":
+		# shipments are scored on the date they were scheduled for in the order
+		suppliers = [doc.supplier]
+		po_items = [d.purchase_order_item for d in doc.items if d.purchase_order_item]
+		dates = [doc.posting_date]
+		if po_items:
+			dates += frappe.get_all(
+				"Purchase Order Item", filters={"name": ("in", po_items)}, pluck="schedule_date"
+			)
+	elif doc.doctype == "Request for Quotation":
+		suppliers = [d.supplier for d in doc.suppliers]
+		dates = [doc.transaction_date]
+	elif doc.doctype == "Supplier Quotation":
+		# quotations are scored on the date of the request they answer
+		suppliers = [doc.supplier]
+		rfqs = list({d.request_for_quotation for d in doc.items if d.request_for_quotation})
+		dates = (
+			frappe.get_all("Request for Quotation", filters={"name": ("in", rfqs)}, pluck="transaction_date")
+			if rfqs
+			else []
+		)
+	else:
+		return {}
+
+	dates = [getdate(d) for d in dates if d]
+	if not dates:
+		return {}
+
+	return {supplier: (min(dates), max(dates)) for supplier in suppliers if supplier}
+
+
+def recalculate_scorecard_periods(changes):
+	"""Recalculates the submitted periods overlapping the changed dates of each supplier and their scorecards."""
+	names = []
+	for supplier, (from_date, to_date) in changes.items():
+		names += frappe.get_all(
+			"Supplier Scorecard Period",
+			filters={
+				"supplier": supplier,
+				"docstatus": 1,
+				"start_date": ("<=", to_date),
+				"end_date": (">=", from_date),
+			},
+			pluck="name",
+		)
+
+	periods = [frappe.get_doc("Supplier Scorecard Period", name) for name in names]
+	set_variable_values(periods)
+
+	for period in periods:
+		period.calculate_variables()
+		period.calculate_criteria()
+		period.calculate_score()
+
+		period.db_update()
+		for row in period.variables + period.criteria:
+			row.db_update()
+
+	for scorecard in {period.scorecard for period in periods}:
+		# Save the scorecard to update the score and standings
+		frappe.get_doc("Supplier Scorecard", scorecard).save()
+
+
+def get_missing_periods(period, start_date, existing_periods, include_open=False):
+	"""
+	Returns (start date, end date) of closed periods since `start_date` that don't overlap an existing
+	scorecard period, followed by the period still open today if `include_open` is set. Periods already
+	scored are left as they are.
+	"""
+	end_date = get_scorecard_date(period, start_date)
+	todays = getdate(nowdate())
+
+	def is_missing(start_date, end_date):
 		# check to make sure there is no scorecard period already created
-		scorecards = frappe.db.sql(
-			"""
-			SELECT
-				scp.name
-			FROM
-				`tabSupplier Scorecard Period` scp
-			WHERE
-				scp.scorecard = %(sc)s
-				AND scp.docstatus = 1
-				AND (
-					(scp.start_date > %(end_date)s
-					AND scp.end_date < %(start_date)s)
-				OR
-					(scp.start_date < %(end_date)s
-					AND scp.end_date > %(start_date)s))
-			ORDER BY
-				scp.end_date DESC""",
-			{"sc": docname, "start_date": start_date, "end_date": end_date},
-			as_dict=1,
+		return not any(
+			(scp_start > end_date and scp_end < start_date) or (scp_start < end_date and scp_end > start_date)
+			for scp_start, scp_end in existing_periods
 		)
-		if len(scorecards) == 0:
-			period_card = make_supplier_scorecard(docname, None)
-			period_card.start_date = start_date
-			period_card.end_date = end_date
-			period_card.insert(ignore_permissions=True)
-			period_card.submit()
-			scp_count = scp_count + 1
-			if start_date < first_start_date:
-				first_start_date = start_date
-			last_end_date = end_date
+
+	missing_periods = []
+	while (start_date < todays) and (end_date <= todays):
+		if is_missing(start_date, end_date):
+			missing_periods.append((start_date, end_date))
 
 		start_date = getdate(add_days(end_date, 1))
-		end_date = get_scorecard_date(sc.period, start_date)
-	if scp_count > 0:
-		frappe.msgprint(
-			_("Created {0} scorecards for {1} between:").format(scp_count, sc.supplier)
-			+ " "
-			+ str(first_start_date)
-			+ " - "
-			+ str(last_end_date)
+		end_date = get_scorecard_date(period, start_date)
+
+	if include_open and start_date <= todays and is_missing(start_date, end_date):
+		missing_periods.append((start_date, end_date))
+
+	return missing_periods
+
+
+def get_scorecard_periods(scorecards):
+	"""Returns (start date, end date) of submitted periods of the scorecards."""
+	scorecard_periods = defaultdict(list)
+	if not scorecards:
+		return scorecard_periods
+
+	for scorecard, start_date, end_date in frappe.get_all(
+		"Supplier Scorecard Period",
+		filters={"scorecard": ("in", scorecards), "docstatus": 1},
+		fields=["scorecard", "start_date", "end_date"],
+		as_list=True,
+	):
+		scorecard_periods[scorecard].append((getdate(start_date), getdate(end_date)))
+
+	return scorecard_periods
+
+
+def get_draft_periods(scorecards):
+	"""Returns draft periods of the scorecards by (scorecard, start date, end date)."""
+	if not scorecards:
+		return {}
+
+	return {
+		(d.scorecard, getdate(d.start_date), getdate(d.end_date)): d.name
+		for d in frappe.get_all(
+			"Supplier Scorecard Period",
+			filters={"scorecard": ("in", scorecards), "docstatus": 0},
+			fields=["name", "scorecard", "start_date", "end_date"],
 		)
-	return scp_count
+	}
+
+
+def get_period_variables(periods):
+	"""Returns scoring variables of the scorecard periods."""
+	variables = defaultdict(list)
+	if not periods:
+		return variables
+
+	for var in frappe.get_all(
+		"Supplier Scorecard Scoring Variable",
+		filters={"parenttype": "Supplier Scorecard Period", "parent": ("in", periods)},
+		fields=["parent", "param_name", "value"],
+		order_by="idx",
+	):
+		variables[var.parent].append(var)
+
+	return variables
 
 
 def get_scorecard_date(period, start_date):
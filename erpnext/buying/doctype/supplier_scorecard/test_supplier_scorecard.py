@@ -4,6 +4,13 @@
 
 import frappe
 from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_days, flt, get_last_day, getdate, nowdate
+
+import erpnext.buying.doctype.supplier_scorecard_variable.supplier_scorecard_variable as variable_functions
+from erpnext.buying.doctype.request_for_quotation.test_request_for_quotation import (
+	make_request_for_quotation,
+)
+from erpnext.buying.doctype.supplier_scorecard.supplier_scorecard import get_missing_periods
 
 
 class TestSupplierScorecard(FrappeTestCase):
@@ -18,6 +25,161 @@ class TestSupplierScorecard(FrappeTestCase):
 			d.weight = 0
 		self.assertRaises(frappe.ValidationError, my_doc.insert)
 
+	def test_missing_periods(self):
+		start_date = getdate(add_days(nowdate(), -30))
+		periods = get_missing_periods("Per Week", start_date, [])
+		self.assertEqual(len(periods), 3)
+		self.assertEqual(periods[0][0], start_date)
+
+		# periods already scored are not created again
+		missing_periods = get_missing_periods("Per Week", start_date, periods[:2])
+		self.assertEqual(missing_periods, periods[2:])
+		self.assertEqual(get_missing_periods("Per Week", start_date, periods), [])
+
+		# the open period follows the closed ones
+		open_period = get_missing_periods("Per Week", start_date, periods, include_open=True)
+		self.assertEqual(len(open_period), 1)
+		self.assertTrue(open_period[0][0] <= getdate(nowdate()) < open_period[0][1])
+
+	def test_open_period_is_kept_as_draft(self):
+		delete_test_scorecards()
+		doc = make_supplier_scorecard().insert()
+
+		open_periods = frappe.get_all(
+			"Supplier Scorecard Period",
+			filters={"scorecard": doc.name, "docstatus": 0},
+			fields=["start_date", "end_date"],
+		)
+		# a monthly period ending today is closed and submitted
+		today = getdate(nowdate())
+		self.assertEqual(len(open_periods), 0 if get_last_day(today) == today else 1)
+		for period in open_periods:
+			self.assertTrue(period.start_date <= today < period.end_date)
+
+	def test_grouped_variables_match_period_functions(self):
+		supplier = valid_scorecard[0].get("supplier")
+		periods = [
+			frappe._dict(
+				supplier=supplier,
+				start_date=getdate(add_days(nowdate(), -60)),
+				end_date=getdate(add_days(nowdate(), -31)),
+			),
+			frappe._dict(
+				supplier=supplier,
+				start_date=getdate(add_days(nowdate(), -30)),
+				end_date=getdate(nowdate()),
+			),
+		]
+		paths = [
+			*variable_functions.GROUPED_VARIABLES,
+			*variable_functions.DERIVED_VARIABLES,
+			"get_total_workdays",
+		]
+
+		def get_values():
+			return {
+				path: [flt(d) for d in variable_functions.get_grouped_variable_values(path, periods)]
+				for path in paths
+			}
+
+		before = get_values()
+
+		# an order scheduled in the first period, received 5 days late, and a request for quotation today
+		po = make_scored_purchase_order(add_days(nowdate(), -45), add_days(nowdate(), -40))
+		make_scored_purchase_receipt(po, add_days(nowdate(), -35))
+		make_request_for_quotation(supplier_data=[{"supplier": supplier, "supplier_name": supplier}])
+
+		values = get_values()
+		for path, expected in (
+			("get_total_cost_of_shipments", [1000, 0]),
+			("get_total_shipments", [1, 0]),
+			("get_ordered_qty", [10, 0]),
+			("get_total_days_late", [50, 0]),
+			("get_total_received_items", [10, 0]),
+			("get_rfq_total_number", [0, 1]),
+			("get_rfq_total_items", [0, 1]),
+		):
+			self.assertEqual([v - b for v, b in zip(values[path], before[path], strict=True)], expected, path)
+
+		for path in paths:
+			self.assertEqual(
+				values[path], [flt(getattr(variable_functions, path)(period)) for period in periods], path
+			)
+
+	def test_submitted_period_is_recalculated(self):
+		from erpnext.buying.doctype.supplier_scorecard.supplier_scorecard import (
+			get_scorecard_changes,
+			recalculate_scorecard_periods,
+		)
+		from erpnext.buying.doctype.supplier_scorecard_period.supplier_scorecard_period import (
+			make_supplier_scorecard as make_scorecard_period,
+		)
+
+		delete_test_scorecards()
+		scorecard = make_supplier_scorecard().insert()
+		if not frappe.db.exists("Supplier Scorecard Variable", "_Test Total Shipments"):
+			frappe.get_doc(
+				{
+					"doctype": "Supplier Scorecard Variable",
+					"variable_label": "_Test Total Shipments",
+					"param_name": "_test_total_shipments",
+					"path": "get_total_shipments",
+				}
+			).insert()
+
+		period = make_scorecard_period(scorecard.name)
+		period.start_date = add_days(nowdate(), -60)
+		period.end_date = add_days(nowdate(), -31)
+		period.append(
+			"variables",
+			{
+				"variable_label": "_Test Total Shipments",
+				"param_name": "_test_total_shipments",
+				"path": "get_total_shipments",
+			},
+		)
+		period.insert()
+		period.submit()
+
+		po = make_scored_purchase_order(add_days(nowdate(), -45), add_days(nowdate(), -40))
+		recalculate_scorecard_periods(get_scorecard_changes(po))
+
+		period.reload()
+		self.assertEqual(period.docstatus, 1)
+		self.assertEqual(flt(period.variables[0].value), flt(variable_functions.get_total_shipments(period)))
+		self.assertTrue(period.variables[0].value > 0)
+
+
+def make_scored_purchase_order(transaction_date, schedule_date):
+	from erpnext.buying.doctype.purchase_order.test_purchase_order import create_purchase_order
+
+	po = create_purchase_order(
+		supplier=valid_scorecard[0].get("supplier"),
+		transaction_date=transaction_date,
+		qty=10,
+		rate=100,
+		do_not_save=True,
+	)
+	po.schedule_date = schedule_date
+	for item in po.items:
+		item.schedule_date = schedule_date
+
+	po.set_missing_values()
+	po.insert()
+	po.submit()
+	return po
+
+
+def make_scored_purchase_receipt(po, posting_date):
+	from erpnext.buying.doctype.purchase_order.purchase_order import make_purchase_receipt
+
+	pr = make_purchase_receipt(po.name)
+	pr.set_posting_time = 1
+	pr.posting_date = posting_date
+	pr.insert()
+	pr.submit()
+	return pr
+
 
 def make_supplier_scorecard():
 	my_doc = frappe.get_doc(valid_scorecard[0])
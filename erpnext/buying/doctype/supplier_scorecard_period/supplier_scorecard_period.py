@@ -2,6 +2,8 @@
 # For license information, please see license.txt
 
 
+from collections import defaultdict
+
 import frappe
 from frappe import _, throw
 from frappe.model.document import Document
@@ -55,8 +57,13 @@ class SupplierScorecardPeriod(Document):
 			throw(_("Criteria weights must add up to 100%"))
 
 	def calculate_variables(self):
+		# values of built-in variables evaluated together for many periods, see `set_variable_values`
+		variable_values = self.flags.variable_values or {}
+
 		for var in self.variables:
-			if "." in var.path:
+			if var.path in variable_values:
+				var.value = variable_values[var.path]
+			elif "." in var.path:
 				method_to_call = import_string_path(var.path)
 				var.value = method_to_call(self)
 			else:
@@ -91,32 +98,56 @@ class SupplierScorecardPeriod(Document):
 		self.total_score = myscore
 
 	def calculate_weighted_score(self, weighing_function):
-		try:
-			weighed_score = frappe.safe_eval(
-				self.get_eval_statement(weighing_function), None, {"max": max, "min": min}
-			)
-		except Exception:
-			frappe.throw(
-				_("Could not solve weighted score function. Make sure the formula is valid."),
-				frappe.ValidationError,
-			)
-			weighed_score = 0
-		return weighed_score
+		return calculate_weighted_score(weighing_function, self.variables)
 
 	def get_eval_statement(self, formula):
-		my_eval_statement = formula.replace("\r", "").replace("\n", "")
+		return get_eval_statement(formula, self.variables)
 
-		for var in self.variables:
-			if var.value:
-				if var.param_name in my_eval_statement:
-					my_eval_statement = my_eval_statement.replace(
-						"{" + var.param_name + "}", f"{var.value:.2f}"
-					)
-			else:
-				if var.param_name in my_eval_statement:
-					my_eval_statement = my_eval_statement.replace("{" + var.param_name + "}", "0.0")
 
-		return my_eval_statement
+def set_variable_values(periods):
+	"""Evaluates built-in variables of the periods together, grouped by supplier and date."""
+	variable_periods = defaultdict(list)
+	for period in periods:
+		period.flags.variable_values = {}
+		for var in period.variables:
+			variable_periods[var.path].append(period)
+
+	for path, periods in variable_periods.items():
+		# custom variables are evaluated per period
+		values = variable_functions.get_grouped_variable_values(path, periods)
+		if values is None:
+			continue
+
+		for period, value in zip(periods, values, strict=True):
+			period.flags.variable_values[path] = value
+
+
+def calculate_weighted_score(weighing_function, variables):
+	try:
+		weighed_score = frappe.safe_eval(
+			get_eval_statement(weighing_function, variables), None, {"max": max, "min": min}
+		)
+	except Exception:
+		frappe.throw(
+			_("Could not solve weighted score function. Make sure the formula is valid."),
+			frappe.ValidationError,
+		)
+		weighed_score = 0
+	return weighed_score
+
+
+def get_eval_statement(formula, variables):
+	my_eval_statement = formula.replace("\r", "").replace("\n", "")
+
+	for var in variables:
+		if var.value:
+			if var.param_name in my_eval_statement:
+				my_eval_statement = my_eval_statement.replace("{" + var.param_name + "}", f"{var.value:.2f}")
+		else:
+			if var.param_name in my_eval_statement:
+				my_eval_statement = my_eval_statement.replace("{" + var.param_name + "}", "0.0")
+
+	return my_eval_statement
 
 
 def import_string_path(path):
@@ -3,12 +3,13 @@
 
 
 import sys
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
 
 import frappe
 from frappe import _
 from frappe.model.document import Document
-from frappe.query_builder.functions import Sum
-from frappe.utils import getdate
+from frappe.utils import date_diff, flt, getdate
 
 
 class VariablePathNotFound(frappe.ValidationError):
@@ -58,53 +59,12 @@ def get_total_workdays(scorecard):
 
 def get_item_workdays(scorecard):
 	"""Gets the number of days in this period"""
-	supplier = frappe.get_doc("Supplier", scorecard.supplier)
-	total_item_days = frappe.db.sql(
-		"""
-			SELECT
-				SUM(DATEDIFF( %(end_date)s, po_item.schedule_date) * (po_item.qty))
-			FROM
-				`tabPurchase Order Item` po_item,
-				`tabPurchase Order` po
-			WHERE
-				po.supplier = %(supplier)s
-				AND po_item.received_qty < po_item.qty
-				AND po_item.schedule_date BETWEEN %(start_date)s AND %(end_date)s
-				AND po_item.parent = po.name""",
-		{"supplier": supplier.name, "start_date": scorecard.start_date, "end_date": scorecard.end_date},
-		as_dict=0,
-	)[0][0]
-
-	if not total_item_days:
-		total_item_days = 0
-	return total_item_days
+	return get_grouped_variable_values("get_item_workdays", [scorecard])[0]
 
 
 def get_total_cost_of_shipments(scorecard):
 	"""Gets the total cost of all shipments in the period (based on Purchase Orders)"""
-	supplier = frappe.get_doc("Supplier", scorecard.supplier)
-
-	# Look up all PO Items with delivery dates between our dates
-	data = frappe.db.sql(
-		"""
-			SELECT
-				SUM(po_item.base_amount)
-			FROM
-				`tabPurchase Order Item` po_item,
-				`tabPurchase Order` po
-			WHERE
-				po.supplier = %(supplier)s
-				AND po_item.schedule_date BETWEEN %(start_date)s AND %(end_date)s
-				AND po_item.docstatus = 1
-				AND po_item.parent = po.name""",
-		{"supplier": supplier.name, "start_date": scorecard.start_date, "end_date": scorecard.end_date},
-		as_dict=0,
-	)[0][0]
-
-	if data:
-		return data
-	else:
-		return 0
+	return get_grouped_variable_values("get_total_cost_of_shipments", [scorecard])[0]
 
 
 def get_cost_of_delayed_shipments(scorecard):
@@ -114,115 +74,17 @@ def get_cost_of_delayed_shipments(scorecard):
 
 def get_cost_of_on_time_shipments(scorecard):
 	"""Gets the total cost of all on_time shipments in the period (based on Purchase Receipts)"""
-	supplier = frappe.get_doc("Supplier", scorecard.supplier)
-
-	# Look up all PO Items with delivery dates between our dates
-
-	total_delivered_on_time_costs = frappe.db.sql(
-		"""
-			SELECT
-				SUM(pr_item.base_amount)
-			FROM
-				`tabPurchase Order Item` po_item,
-				`tabPurchase Receipt Item` pr_item,
-				`tabPurchase Order` po,
-				`tabPurchase Receipt` pr
-			WHERE
-				po.supplier = %(supplier)s
-				AND po_item.schedule_date BETWEEN %(start_date)s AND %(end_date)s
-				AND po_item.schedule_date >= pr.posting_date
-				AND pr_item.docstatus = 1
-				AND pr_item.purchase_order_item = po_item.name
-				AND po_item.parent = po.name
-				AND pr_item.parent = pr.name""",
-		{"supplier": supplier.name, "start_date": scorecard.start_date, "end_date": scorecard.end_date},
-		as_dict=0,
-	)[0][0]
-
-	if total_delivered_on_time_costs:
-		return total_delivered_on_time_costs
-	else:
-		return 0
+	return get_grouped_variable_values("get_cost_of_on_time_shipments", [scorecard])[0]
 
 
 def get_total_days_late(scorecard):
 	"""Gets the number of item days late in the period (based on Purchase Receipts vs POs)"""
-	supplier = frappe.get_doc("Supplier", scorecard.supplier)
-	total_delivered_late_days = frappe.db.sql(
-		"""
-			SELECT
-				SUM(DATEDIFF(pr.posting_date,po_item.schedule_date)* pr_item.qty)
-			FROM
-				`tabPurchase Order Item` po_item,
-				`tabPurchase Receipt Item` pr_item,
-				`tabPurchase Order` po,
-				`tabPurchase Receipt` pr
-			WHERE
-				po.supplier = %(supplier)s
-				AND po_item.schedule_date BETWEEN %(start_date)s AND %(end_date)s
-				AND po_item.schedule_date < pr.posting_date
-				AND pr_item.docstatus = 1
-				AND pr_item.purchase_order_item = po_item.name
-				AND po_item.parent = po.name
-				AND pr_item.parent = pr.name""",
-		{"supplier": supplier.name, "start_date": scorecard.start_date, "end_date": scorecard.end_date},
-		as_dict=0,
-	)[0][0]
-	if not total_delivered_late_days:
-		total_delivered_late_days = 0
-
-	total_missed_late_days = frappe.db.sql(
-		"""
-			SELECT
-				SUM(DATEDIFF( %(end_date)s, po_item.schedule_date) * (po_item.qty - po_item.received_qty))
-			FROM
-				`tabPurchase Order Item` po_item,
-				`tabPurchase Order` po
-			WHERE
-				po.supplier = %(supplier)s
-				AND po_item.received_qty < po_item.qty
-				AND po_item.schedule_date BETWEEN %(start_date)s AND %(end_date)s
-				AND po_item.parent = po.name""",
-		{"supplier": supplier.name, "start_date": scorecard.start_date, "end_date": scorecard.end_date},
-		as_dict=0,
-	)[0][0]
-
-	if not total_missed_late_days:
-		total_missed_late_days = 0
-	return total_missed_late_days + total_delivered_late_days
+	return get_grouped_variable_values("get_total_days_late", [scorecard])[0]
 
 
 def get_on_time_shipments(scorecard):
 	"""Gets the number of late shipments (counting each item) in the period (based on Purchase Receipts vs POs)"""
-
-	supplier = frappe.get_doc("Supplier", scorecard.supplier)
-
-	# Look up all PO Items with delivery dates between our dates
-	total_items_delivered_on_time = frappe.db.sql(
-		"""
-			SELECT
-				COUNT(pr_item.qty)
-			FROM
-				`tabPurchase Order Item` po_item,
-				`tabPurchase Receipt Item` pr_item,
-				`tabPurchase Order` po,
-				`tabPurchase Receipt` pr
-			WHERE
-				po.supplier = %(supplier)s
-				AND po_item.schedule_date BETWEEN %(start_date)s AND %(end_date)s
-				AND po_item.schedule_date <= pr.posting_date
-				AND po_item.qty = pr_item.qty
-				AND pr_item.docstatus = 1
-				AND pr_item.purchase_order_item = po_item.name
-				AND po_item.parent = po.name
-				AND pr_item.parent = pr.name""",
-		{"supplier": supplier.name, "start_date": scorecard.start_date, "end_date": scorecard.end_date},
-		as_dict=0,
-	)[0][0]
-
-	if not total_items_delivered_on_time:
-		total_items_delivered_on_time = 0
-	return total_items_delivered_on_time
+	return get_grouped_variable_values("get_on_time_shipments", [scorecard])[0]
 
 
 def get_late_shipments(scorecard):
@@ -232,377 +94,334 @@ def get_late_shipments(scorecard):
 
 def get_total_received(scorecard):
 	"""Gets the total number of received shipments in the period (based on Purchase Receipts)"""
-	supplier = frappe.get_doc("Supplier", scorecard.supplier)
-
-	# Look up all PO Items with delivery dates between our dates
-	data = frappe.db.sql(
-		"""
-			SELECT
-				COUNT(pr_item.base_amount)
-			FROM
-				`tabPurchase Receipt Item` pr_item,
-				`tabPurchase Receipt` pr
-			WHERE
-				pr.supplier = %(supplier)s
-				AND pr.posting_date BETWEEN %(start_date)s AND %(end_date)s
-				AND pr_item.docstatus = 1
-				AND pr_item.parent = pr.name""",
-		{"supplier": supplier.name, "start_date": scorecard.start_date, "end_date": scorecard.end_date},
-		as_dict=0,
-	)[0][0]
-
-	if not data:
-		data = 0
-	return data
+	return get_grouped_variable_values("get_total_received", [scorecard])[0]
 
 
 def get_total_received_amount(scorecard):
 	"""Gets the total amount (in company currency) received in the period (based on Purchase Receipts)"""
-	supplier = frappe.get_doc("Supplier", scorecard.supplier)
-
-	# Look up all PO Items with delivery dates between our dates
-	data = frappe.db.sql(
-		"""
-			SELECT
-				SUM(pr_item.received_qty * pr_item.base_rate)
-			FROM
-				`tabPurchase Receipt Item` pr_item,
-				`tabPurchase Receipt` pr
-			WHERE
-				pr.supplier = %(supplier)s
-				AND pr.posting_date BETWEEN %(start_date)s AND %(end_date)s
-				AND pr_item.docstatus = 1
-				AND pr_item.parent = pr.name""",
-		{"supplier": supplier.name, "start_date": scorecard.start_date, "end_date": scorecard.end_date},
-		as_dict=0,
-	)[0][0]
-
-	if not data:
-		data = 0
-	return data
+	return get_grouped_variable_values("get_total_received_amount", [scorecard])[0]
 
 
 def get_total_received_items(scorecard):
 	"""Gets the total number of received shipments in the period (based on Purchase Receipts)"""
-	supplier = frappe.get_doc("Supplier", scorecard.supplier)
-
-	# Look up all PO Items with delivery dates between our dates
-	data = frappe.db.sql(
-		"""
-			SELECT
-				SUM(pr_item.received_qty)
-			FROM
-				`tabPurchase Receipt Item` pr_item,
-				`tabPurchase Receipt` pr
-			WHERE
-				pr.supplier = %(supplier)s
-				AND pr.posting_date BETWEEN %(start_date)s AND %(end_date)s
-				AND pr_item.docstatus = 1
-				AND pr_item.parent = pr.name""",
-		{"supplier": supplier.name, "start_date": scorecard.start_date, "end_date": scorecard.end_date},
-		as_dict=0,
-	)[0][0]
-
-	if not data:
-		data = 0
-	return data
+	return get_grouped_variable_values("get_total_received_items", [scorecard])[0]
 
 
 def get_total_rejected_amount(scorecard):
 	"""Gets the total amount (in company currency) rejected in the period (based on Purchase Receipts)"""
-	supplier = frappe.get_doc("Supplier", scorecard.supplier)
-
-	# Look up all PO Items with delivery dates between our dates
-	data = frappe.db.sql(
-		"""
-			SELECT
-				SUM(pr_item.rejected_qty * pr_item.base_rate)
-			FROM
-				`tabPurchase Receipt Item` pr_item,
-				`tabPurchase Receipt` pr
-			WHERE
-				pr.supplier = %(supplier)s
-				AND pr.posting_date BETWEEN %(start_date)s AND %(end_date)s
-				AND pr_item.docstatus = 1
-				AND pr_item.parent = pr.name""",
-		{"supplier": supplier.name, "start_date": scorecard.start_date, "end_date": scorecard.end_date},
-		as_dict=0,
-	)[0][0]
-
-	if not data:
-		data = 0
-	return data
+	return get_grouped_variable_values("get_total_rejected_amount", [scorecard])[0]
 
 
 def get_total_rejected_items(scorecard):
 	"""Gets the total number of rejected items in the period (based on Purchase Receipts)"""
-	supplier = frappe.get_doc("Supplier", scorecard.supplier)
-
-	# Look up all PO Items with delivery dates between our dates
-	data = frappe.db.sql(
-		"""
-			SELECT
-				SUM(pr_item.rejected_qty)
-			FROM
-				`tabPurchase Receipt Item` pr_item,
-				`tabPurchase Receipt` pr
-			WHERE
-				pr.supplier = %(supplier)s
-				AND pr.posting_date BETWEEN %(start_date)s AND %(end_date)s
-				AND pr_item.docstatus = 1
-				AND pr_item.parent = pr.name""",
-		{"supplier": supplier.name, "start_date": scorecard.start_date, "end_date": scorecard.end_date},
-		as_dict=0,
-	)[0][0]
-
-	if not data:
-		data = 0
-	return data
+	return get_grouped_variable_values("get_total_rejected_items", [scorecard])[0]
 
 
 def get_total_accepted_amount(scorecard):
 	"""Gets the total amount (in company currency) accepted in the period (based on Purchase Receipts)"""
-	supplier = frappe.get_doc("Supplier", scorecard.supplier)
-
-	# Look up all PO Items with delivery dates between our dates
-	data = frappe.db.sql(
-		"""
-			SELECT
-				SUM(pr_item.qty * pr_item.base_rate)
-			FROM
-				`tabPurchase Receipt Item` pr_item,
-				`tabPurchase Receipt` pr
-			WHERE
-				pr.supplier = %(supplier)s
-				AND pr.posting_date BETWEEN %(start_date)s AND %(end_date)s
-				AND pr_item.docstatus = 1
-				AND pr_item.parent = pr.name""",
-		{"supplier": supplier.name, "start_date": scorecard.start_date, "end_date": scorecard.end_date},
-		as_dict=0,
-	)[0][0]
-
-	if not data:
-		data = 0
-	return data
+	return get_grouped_variable_values("get_total_accepted_amount", [scorecard])[0]
 
 
 def get_total_accepted_items(scorecard):
 	"""Gets the total number of rejected items in the period (based on Purchase Receipts)"""
-	supplier = frappe.get_doc("Supplier", scorecard.supplier)
-
-	# Look up all PO Items with delivery dates between our dates
-	data = frappe.db.sql(
-		"""
-			SELECT
-				SUM(pr_item.qty)
-			FROM
-				`tabPurchase Receipt Item` pr_item,
-				`tabPurchase Receipt` pr
-			WHERE
-				pr.supplier = %(supplier)s
-				AND pr.posting_date BETWEEN %(start_date)s AND %(end_date)s
-				AND pr_item.docstatus = 1
-				AND pr_item.parent = pr.name""",
-		{"supplier": supplier.name, "start_date": scorecard.start_date, "end_date": scorecard.end_date},
-		as_dict=0,
-	)[0][0]
-
-	if not data:
-		data = 0
-	return data
+	return get_grouped_variable_values("get_total_accepted_items", [scorecard])[0]
 
 
 def get_total_shipments(scorecard):
 	"""Gets the total number of ordered shipments to arrive in the period (based on Purchase Receipts)"""
-	supplier = frappe.get_doc("Supplier", scorecard.supplier)
-
-	# Look up all PO Items with delivery dates between our dates
-	data = frappe.db.sql(
-		"""
-			SELECT
-				COUNT(po_item.base_amount)
-			FROM
-				`tabPurchase Order Item` po_item,
-				`tabPurchase Order` po
-			WHERE
-				po.supplier = %(supplier)s
-				AND po_item.schedule_date BETWEEN %(start_date)s AND %(end_date)s
-				AND po_item.docstatus = 1
-				AND po_item.parent = po.name""",
-		{"supplier": supplier.name, "start_date": scorecard.start_date, "end_date": scorecard.end_date},
-		as_dict=0,
-	)[0][0]
-
-	if not data:
-		data = 0
-	return data
+	return get_grouped_variable_values("get_total_shipments", [scorecard])[0]
 
 
 def get_ordered_qty(scorecard):
 	"""Returns the total number of ordered quantity (based on Purchase Orders)"""
-
-	po = frappe.qb.DocType("Purchase Order")
-
-	return (
-		frappe.qb.from_(po)
-		.select(Sum(po.total_qty))
-		.where(
-			(po.supplier == scorecard.supplier)
-			& (po.docstatus == 1)
-			& (po.transaction_date >= scorecard.get("start_date"))
-			& (po.transaction_date <= scorecard.get("end_date"))
-		)
-	).run(as_list=True)[0][0] or 0
+	return get_grouped_variable_values("get_ordered_qty", [scorecard])[0]
 
 
 def get_rfq_total_number(scorecard):
 	"""Gets the total number of RFQs sent to supplier"""
-	supplier = frappe.get_doc("Supplier", scorecard.supplier)
-
-	# Look up all PO Items with delivery dates between our dates
-	data = frappe.db.sql(
-		"""
-			SELECT
-				COUNT(rfq.name) as total_rfqs
-			FROM
-				`tabRequest for Quotation Item` rfq_item,
-				`tabRequest for Quotation Supplier` rfq_sup,
-				`tabRequest for Quotation` rfq
-			WHERE
-				rfq_sup.supplier = %(supplier)s
-				AND rfq.transaction_date BETWEEN %(start_date)s AND %(end_date)s
-				AND rfq_item.docstatus = 1
-				AND rfq_item.parent = rfq.name
-				AND rfq_sup.parent = rfq.name""",
-		{"supplier": supplier.name, "start_date": scorecard.start_date, "end_date": scorecard.end_date},
-		as_dict=0,
-	)[0][0]
-
-	if not data:
-		data = 0
-	return data
+	return get_grouped_variable_values("get_rfq_total_number", [scorecard])[0]
 
 
 def get_rfq_total_items(scorecard):
 	"""Gets the total number of RFQ items sent to supplier"""
-	supplier = frappe.get_doc("Supplier", scorecard.supplier)
-
-	# Look up all PO Items with delivery dates between our dates
-	data = frappe.db.sql(
-		"""
-			SELECT
-				COUNT(rfq_item.name) as total_rfqs
-			FROM
-				`tabRequest for Quotation Item` rfq_item,
-				`tabRequest for Quotation Supplier` rfq_sup,
-				`tabRequest for Quotation` rfq
-			WHERE
-				rfq_sup.supplier = %(supplier)s
-				AND rfq.transaction_date BETWEEN %(start_date)s AND %(end_date)s
-				AND rfq_item.docstatus = 1
-				AND rfq_item.parent = rfq.name
-				AND rfq_sup.parent = rfq.name""",
-		{"supplier": supplier.name, "start_date": scorecard.start_date, "end_date": scorecard.end_date},
-		as_dict=0,
-	)[0][0]
-	if not data:
-		data = 0
-	return data
+	return get_grouped_variable_values("get_rfq_total_items", [scorecard])[0]
 
 
 def get_sq_total_number(scorecard):
 	"""Gets the total number of RFQ items sent to supplier"""
-	supplier = frappe.get_doc("Supplier", scorecard.supplier)
-
-	# Look up all PO Items with delivery dates between our dates
-	data = frappe.db.sql(
-		"""
-			SELECT
-				COUNT(sq.name) as total_sqs
-			FROM
-				`tabRequest for Quotation Item` rfq_item,
-				`tabSupplier Quotation Item` sq_item,
-				`tabRequest for Quotation Supplier` rfq_sup,
-				`tabRequest for Quotation` rfq,
-				`tabSupplier Quotation` sq
-			WHERE
-				rfq_sup.supplier = %(supplier)s
-				AND rfq.transaction_date BETWEEN %(start_date)s AND %(end_date)s
-				AND sq_item.request_for_quotation_item = rfq_item.name
-				AND sq_item.docstatus = 1
-				AND rfq_item.docstatus = 1
-				AND sq.supplier = %(supplier)s
-				AND sq_item.parent = sq.name
-				AND rfq_item.parent = rfq.name
-				AND rfq_sup.parent = rfq.name""",
-		{"supplier": supplier.name, "start_date": scorecard.start_date, "end_date": scorecard.end_date},
-		as_dict=0,
-	)[0][0]
-	if not data:
-		data = 0
-	return data
+	return get_grouped_variable_values("get_sq_total_number", [scorecard])[0]
 
 
 def get_sq_total_items(scorecard):
 	"""Gets the total number of RFQ items sent to supplier"""
-	supplier = frappe.get_doc("Supplier", scorecard.supplier)
-
-	# Look up all PO Items with delivery dates between our dates
-	data = frappe.db.sql(
-		"""
-			SELECT
-				COUNT(sq_item.name) as total_sqs
-			FROM
-				`tabRequest for Quotation Item` rfq_item,
-				`tabSupplier Quotation Item` sq_item,
-				`tabSupplier Quotation` sq,
-				`tabRequest for Quotation Supplier` rfq_sup,
-				`tabRequest for Quotation` rfq
-			WHERE
-				rfq_sup.supplier = %(supplier)s
-				AND rfq.transaction_date BETWEEN %(start_date)s AND %(end_date)s
-				AND sq_item.request_for_quotation_item = rfq_item.name
-				AND sq_item.docstatus = 1
-				AND sq.supplier = %(supplier)s
-				AND sq_item.parent = sq.name
-				AND rfq_item.docstatus = 1
-				AND rfq_item.parent = rfq.name
-				AND rfq_sup.parent = rfq.name""",
-		{"supplier": supplier.name, "start_date": scorecard.start_date, "end_date": scorecard.end_date},
-		as_dict=0,
-	)[0][0]
-	if not data:
-		data = 0
-	return data
+	return get_grouped_variable_values("get_sq_total_items", [scorecard])[0]
 
 
 def get_rfq_response_days(scorecard):
 	"""Gets the total number of days it has taken a supplier to respond to rfqs in the period"""
-	supplier = frappe.get_doc("Supplier", scorecard.supplier)
-	total_sq_days = frappe.db.sql(
-		"""
-			SELECT
-				SUM(DATEDIFF(sq.transaction_date, rfq.transaction_date))
-			FROM
-				`tabRequest for Quotation Item` rfq_item,
-				`tabSupplier Quotation Item` sq_item,
-				`tabSupplier Quotation` sq,
-				`tabRequest for Quotation Supplier` rfq_sup,
-				`tabRequest for Quotation` rfq
-			WHERE
-				rfq_sup.supplier = %(supplier)s
-				AND rfq.transaction_date BETWEEN %(start_date)s AND %(end_date)s
-				AND sq_item.request_for_quotation_item = rfq_item.name
-				AND sq_item.docstatus = 1
-				AND sq.supplier = %(supplier)s
-				AND sq_item.parent = sq.name
-				AND rfq_item.docstatus = 1
-				AND rfq_item.parent = rfq.name
-				AND rfq_sup.parent = rfq.name""",
-		{"supplier": supplier.name, "start_date": scorecard.start_date, "end_date": scorecard.end_date},
-		as_dict=0,
-	)[0][0]
-	if not total_sq_days:
-		total_sq_days = 0
-
-	return total_sq_days
+	return get_grouped_variable_values("get_rfq_response_days", [scorecard])[0]
+
+
+# Queries evaluating built-in variables for many suppliers at once, grouped by supplier and date, and run by
+# the functions above for a single period. The value of a period is the sum of `value` over its dates plus
+# `pending_qty` weighted by the days from the date to the end of the period.
+ITEM_WORKDAYS = """
+	SELECT
+		po.supplier, po_item.schedule_date AS date, SUM(po_item.qty) AS pending_qty
+	FROM
+		`tabPurchase Order Item` po_item,
+		`tabPurchase Order` po
+	WHERE
+		po.supplier IN %(suppliers)s
+		AND po_item.received_qty < po_item.qty
+		AND po_item.schedule_date BETWEEN %(from_date)s AND %(to_date)s
+		AND po_item.parent = po.name
+	GROUP BY po.supplier, po_item.schedule_date"""
+
+TOTAL_COST_OF_SHIPMENTS = """
+	SELECT
+		po.supplier, po_item.schedule_date AS date, SUM(po_item.base_amount) AS value
+	FROM
+		`tabPurchase Order Item` po_item,
+		`tabPurchase Order` po
+	WHERE
+		po.supplier IN %(suppliers)s
+		AND po_item.schedule_date BETWEEN %(from_date)s AND %(to_date)s
+		AND po_item.docstatus = 1
+		AND po_item.parent = po.name
+	GROUP BY po.supplier, po_item.schedule_date"""
+
+COST_OF_ON_TIME_SHIPMENTS = """
+	SELECT
+		po.supplier, po_item.schedule_date AS date, SUM(pr_item.base_amount) AS value
+	FROM
+		`tabPurchase Order Item` po_item,
+		`tabPurchase Receipt Item` pr_item,
+		`tabPurchase Order` po,
+		`tabPurchase Receipt` pr
+	WHERE
+		po.supplier IN %(suppliers)s
+		AND po_item.schedule_date BETWEEN %(from_date)s AND %(to_date)s
+		AND po_item.schedule_date >= pr.posting_date
+		AND pr_item.docstatus = 1
+		AND pr_item.purchase_order_item = po_item.name
+		AND po_item.parent = po.name
+		AND pr_item.parent = pr.name
+	GROUP BY po.supplier, po_item.schedule_date"""
+
+DELIVERED_LATE_DAYS = """
+	SELECT
+		po.supplier,
+		po_item.schedule_date AS date,
+		SUM(DATEDIFF(pr.posting_date, po_item.schedule_date) * pr_item.qty) AS value
+	FROM
+		`tabPurchase Order Item` po_item,
+		`tabPurchase Receipt Item` pr_item,
+		`tabPurchase Order` po,
+		`tabPurchase Receipt` pr
+	WHERE
+		po.supplier IN %(suppliers)s
+		AND po_item.schedule_date BETWEEN %(from_date)s AND %(to_date)s
+		AND po_item.schedule_date < pr.posting_date
+		AND pr_item.docstatus = 1
+		AND pr_item.purchase_order_item = po_item.name
+		AND po_item.parent = po.name
+		AND pr_item.parent = pr.name
+	GROUP BY po.supplier, po_item.schedule_date"""
+
+MISSED_LATE_DAYS = """
+	SELECT
+		po.supplier,
+		po_item.schedule_date AS date,
+		SUM(po_item.qty - po_item.received_qty) AS pending_qty
+	FROM
+		`tabPurchase Order Item` po_item,
+		`tabPurchase Order` po
+	WHERE
+		po.supplier IN %(suppliers)s
+		AND po_item.received_qty < po_item.qty
+		AND po_item.schedule_date BETWEEN %(from_date)s AND %(to_date)s
+		AND po_item.parent = po.name
+	GROUP BY po.supplier, po_item.schedule_date"""
+
+ON_TIME_SHIPMENTS = """
+	SELECT
+		po.supplier, po_item.schedule_date AS date, COUNT(pr_item.qty) AS value
+	FROM
+		`tabPurchase Order Item` po_item,
+		`tabPurchase Receipt Item` pr_item,
+		`tabPurchase Order` po,
+		`tabPurchase Receipt` pr
+	WHERE
+		po.supplier IN %(suppliers)s
+		AND po_item.schedule_date BETWEEN %(from_date)s AND %(to_date)s
+		AND po_item.schedule_date <= pr.posting_date
+		AND po_item.qty = pr_item.qty
+		AND pr_item.docstatus = 1
+		AND pr_item.purchase_order_item = po_item.name
+		AND po_item.parent = po.name
+		AND pr_item.parent = pr.name
+	GROUP BY po.supplier, po_item.schedule_date"""
+
+TOTAL_SHIPMENTS = """
+	SELECT
+		po.supplier, po_item.schedule_date AS date, COUNT(po_item.base_amount) AS value
+	FROM
+		`tabPurchase Order Item` po_item,
+		`tabPurchase Order` po
+	WHERE
+		po.supplier IN %(suppliers)s
+		AND po_item.schedule_date BETWEEN %(from_date)s AND %(to_date)s
+		AND po_item.docstatus = 1
+		AND po_item.parent = po.name
+	GROUP BY po.supplier, po_item.schedule_date"""
+
+RECEIVED = """
+	SELECT
+		pr.supplier, pr.posting_date AS date, {value} AS value
+	FROM
+		`tabPurchase Receipt Item` pr_item,
+		`tabPurchase Receipt` pr
+	WHERE
+		pr.supplier IN %(suppliers)s
+		AND pr.posting_date BETWEEN %(from_date)s AND %(to_date)s
+		AND pr_item.docstatus = 1
+		AND pr_item.parent = pr.name
+	GROUP BY pr.supplier, pr.posting_date"""
+
+ORDERED_QTY = """
+	SELECT
+		po.supplier, po.transaction_date AS date, SUM(po.total_qty) AS value
+	FROM
+		`tabPurchase Order` po
+	WHERE
+		po.supplier IN %(suppliers)s
+		AND po.docstatus = 1
+		AND po.transaction_date BETWEEN %(from_date)s AND %(to_date)s
+	GROUP BY po.supplier, po.transaction_date"""
+
+RFQ_ITEMS = """
+	SELECT
+		rfq_sup.supplier, rfq.transaction_date AS date, {value} AS value
+	FROM
+		`tabRequest for Quotation Item` rfq_item,
+		`tabRequest for Quotation Supplier` rfq_sup,
+		`tabRequest for Quotation` rfq
+	WHERE
+		rfq_sup.supplier IN %(suppliers)s
+		AND rfq.transaction_date BETWEEN %(from_date)s AND %(to_date)s
+		AND rfq_item.docstatus = 1
+		AND rfq_item.parent = rfq.name
+		AND rfq_sup.parent = rfq.name
+	GROUP BY rfq_sup.supplier, rfq.transaction_date"""
+
+SQ_ITEMS = """
+	SELECT
+		rfq_sup.supplier, rfq.transaction_date AS date, {value} AS value
+	FROM
+		`tabRequest for Quotation Item` rfq_item,
+		`tabSupplier Quotation Item` sq_item,
+		`tabSupplier Quotation` sq,
+		`tabRequest for Quotation Supplier` rfq_sup,
+		`tabRequest for Quotation` rfq
+	WHERE
+		rfq_sup.supplier IN %(suppliers)s
+		AND rfq.transaction_date BETWEEN %(from_date)s AND %(to_date)s
+		AND sq_item.request_for_quotation_item = rfq_item.name
+		AND sq_item.docstatus = 1
+		AND sq.supplier = rfq_sup.supplier
+		AND sq_item.parent = sq.name
+		AND rfq_item.docstatus = 1
+		AND rfq_item.parent = rfq.name
+		AND rfq_sup.parent = rfq.name
+	GROUP BY rfq_sup.supplier, rfq.transaction_date"""
+
+GROUPED_VARIABLES = {
+	"get_item_workdays": (ITEM_WORKDAYS,),
+	"get_total_cost_of_shipments": (TOTAL_COST_OF_SHIPMENTS,),
+	"get_cost_of_on_time_shipments": (COST_OF_ON_TIME_SHIPMENTS,),
+	"get_total_days_late": (DELIVERED_LATE_DAYS, MISSED_LATE_DAYS),
+	"get_on_time_shipments": (ON_TIME_SHIPMENTS,),
+	"get_total_shipments": (TOTAL_SHIPMENTS,),
+	"get_total_received": (RECEIVED.format(value="COUNT(pr_item.base_amount)"),),
+	"get_total_received_amount": (RECEIVED.format(value="SUM(pr_item.received_qty * pr_item.base_rate)"),),
+	"get_total_received_items": (RECEIVED.format(value="SUM(pr_item.received_qty)"),),
+	"get_total_rejected_amount": (RECEIVED.format(value="SUM(pr_item.rejected_qty * pr_item.base_rate)"),),
+	"get_total_rejected_items": (RECEIVED.format(value="SUM(pr_item.rejected_qty)"),),
+	"get_total_accepted_amount": (RECEIVED.format(value="SUM(pr_item.qty * pr_item.base_rate)"),),
+	"get_total_accepted_items": (RECEIVED.format(value="SUM(pr_item.qty)"),),
+	"get_ordered_qty": (ORDERED_QTY,),
+	"get_rfq_total_number": (RFQ_ITEMS.format(value="COUNT(rfq.name)"),),
+	"get_rfq_total_items": (RFQ_ITEMS.format(value="COUNT(rfq_item.name)"),),
+	"get_sq_total_number": (SQ_ITEMS.format(value="COUNT(sq.name)"),),
+	"get_sq_total_items": (SQ_ITEMS.format(value="COUNT(sq_item.name)"),),
+	"get_rfq_response_days": (
+		SQ_ITEMS.format(value="SUM(DATEDIFF(sq.transaction_date, rfq.transaction_date))"),
+	),
+}
+
+# Variables computed as the difference of two other variables
+DERIVED_VARIABLES = {
+	"get_cost_of_delayed_shipments": ("get_total_cost_of_shipments", "get_cost_of_on_time_shipments"),
+	"get_late_shipments": ("get_total_shipments", "get_on_time_shipments"),
+}
+
+
+def get_grouped_variable_values(path, periods):
+	"""
+	Returns the values of a built-in variable for the periods (having supplier, start_date and end_date),
+	evaluated for all of them together. Returns None for variables that have to be evaluated per period.
+	"""
+	if path == "get_total_workdays":
+		return [get_total_workdays(period) for period in periods]
+
+	if path in DERIVED_VARIABLES:
+		total, part = (get_grouped_variable_values(d, periods) for d in DERIVED_VARIABLES[path])
+		return [flt(t) - flt(p) for t, p in zip(total, part, strict=True)]
+
+	if path not in GROUPED_VARIABLES:
+		return None
+
+	values = [0] * len(periods)
+	for query in GROUPED_VARIABLES[path]:
+		for idx, value in enumerate(get_period_values(query, periods)):
+			values[idx] += value
+
+	return values
+
+
+def get_period_values(query, periods):
+	"""Runs a query grouped by supplier and date once and sums its rows into each period."""
+	if not periods:
+		return []
+
+	rows = frappe.db.sql(
+		query,
+		{
+			"suppliers": tuple({period.supplier for period in periods}),
+			"from_date": min(getdate(period.start_date) for period in periods),
+			"to_date": max(getdate(period.end_date) for period in periods),
+		},
+		as_dict=True,
+	)
+
+	supplier_rows = defaultdict(list)
+	for row in sorted(rows, key=lambda d: d.date):
+		supplier_rows[row.supplier].append(row)
+
+	supplier_dates = {supplier: [row.date for row in rows] for supplier, rows in supplier_rows.items()}
+
+	values = []
+	for period in periods:
+		start_date, end_date = getdate(period.start_date), getdate(period.end_date)
+		dates = supplier_dates.get(period.supplier, [])
+		values.append(
+			sum(
+				flt(row.value) + flt(row.get("pending_qty")) * date_diff(end_date, row.date)
+				for row in supplier_rows[period.supplier][
+					bisect_left(dates, start_date) : bisect_right(dates, end_date)
+				]
+			)
+		)
+
+	return values
@@ -7,10 +7,13 @@ import json
 
 import frappe
 from frappe import _
-from frappe.utils import cstr, flt
+from frappe.utils import cint, create_batch, cstr, flt
 
 from erpnext.utilities.product import get_item_codes_by_attributes
 
+VARIANT_CREATION_BATCH_SIZE = 50
+VARIANT_CREATION_PROGRESS_EXPIRY = 6 * 60 * 60
+
 
 class ItemVariantExistsError(frappe.ValidationError):
 	pass
@@ -81,14 +84,18 @@ def make_variant_based_on_manufacturer(template, manufacturer, manufacturer_part
 	return variant
 
 
-def validate_item_variant_attributes(item, args=None):
+def validate_item_variant_attributes(item, args=None, attribute_values=None):
+	"""
+	Validates attribute values of the variant `item`. `attribute_values` takes values and numeric
+	ranges preloaded by `load_attribute_values`, so variants created together don't query them again.
+	"""
 	if isinstance(item, str):
 		item = frappe.get_doc("Item", item)
 
 	if not args:
 		args = {d.attribute.lower(): d.attribute_value for d in item.attributes}
 
-	attribute_values, numeric_values = get_attribute_values(item)
+	attribute_values, numeric_values = attribute_values or get_attribute_values(item)
 
 	for attribute, value in args.items():
 		if not value:
@@ -157,24 +164,32 @@ def validate_item_attribute_value(attributes_list, attribute, attribute_value, i
 
 def get_attribute_values(item):
 	if not frappe.flags.attribute_values:
-		attribute_values = {}
-		numeric_values = {}
-		for t in frappe.get_all("Item Attribute Value", fields=["parent", "attribute_value"]):
-			attribute_values.setdefault(t.parent.lower(), []).append(t.attribute_value)
-
-		for t in frappe.get_all(
-			"Item Variant Attribute",
-			fields=["attribute", "from_range", "to_range", "increment"],
-			filters={"numeric_values": 1, "parent": item.variant_of},
-		):
-			numeric_values[t.attribute.lower()] = t
-
-		frappe.flags.attribute_values = attribute_values
-		frappe.flags.numeric_values = numeric_values
+		frappe.flags.attribute_values, frappe.flags.numeric_values = load_attribute_values(item.variant_of)
 
 	return frappe.flags.attribute_values, frappe.flags.numeric_values
 
 
+def load_attribute_values(template, attributes=None):
+	"""
+	Returns a map of attribute to its values, for `attributes` if set, and a map of attribute to the
+	numeric range of numeric attributes of the template.
+	"""
+	attribute_values = {}
+	numeric_values = {}
+	filters = {"parent": ("in", attributes)} if attributes else {}
+	for t in frappe.get_all("Item Attribute Value", fields=["parent", "attribute_value"], filters=filters):
+		attribute_values.setdefault(t.parent.lower(), []).append(t.attribute_value)
+
+	for t in frappe.get_all(
+		"Item Variant Attribute",
+		fields=["attribute", "from_range", "to_range", "increment"],
+		filters={"numeric_values": 1, "parent": template},
+	):
+		numeric_values[t.attribute.lower()] = t
+
+	return attribute_values, numeric_values
+
+
 def find_variant(template, args, variant_item_code=None):
 	possible_variants = [i for i in get_item_codes_by_attributes(args, template) if i != variant_item_code]
 
@@ -204,6 +219,16 @@ def create_variant(item, args, use_template_image=False):
 		args = json.loads(args)
 
 	template = frappe.get_doc("Item", item)
+	variant = make_variant(template, args)
+
+	if use_template_image and template.image:
+		variant.image = template.image
+
+	return variant
+
+
+def make_variant(template, args, allow_fields=None, attribute_abbreviations=None):
+	"""Returns a new variant of `template` for attribute values in `args`, without saving it"""
 	variant = frappe.new_doc("Item")
 	variant.variant_based_on = "Item Attribute"
 	variant_attributes = []
@@ -212,12 +237,8 @@ def create_variant(item, args, use_template_image=False):
 		variant_attributes.append({"attribute": d.attribute, "attribute_value": args.get(d.attribute)})
 
 	variant.set("attributes", variant_attributes)
-	copy_attributes_to_variant(template, variant)
-
-	if use_template_image and template.image:
-		variant.image = template.image
-
-	make_variant_item_code(template.item_code, template.item_name, variant)
+	copy_attributes_to_variant(template, variant, allow_fields)
+	make_variant_item_code(template.item_code, template.item_name, variant, attribute_abbreviations)
 
 	return variant
 
@@ -237,35 +258,105 @@ def enqueue_multiple_variant_creation(item, args, use_template_image=False):
 	if total_variants < 10:
 		return create_multiple_variants(item, args, use_template_image)
 	else:
-		frappe.enqueue(
-			"erpnext.controllers.item_variant.create_multiple_variants",
-			item=item,
-			args=args,
-			use_template_image=use_template_image,
-			now=frappe.flags.in_test,
-		)
+		# spread the combinations across workers, progress is counted across batches in the cache
+		progress_key = get_variant_creation_progress_key(item)
+		frappe.cache().set(progress_key, 0, ex=VARIANT_CREATION_PROGRESS_EXPIRY)
+
+		for combinations in create_batch(
+			generate_keyed_value_combinations(variants), VARIANT_CREATION_BATCH_SIZE
+		):
+			frappe.enqueue(
+				"erpnext.controllers.item_variant.create_variants",
+				item=item,
+				combinations=combinations,
+				use_template_image=use_template_image,
+				total_variants=total_variants,
+				now=frappe.flags.in_test,
+			)
 		return "queued"
 
 
 def create_multiple_variants(item, args, use_template_image=False):
-	count = 0
 	if isinstance(args, str):
 		args = json.loads(args)
 
-	template_item = frappe.get_doc("Item", item)
-	args_set = generate_keyed_value_combinations(args)
+	return create_variants(item, generate_keyed_value_combinations(args), use_template_image)
+
+
+def create_variants(item, combinations, use_template_image=False, total_variants=None):
+	"""
+	Creates variants of the template `item` for attribute value combinations that don't have one yet.
+	Existing variants, variant fields, attribute abbreviations and values are loaded once for all
+	combinations. If `total_variants` is set, progress is published against the counter shared by all
+	batches of the template.
+	"""
+	template = frappe.get_doc("Item", item)
+	existing_combinations = get_existing_variant_combinations(item)
+	allow_fields = get_variant_fields()
+	attributes = [d.attribute for d in template.attributes]
+	attribute_abbreviations = get_attribute_abbreviations(attributes)
+	attribute_values = load_attribute_values(item, attributes)
 
-	for attribute_values in args_set:
-		if not get_variant(item, args=attribute_values):
-			variant = create_variant(item, attribute_values)
-			if use_template_image and template_item.image:
-				variant.image = template_item.image
+	count = 0
+	for args in combinations:
+		combination = get_attribute_combination(args)
+		if combination not in existing_combinations:
+			variant = make_variant(template, args, allow_fields, attribute_abbreviations)
+			if use_template_image and template.image:
+				variant.image = template.image
+
+			# combinations with a variant are skipped above, no need to look them up again
+			variant.flags.variant_exists_checked = True
+			variant.flags.attribute_values = attribute_values
 			variant.save()
+
+			existing_combinations.add(combination)
 			count += 1
 
+		if total_variants:
+			publish_variant_creation_progress(item, total_variants)
+
 	return count
 
 
+def get_variant_creation_progress_key(item):
+	return frappe.cache().make_key(f"item_variant_creation_progress:{item}")
+
+
+def publish_variant_creation_progress(item, total_variants):
+	"""Counts a combination processed by any batch of the template and publishes the overall progress"""
+	processed = frappe.cache().incr(get_variant_creation_progress_key(item))
+	frappe.publish_progress(
+		processed / total_variants * 100,
+		title=_("Creating Variants..."),
+		doctype="Item",
+		docname=item,
+		description=_("{0} of {1}").format(processed, total_variants),
+	)
+
+
+def get_attribute_combination(attribute_values):
+	return frozenset((attribute, cstr(value)) for attribute, value in attribute_values.items())
+
+
+def get_existing_variant_combinations(template):
+	"""Returns attribute value combinations of existing variants of the template"""
+	item = frappe.qb.DocType("Item")
+	variant_attribute = frappe.qb.DocType("Item Variant Attribute")
+
+	combinations = {}
+	for variant, attribute, attribute_value in (
+		frappe.qb.from_(variant_attribute)
+		.inner_join(item)
+		.on(item.name == variant_attribute.parent)
+		.select(variant_attribute.parent, variant_attribute.attribute, variant_attribute.attribute_value)
+		.where((variant_attribute.parenttype == "Item") & (item.variant_of == template))
+	).run():
+		combinations.setdefault(variant, set()).add((attribute, cstr(attribute_value)))
+
+	return {frozenset(combination) for combination in combinations.values()}
+
+
 def generate_keyed_value_combinations(args):
 	"""
 	From this:
@@ -318,7 +409,7 @@ def generate_keyed_value_combinations(args):
 	return results
 
 
-def copy_attributes_to_variant(item, variant):
+def copy_attributes_to_variant(item, variant, allow_fields=None):
 	# copy non no-copy fields
 
 	exclude_fields = [
@@ -335,9 +426,9 @@ def copy_attributes_to_variant(item, variant):
 		# don't copy manufacturer values if based on part no
 		exclude_fields += ["manufacturer", "manufacturer_part_no"]
 
-	allow_fields = [d.field_name for d in frappe.get_all("Variant Field", fields=["field_name"])]
-	if "variant_based_on" not in allow_fields:
-		allow_fields.append("variant_based_on")
+	if allow_fields is None:
+		allow_fields = get_variant_fields()
+
 	for field in item.meta.fields:
 		# "Table" is part of `no_value_field` but we shouldn't ignore tables
 		if (field.reqd or field.fieldname in allow_fields) and field.fieldname not in exclude_fields:
@@ -370,32 +461,52 @@ def copy_attributes_to_variant(item, variant):
 					variant.description = attributes_description
 
 
-def make_variant_item_code(template_item_code, template_item_name, variant):
+def get_variant_fields():
+	"""Returns fields copied from templates to their variants as per Item Variant Settings"""
+	allow_fields = [d.field_name for d in frappe.get_all("Variant Field", fields=["field_name"])]
+	if "variant_based_on" not in allow_fields:
+		allow_fields.append("variant_based_on")
+
+	return allow_fields
+
+
+def get_attribute_abbreviations(attributes):
+	"""Returns numeric flag and abbreviations of values for the item attributes"""
+	attribute_abbreviations = {}
+	if not attributes:
+		return attribute_abbreviations
+
+	for d in frappe.get_all(
+		"Item Attribute", filters={"name": ("in", attributes)}, fields=["name", "numeric_values"]
+	):
+		attribute_abbreviations[d.name] = frappe._dict(numeric_values=cint(d.numeric_values), abbr={})
+
+	for d in frappe.get_all(
+		"Item Attribute Value",
+		filters={"parent": ("in", list(attribute_abbreviations))},
+		fields=["parent", "attribute_value", "abbr"],
+	):
+		attribute_abbreviations[d.parent].abbr[d.attribute_value] = d.abbr
+
+	return attribute_abbreviations
+
+
+def make_variant_item_code(template_item_code, template_item_name, variant, attribute_abbreviations=None):
 	"""Uses template's item code and abbreviations to make variant's item code"""
 	if variant.item_code:
 		return
 
+	if attribute_abbreviations is None:
+		attribute_abbreviations = get_attribute_abbreviations([attr.attribute for attr in variant.attributes])
+
 	abbreviations = []
 	for attr in variant.attributes:
-		item_attribute = frappe.db.sql(
-			"""select i.numeric_values, v.abbr
-			from `tabItem Attribute` i left join `tabItem Attribute Value` v
-				on (i.name=v.parent)
-			where i.name=%(attribute)s and (v.attribute_value=%(attribute_value)s or i.numeric_values = 1)""",
-			{"attribute": attr.attribute, "attribute_value": attr.attribute_value},
-			as_dict=True,
-		)
-
-		if not item_attribute:
-			continue
-			# frappe.throw(_('Invalid attribute {0} {1}').format(frappe.bold(attr.attribute),
-			# 	frappe.bold(attr.attribute_value)), title=_('Invalid Attribute'),
-			# 	exc=InvalidItemAttributeValueError)
+		item_attribute = attribute_abbreviations.get(attr.attribute)
 
-		abbr_or_value = (
-			cstr(attr.attribute_value) if item_attribute[0].numeric_values else item_attribute[0].abbr
-		)
-		abbreviations.append(abbr_or_value)
+		if item_attribute and item_attribute.numeric_values:
+			abbreviations.append(cstr(attr.attribute_value))
+		elif item_attribute and attr.attribute_value in item_attribute.abbr:
+			abbreviations.append(item_attribute.abbr[attr.attribute_value])
 
 	if abbreviations:
 		variant.item_code = "{}-{}".format(template_item_code, "-".join(abbreviations))
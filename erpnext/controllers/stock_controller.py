@@ -6,9 +6,12 @@ from collections import defaultdict
 
 import frappe
 from frappe import _, bold
-from frappe.utils import cint, cstr, flt, get_link_to_form, getdate
+from frappe.utils import cint, create_batch, cstr, flt, get_datetime, get_link_to_form, getdate
 
 import erpnext
+from erpnext.accounts.doctype.accounting_dimension.accounting_dimension import (
+	get_accounting_dimensions,
+)
 from erpnext.accounts.general_ledger import (
 	make_gl_entries,
 	make_reverse_gl_entries,
@@ -29,6 +32,7 @@ from erpnext.stock.doctype.serial_and_batch_bundle.serial_and_batch_bundle impor
 	get_type_of_transaction,
 )
 from erpnext.stock.stock_ledger import get_items_to_be_repost
+from erpnext.stock.utils import get_combine_datetime
 
 
 class QualityInspectionRequiredError(frappe.ValidationError):
@@ -519,63 +523,20 @@ class StockController(AccountsController):
 		voucher_details = self.get_voucher_details(default_expense_account, default_cost_center, sle_map)
 
 		gl_list = []
+		rounding_gl_list = []
 		warehouse_with_no_account = []
 		precision = self.get_debit_field_precision()
+		stock_value_differences = self.get_stock_value_differences(
+			voucher_details, sle_map, warehouse_account, precision
+		)
+
 		for item_row in voucher_details:
 			sle_list = sle_map.get(item_row.name)
 			sle_rounding_diff = 0.0
 			if sle_list:
 				for sle in sle_list:
 					if warehouse_account.get(sle.warehouse):
-						# from warehouse account
-
 						sle_rounding_diff += flt(sle.stock_value_difference)
-
-						self.check_expense_account(item_row)
-
-						# expense account/ target_warehouse / source_warehouse
-						if item_row.get("target_warehouse"):
-							warehouse = item_row.get("target_warehouse")
-							expense_account = warehouse_account[warehouse]["account"]
-						else:
-							expense_account = item_row.expense_account
-
-						gl_list.append(
-							self.get_gl_dict(
-								{
-									"account": warehouse_account[sle.warehouse]["account"],
-									"against": expense_account,
-									"cost_center": item_row.cost_center,
-									"project": sle.get("project") or item_row.project or self.get("project"),
-									"remarks": self.get("remarks") or _("Accounting Entry for Stock"),
-									"debit": flt(sle.stock_value_difference, precision),
-									"is_opening": item_row.get("is_opening")
-									or self.get("is_opening")
-									or "No",
-								},
-								warehouse_account[sle.warehouse]["account_currency"],
-								item=item_row,
-							)
-						)
-
-						gl_list.append(
-							self.get_gl_dict(
-								{
-									"account": expense_account,
-									"against": warehouse_account[sle.warehouse]["account"],
-									"cost_center": item_row.cost_center,
-									"remarks": self.get("remarks") or _("Accounting Entry for Stock"),
-									"debit": -1 * flt(sle.stock_value_difference, precision),
-									"project": sle.get("project")
-									or item_row.get("project")
-									or self.get("project"),
-									"is_opening": item_row.get("is_opening")
-									or self.get("is_opening")
-									or "No",
-								},
-								item=item_row,
-							)
-						)
 					elif sle.warehouse not in warehouse_with_no_account:
 						warehouse_with_no_account.append(sle.warehouse)
 
@@ -594,7 +555,7 @@ class StockController(AccountsController):
 						).format(frappe.bold(self.company))
 					)
 
-				gl_list.append(
+				rounding_gl_list.append(
 					self.get_gl_dict(
 						{
 							"account": expense_account,
@@ -610,7 +571,7 @@ class StockController(AccountsController):
 					)
 				)
 
-				gl_list.append(
+				rounding_gl_list.append(
 					self.get_gl_dict(
 						{
 							"account": warehouse_asset_account,
@@ -625,6 +586,40 @@ class StockController(AccountsController):
 					)
 				)
 
+		for row in stock_value_differences.values():
+			gl_list.append(
+				self.get_gl_dict(
+					{
+						"account": row.stock_account,
+						"against": row.expense_account,
+						"cost_center": row.cost_center,
+						"project": row.project,
+						"remarks": self.get("remarks") or _("Accounting Entry for Stock"),
+						"debit": row.stock_value_difference,
+						"is_opening": row.is_opening,
+					},
+					row.account_currency,
+					item=row.item_row,
+				)
+			)
+
+			gl_list.append(
+				self.get_gl_dict(
+					{
+						"account": row.expense_account,
+						"against": row.stock_account,
+						"cost_center": row.cost_center,
+						"remarks": self.get("remarks") or _("Accounting Entry for Stock"),
+						"debit": -1 * row.stock_value_difference,
+						"project": row.project,
+						"is_opening": row.is_opening,
+					},
+					item=row.item_row,
+				)
+			)
+
+		gl_list.extend(rounding_gl_list)
+
 		if warehouse_with_no_account:
 			for wh in warehouse_with_no_account:
 				if frappe.get_cached_value("Warehouse", wh, "company"):
@@ -636,6 +631,58 @@ class StockController(AccountsController):
 
 		return process_gl_map(gl_list, precision=precision)
 
+	def get_stock_value_differences(self, voucher_details, sle_map, warehouse_account, precision):
+		"""
+		Returns stock value differences of the voucher summed by stock account, expense account, cost center,
+		project and accounting dimensions, so that stock GL Entries are made once per combination
+		instead of once per stock ledger entry.
+		"""
+		accounting_dimensions = get_accounting_dimensions()
+		stock_value_differences = {}
+
+		for item_row in voucher_details:
+			sle_list = [
+				sle for sle in sle_map.get(item_row.name) or [] if warehouse_account.get(sle.warehouse)
+			]
+			if not sle_list:
+				continue
+
+			self.check_expense_account(item_row)
+
+			# expense account/ target_warehouse / source_warehouse
+			if item_row.get("target_warehouse"):
+				expense_account = warehouse_account[item_row.get("target_warehouse")]["account"]
+			else:
+				expense_account = item_row.expense_account
+
+			is_opening = item_row.get("is_opening") or self.get("is_opening") or "No"
+			dimensions = tuple(item_row.get(dimension) for dimension in accounting_dimensions)
+
+			for sle in sle_list:
+				stock_account = warehouse_account[sle.warehouse]["account"]
+				project = sle.get("project") or item_row.get("project") or self.get("project")
+				key = (stock_account, expense_account, item_row.cost_center, project, is_opening, *dimensions)
+
+				if key not in stock_value_differences:
+					stock_value_differences[key] = frappe._dict(
+						{
+							"stock_account": stock_account,
+							"expense_account": expense_account,
+							"cost_center": item_row.cost_center,
+							"project": project,
+							"is_opening": is_opening,
+							"stock_value_difference": 0.0,
+							"account_currency": warehouse_account[sle.warehouse]["account_currency"],
+							"item_row": item_row,
+						}
+					)
+
+				stock_value_differences[key].stock_value_difference += flt(
+					sle.stock_value_difference, precision
+				)
+
+		return stock_value_differences
+
 	def get_debit_field_precision(self):
 		if not frappe.flags.debit_field_precision:
 			frappe.flags.debit_field_precision = frappe.get_precision("GL Entry", "debit_in_account_currency")
@@ -697,6 +744,12 @@ class StockController(AccountsController):
 	def get_stock_ledger_details(self):
 		stock_ledger = {}
 
+		if self.flags.preview_sl_entries is not None:
+			for sle in self.flags.preview_sl_entries:
+				stock_ledger.setdefault(sle.voucher_detail_no, []).append(sle)
+
+			return stock_ledger
+
 		table = frappe.qb.DocType("Stock Ledger Entry")
 
 		stock_ledger_entries = (
@@ -938,7 +991,14 @@ class StockController(AccountsController):
 
 	def make_sl_entries(self, sl_entries, allow_negative_stock=False, via_landed_cost_voucher=False):
 		from erpnext.stock.serial_batch_bundle import update_batch_qty
-		from erpnext.stock.stock_ledger import make_sl_entries
+		from erpnext.stock.stock_ledger import StockLedgerPreview, make_sl_entries
+
+		if self.flags.ledger_preview:
+			# entries are computed in memory for ledger previews
+			self.flags.preview_sl_entries = (self.flags.preview_sl_entries or []) + StockLedgerPreview(
+				sl_entries, allow_negative_stock, voucher=self
+			).sl_entries
+			return
 
 		make_sl_entries(sl_entries, allow_negative_stock, via_landed_cost_voucher)
 		update_batch_qty(self.doctype, self.name, via_landed_cost_voucher=via_landed_cost_voucher)
@@ -1262,7 +1322,7 @@ class StockController(AccountsController):
 	def validate_putaway_capacity(self):
 		# if over receipt is attempted while 'apply putaway rule' is disabled
 		# and if rule was applied on the transaction, validate it.
-		from erpnext.stock.doctype.putaway_rule.putaway_rule import get_available_putaway_capacity
+		from erpnext.stock.doctype.putaway_rule.putaway_rule import get_balance_qty
 
 		valid_doctype = self.doctype in (
 			"Purchase Receipt",
@@ -1278,15 +1338,27 @@ class StockController(AccountsController):
 			valid_doctype = False
 
 		if valid_doctype:
-			rule_map = defaultdict(dict)
-			for item in self.get("items"):
-				warehouse_field = "t_warehouse" if self.doctype == "Stock Entry" else "warehouse"
-				rule = frappe.db.get_value(
+			warehouse_field = "t_warehouse" if self.doctype == "Stock Entry" else "warehouse"
+			item_codes = list({item.get("item_code") for item in self.get("items") if item.get("item_code")})
+			if not item_codes:
+				return
+
+			rules = {
+				(rule.item_code, rule.warehouse): rule
+				for rule in frappe.get_all(
 					"Putaway Rule",
-					{"item_code": item.get("item_code"), "warehouse": item.get(warehouse_field)},
-					["name", "disable"],
-					as_dict=True,
+					filters={"item_code": ("in", item_codes)},
+					fields=["name", "item_code", "warehouse", "stock_capacity"],
 				)
+			}
+			if not rules:
+				return
+
+			balance_qty = get_balance_qty(item_codes, list({rule.warehouse for rule in rules.values()}))
+
+			rule_map = defaultdict(dict)
+			for item in self.get("items"):
+				rule = rules.get((item.get("item_code"), item.get(warehouse_field)))
 				if rule:
 					if rule.get("disabled"):
 						continue  # dont validate for disabled rule
@@ -1300,10 +1372,13 @@ class StockController(AccountsController):
 
 					rule_name = rule.get("name")
 					if not rule_map[rule_name]:
+						free_space = flt(rule.stock_capacity) - balance_qty.get(
+							(rule.item_code, rule.warehouse), 0
+						)
 						rule_map[rule_name]["warehouse"] = item.get(warehouse_field)
 						rule_map[rule_name]["item"] = item.get("item_code")
 						rule_map[rule_name]["qty_put"] = 0
-						rule_map[rule_name]["capacity"] = get_available_putaway_capacity(rule_name)
+						rule_map[rule_name]["capacity"] = free_space if free_space > 0 else 0
 					rule_map[rule_name]["qty_put"] += flt(stock_qty)
 
 			for rule, values in rule_map.items():
@@ -1439,13 +1514,13 @@ def get_accounting_ledger_preview(doc, filters):
 	]
 
 	doc.docstatus = 1
+	doc.flags.ledger_preview = True
 
 	if doc.get("update_stock") or doc.doctype in ("Purchase Receipt", "Delivery Note"):
 		doc.update_stock_ledger()
 
-	doc.make_gl_entries()
+	gl_entries = get_gl_entries_for_preview(doc)
 	columns = get_gl_columns(filters)
-	gl_entries = get_gl_entries_for_preview(doc.doctype, doc.name, fields)
 
 	gl_columns = get_columns(columns, fields)
 	gl_data = get_data(fields, gl_entries)
@@ -1458,17 +1533,6 @@ def get_stock_ledger_preview(doc, filters):
 
 	sl_columns, sl_data = [], []
 	fields = [
-		"item_code",
-		"stock_uom",
-		"actual_qty",
-		"qty_after_transaction",
-		"warehouse",
-		"incoming_rate",
-		"valuation_rate",
-		"stock_value",
-		"stock_value_difference",
-	]
-	columns_fields = [
 		"item_code",
 		"stock_uom",
 		"in_qty",
@@ -1483,20 +1547,20 @@ def get_stock_ledger_preview(doc, filters):
 
 	if doc.get("update_stock") or doc.doctype in ("Purchase Receipt", "Delivery Note"):
 		doc.docstatus = 1
+		doc.flags.ledger_preview = True
 		doc.update_stock_ledger()
 		columns = get_sl_columns(filters)
-		sl_entries = get_sl_entries_for_preview(doc.doctype, doc.name, fields)
+		sl_entries = get_sl_entries_for_preview(doc)
 
-		sl_columns = get_columns(columns, columns_fields)
-		sl_data = get_data(columns_fields, sl_entries)
+		sl_columns = get_columns(columns, fields)
+		sl_data = get_data(fields, sl_entries)
 
 	return sl_columns, sl_data
 
 
-def get_sl_entries_for_preview(doctype, docname, fields):
-	sl_entries = frappe.get_all(
-		"Stock Ledger Entry", filters={"voucher_type": doctype, "voucher_no": docname}, fields=fields
-	)
+def get_sl_entries_for_preview(doc):
+	"""Returns stock ledger entries computed in memory by `update_stock_ledger` in preview mode."""
+	sl_entries = doc.flags.preview_sl_entries or []
 
 	for entry in sl_entries:
 		if entry.actual_qty > 0:
@@ -1511,8 +1575,14 @@ def get_sl_entries_for_preview(doctype, docname, fields):
 	return sl_entries
 
 
-def get_gl_entries_for_preview(doctype, docname, fields):
-	return frappe.get_all("GL Entry", filters={"voucher_type": doctype, "voucher_no": docname}, fields=fields)
+def get_gl_entries_for_preview(doc):
+	"""Returns GL entries of the document as they would be posted, without saving them."""
+	frappe.flags.preview_gl_entries = []
+	try:
+		doc.make_gl_entries()
+		return frappe.flags.preview_gl_entries
+	finally:
+		frappe.flags.preview_gl_entries = None
 
 
 def get_columns(raw_columns, fields):
@@ -1650,6 +1720,11 @@ def future_sle_exists(args, sl_entries=None, allow_force_reposting=True):
 		if not sl_entries:
 			return
 
+	posting_datetime = get_combine_datetime(args.posting_date, args.posting_time)
+	sl_entries = get_sle_entries_with_later_postings(sl_entries, posting_datetime)
+	if not sl_entries:
+		return 0
+
 	or_conditions = get_conditions_to_validate_future_sle(sl_entries)
 
 	data = frappe.db.sql(
@@ -1658,14 +1733,13 @@ def future_sle_exists(args, sl_entries=None, allow_force_reposting=True):
 		from `tabStock Ledger Entry` force index (item_warehouse)
 		where
 			({})
-			and timestamp(posting_date, posting_time)
-				>= timestamp(%(posting_date)s, %(posting_time)s)
+			and posting_datetime >= %(posting_datetime)s
 			and voucher_no != %(voucher_no)s
 			and is_cancelled = 0
 		GROUP BY
 			item_code, warehouse
 		""".format(" or ".join(or_conditions)),
-		args,
+		{**args, "posting_datetime": posting_datetime},
 		as_dict=1,
 	)
 
@@ -1703,6 +1777,33 @@ def get_cached_data(args, key):
 		return frappe.local.future_sle[key]
 
 
+def get_sle_entries_with_later_postings(sl_entries, posting_datetime):
+	"""
+	Returns entries whose item and warehouse have stock ledger entries posted at or after `posting_datetime`,
+	going by the last posting datetime kept in Bin. Bins without it are checked against the ledger.
+	"""
+	bin = frappe.qb.DocType("Bin")
+	item_codes = list({entry.item_code for entry in sl_entries})
+	warehouses = list({entry.warehouse for entry in sl_entries})
+
+	last_posting_datetimes = {}
+	for item_codes_batch in create_batch(item_codes, 1000):
+		for item_code, warehouse, last_posting_datetime in (
+			frappe.qb.from_(bin)
+			.select(bin.item_code, bin.warehouse, bin.last_posting_datetime)
+			.where(bin.item_code.isin(item_codes_batch) & bin.warehouse.isin(warehouses))
+		).run():
+			last_posting_datetimes[(item_code, warehouse)] = last_posting_datetime
+
+	posting_datetime = get_datetime(posting_datetime)
+	return [
+		entry
+		for entry in sl_entries
+		if (last_posting_datetime := last_posting_datetimes.get((entry.item_code, entry.warehouse))) is None
+		or get_datetime(last_posting_datetime) >= posting_datetime
+	]
+
+
 def get_sle_entries_against_voucher(args):
 	return frappe.get_all(
 		"Stock Ledger Entry",
@@ -1756,22 +1857,37 @@ def create_item_wise_repost_entries(
 ):
 	"""Using a voucher create repost item valuation records for all item-warehouse pairs."""
 
-	stock_ledger_entries = get_items_to_be_repost(voucher_type, voucher_no)
+	return create_item_wise_repost_entries_for_vouchers(
+		[(voucher_type, voucher_no)], allow_zero_rate, via_landed_cost_voucher
+	)
 
-	distinct_item_warehouses = set()
-	repost_entries = []
 
-	for sle in stock_ledger_entries:
-		item_wh = (sle.item_code, sle.warehouse)
-		if item_wh in distinct_item_warehouses:
-			continue
-		distinct_item_warehouses.add(item_wh)
+def create_item_wise_repost_entries_for_vouchers(
+	vouchers, allow_zero_rate=False, via_landed_cost_voucher=False
+):
+	"""
+	Using vouchers create one repost item valuation record per item-warehouse pair, reposting
+	from the earliest posting of the pair in the vouchers.
+	"""
 
+	item_warehouse_postings = {}
+	for voucher_type, voucher_no in vouchers:
+		for sle in get_items_to_be_repost(voucher_type, voucher_no):
+			item_wh = (sle.item_code, sle.warehouse)
+			posting_datetime = get_combine_datetime(sle.posting_date, sle.posting_time)
+			if (
+				item_wh not in item_warehouse_postings
+				or posting_datetime < item_warehouse_postings[item_wh][0]
+			):
+				item_warehouse_postings[item_wh] = (posting_datetime, sle)
+
+	repost_entries = []
+	for (item_code, warehouse), (_posting_datetime, sle) in item_warehouse_postings.items():
 		repost_entry = frappe.new_doc("Repost Item Valuation")
 		repost_entry.based_on = "Item and Warehouse"
 
-		repost_entry.item_code = sle.item_code
-		repost_entry.warehouse = sle.warehouse
+		repost_entry.item_code = item_code
+		repost_entry.warehouse = warehouse
 		repost_entry.posting_date = sle.posting_date
 		repost_entry.posting_time = sle.posting_time
 		repost_entry.allow_zero_rate = allow_zero_rate
@@ -3,7 +3,13 @@ import unittest
 
 import frappe
 
-from erpnext.controllers.item_variant import copy_attributes_to_variant, make_variant_item_code
+from erpnext.controllers.item_variant import (
+	copy_attributes_to_variant,
+	create_multiple_variants,
+	create_variants,
+	get_variant_creation_progress_key,
+	make_variant_item_code,
+)
 from erpnext.stock.doctype.item.test_item import set_item_variant_settings
 from erpnext.stock.doctype.quality_inspection.test_quality_inspection import (
 	create_quality_inspection_parameter,
@@ -17,6 +23,32 @@ class TestItemVariant(unittest.TestCase):
 		variant = make_item_variant()
 		self.assertEqual(variant.get("quality_inspection_template"), "_Test QC Template")
 
+	def test_create_multiple_variants(self):
+		sizes = ["Small", "Medium"]
+		for abbr in ("S", "M"):
+			frappe.delete_doc_if_exists("Item", f"_Test Variant Item-{abbr}", force=1)
+
+		self.assertEqual(create_multiple_variants("_Test Variant Item", {"Test Size": sizes}), 2)
+		for abbr in ("S", "M"):
+			self.assertEqual(
+				frappe.db.get_value("Item", f"_Test Variant Item-{abbr}", "variant_of"), "_Test Variant Item"
+			)
+
+		# existing variants are skipped
+		self.assertEqual(create_multiple_variants("_Test Variant Item", {"Test Size": sizes}), 0)
+
+	def test_variant_creation_progress_is_shared_by_batches(self):
+		frappe.delete_doc_if_exists("Item", "_Test Variant Item-L", force=1)
+		progress_key = get_variant_creation_progress_key("_Test Variant Item")
+		frappe.cache().set(progress_key, 0)
+
+		batches = [[{"Test Size": "Small"}, {"Test Size": "Medium"}], [{"Test Size": "Large"}]]
+		created = [create_variants("_Test Variant Item", batch, total_variants=3) for batch in batches]
+
+		self.assertEqual(created[1], 1)
+		# combinations skipped for existing variants are counted too
+		self.assertEqual(int(frappe.cache().get(progress_key)), 3)
+
 
 def create_variant_with_tables(item, args):
 	if isinstance(args, str):
@@ -334,6 +334,14 @@ doc_events = {
 	tuple(period_closing_doctypes): {
 		"validate": "erpnext.accounts.doctype.accounting_period.accounting_period.validate_accounting_period_on_doc_save",
 	},
+	("Purchase Invoice", "Sales Order", "Purchase Order", "Quotation"): {
+		"on_submit": "erpnext.setup.doctype.company_daily_summary.company_daily_summary.update_daily_summary_for_transaction",
+		"on_cancel": "erpnext.setup.doctype.company_daily_summary.company_daily_summary.update_daily_summary_for_transaction",
+	},
+	("Purchase Order", "Purchase Receipt", "Request for Quotation", "Supplier Quotation"): {
+		"on_submit": "erpnext.buying.doctype.supplier_scorecard.supplier_scorecard.update_scorecard_periods_on_change",
+		"on_cancel": "erpnext.buying.doctype.supplier_scorecard.supplier_scorecard.update_scorecard_periods_on_change",
+	},
 	"Stock Entry": {
 		"on_submit": "erpnext.stock.doctype.material_request.material_request.update_completed_and_requested_qty",
 		"on_cancel": "erpnext.stock.doctype.material_request.material_request.update_completed_and_requested_qty",
@@ -377,10 +385,20 @@ doc_events = {
 		"on_submit": [
 			"erpnext.regional.create_transaction_log",
 			"erpnext.accounts.doctype.dunning.dunning.resolve_dunning",
+			"erpnext.accounts.doctype.bank_reconciliation_tool.bank_reconciliation_tool.update_candidate_index",
 		],
-		"on_cancel": ["erpnext.accounts.doctype.dunning.dunning.resolve_dunning"],
+		"on_cancel": [
+			"erpnext.accounts.doctype.dunning.dunning.resolve_dunning",
+			"erpnext.accounts.doctype.bank_reconciliation_tool.bank_reconciliation_tool.update_candidate_index",
+		],
+		"on_update_after_submit": "erpnext.accounts.doctype.bank_reconciliation_tool.bank_reconciliation_tool.update_candidate_index",
 		"on_trash": "erpnext.regional.check_deletion_permission",
 	},
+	"Journal Entry": {
+		"on_submit": "erpnext.accounts.doctype.bank_reconciliation_tool.bank_reconciliation_tool.update_candidate_index",
+		"on_update_after_submit": "erpnext.accounts.doctype.bank_reconciliation_tool.bank_reconciliation_tool.update_candidate_index",
+		"on_cancel": "erpnext.accounts.doctype.bank_reconciliation_tool.bank_reconciliation_tool.update_candidate_index",
+	},
 	"Address": {
 		"validate": [
 			"erpnext.regional.italy.utils.set_state_code",
@@ -437,6 +455,7 @@ scheduler_events = {
 	"hourly_long": [
 		"erpnext.stock.doctype.repost_item_valuation.repost_item_valuation.repost_entries",
 		"erpnext.utilities.bulk_transaction.retry",
+		"erpnext.accounts.doctype.repost_accounting_ledger.repost_accounting_ledger.retry_pending_reposts",
 	],
 	"daily": [
 		"erpnext.support.doctype.issue.issue.auto_close_tickets",
@@ -446,6 +465,7 @@ scheduler_events = {
 		"erpnext.projects.doctype.task.task.set_tasks_as_overdue",
 		"erpnext.stock.doctype.serial_no.serial_no.update_maintenance_status",
 		"erpnext.buying.doctype.supplier_scorecard.supplier_scorecard.refresh_scorecards",
+		"erpnext.setup.doctype.company_daily_summary.company_daily_summary.compact_daily_summary",
 		"erpnext.setup.doctype.company.company.cache_companies_monthly_sales_history",
 		"erpnext.assets.doctype.asset.asset.update_maintenance_status",
 		"erpnext.assets.doctype.asset.asset.make_post_gl_entry",
@@ -461,6 +481,7 @@ scheduler_events = {
 		"erpnext.accounts.doctype.process_statement_of_accounts.process_statement_of_accounts.send_auto_email",
 		"erpnext.accounts.utils.auto_create_exchange_rate_revaluation_daily",
 		"erpnext.accounts.utils.run_ledger_health_checks",
+		"erpnext.accounts.doctype.budget_consumption.budget_consumption.compact_budget_consumption",
 		"erpnext.assets.doctype.asset_maintenance_log.asset_maintenance_log.update_asset_maintenance_log_status",
 	],
 	"weekly": [
@@ -29,6 +29,10 @@ from erpnext.manufacturing.doctype.manufacturing_settings.manufacturing_settings
 )
 from erpnext.manufacturing.doctype.workstation_type.workstation_type import get_workstations
 
+# time logs are loaded into the workstation timeline in windows of a week, starting on Mondays
+TIMELINE_START = datetime.datetime(2000, 1, 3)
+TIMELINE_WINDOW = datetime.timedelta(days=7)
+
 
 class OverlapError(frappe.ValidationError):
 	pass
@@ -314,6 +318,18 @@ class JobCard(Document):
 		if args.get("remaining_time_in_mins") and get_datetime(args.from_time) >= get_datetime(args.to_time):
 			args.to_time = add_to_date(args.from_time, minutes=args.get("remaining_time_in_mins"))
 
+		timeline = self.flags.workstation_timeline
+		if timeline and not args.get("employee"):
+			return timeline.get_time_logs(
+				doctype,
+				args.from_time,
+				args.to_time,
+				self.workstation_type,
+				self.workstation,
+				exclude_row=args.name,
+				exclude_job_card=args.parent,
+			)
+
 		jc = frappe.qb.DocType("Job Card")
 		jctl = frappe.qb.DocType(doctype)
 
@@ -369,6 +385,9 @@ class JobCard(Document):
 		return time_logs
 
 	def get_open_job_cards(self, employee, workstation=None):
+		if not employee:
+			return []
+
 		jc = frappe.qb.DocType("Job Card")
 		jctl = frappe.qb.DocType("Job Card Time Log")
 
@@ -1087,6 +1106,143 @@ class JobCard(Document):
 		frappe.db.set_value("Workstation", self.workstation, "status", status)
 
 
+class WorkstationTimeline:
+	"""
+	Time slots booked on workstations by job cards, so that operations of a work order can be scheduled
+	without querying time logs for every slot that is tried.
+
+	Time logs are loaded per workstation in week long windows when a time range in the window is first
+	checked, and kept in a bucket per window. Checking a time range only looks at the buckets of the
+	windows it overlaps.
+	"""
+
+	def __init__(self):
+		# (doctype, workstation, workstation_type): {window: {row name: time log}}
+		self.buckets = {}
+
+	def get_buckets(self, doctype, from_time, to_time, workstation=None, workstation_type=None):
+		"""Returns buckets of the windows overlapping the time range, loading the windows not loaded yet."""
+		key = (doctype, workstation, workstation_type)
+		buckets = self.buckets.setdefault(key, {})
+		windows = range(get_timeline_window(from_time), get_timeline_window(to_time) + 1)
+
+		if missing := [window for window in windows if window not in buckets]:
+			self.load_time_logs(key, missing[0], missing[-1])
+
+		return [buckets[window] for window in windows]
+
+	def load_time_logs(self, key, first_window, last_window):
+		doctype, workstation, workstation_type = key
+		buckets = self.buckets[key]
+		for window in range(first_window, last_window + 1):
+			buckets.setdefault(window, {})
+
+		jc = frappe.qb.DocType("Job Card")
+		jctl = frappe.qb.DocType(doctype)
+		query = (
+			frappe.qb.from_(jctl)
+			.from_(jc)
+			.select(
+				jc.name.as_("name"),
+				jctl.name.as_("row_name"),
+				jctl.from_time,
+				jctl.to_time,
+				jc.workstation,
+				jc.workstation_type,
+			)
+			.where(
+				(jctl.parent == jc.name)
+				& (jctl.from_time < TIMELINE_START + (last_window + 1) * TIMELINE_WINDOW)
+				& (jctl.to_time > TIMELINE_START + first_window * TIMELINE_WINDOW)
+			)
+		)
+
+		if workstation:
+			query = query.where(jc.workstation == workstation)
+
+		if workstation_type:
+			query = query.where(jc.workstation_type == workstation_type)
+
+		if doctype == "Job Card Time Log":
+			query = query.where(jc.docstatus < 2)
+		else:
+			query = query.where((jc.docstatus == 0) & (jc.total_time_in_mins == 0))
+
+		for time_log in query.run(as_dict=True):
+			add_to_timeline_buckets(buckets, time_log)
+
+	def add_job_card(self, job_card):
+		"""Books the scheduled time logs of a job card in the windows loaded before it was created."""
+		for (doctype, workstation, workstation_type), buckets in self.buckets.items():
+			if (
+				doctype != "Job Card Scheduled Time"
+				or (workstation and workstation != job_card.workstation)
+				or (workstation_type and workstation_type != job_card.workstation_type)
+			):
+				continue
+
+			for row in job_card.scheduled_time_logs:
+				add_to_timeline_buckets(
+					buckets,
+					frappe._dict(
+						{
+							"name": job_card.name,
+							"row_name": row.name,
+							"from_time": row.from_time,
+							"to_time": row.to_time,
+							"workstation": job_card.workstation,
+							"workstation_type": job_card.workstation_type,
+						}
+					),
+				)
+
+	def get_time_logs(
+		self,
+		doctype,
+		from_time,
+		to_time,
+		workstation_type=None,
+		workstation=None,
+		exclude_row=None,
+		exclude_job_card=None,
+	):
+		"""Returns time logs overlapping the time range, in the same way as `JobCard.get_time_logs`."""
+		from_time, to_time = get_datetime(from_time), get_datetime(to_time)
+
+		time_logs = {}
+		for bucket in self.get_buckets(doctype, from_time, to_time, workstation, workstation_type):
+			for time_log in bucket.values():
+				if (
+					time_log.row_name != exclude_row
+					and time_log.name != exclude_job_card
+					and (
+						(time_log.from_time < from_time and time_log.to_time > from_time)
+						or (time_log.from_time < to_time and time_log.to_time > to_time)
+						or (time_log.from_time >= from_time and time_log.to_time <= to_time)
+					)
+				):
+					time_logs[time_log.row_name] = time_log
+
+		return sorted(time_logs.values(), key=lambda x: x.to_time)
+
+
+def get_timeline_window(time):
+	return (get_datetime(time) - TIMELINE_START) // TIMELINE_WINDOW
+
+
+def add_to_timeline_buckets(buckets, time_log):
+	"""Adds the time log to the loaded buckets of the windows it overlaps."""
+	if not (time_log.from_time and time_log.to_time):
+		return
+
+	time_log.from_time = get_datetime(time_log.from_time)
+	time_log.to_time = get_datetime(time_log.to_time)
+
+	for window in range(get_timeline_window(time_log.from_time), get_timeline_window(time_log.to_time) + 1):
+		if window in buckets:
+			buckets[window][time_log.row_name] = time_log
+
+
 @frappe.whitelist()
 def make_time_log(args):
 	if isinstance(args, str):
@@ -14,6 +14,7 @@ from erpnext.manufacturing.doctype.job_card.job_card import (
 	JobCardOverTransferError,
 	OperationMismatchError,
 	OverlapError,
+	WorkstationTimeline,
 	make_corrective_job_card,
 	make_material_request,
 )
@@ -176,6 +177,71 @@ class TestJobCard(FrappeTestCase):
 		jc2.save()
 		self.assertTrue(jc2.name)
 
+	def test_workstation_timeline_matches_time_logs(self):
+		job_card = frappe.get_last_doc("Job Card", {"work_order": self.work_order.name})
+		job_card.append(
+			"scheduled_time_logs",
+			{"from_time": now(), "to_time": add_to_date(now(), hours=2), "time_in_mins": 120},
+		)
+		job_card.total_time_in_mins = 0
+		job_card.save()
+
+		timeline = WorkstationTimeline()
+		for hours in (-1, 1, 3):
+			args = frappe._dict(
+				{"from_time": add_to_date(now(), hours=hours), "to_time": add_to_date(now(), hours=hours + 1)}
+			)
+			for doctype in ("Job Card Time Log", "Job Card Scheduled Time"):
+				expected = [d.row_name for d in job_card.get_time_logs(args, doctype)]
+				self.assertEqual(
+					[
+						d.row_name
+						for d in timeline.get_time_logs(
+							doctype,
+							args.from_time,
+							args.to_time,
+							job_card.workstation_type,
+							job_card.workstation,
+						)
+					],
+					expected,
+				)
+
+		# time logs of the job card being scheduled are not overlaps
+		args = frappe._dict(
+			{"from_time": now(), "to_time": add_to_date(now(), hours=1), "parent": job_card.name}
+		)
+		self.assertEqual(job_card.get_time_logs(args, "Job Card Scheduled Time"), [])
+
+		job_card.flags.workstation_timeline = timeline
+		self.assertEqual(job_card.get_time_logs(args, "Job Card Scheduled Time"), [])
+
+	def test_workstation_timeline_loads_windows_on_demand(self):
+		job_card = frappe.get_last_doc("Job Card", {"work_order": self.work_order.name})
+		from_time = add_to_date(now(), days=20)
+		job_card.append(
+			"scheduled_time_logs",
+			{"from_time": from_time, "to_time": add_to_date(from_time, days=8), "time_in_mins": 8 * 24 * 60},
+		)
+		job_card.total_time_in_mins = 0
+		job_card.save()
+
+		timeline = WorkstationTimeline()
+		args = ("Job Card Scheduled Time", now(), add_to_date(now(), hours=1), None, job_card.workstation)
+		self.assertEqual(timeline.get_time_logs(*args), [])
+		self.assertEqual(len(timeline.buckets[("Job Card Scheduled Time", job_card.workstation, None)]), 1)
+
+		# a time log spanning windows is found from any of them
+		for days in (21, 27):
+			check_from = add_to_date(now(), days=days)
+			time_logs = timeline.get_time_logs(
+				"Job Card Scheduled Time",
+				check_from,
+				add_to_date(check_from, hours=1),
+				workstation=job_card.workstation,
+			)
+			self.assertIn(job_card.scheduled_time_logs[-1].name, [d.row_name for d in time_logs])
+
 	def test_job_card_multiple_materials_transfer(self):
 		"Test transferring RMs separately against Job Card with multiple RMs."
 		self.transfer_material_against = "Job Card"
@@ -8,6 +8,7 @@ import json
 import frappe
 from frappe import _, msgprint
 from frappe.model.document import Document
+from frappe.query_builder import Tuple
 from frappe.query_builder.functions import IfNull, Sum
 from frappe.utils import (
 	add_days,
@@ -1804,7 +1805,20 @@ def set_default_warehouses(row, default_warehouses):
 
 
 def get_reserved_qty_for_production_plan(item_code, warehouse):
-	from erpnext.manufacturing.doctype.work_order.work_order import get_reserved_qty_for_production
+	return get_reserved_qty_for_production_plan_of_items([(item_code, warehouse)]).get((item_code, warehouse))
+
+
+def get_reserved_qty_for_production_plan_of_items(item_warehouses):
+	"""
+	Returns qty reserved by open production plans for each (item, warehouse) that is not yet reserved
+	by their work orders. Items without production plan requirements are left out.
+	"""
+	from erpnext.manufacturing.doctype.work_order.work_order import (
+		get_reserved_qty_for_production_of_items,
+	)
+
+	if not item_warehouses:
+		return {}
 
 	table = frappe.qb.DocType("Production Plan")
 	child = frappe.qb.DocType("Material Request Plan Item")
@@ -1815,35 +1829,33 @@ def get_reserved_qty_for_production_plan(item_code, warehouse):
 		frappe.qb.from_(table)
 		.inner_join(child)
 		.on(table.name == child.parent)
-		.select(Sum(child.required_bom_qty))
+		.select(child.item_code, child.warehouse, Sum(child.required_bom_qty).as_("required_qty"))
 		.where(
 			(table.docstatus == 1)
-			& (child.item_code == item_code)
-			& (child.warehouse == warehouse)
+			& (Tuple(child.item_code, child.warehouse).isin(list(item_warehouses)))
 			& (table.status.notin(["Completed", "Closed"]))
 		)
+		.groupby(child.item_code, child.warehouse)
 	)
 
 	if non_completed_production_plans:
 		query = query.where(table.name.isin(non_completed_production_plans))
 
-	query = query.run()
-
-	if not query or query[0][0] is None:
-		return None
-
-	reserved_qty_for_production_plan = flt(query[0][0])
+	required_qty = {
+		(row.item_code, row.warehouse): flt(row.required_qty)
+		for row in query.run(as_dict=True)
+		if row.required_qty is not None
+	}
+	if not required_qty:
+		return {}
 
-	reserved_qty_for_production = flt(
-		get_reserved_qty_for_production(
-			item_code, warehouse, non_completed_production_plans, check_production_plan=True
-		)
+	reserved_qty_for_production = get_reserved_qty_for_production_of_items(
+		list(required_qty), non_completed_production_plans, check_production_plan=True
 	)
 
-	if reserved_qty_for_production > reserved_qty_for_production_plan:
-		return 0.0
-
-	return reserved_qty_for_production_plan - reserved_qty_for_production
+	return {
+		key: max(qty - flt(reserved_qty_for_production.get(key)), 0.0) for key, qty in required_qty.items()
+	}
 
 
 @frappe.request_cache
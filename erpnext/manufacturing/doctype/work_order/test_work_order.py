@@ -15,6 +15,8 @@ from erpnext.manufacturing.doctype.work_order.work_order import (
 	OverProductionError,
 	StockOverProductionError,
 	close_work_order,
+	get_reserved_qty_for_production,
+	get_reserved_qty_for_production_of_items,
 	make_job_card,
 	make_stock_entry,
 	make_stock_return_entry,
@@ -146,6 +148,83 @@ class TestWorkOrder(FrappeTestCase):
 
 		self.assertEqual(cint(bin1_at_completion.reserved_qty_for_production), reserved_qty_on_submission - 1)
 
+	def test_reserved_qty_for_production_of_items(self):
+		warehouse = "_Test Warehouse - _TC"
+		wo_order = make_wo_order_test_record(
+			item="_Test FG Item", qty=2, source_warehouse=warehouse, skip_transfer=1
+		)
+
+		item_warehouses = [(d.item_code, d.source_warehouse) for d in wo_order.required_items]
+		reserved_qty = get_reserved_qty_for_production_of_items(item_warehouses)
+
+		for item_code, source_warehouse in item_warehouses:
+			self.assertEqual(
+				reserved_qty.get((item_code, source_warehouse), 0),
+				get_reserved_qty_for_production(item_code, source_warehouse),
+			)
+			self.assertEqual(
+				flt(get_bin(item_code, source_warehouse).reserved_qty_for_production),
+				reserved_qty.get((item_code, source_warehouse), 0),
+			)
+
+	def test_required_items_qty_with_substitute_and_return_items(self):
+		frappe.db.set_single_value("Manufacturing Settings", "backflush_raw_materials_based_on", "BOM")
+
+		fg_item = "Test FG Item For Required Items Qty"
+		source_warehouse = "Stores - _TC"
+		raw_materials = ["Test Required Items Qty RM 1", "Test Required Items Qty RM 2"]
+		substitute = "Test Required Items Qty Substitute RM"
+
+		make_item(fg_item, {"is_stock_item": 1})
+		for item in [*raw_materials, substitute]:
+			make_item(item, {"is_stock_item": 1, "allow_alternative_item": 1})
+			test_stock_entry.make_stock_entry(item_code=item, target=source_warehouse, qty=10, basic_rate=100)
+
+		if not frappe.db.exists(
+			"Item Alternative", {"item_code": raw_materials[0], "alternative_item_code": substitute}
+		):
+			frappe.get_doc(
+				{
+					"doctype": "Item Alternative",
+					"item_code": raw_materials[0],
+					"alternative_item_code": substitute,
+					"two_way": 1,
+				}
+			).insert()
+
+		make_bom(item=fg_item, source_warehouse=source_warehouse, raw_materials=raw_materials)
+		wo = make_wo_order_test_record(item=fg_item, qty=5, source_warehouse=source_warehouse)
+
+		transfer_entry = frappe.get_doc(make_stock_entry(wo.name, "Material Transfer for Manufacture", 5))
+		transfer_entry.save()
+		transfer_entry.items[0].item_code = substitute
+		transfer_entry.items[0].original_item = raw_materials[0]
+		transfer_entry.submit()
+		transferred_qty = {row.original_item or row.item_code: row.qty for row in transfer_entry.items}
+
+		return_entry = frappe.copy_doc(transfer_entry)
+		return_entry.is_return = 1
+		for row in return_entry.items:
+			row.s_warehouse, row.t_warehouse = row.t_warehouse, row.s_warehouse
+			row.qty = row.transfer_qty = 1
+		return_entry.submit()
+
+		frappe.get_doc(make_stock_entry(wo.name, "Manufacture", 2)).submit()
+
+		required_items_qty = frappe.get_doc("Work Order", wo.name).get_required_items_qty()
+		for item_code in raw_materials:
+			# the substitute's transfers and returns are counted against the item it substitutes
+			self.assertEqual(required_items_qty[item_code]["transferred_qty"], transferred_qty[item_code])
+			self.assertEqual(required_items_qty[item_code]["returned_qty"], 1)
+			self.assertTrue(required_items_qty[item_code]["consumed_qty"])
+
+		self.assertNotIn("transferred_qty", required_items_qty[substitute])
+		# consumption of the substitute is counted against both items
+		self.assertEqual(
+			required_items_qty[substitute]["consumed_qty"],
+			required_items_qty[raw_materials[0]]["consumed_qty"],
+		)
+
 	def test_production_item(self):
 		wo_order = make_wo_order_test_record(item="_Test FG Item", qty=1, do_not_save=True)
 		frappe.db.set_value("Item", "_Test FG Item", "end_of_life", "2000-1-1")
@@ -2,13 +2,14 @@
 # License: GNU General Public License v3. See license.txt
 
 import json
+from collections import defaultdict
 
 import frappe
 from dateutil.relativedelta import relativedelta
 from frappe import _
 from frappe.model.document import Document
 from frappe.model.mapper import get_mapped_doc
-from frappe.query_builder import Case
+from frappe.query_builder import Case, Tuple
 from frappe.query_builder.functions import Sum
 from frappe.utils import (
 	cint,
@@ -21,21 +22,21 @@ from frappe.utils import (
 	nowdate,
 	time_diff_in_hours,
 )
-from pypika import functions as fn
 
 from erpnext.manufacturing.doctype.bom.bom import (
 	get_bom_item_rate,
 	get_bom_items_as_dict,
 	validate_bom_no,
 )
+from erpnext.manufacturing.doctype.job_card.job_card import WorkstationTimeline
 from erpnext.manufacturing.doctype.manufacturing_settings.manufacturing_settings import (
 	get_mins_between_operations,
 )
 from erpnext.stock.doctype.batch.batch import make_batch
 from erpnext.stock.doctype.item.item import get_item_defaults, validate_end_of_life
 from erpnext.stock.doctype.serial_no.serial_no import get_available_serial_nos, get_serial_nos
-from erpnext.stock.stock_balance import get_planned_qty, update_bin_qty
-from erpnext.stock.utils import get_bin, get_latest_stock_qty, validate_warehouse_company
+from erpnext.stock.stock_balance import get_planned_qty, update_bin_qty, update_bins_qty
+from erpnext.stock.utils import get_latest_stock_qty, validate_warehouse_company
 from erpnext.utilities.transaction_base import validate_uom_is_integer
 
 
@@ -354,11 +355,15 @@ class WorkOrder(Document):
 	def update_work_order_qty(self):
 		"""Update **Manufactured Qty** and **Material Transferred for Qty** in Work Order
 		based on Stock Entry"""
+		from erpnext.selling.doctype.sales_order.sales_order import update_produced_qty_in_so_item
 
 		allowance_percentage = flt(
 			frappe.db.get_single_value("Manufacturing Settings", "overproduction_percentage_for_work_order")
 		)
 
+		stock_entry_qty = self.get_stock_entry_qty()
+		values = {"process_loss_qty": stock_entry_qty.process_loss_qty}
+
 		for purpose, fieldname in (
 			("Manufacture", "produced_qty"),
 			("Material Transfer for Manufacture", "material_transferred_for_manufacturing"),
@@ -370,7 +375,7 @@ class WorkOrder(Document):
 			):
 				continue
 
-			qty = self.get_transferred_or_manufactured_qty(purpose)
+			qty = stock_entry_qty[purpose]
 
 			completed_qty = self.qty + (allowance_percentage / 100 * self.qty)
 			if qty > completed_qty:
@@ -381,42 +386,46 @@ class WorkOrder(Document):
 					StockOverProductionError,
 				)
 
-			self.db_set(fieldname, qty)
-			self.set_process_loss_qty()
+			values[fieldname] = qty
 
-			from erpnext.selling.doctype.sales_order.sales_order import update_produced_qty_in_so_item
+		self.db_set(values)
 
-			if self.sales_order and self.sales_order_item:
-				update_produced_qty_in_so_item(self.sales_order, self.sales_order_item)
+		if self.sales_order and self.sales_order_item:
+			update_produced_qty_in_so_item(self.sales_order, self.sales_order_item)
 
 		if self.production_plan:
 			self.set_produced_qty_for_sub_assembly_item()
 			self.update_production_plan_status()
 
-	def get_transferred_or_manufactured_qty(self, purpose):
-		table = frappe.qb.DocType("Stock Entry")
-		query = frappe.qb.from_(table).where(
-			(table.work_order == self.name) & (table.docstatus == 1) & (table.purpose == purpose)
-		)
-
-		if purpose == "Manufacture":
-			query = query.select(Sum(table.fg_completed_qty) - Sum(table.process_loss_qty))
-		else:
-			query = query.select(Sum(table.fg_completed_qty))
-
-		return flt(query.run()[0][0])
-
-	def set_process_loss_qty(self):
+	def get_stock_entry_qty(self):
+		"""Returns manufactured, transferred and process loss qty from submitted Stock Entries."""
 		table = frappe.qb.DocType("Stock Entry")
-		process_loss_qty = (
+		stock_entries = (
 			frappe.qb.from_(table)
-			.select(Sum(table.process_loss_qty))
+			.select(
+				table.purpose,
+				Sum(table.fg_completed_qty).as_("fg_completed_qty"),
+				Sum(table.process_loss_qty).as_("process_loss_qty"),
+			)
 			.where(
-				(table.work_order == self.name) & (table.purpose == "Manufacture") & (table.docstatus == 1)
+				(table.work_order == self.name)
+				& (table.docstatus == 1)
+				& (table.purpose.isin(["Manufacture", "Material Transfer for Manufacture"]))
 			)
-		).run()[0][0]
+			.groupby(table.purpose)
+		).run(as_dict=True)
 
-		self.db_set("process_loss_qty", flt(process_loss_qty))
+		stock_entry_qty = frappe._dict(
+			{"Manufacture": 0.0, "Material Transfer for Manufacture": 0.0, "process_loss_qty": 0.0}
+		)
+		for row in stock_entries:
+			if row.purpose == "Manufacture":
+				stock_entry_qty[row.purpose] = flt(row.fg_completed_qty) - flt(row.process_loss_qty)
+				stock_entry_qty.process_loss_qty = flt(row.process_loss_qty)
+			else:
+				stock_entry_qty[row.purpose] = flt(row.fg_completed_qty)
+
+		return stock_entry_qty
 
 	def update_production_plan_status(self):
 		production_plan = frappe.get_doc("Production Plan", self.production_plan)
@@ -611,22 +620,32 @@ class WorkOrder(Document):
 		enable_capacity_planning = not cint(manufacturing_settings_doc.disable_capacity_planning)
 		plan_days = cint(manufacturing_settings_doc.capacity_planning_for_days) or 30
 
+		workstation_timeline = WorkstationTimeline() if enable_capacity_planning else None
+
 		for index, row in enumerate(self.operations):
 			qty = self.qty
 			while qty > 0:
 				qty = split_qty_based_on_batch_size(self, row, qty)
 				if row.job_card_qty > 0:
-					self.prepare_data_for_job_card(row, index, plan_days, enable_capacity_planning)
+					self.prepare_data_for_job_card(
+						row, index, plan_days, enable_capacity_planning, workstation_timeline
+					)
 
 		planned_end_date = self.operations and self.operations[-1].planned_end_time
 		if planned_end_date:
 			self.db_set("planned_end_date", planned_end_date)
 
-	def prepare_data_for_job_card(self, row, index, plan_days, enable_capacity_planning):
+	def prepare_data_for_job_card(
+		self, row, index, plan_days, enable_capacity_planning, workstation_timeline=None
+	):
 		self.set_operation_start_end_time(index, row)
 
 		job_card_doc = create_job_card(
-			self, row, auto_create=True, enable_capacity_planning=enable_capacity_planning
+			self,
+			row,
+			auto_create=True,
+			enable_capacity_planning=enable_capacity_planning,
+			workstation_timeline=workstation_timeline,
 		)
 
 		if enable_capacity_planning and job_card_doc:
@@ -1030,23 +1049,111 @@ class WorkOrder(Document):
 		update bin reserved_qty_for_production
 		called from Stock Entry for production, after submit, cancel
 		"""
-		# calculate consumed qty based on submitted stock entries
-		self.update_consumed_qty_for_required_items()
+		required_items_qty = self.get_required_items_qty()
 
+		# calculate consumed qty based on submitted stock entries
+		fieldnames = ["consumed_qty"]
 		if self.docstatus == 1:
-			# calculate transferred qty based on submitted stock entries
-			self.update_transferred_qty_for_required_items()
-			self.update_returned_qty()
+			# calculate transferred and returned qty based on submitted stock entries
+			fieldnames += ["transferred_qty", "returned_qty"]
+
+		self.set_required_items_qty(required_items_qty, fieldnames)
 
+		if self.docstatus == 1:
 			# update in bin
 			self.update_reserved_qty_for_production()
 
 	def update_reserved_qty_for_production(self, items=None):
 		"""update reserved_qty_for_production in bins"""
-		for d in self.required_items:
-			if d.source_warehouse:
-				stock_bin = get_bin(d.item_code, d.source_warehouse)
-				stock_bin.update_reserved_qty_for_production()
+		from erpnext.manufacturing.doctype.production_plan.production_plan import (
+			get_reserved_qty_for_production_plan_of_items,
+		)
+
+		item_warehouses = list(
+			{(d.item_code, d.source_warehouse) for d in self.required_items if d.source_warehouse}
+		)
+		reserved_qty_for_production = get_reserved_qty_for_production_of_items(item_warehouses)
+		reserved_qty_for_production_plan = get_reserved_qty_for_production_plan_of_items(item_warehouses)
+
+		update_bins_qty(
+			{
+				(item_code, warehouse): {
+					"reserved_qty_for_production": reserved_qty_for_production.get(
+						(item_code, warehouse), 0.0
+					),
+					"reserved_qty_for_production_plan": flt(
+						reserved_qty_for_production_plan.get((item_code, warehouse))
+					),
+				}
+				for item_code, warehouse in item_warehouses
+			}
+		)
+
+	def get_required_items_qty(self):
+		"""
+		Returns transferred, returned and consumed qty of required items from submitted Stock Entries,
+		computed with one query for all items.
+		"""
+		ste = frappe.qb.DocType("Stock Entry")
+		ste_child = frappe.qb.DocType("Stock Entry Detail")
+
+		data = (
+			frappe.qb.from_(ste)
+			.inner_join(ste_child)
+			.on(ste_child.parent == ste.name)
+			.select(
+				ste.purpose,
+				ste.is_return,
+				ste_child.item_code,
+				ste_child.original_item,
+				Sum(ste_child.qty).as_("qty"),
+				Sum(Case().when(ste_child.s_warehouse.isnotnull(), ste_child.qty).else_(0)).as_("issued_qty"),
+			)
+			.where(
+				(ste.docstatus == 1)
+				& (ste.work_order == self.name)
+				& (
+					ste.purpose.isin(
+						[
+							"Material Transfer for Manufacture",
+							"Material Consumption for Manufacture",
+							"Manufacture",
+						]
+					)
+				)
+			)
+			.groupby(ste.purpose, ste.is_return, ste_child.item_code, ste_child.original_item)
+		).run(as_dict=True)
+
+		required_items_qty = defaultdict(lambda: defaultdict(float))
+		for row in data:
+			if row.purpose == "Material Transfer for Manufacture":
+				fieldname = "returned_qty" if row.is_return else "transferred_qty"
+				required_items_qty[row.original_item or row.item_code][fieldname] += flt(row.qty)
+			else:
+				# consumption is counted against both the item and the item it substitutes
+				for item_code in {row.item_code, row.original_item} - {None, ""}:
+					required_items_qty[item_code]["consumed_qty"] += flt(row.issued_qty)
+
+		return required_items_qty
+
+	def set_required_items_qty(self, required_items_qty, fieldnames):
+		"""Sets qty of all required items with one statement."""
+		if not self.required_items:
+			return
+
+		wo_item = frappe.qb.DocType("Work Order Item")
+		query = frappe.qb.update(wo_item).where(wo_item.name.isin([row.name for row in self.required_items]))
+
+		for fieldname in fieldnames:
+			case = Case()
+			for row in self.required_items:
+				row.set(fieldname, required_items_qty[row.item_code][fieldname])
+				case = case.when(wo_item.name == row.name, row.get(fieldname))
+
+			query = query.set(wo_item[fieldname], case.else_(wo_item[fieldname]))
+
+		query.run()
 
 	@frappe.whitelist()
 	def get_items_and_operations_from_bom(self):
@@ -1107,93 +1214,6 @@ class WorkOrder(Document):
 
 			self.set_available_qty()
 
-	def update_transferred_qty_for_required_items(self):
-		ste = frappe.qb.DocType("Stock Entry")
-		ste_child = frappe.qb.DocType("Stock Entry Detail")
-
-		query = (
-			frappe.qb.from_(ste)
-			.inner_join(ste_child)
-			.on(ste_child.parent == ste.name)
-			.select(
-				ste_child.item_code,
-				ste_child.original_item,
-				fn.Sum(ste_child.qty).as_("qty"),
-			)
-			.where(
-				(ste.docstatus == 1)
-				& (ste.work_order == self.name)
-				& (ste.purpose == "Material Transfer for Manufacture")
-				& (ste.is_return == 0)
-			)
-			.groupby(ste_child.item_code)
-		)
-
-		data = query.run(as_dict=1) or []
-		transferred_items = frappe._dict({d.original_item or d.item_code: d.qty for d in data})
-
-		for row in self.required_items:
-			row.db_set(
-				"transferred_qty", (transferred_items.get(row.item_code) or 0.0), update_modified=False
-			)
-
-	def update_returned_qty(self):
-		ste = frappe.qb.DocType("Stock Entry")
-		ste_child = frappe.qb.DocType("Stock Entry Detail")
-
-		query = (
-			frappe.qb.from_(ste)
-			.inner_join(ste_child)
-			.on(ste_child.parent == ste.name)
-			.select(
-				ste_child.item_code,
-				ste_child.original_item,
-				fn.Sum(ste_child.qty).as_("qty"),
-			)
-			.where(
-				(ste.docstatus == 1)
-				& (ste.work_order == self.name)
-				& (ste.purpose == "Material Transfer for Manufacture")
-				& (ste.is_return == 1)
-			)
-			.groupby(ste_child.item_code)
-		)
-
-		data = query.run(as_dict=1) or []
-		returned_dict = frappe._dict({d.original_item or d.item_code: d.qty for d in data})
-
-		for row in self.required_items:
-			row.db_set("returned_qty", (returned_dict.get(row.item_code) or 0.0), update_modified=False)
-
-	def update_consumed_qty_for_required_items(self):
-		"""
-		Update consumed qty from submitted stock entries
-		against a work order for each stock item
-		"""
-
-		for item in self.required_items:
-			consumed_qty = frappe.db.sql(
-				"""
-				SELECT
-					SUM(detail.qty)
-				FROM
-					`tabStock Entry` entry,
-					`tabStock Entry Detail` detail
-				WHERE
-					entry.work_order = %(name)s
-						AND (entry.purpose = "Material Consumption for Manufacture"
-							OR entry.purpose = "Manufacture")
-						AND entry.docstatus = 1
-						AND detail.parent = entry.name
-						AND detail.s_warehouse IS NOT null
-						AND (detail.item_code = %(item)s
-							OR detail.original_item = %(item)s)
-				""",
-				{"name": self.name, "item": item.item_code},
-			)[0][0]
-
-			item.db_set("consumed_qty", flt(consumed_qty), update_modified=False)
-
 	@frappe.whitelist()
 	def make_bom(self):
 		data = frappe.db.sql(
@@ -1592,7 +1612,9 @@ def validate_operation_data(row):
 		)
 
 
-def create_job_card(work_order, row, enable_capacity_planning=False, auto_create=False):
+def create_job_card(
+	work_order, row, enable_capacity_planning=False, auto_create=False, workstation_timeline=None
+):
 	doc = frappe.new_doc("Job Card")
 	doc.update(
 		{
@@ -1621,9 +1643,12 @@ def create_job_card(work_order, row, enable_capacity_planning=False, auto_create
 	if auto_create:
 		doc.flags.ignore_mandatory = True
 		if enable_capacity_planning:
+			doc.flags.workstation_timeline = workstation_timeline
 			doc.schedule_time_logs(row)
 
 		doc.insert()
+		if enable_capacity_planning and workstation_timeline:
+			workstation_timeline.add_job_card(doc)
 		frappe.msgprint(_("Job card {0} created").format(get_link_to_form("Job Card", doc.name)), alert=True)
 
 	if enable_capacity_planning:
@@ -1691,6 +1716,23 @@ def get_reserved_qty_for_production(
 	check_production_plan: bool = False,
 ) -> float:
 	"""Get total reserved quantity for any item in specified warehouse"""
+	return get_reserved_qty_for_production_of_items(
+		[(item_code, warehouse)], non_completed_production_plans, check_production_plan
+	).get((item_code, warehouse), 0.0)
+
+
+def get_reserved_qty_for_production_of_items(
+	item_warehouses: list[tuple[str, str]],
+	non_completed_production_plans: list | None = None,
+	check_production_plan: bool = False,
+) -> dict:
+	"""
+	Returns total quantity reserved for production of each (item, warehouse) with one query. If
+	`check_production_plan`, only required qty of work orders made from production plans is counted.
+	"""
+	if not item_warehouses:
+		return {}
+
 	wo = frappe.qb.DocType("Work Order")
 	wo_item = frappe.qb.DocType("Work Order Item")
 
@@ -1704,13 +1746,13 @@ def get_reserved_qty_for_production(
 	query = (
 		frappe.qb.from_(wo)
 		.from_(wo_item)
-		.select(Sum(qty_field))
+		.select(wo_item.item_code, wo_item.source_warehouse, Sum(qty_field).as_("reserved_qty"))
 		.where(
-			(wo_item.item_code == item_code)
+			(Tuple(wo_item.item_code, wo_item.source_warehouse).isin(list(item_warehouses)))
 			& (wo_item.parent == wo.name)
 			& (wo.docstatus == 1)
-			& (wo_item.source_warehouse == warehouse)
 		)
+		.groupby(wo_item.item_code, wo_item.source_warehouse)
 	)
 
 	if check_production_plan:
@@ -1727,7 +1769,7 @@ def get_reserved_qty_for_production(
 	if non_completed_production_plans:
 		query = query.where(wo.production_plan.isin(non_completed_production_plans))
 
-	return query.run()[0][0] or 0.0
+	return {(row.item_code, row.source_warehouse): flt(row.reserved_qty) for row in query.run(as_dict=True)}
 
 
 @frappe.whitelist()
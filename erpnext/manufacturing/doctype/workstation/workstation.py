@@ -162,9 +162,9 @@ class Workstation(Document):
 		):
 			return schedule_date
 
-		if schedule_date in tuple(get_holidays(self.holiday_list)):
+		holidays = set(get_holidays(self.holiday_list))
+		while schedule_date in holidays:
 			schedule_date = add_days(schedule_date, 1)
-			return self.validate_workstation_holiday(schedule_date, skip_holiday_list_check=True)
 
 		return schedule_date
 
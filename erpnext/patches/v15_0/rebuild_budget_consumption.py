@@ -0,0 +1,11 @@
+import frappe
+
+from erpnext.accounts.doctype.budget_consumption.budget_consumption import rebuild_budget_consumption
+
+
+def execute():
+	for budget in frappe.get_all(
+		"Budget", filters={"docstatus": 1}, fields=["name", "company", "fiscal_year", "budget_against"]
+	):
+		accounts = frappe.get_all("Budget Account", filters={"parent": budget.name}, pluck="account")
+		rebuild_budget_consumption(budget.company, budget.fiscal_year, accounts, budget.budget_against)
@@ -0,0 +1,8 @@
+import frappe
+
+from erpnext.setup.doctype.company_daily_summary.company_daily_summary import rebuild_daily_summary
+
+
+def execute():
+	for company in frappe.get_all("Company", pluck="name"):
+		rebuild_daily_summary(company)
@@ -0,0 +1,22 @@
+import frappe
+from frappe.query_builder.functions import Max
+
+
+def execute():
+	sle = frappe.qb.DocType("Stock Ledger Entry")
+	bin = frappe.qb.DocType("Bin")
+
+	for warehouse in frappe.get_all("Warehouse", filters={"is_group": 0}, pluck="name"):
+		last_posting_datetimes = (
+			frappe.qb.from_(sle)
+			.select(sle.item_code, Max(sle.posting_datetime))
+			.where((sle.warehouse == warehouse) & (sle.is_cancelled == 0))
+			.groupby(sle.item_code)
+		).run()
+
+		for item_code, last_posting_datetime in last_posting_datetimes:
+			(
+				frappe.qb.update(bin)
+				.set(bin.last_posting_datetime, last_posting_datetime)
+				.where((bin.item_code == item_code) & (bin.warehouse == warehouse))
+			).run()
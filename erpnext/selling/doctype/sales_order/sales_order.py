@@ -36,7 +36,7 @@ from erpnext.stock.doctype.stock_reservation_entry.stock_reservation_entry impor
 	has_reserved_stock,
 )
 from erpnext.stock.get_item_details import get_bin_details, get_default_bom, get_price_list_rate
-from erpnext.stock.stock_balance import get_reserved_qty, update_bin_qty
+from erpnext.stock.stock_balance import get_reserved_qty, update_bins_qty
 
 form_grid_templates = {"items": "templates/form_grid/item_grid.html"}
 
@@ -516,8 +516,12 @@ class SalesOrder(SellingController):
 				else:
 					_valid_for_reserve(d.item_code, d.warehouse)
 
-		for item_code, warehouse in item_wh_list:
-			update_bin_qty(item_code, warehouse, {"reserved_qty": get_reserved_qty(item_code, warehouse)})
+		update_bins_qty(
+			{
+				(item_code, warehouse): {"reserved_qty": get_reserved_qty(item_code, warehouse)}
+				for item_code, warehouse in item_wh_list
+			}
+		)
 
 	def on_update(self):
 		pass
@@ -11,10 +11,11 @@ from frappe.cache_manager import clear_defaults_cache
 from frappe.contacts.address_and_contact import load_address_and_contact
 from frappe.custom.doctype.property_setter.property_setter import make_property_setter
 from frappe.desk.page.setup_wizard.setup_wizard import make_records
-from frappe.utils import cint, formatdate, get_link_to_form, get_timestamp, today
+from frappe.utils import cint, get_first_day, get_last_day, get_link_to_form, get_timestamp, today
 from frappe.utils.nestedset import NestedSet, rebuild_tree
 
 from erpnext.accounts.doctype.account.account import get_account_currency
+from erpnext.setup.doctype.company_daily_summary.company_daily_summary import get_daily_summary_totals
 from erpnext.setup.setup_wizard.operations.taxes_setup import setup_taxes_and_charges
 
 
@@ -729,39 +730,22 @@ def install_country_fixtures(company, country):
 
 
 def update_company_current_month_sales(company):
-	current_month_year = formatdate(today(), "MM-yyyy")
-
-	results = frappe.db.sql(
-		f"""
-		SELECT
-			SUM(base_grand_total) AS total,
-			DATE_FORMAT(`posting_date`, '%m-%Y') AS month_year
-		FROM
-			`tabSales Invoice`
-		WHERE
-			DATE_FORMAT(`posting_date`, '%m-%Y') = '{current_month_year}'
-			AND docstatus = 1
-			AND company = {frappe.db.escape(company)}
-		GROUP BY
-			month_year
-	""",
-		as_dict=True,
-	)
-
-	monthly_total = results[0]["total"] if len(results) > 0 else 0
+	monthly_total = get_daily_summary_totals(
+		company, get_first_day(today()), get_last_day(today())
+	).sales_amount
 
 	frappe.db.set_value("Company", company, "total_monthly_sales", monthly_total)
 
 
 def update_company_monthly_sales(company):
-	"""Cache past year monthly sales of every company based on sales invoices"""
+	"""Cache past year monthly sales of every company based on the daily sales summary"""
 	import json
 
 	from frappe.utils.goal import get_monthly_results
 
-	filter_str = f"company = {frappe.db.escape(company)} and status != 'Draft' and docstatus=1"
+	filter_str = f"company = {frappe.db.escape(company)}"
 	month_to_value_dict = get_monthly_results(
-		"Sales Invoice", "base_grand_total", "posting_date", filter_str, "sum"
+		"Company Daily Summary", "sales_amount", "posting_date", filter_str, "sum"
 	)
 
 	frappe.db.set_value("Company", company, "sales_monthly_history", json.dumps(month_to_value_dict))
@@ -838,11 +822,6 @@ def get_all_transactions_annual_history(company):
 
 			UNION ALL
 
-			select name, posting_date as transaction_date, company
-			from `tabSales Invoice`
-
-			UNION ALL
-
 			select name, creation as transaction_date, company
 			from `tabIssue`
 
@@ -864,9 +843,26 @@ def get_all_transactions_annual_history(company):
 		as_dict=True,
 	)
 
-	for d in items:
+	# sales invoices are counted from the daily summary instead of scanning all invoices
+	sales_invoices = frappe.db.sql(
+		"""
+		select posting_date as transaction_date, sum(sales_count) as count
+		from `tabCompany Daily Summary`
+		where
+			company=%s
+			and posting_date > date_sub(curdate(), interval 1 year)
+		group by
+			posting_date
+		having
+			sum(sales_count) > 0
+			""",
+		(company),
+		as_dict=True,
+	)
+
+	for d in items + sales_invoices:
 		timestamp = get_timestamp(d["transaction_date"])
-		out.update({timestamp: d["count"]})
+		out[timestamp] = out.get(timestamp, 0) + d["count"]
 
 	return out
 
@@ -0,0 +1,224 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+from collections import defaultdict
+
+import frappe
+from frappe import qb, scrub
+from frappe.model.document import Document
+from frappe.query_builder.functions import Count, Sum
+from frappe.utils import flt, getdate
+
+from erpnext.utilities.delta_rows import compact_delta_rows, insert_delta_rows
+
+# doctype: (date field, amount field, count field) of submitted transactions summarised per day
+TRANSACTION_SUMMARY_FIELDS = {
+	"Sales Invoice": ("posting_date", "sales_amount", "sales_count"),
+	"Purchase Invoice": ("posting_date", "purchase_amount", "purchase_count"),
+	"Sales Order": ("transaction_date", "sales_order_amount", "sales_order_count"),
+	"Purchase Order": ("transaction_date", "purchase_order_amount", "purchase_order_count"),
+	"Quotation": ("transaction_date", "quotation_amount", "quotation_count"),
+}
+
+# balance sheet accounts whose daily movement is summarised, balances are the sum of movements to date
+BALANCE_FIELDS = ("bank_balance", "credit_balance", "receivable", "payable")
+
+SUMMARY_FIELDS = (
+	*[fieldname for fields in TRANSACTION_SUMMARY_FIELDS.values() for fieldname in fields[1:]],
+	"income",
+	"income_count",
+	"expense",
+	"expense_count",
+	*BALANCE_FIELDS,
+)
+
+
+class CompanyDailySummary(Document):
+	# begin: auto-generated types
+	# This code is auto-generated. Do not modify anything in this block.
+
+	from typing import TYPE_CHECKING
+
+	if TYPE_CHECKING:
+		from frappe.types import DF
+
+		bank_balance: DF.Currency
+		company: DF.Link
+		credit_balance: DF.Currency
+		expense: DF.Currency
+		expense_count: DF.Int
+		income: DF.Currency
+		income_count: DF.Int
+		payable: DF.Currency
+		posting_date: DF.Date
+		purchase_amount: DF.Currency
+		purchase_count: DF.Int
+		purchase_order_amount: DF.Currency
+		purchase_order_count: DF.Int
+		quotation_amount: DF.Currency
+		quotation_count: DF.Int
+		receivable: DF.Currency
+		sales_amount: DF.Currency
+		sales_count: DF.Int
+		sales_order_amount: DF.Currency
+		sales_order_count: DF.Int
+	# end: auto-generated types
+
+	pass
+
+
+def on_doctype_update():
+	frappe.db.add_index("Company Daily Summary", ["company", "posting_date"])
+
+
+def update_daily_summary(company, posting_date, **deltas):
+	"""
+	Records `deltas` to the summary of the company for the day.
+
+	Each posting appends its own row instead of incrementing a shared row of the day, so concurrent
+	postings of a company do not wait on each other's row lock. Rows are summed when read and merged
+	periodically by `compact_daily_summary`.
+	"""
+	insert_summary_rows({(company, getdate(posting_date)): deltas})
+
+
+def insert_summary_rows(day_wise_summary: dict) -> None:
+	"""Bulk inserts summary rows from a map of (company, posting_date) to summary field values."""
+	insert_delta_rows(
+		"Company Daily Summary",
+		["company", "posting_date"],
+		SUMMARY_FIELDS,
+		{key: row for key, row in day_wise_summary.items() if key[0]},
+	)
+
+
+def update_daily_summary_for_transaction(doc, method=None):
+	"""Updates the transaction totals of the day on submit or cancel of `doc`."""
+	date_field, amount_field, count_field = TRANSACTION_SUMMARY_FIELDS[doc.doctype]
+	multiplier = -1 if doc.docstatus == 2 else 1
+	update_daily_summary(
+		doc.company,
+		doc.get(date_field),
+		**{amount_field: flt(doc.base_grand_total) * multiplier, count_field: multiplier},
+	)
+
+
+def get_balance_fieldname(root_type, account_type):
+	if account_type == "Bank":
+		return {"Asset": "bank_balance", "Liability": "credit_balance"}.get(root_type)
+
+	return {"Receivable": "receivable", "Payable": "payable"}.get(account_type)
+
+
+def update_daily_summary_for_gl_entries(gl_entries, cancel=False):
+	"""
+	Updates income, expense and the movement of bank, receivable and payable accounts of the day from
+	GL Entries being posted, or being cancelled if `cancel`.
+	"""
+	multiplier = -1 if cancel else 1
+	summary = defaultdict(lambda: defaultdict(float))
+
+	for entry in gl_entries:
+		if entry.get("voucher_type") == "Period Closing Voucher":
+			continue
+
+		root_type, account_type = frappe.get_cached_value(
+			"Account", entry.get("account"), ["root_type", "account_type"]
+		)
+		amount = (flt(entry.get("debit")) - flt(entry.get("credit"))) * multiplier
+		row = summary[(entry.get("company"), getdate(entry.get("posting_date")))]
+
+		if root_type in ("Income", "Expense"):
+			fieldname = scrub(root_type)
+			row[fieldname] += amount
+			row[fieldname + "_count"] += multiplier
+		elif fieldname := get_balance_fieldname(root_type, account_type):
+			row[fieldname] += amount
+
+	insert_summary_rows(summary)
+
+
+def get_daily_summary_totals(company, from_date, to_date) -> frappe._dict:
+	"""
+	Returns totals of the summary fields for the company between the given dates, or up to `to_date` if
+	`from_date` is not set.
+	"""
+	summary = qb.DocType("Company Daily Summary")
+	query = (
+		qb.from_(summary)
+		.select(*[Sum(summary[fieldname]).as_(fieldname) for fieldname in SUMMARY_FIELDS])
+		.where((summary.company == company) & (summary.posting_date <= getdate(to_date)))
+	)
+
+	if from_date:
+		query = query.where(summary.posting_date >= getdate(from_date))
+
+	result = query.run(as_dict=True)
+	return frappe._dict({fieldname: flt(result[0].get(fieldname)) for fieldname in SUMMARY_FIELDS})
+
+
+def rebuild_daily_summary(company):
+	"""Rebuilds the summary of the company from transactions and GL Entries with grouped queries."""
+	summary = qb.DocType("Company Daily Summary")
+	qb.from_(summary).delete().where(summary.company == company).run()
+
+	day_wise_summary = defaultdict(lambda: dict.fromkeys(SUMMARY_FIELDS, 0))
+
+	for doctype, (date_field, amount_field, count_field) in TRANSACTION_SUMMARY_FIELDS.items():
+		dt = qb.DocType(doctype)
+		transactions = (
+			qb.from_(dt)
+			.select(
+				dt[date_field].as_("posting_date"),
+				Sum(dt.base_grand_total).as_("amount"),
+				Count(dt.name).as_("count"),
+			)
+			.where((dt.company == company) & (dt.docstatus == 1))
+			.groupby(dt[date_field])
+		).run(as_dict=True)
+
+		for row in transactions:
+			day_wise_summary[row.posting_date].update(
+				{amount_field: flt(row.amount), count_field: row["count"]}
+			)
+
+	gle = qb.DocType("GL Entry")
+	account = qb.DocType("Account")
+	ledger = (
+		qb.from_(gle)
+		.inner_join(account)
+		.on(gle.account == account.name)
+		.select(
+			gle.posting_date,
+			account.root_type,
+			account.account_type,
+			(Sum(gle.debit) - Sum(gle.credit)).as_("amount"),
+			Count(gle.name).as_("count"),
+		)
+		.where(
+			(gle.company == company)
+			& (gle.is_cancelled == 0)
+			& (gle.voucher_type != "Period Closing Voucher")
+			& (
+				account.root_type.isin(["Income", "Expense"])
+				| account.account_type.isin(["Bank", "Receivable", "Payable"])
+			)
+		)
+		.groupby(gle.posting_date, account.root_type, account.account_type)
+	).run(as_dict=True)
+
+	for row in ledger:
+		day = day_wise_summary[row.posting_date]
+		if row.root_type in ("Income", "Expense"):
+			fieldname = scrub(row.root_type)
+			day[fieldname] += flt(row.amount)
+			day[fieldname + "_count"] += row["count"]
+		elif fieldname := get_balance_fieldname(row.root_type, row.account_type):
+			day[fieldname] += flt(row.amount)
+
+	insert_summary_rows({(company, posting_date): row for posting_date, row in day_wise_summary.items()})
+
+
+def compact_daily_summary(created_before=None):
+	"""Merges the summary rows appended by postings into one row per company and day."""
+	compact_delta_rows("Company Daily Summary", ["company", "posting_date"], SUMMARY_FIELDS, created_before)
@@ -0,0 +1,76 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_days, add_to_date, now_datetime, nowdate
+
+from erpnext.accounts.doctype.purchase_invoice.test_purchase_invoice import make_purchase_invoice
+from erpnext.accounts.doctype.sales_invoice.test_sales_invoice import create_sales_invoice
+from erpnext.setup.doctype.company_daily_summary.company_daily_summary import (
+	compact_daily_summary,
+	get_daily_summary_totals,
+	rebuild_daily_summary,
+)
+
+
+class TestCompanyDailySummary(FrappeTestCase):
+	def tearDown(self):
+		frappe.db.rollback()
+
+	def test_summary_on_sales_invoice_submit_and_cancel(self):
+		company = "_Test Company"
+		posting_date = add_days(nowdate(), -2)
+		before = get_daily_summary_totals(company, posting_date, posting_date)
+
+		si = create_sales_invoice(company=company, posting_date=posting_date, qty=2, rate=150)
+		after_submit = get_daily_summary_totals(company, posting_date, posting_date)
+		self.assertEqual(after_submit.sales_amount - before.sales_amount, si.base_grand_total)
+		self.assertEqual(after_submit.sales_count - before.sales_count, 1)
+		self.assertEqual(after_submit.income - before.income, -si.base_net_total)
+
+		si.cancel()
+		after_cancel = get_daily_summary_totals(company, posting_date, posting_date)
+		for fieldname in ("sales_amount", "sales_count", "income"):
+			self.assertEqual(after_cancel[fieldname], before[fieldname])
+
+	def test_rebuild_matches_incremental_summary(self):
+		company = "_Test Company"
+		posting_date = add_days(nowdate(), -3)
+		create_sales_invoice(company=company, posting_date=posting_date, qty=1, rate=300)
+		create_sales_invoice(company=company, posting_date=posting_date, qty=4, rate=25)
+
+		incremental = get_daily_summary_totals(company, posting_date, posting_date)
+		rebuild_daily_summary(company)
+		self.assertEqual(get_daily_summary_totals(company, posting_date, posting_date), incremental)
+
+	def test_compaction_merges_rows_of_a_day(self):
+		company = "_Test Company"
+		posting_date = add_days(nowdate(), -4)
+		create_sales_invoice(company=company, posting_date=posting_date, qty=1, rate=100)
+		create_sales_invoice(company=company, posting_date=posting_date, qty=2, rate=50)
+
+		filters = {"company": company, "posting_date": posting_date}
+		self.assertTrue(frappe.db.count("Company Daily Summary", filters) > 1)
+
+		before = get_daily_summary_totals(company, posting_date, posting_date)
+		compact_daily_summary(created_before=add_to_date(now_datetime(), seconds=1))
+		self.assertEqual(frappe.db.count("Company Daily Summary", filters), 1)
+		self.assertEqual(get_daily_summary_totals(company, posting_date, posting_date), before)
+
+	def test_summary_of_purchase_invoice_and_party_balances(self):
+		company = "_Test Company"
+		posting_date = nowdate()
+		before = get_daily_summary_totals(company, posting_date, posting_date)
+
+		pi = make_purchase_invoice(company=company, qty=2, rate=80)
+		si = create_sales_invoice(company=company, posting_date=posting_date, qty=1, rate=120)
+		after = get_daily_summary_totals(company, posting_date, posting_date)
+
+		self.assertEqual(after.purchase_amount - before.purchase_amount, pi.base_grand_total)
+		self.assertEqual(after.purchase_count - before.purchase_count, 1)
+		self.assertEqual(after.payable - before.payable, -pi.base_grand_total)
+		self.assertEqual(after.receivable - before.receivable, si.base_grand_total)
+
+		rebuild_daily_summary(company)
+		self.assertEqual(get_daily_summary_totals(company, posting_date, posting_date), after)
@@ -22,7 +22,12 @@ from frappe.utils import (
 	today,
 )
 
-from erpnext.accounts.utils import get_balance_on, get_count_on, get_fiscal_year
+from erpnext.accounts.utils import get_fiscal_year
+from erpnext.setup.doctype.company_daily_summary.company_daily_summary import (
+	TRANSACTION_SUMMARY_FIELDS,
+	get_balance_fieldname,
+	get_daily_summary_totals,
+)
 
 user_specific_content = ["calendar_events", "todo_list"]
 
@@ -79,7 +84,6 @@ class EmailDigest(Document):
 
 		self.from_date, self.to_date = self.get_from_to_date()
 		self.set_dates()
-		self._accounts = {}
 		self.currency = frappe.db.get_value("Company", self.company, "default_currency")
 
 	@frappe.whitelist()
@@ -385,7 +389,7 @@ class EmailDigest(Document):
 
 	def get_income(self):
 		"""Get income for given period"""
-		income, past_income, count = self.get_period_amounts(self.get_roots("income"), "income")
+		income, past_income, count = self.get_period_amounts("income")
 
 		income_account = frappe.db.get_all(
 			"Account",
@@ -415,13 +419,10 @@ class EmailDigest(Document):
 
 	def get_year_to_date_balance(self, root_type, fieldname):
 		"""Get income to date"""
-		balance = 0.0
-		count = 0
 		fy_start_date = get_fiscal_year(self.future_to_date)[1]
 
-		for account in self.get_root_type_accounts(root_type):
-			balance += get_balance_on(account, date=self.future_to_date, start_date=fy_start_date)
-			count += get_count_on(account, fieldname, date=self.future_to_date)
+		totals = get_daily_summary_totals(self.company, fy_start_date, self.future_to_date)
+		balance, count = totals[root_type], totals[root_type + "_count"]
 
 		if fieldname == "income":
 			filters = {"currency": self.currency}
@@ -456,7 +457,7 @@ class EmailDigest(Document):
 		return self.get_type_balance("invoiced_amount", "Receivable")
 
 	def get_expenses_booked(self):
-		expenses, past_expenses, count = self.get_period_amounts(self.get_roots("expense"), "expenses_booked")
+		expenses, past_expenses, count = self.get_period_amounts("expense")
 
 		expense_account = frappe.db.get_all(
 			"Account",
@@ -476,16 +477,12 @@ class EmailDigest(Document):
 		)
 		return {"label": label, "value": expenses, "last_value": past_expenses, "count": count}
 
-	def get_period_amounts(self, accounts, fieldname):
-		"""Get amounts for current and past periods"""
-		balance = past_balance = 0.0
-		count = 0
-		for account in accounts:
-			balance += get_incomes_expenses_for_period(account, self.future_from_date, self.future_to_date)
-			past_balance += get_incomes_expenses_for_period(account, self.past_from_date, self.past_to_date)
-			count += get_count_for_period(account, fieldname, self.future_from_date, self.future_to_date)
+	def get_period_amounts(self, root_type):
+		"""Get amounts for current and past periods from the company's daily summary"""
+		totals = get_daily_summary_totals(self.company, self.future_from_date, self.future_to_date)
+		past_totals = get_daily_summary_totals(self.company, self.past_from_date, self.past_to_date)
 
-		return balance, past_balance, count
+		return totals[root_type], past_totals[root_type], totals[root_type + "_count"]
 
 	def get_sales_orders_to_bill(self):
 		"""Get value not billed"""
@@ -592,33 +589,10 @@ class EmailDigest(Document):
 		return {"label": label, "value": value, "count": count}
 
 	def get_type_balance(self, fieldname, account_type, root_type=None):
-		if root_type:
-			accounts = [
-				d.name
-				for d in frappe.db.get_all(
-					"Account",
-					filters={
-						"account_type": account_type,
-						"company": self.company,
-						"is_group": 0,
-						"root_type": root_type,
-					},
-				)
-			]
-		else:
-			accounts = [
-				d.name
-				for d in frappe.db.get_all(
-					"Account", filters={"account_type": account_type, "company": self.company, "is_group": 0}
-				)
-			]
-
-		balance = prev_balance = 0.0
-		count = 0
-		for account in accounts:
-			balance += get_balance_on(account, date=self.future_to_date, in_account_currency=False)
-			count += get_count_on(account, fieldname, date=self.future_to_date)
-			prev_balance += get_balance_on(account, date=self.past_to_date, in_account_currency=False)
+		"""Get balance of accounts of the type from the movements summarised up to the period ends"""
+		summary_field = get_balance_fieldname(root_type, account_type)
+		balance = get_daily_summary_totals(self.company, None, self.future_to_date)[summary_field]
+		prev_balance = get_daily_summary_totals(self.company, None, self.past_to_date)[summary_field]
 
 		if fieldname in ("bank_balance", "credit_balance"):
 			label = ""
@@ -660,32 +634,7 @@ class EmailDigest(Document):
 			else:
 				label = self.meta.get_label(fieldname)
 
-			return {"label": label, "value": balance, "last_value": prev_balance, "count": count}
-
-	def get_roots(self, root_type):
-		return [
-			d.name
-			for d in frappe.db.get_all(
-				"Account",
-				filters={
-					"root_type": root_type.title(),
-					"company": self.company,
-					"is_group": 1,
-					"parent_account": ["in", ("", None)],
-				},
-			)
-		]
-
-	def get_root_type_accounts(self, root_type):
-		if root_type not in self._accounts:
-			self._accounts[root_type] = [
-				d.name
-				for d in frappe.db.get_all(
-					"Account",
-					filters={"root_type": root_type.title(), "company": self.company, "is_group": 0},
-				)
-			]
-		return self._accounts[root_type]
+			return {"label": label, "value": balance, "last_value": prev_balance}
 
 	def get_purchase_order(self):
 		return self.get_summary_of_doc("Purchase Order", "purchase_order")
@@ -762,18 +711,14 @@ class EmailDigest(Document):
 		return {"label": label, "value": value, "last_value": last_value, "count": count}
 
 	def get_summary_of_doc(self, doc_type, fieldname):
-		date_field = (
-			"posting_date" if doc_type in ["Sales Invoice", "Purchase Invoice"] else "transaction_date"
-		)
-
-		value = flt(self.get_total_on(doc_type, self.future_from_date, self.future_to_date)[0].grand_total)
-		count = self.get_total_on(doc_type, self.future_from_date, self.future_to_date)[0].count
+		date_field, amount_field, count_field = TRANSACTION_SUMMARY_FIELDS[doc_type]
 
-		last_value = flt(self.get_total_on(doc_type, self.past_from_date, self.past_to_date)[0].grand_total)
+		totals = get_daily_summary_totals(self.company, self.future_from_date, self.future_to_date)
+		past_totals = get_daily_summary_totals(self.company, self.past_from_date, self.past_to_date)
 
 		filters = {
 			date_field: [[">=", self.future_from_date], ["<=", self.future_to_date]],
-			"status": [["!=", "Cancelled"]],
+			"docstatus": 1,
 			"company": self.company,
 		}
 
@@ -785,22 +730,12 @@ class EmailDigest(Document):
 			doctype=doc_type,
 		)
 
-		return {"label": label, "value": value, "last_value": last_value, "count": count}
-
-	def get_total_on(self, doc_type, from_date, to_date):
-		date_field = (
-			"posting_date" if doc_type in ["Sales Invoice", "Purchase Invoice"] else "transaction_date"
-		)
-
-		return frappe.get_all(
-			doc_type,
-			filters={
-				date_field: ["between", (from_date, to_date)],
-				"status": ["not in", ("Cancelled")],
-				"company": self.company,
-			},
-			fields=["count(*) as count", "sum(grand_total) as grand_total"],
-		)
+		return {
+			"label": label,
+			"value": totals[amount_field],
+			"last_value": past_totals[amount_field],
+			"count": totals[count_field],
+		}
 
 	def get_from_to_date(self):
 		today = now_datetime().date()
@@ -906,43 +841,6 @@ def get_digest_msg(name):
 	return frappe.get_doc("Email Digest", name).get_msg_html()
 
 
-def get_incomes_expenses_for_period(account, from_date, to_date):
-	"""Get amounts for current and past periods"""
-
-	val = 0.0
-	balance_on_to_date = get_balance_on(account, date=to_date)
-	balance_before_from_date = get_balance_on(account, date=from_date - timedelta(days=1))
-
-	fy_start_date = get_fiscal_year(to_date)[1]
-
-	if from_date == fy_start_date:
-		val = balance_on_to_date
-	elif from_date > fy_start_date:
-		val = balance_on_to_date - balance_before_from_date
-	else:
-		last_year_closing_balance = get_balance_on(account, date=fy_start_date - timedelta(days=1))
-		val = balance_on_to_date + (last_year_closing_balance - balance_before_from_date)
-
-	return val
-
-
-def get_count_for_period(account, fieldname, from_date, to_date):
-	count = 0.0
-	count_on_to_date = get_count_on(account, fieldname, to_date)
-	count_before_from_date = get_count_on(account, fieldname, from_date - timedelta(days=1))
-
-	fy_start_date = get_fiscal_year(to_date)[1]
-	if from_date == fy_start_date:
-		count = count_on_to_date
-	elif from_date > fy_start_date:
-		count = count_on_to_date - count_before_from_date
-	else:
-		last_year_closing_count = get_count_on(account, fieldname, fy_start_date - timedelta(days=1))
-		count = count_on_to_date + (last_year_closing_count - count_before_from_date)
-
-	return count
-
-
 def get_future_date_for_calendaer_event(frequency):
 	from_date = to_date = today()
 
@@ -39,6 +39,17 @@ class TestTransactionDeletionRecord(FrappeTestCase):
 		tasks_containing_company = frappe.get_all("Task", filters={"company": "Dunder Mifflin Paper Co"})
 		self.assertEqual(tasks_containing_company, [])
 
+	def test_batches_resume_after_last_deleted_name(self):
+		tasks = sorted(create_task("Dunder Mifflin Paper Co").name for _i in range(5))
+		tdr = frappe.get_doc({"doctype": "Transaction Deletion Record", "company": "Dunder Mifflin Paper Co"})
+		tdr.batch_size = 2
+
+		docfield = frappe._dict(doctype_name="Task", docfield_name="company", last_deleted_name=None)
+		self.assertEqual(tdr.get_next_batch_to_delete(docfield), tasks[:2])
+
+		docfield.last_deleted_name = tasks[1]
+		self.assertEqual(tdr.get_next_batch_to_delete(docfield), tasks[2:4])
+
 	def test_company_transaction_deletion_request(self):
 		from erpnext.setup.doctype.company.company import create_transaction_deletion_request
 
@@ -67,3 +78,4 @@ def create_transaction_deletion_doc(company):
 def create_task(company):
 	task = frappe.get_doc({"doctype": "Task", "company": company, "subject": "Delete"})
 	task.insert()
+	return task
@@ -1,6 +1,7 @@
 # Copyright (c) 2021, Frappe Technologies Pvt. Ltd. and contributors
 # For license information, please see license.txt
 
+import time
 from collections import OrderedDict
 
 import frappe
@@ -10,6 +11,9 @@ from frappe.model.document import Document
 from frappe.utils import cint, comma_and, create_batch, get_link_to_form
 from frappe.utils.background_jobs import get_job, is_job_enqueued
 
+# seconds after which a deletion job stops and continues in a new job, well within the long queue timeout
+DELETION_JOB_TIME_LIMIT = 600
+
 
 class TransactionDeletionRecord(Document):
 	# begin: auto-generated types
@@ -31,6 +35,7 @@ class TransactionDeletionRecord(Document):
 		clear_notifications: DF.Check
 		company: DF.Link
 		delete_bin_data: DF.Check
+		delete_doctypes_in_parallel: DF.Check
 		delete_leads_and_addresses: DF.Check
 		delete_transactions: DF.Check
 		doctypes: DF.Table[TransactionDeletionRecordDetails]
@@ -155,15 +160,18 @@ class TransactionDeletionRecord(Document):
 		if task_to_execute:
 			method = self.task_to_internal_method_map[task_to_execute]
 			if task := getattr(self, method, None):
-				try:
-					task()
-				except Exception:
-					frappe.db.rollback()
-					traceback = frappe.get_traceback(with_context=True)
-					if traceback:
-						message = "Traceback: <br>" + traceback
-						frappe.db.set_value(self.doctype, self.name, "error_log", message)
-					frappe.db.set_value(self.doctype, self.name, "status", "Failed")
+				self.run_task(task)
+
+	def run_task(self, task, *args):
+		try:
+			task(*args)
+		except Exception:
+			frappe.db.rollback()
+			traceback = frappe.get_traceback(with_context=True)
+			if traceback:
+				message = "Traceback: <br>" + traceback
+				frappe.db.set_value(self.doctype, self.name, "error_log", message)
+			frappe.db.set_value(self.doctype, self.name, "status", "Failed")
 
 	def delete_notifications(self):
 		self.validate_doc_status()
@@ -289,54 +297,123 @@ class TransactionDeletionRecord(Document):
 	def delete_company_transactions(self):
 		self.validate_doc_status()
 		if not self.delete_transactions:
-			doctypes_to_be_ignored_list = self.get_doctypes_to_be_ignored_list()
-			self.get_doctypes_with_company_field(doctypes_to_be_ignored_list)
+			pending_doctypes = [
+				docfield
+				for docfield in self.doctypes
+				if docfield.doctype_name != self.doctype and not docfield.done
+			]
+
+			if self.delete_doctypes_in_parallel and not self.process_in_single_transaction:
+				for docfield in pending_doctypes:
+					self.enqueue_doctype_deletion(docfield.name)
+
+				if not pending_doctypes:
+					self.complete_transaction_deletion()
+				return
+
+			started_at = time.monotonic()
+			for docfield in pending_doctypes:
+				if not self.delete_doctype_transactions(docfield, started_at):
+					# as method is enqueued after commit, calling itself will not make validate_doc_status to throw
+					# continue with the remaining transactions in a new job
+					self.enqueue_task(task="Delete Transactions")
+					return
+
+			self.complete_transaction_deletion()
+
+	def enqueue_doctype_deletion(self, docfield_name: str):
+		frappe.enqueue(
+			"frappe.utils.background_jobs.run_doc_method",
+			doctype=self.doctype,
+			name=self.name,
+			doc_method="execute_doctype_deletion",
+			job_id=f"{self.generate_job_name_for_task('Delete Transactions')}_{docfield_name}",
+			queue="long",
+			enqueue_after_commit=True,
+			docfield_name=docfield_name,
+		)
 
-			self.get_all_child_doctypes()
-			for docfield in self.doctypes:
-				if docfield.doctype_name != self.doctype and not docfield.done:
-					no_of_docs = self.get_number_of_docs_linked_with_specified_company(
-						docfield.doctype_name, docfield.docfield_name
-					)
-					if no_of_docs > 0:
-						reference_docs = frappe.get_all(
-							docfield.doctype_name,
-							filters={docfield.docfield_name: self.company},
-							limit=self.batch_size,
-						)
-						reference_doc_names = [r.name for r in reference_docs]
-
-						self.delete_version_log(docfield.doctype_name, reference_doc_names)
-						self.delete_communications(docfield.doctype_name, reference_doc_names)
-						self.delete_comments(docfield.doctype_name, reference_doc_names)
-						self.unlink_attachments(docfield.doctype_name, reference_doc_names)
-						self.delete_child_tables(docfield.doctype_name, reference_doc_names)
-						self.delete_docs_linked_with_specified_company(
-							docfield.doctype_name, reference_doc_names
-						)
-						processed = int(docfield.no_of_docs) + len(reference_doc_names)
-						frappe.db.set_value(docfield.doctype, docfield.name, "no_of_docs", processed)
-					else:
-						# reset naming series
-						naming_series = frappe.db.get_value("DocType", docfield.doctype_name, "autoname")
-						if naming_series:
-							if "#" in naming_series:
-								self.update_naming_series(naming_series, docfield.doctype_name)
-						frappe.db.set_value(docfield.doctype, docfield.name, "done", 1)
-
-			pending_doctypes = frappe.db.get_all(
-				"Transaction Deletion Record Details",
-				filters={"parent": self.name, "done": 0},
-				pluck="doctype_name",
+	def execute_doctype_deletion(self, docfield_name: str):
+		self.run_task(self.delete_transactions_of_doctype, docfield_name)
+
+	def delete_transactions_of_doctype(self, docfield_name: str):
+		"""Deletes the transactions of a single DocType, when DocTypes are deleted in parallel"""
+		self.validate_doc_status()
+		docfield = next((d for d in self.doctypes if d.name == docfield_name), None)
+		if not docfield or docfield.done:
+			return
+
+		if self.delete_doctype_transactions(docfield, time.monotonic()):
+			self.complete_transaction_deletion()
+		else:
+			self.enqueue_doctype_deletion(docfield_name)
+
+	def delete_doctype_transactions(self, docfield, started_at: float) -> bool:
+		"""Deletes the transactions of the DocType in batches of names, committing after each batch.
+
+		Progress is saved on the summary row, so that a failed or interrupted job resumes after the last
+		deleted name. Returns False if the time limit of the job is reached before all are deleted.
+		"""
+		while True:
+			reference_doc_names = self.get_next_batch_to_delete(docfield)
+			if not reference_doc_names:
+				# reset naming series
+				naming_series = frappe.db.get_value("DocType", docfield.doctype_name, "autoname")
+				if naming_series:
+					if "#" in naming_series:
+						self.update_naming_series(naming_series, docfield.doctype_name)
+				frappe.db.set_value(docfield.doctype, docfield.name, "done", 1)
+				self.commit_batch()
+				return True
+
+			self.delete_version_log(docfield.doctype_name, reference_doc_names)
+			self.delete_communications(docfield.doctype_name, reference_doc_names)
+			self.delete_comments(docfield.doctype_name, reference_doc_names)
+			self.unlink_attachments(docfield.doctype_name, reference_doc_names)
+			self.delete_child_tables(docfield.doctype_name, reference_doc_names)
+			self.delete_docs_linked_with_specified_company(docfield.doctype_name, reference_doc_names)
+
+			docfield.no_of_docs = cint(docfield.no_of_docs) + len(reference_doc_names)
+			docfield.last_deleted_name = reference_doc_names[-1]
+			frappe.db.set_value(
+				docfield.doctype,
+				docfield.name,
+				{"no_of_docs": docfield.no_of_docs, "last_deleted_name": docfield.last_deleted_name},
 			)
-			if pending_doctypes:
-				# as method is enqueued after commit, calling itself will not make validate_doc_status to throw
-				# recursively call this task to delete all transactions
-				self.enqueue_task(task="Delete Transactions")
-			else:
-				self.db_set("status", "Completed")
-				self.db_set("delete_transactions", 1)
-				self.db_set("error_log", None)
+			self.commit_batch()
+
+			if (
+				not self.process_in_single_transaction
+				and time.monotonic() - started_at > DELETION_JOB_TIME_LIMIT
+			):
+				return False
+
+	def get_next_batch_to_delete(self, docfield) -> list:
+		# walk the primary key in order, so that each batch is a bounded range after the previous one
+		table = qb.DocType(docfield.doctype_name)
+		query = (
+			qb.from_(table)
+			.select(table.name)
+			.where(table[docfield.docfield_name] == self.company)
+			.orderby(table.name)
+			.limit(self.batch_size)
+		)
+		if docfield.last_deleted_name:
+			query = query.where(table.name > docfield.last_deleted_name)
+
+		return query.run(pluck=True)
+
+	def commit_batch(self):
+		if not self.process_in_single_transaction:
+			frappe.db.commit()
+
+	def complete_transaction_deletion(self):
+		if frappe.db.exists("Transaction Deletion Record Details", {"parent": self.name, "done": 0}):
+			return
+
+		self.db_set("status", "Completed")
+		self.db_set("delete_transactions", 1)
+		self.db_set("error_log", None)
 
 	def get_doctypes_to_be_ignored_list(self):
 		singles = frappe.get_all("DocType", filters={"issingle": 1}, pluck="name")
@@ -379,7 +456,7 @@ class TransactionDeletionRecord(Document):
 		)
 
 		for table in child_tables:
-			frappe.db.delete(table, {"parent": ["in", reference_doc_names]})
+			frappe.db.delete(table, {"parenttype": doctype, "parent": ["in", reference_doc_names]})
 
 	def delete_docs_linked_with_specified_company(self, doctype, reference_doc_names):
 		frappe.db.delete(doctype, {"name": ("in", reference_doc_names)})
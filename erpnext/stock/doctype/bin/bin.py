@@ -5,8 +5,8 @@
 import frappe
 from frappe.model.document import Document
 from frappe.query_builder import Case, Order
-from frappe.query_builder.functions import Coalesce, CombineDatetime, Sum
-from frappe.utils import flt
+from frappe.query_builder.functions import Coalesce, CombineDatetime, Max, Sum
+from frappe.utils import flt, get_datetime, now
 
 
 class Bin(Document):
@@ -21,6 +21,7 @@ class Bin(Document):
 		actual_qty: DF.Float
 		indented_qty: DF.Float
 		item_code: DF.Link
+		last_posting_datetime: DF.Datetime | None
 		ordered_qty: DF.Float
 		planned_qty: DF.Float
 		projected_qty: DF.Float
@@ -35,22 +36,26 @@ class Bin(Document):
 		warehouse: DF.Link
 	# end: auto-generated types
 
+	def before_insert(self):
+		# bins are created after the first stock ledger entries of the item and warehouse are posted
+		sle = frappe.qb.DocType("Stock Ledger Entry")
+		self.last_posting_datetime = (
+			frappe.qb.from_(sle)
+			.select(Max(sle.posting_datetime))
+			.where(
+				(sle.item_code == self.item_code)
+				& (sle.warehouse == self.warehouse)
+				& (sle.is_cancelled == 0)
+			)
+		).run()[0][0]
+
 	def before_save(self):
 		if self.get("__islocal") or not self.stock_uom:
 			self.stock_uom = frappe.get_cached_value("Item", self.item_code, "stock_uom")
 		self.set_projected_qty()
 
 	def set_projected_qty(self):
-		self.projected_qty = (
-			flt(self.actual_qty)
-			+ flt(self.ordered_qty)
-			+ flt(self.indented_qty)
-			+ flt(self.planned_qty)
-			- flt(self.reserved_qty)
-			- flt(self.reserved_qty_for_production)
-			- flt(self.reserved_qty_for_sub_contract)
-			- flt(self.reserved_qty_for_production_plan)
-		)
+		self.projected_qty = get_projected_qty(self)
 
 	def update_reserved_qty_for_production_plan(self, skip_project_qty_update=False):
 		"""Update qty reserved for production from Production Plan tables
@@ -211,79 +216,192 @@ def on_doctype_update():
 	frappe.db.add_unique("Bin", ["item_code", "warehouse"], constraint_name="unique_item_warehouse")
 
 
+BIN_QTY_FIELDS = [
+	"actual_qty",
+	"ordered_qty",
+	"reserved_qty",
+	"indented_qty",
+	"planned_qty",
+	"reserved_qty_for_production",
+	"reserved_qty_for_sub_contract",
+	"reserved_qty_for_production_plan",
+]
+
+
 def get_bin_details(bin_name):
-	return frappe.db.get_value(
-		"Bin",
-		bin_name,
-		[
-			"actual_qty",
-			"ordered_qty",
-			"reserved_qty",
-			"indented_qty",
-			"planned_qty",
-			"reserved_qty_for_production",
-			"reserved_qty_for_sub_contract",
-			"reserved_qty_for_production_plan",
-		],
-		as_dict=1,
+	return frappe.db.get_value("Bin", bin_name, BIN_QTY_FIELDS, as_dict=1)
+
+
+def get_bin_details_for_update(bin_names):
+	"""
+	Returns quantities of the bins, locking them in order of name so that concurrent transactions
+	updating the same bins wait for each other instead of deadlocking.
+	"""
+	if not bin_names:
+		return {}
+
+	bin = frappe.qb.DocType("Bin")
+	bins = (
+		frappe.qb.from_(bin)
+		.select(bin.name, bin.last_posting_datetime, *[bin[field] for field in BIN_QTY_FIELDS])
+		.where(bin.name.isin(list(bin_names)))
+		.orderby(bin.name)
+		.for_update()
+	).run(as_dict=True)
+
+	return {row.name: row for row in bins}
+
+
+def get_projected_qty(bin_details):
+	return (
+		flt(bin_details.actual_qty)
+		+ flt(bin_details.ordered_qty)
+		+ flt(bin_details.indented_qty)
+		+ flt(bin_details.planned_qty)
+		- flt(bin_details.reserved_qty)
+		- flt(bin_details.reserved_qty_for_production)
+		- flt(bin_details.reserved_qty_for_sub_contract)
+		- flt(bin_details.reserved_qty_for_production_plan)
 	)
 
 
-def update_qty(bin_name, args):
-	from erpnext.controllers.stock_controller import future_sle_exists
+def update_bin_values(bin_values):
+	"""Writes values of multiple bins with one statement, `bin_values` maps bin name to field values."""
+	if not bin_values:
+		return
 
-	bin_details = get_bin_details(bin_name)
-	# actual qty is already updated by processing current voucher
-	actual_qty = bin_details.actual_qty or 0.0
-	sle = frappe.qb.DocType("Stock Ledger Entry")
+	bin = frappe.qb.DocType("Bin")
+	query = frappe.qb.update(bin).set(bin.modified, now()).where(bin.name.isin(list(bin_values)))
 
-	# actual qty is not up to date in case of backdated transaction
-	if future_sle_exists(args, allow_force_reposting=False):
-		last_sle_qty = (
-			frappe.qb.from_(sle)
-			.select(sle.qty_after_transaction)
-			.where(
-				(sle.item_code == args.get("item_code"))
-				& (sle.warehouse == args.get("warehouse"))
-				& (sle.is_cancelled == 0)
-			)
-			.orderby(sle.posting_datetime, order=Order.desc)
-			.orderby(sle.creation, order=Order.desc)
-			.limit(1)
-			.run()
-		)
+	fields = sorted({field for values in bin_values.values() for field in values})
+	for field in fields:
+		case = Case()
+		for bin_name, values in bin_values.items():
+			if field in values:
+				case = case.when(bin.name == bin_name, values[field])
+		query = query.set(bin[field], case.else_(bin[field]))
+
+	query.run()
+
+	for bin_name in bin_values:
+		frappe.clear_document_cache("Bin", bin_name)
 
-		actual_qty = 0.0
-		if last_sle_qty:
-			actual_qty = last_sle_qty[0][0]
-
-	ordered_qty = flt(bin_details.ordered_qty) + flt(args.get("ordered_qty"))
-	reserved_qty = flt(bin_details.reserved_qty) + flt(args.get("reserved_qty"))
-	indented_qty = flt(bin_details.indented_qty) + flt(args.get("indented_qty"))
-	planned_qty = flt(bin_details.planned_qty) + flt(args.get("planned_qty"))
-
-	# compute projected qty
-	projected_qty = (
-		flt(actual_qty)
-		+ flt(ordered_qty)
-		+ flt(indented_qty)
-		+ flt(planned_qty)
-		- flt(reserved_qty)
-		- flt(bin_details.reserved_qty_for_production)
-		- flt(bin_details.reserved_qty_for_sub_contract)
-		- flt(bin_details.reserved_qty_for_production_plan)
+
+def set_bin_qty(bin_qty):
+	"""
+	Sets quantities of multiple bins, `bin_qty` maps bin name to a dict of fieldname and qty.
+	Projected qty is recomputed for bins with a changed qty, unchanged bins are not written.
+	"""
+	bin_details = get_bin_details_for_update(bin_qty)
+
+	bin_values = {}
+	for bin_name, qty_dict in bin_qty.items():
+		details = bin_details[bin_name]
+		values = {field: flt(qty) for field, qty in qty_dict.items() if flt(details.get(field)) != flt(qty)}
+		if not values:
+			continue
+
+		details.update(values)
+		values["projected_qty"] = get_projected_qty(details)
+		bin_values[bin_name] = values
+
+	update_bin_values(bin_values)
+
+
+class BinQtyUpdater:
+	"""
+	Accumulates changes to bins from stock ledger entries of a transaction and writes them with
+	one statement on `flush`. Bins can be locked with `lock` before the entries are posted.
+	"""
+
+	delta_fields = ("ordered_qty", "reserved_qty", "indented_qty", "planned_qty")
+
+	def __init__(self):
+		self.bins = {}
+		self.values = {}
+		self.bin_details = {}
+		self.posting_datetimes = {}
+
+	def lock(self, bin_names):
+		"""Locks the bins in order of name, so that concurrent transactions always lock them in the same order."""
+		bin_names = sorted(set(bin_names) - set(self.bin_details))
+		self.bin_details.update(get_bin_details_for_update(bin_names))
+
+	def add(self, bin_name, args):
+		"""Adds the stock ledger entry `args` to the bin, ordered, reserved, indented and planned qty are deltas."""
+		if bin_name in self.bins:
+			previous_args = self.bins[bin_name]
+			for field in self.delta_fields:
+				args[field] = flt(args.get(field)) + flt(previous_args.get(field))
+
+		if posting_datetime := args.get("posting_datetime"):
+			posting_datetime = get_datetime(posting_datetime)
+			if bin_name not in self.posting_datetimes or self.posting_datetimes[bin_name] < posting_datetime:
+				self.posting_datetimes[bin_name] = posting_datetime
+
+		self.bins[bin_name] = args
+
+	def set_values(self, bin_name, values):
+		"""Sets actual qty, stock value and valuation rate of the bin as computed from the ledger."""
+		self.values.setdefault(bin_name, {}).update(values)
+
+	def flush(self):
+		from erpnext.controllers.stock_controller import future_sle_exists
+
+		self.lock(set(self.bins) | set(self.values))
+
+		bin_values = {}
+		for bin_name in sorted(set(self.bins) | set(self.values)):
+			details = self.bin_details[bin_name]
+			values = self.values.get(bin_name, {})
+			details.update(values)
+
+			if args := self.bins.get(bin_name):
+				# actual qty is not up to date in case of backdated transaction
+				if future_sle_exists(args, allow_force_reposting=False):
+					details.actual_qty = get_last_sle_qty(args.get("item_code"), args.get("warehouse"))
+
+				for field in self.delta_fields:
+					details[field] = flt(details[field]) + flt(args.get(field))
+
+			bin_values[bin_name] = {
+				**values,
+				"actual_qty": flt(details.actual_qty),
+				**{field: details[field] for field in self.delta_fields},
+				"projected_qty": get_projected_qty(details),
+			}
+
+			# the last posting datetime only moves forward, backdated entries leave it as it is
+			posting_datetime = self.posting_datetimes.get(bin_name)
+			if posting_datetime and (
+				not details.last_posting_datetime
+				or get_datetime(details.last_posting_datetime) < posting_datetime
+			):
+				details.last_posting_datetime = posting_datetime
+				bin_values[bin_name]["last_posting_datetime"] = posting_datetime
+
+		update_bin_values(bin_values)
+		self.bins = {}
+		self.values = {}
+		self.posting_datetimes = {}
+
+
+def get_last_sle_qty(item_code, warehouse):
+	sle = frappe.qb.DocType("Stock Ledger Entry")
+	last_sle_qty = (
+		frappe.qb.from_(sle)
+		.select(sle.qty_after_transaction)
+		.where((sle.item_code == item_code) & (sle.warehouse == warehouse) & (sle.is_cancelled == 0))
+		.orderby(sle.posting_datetime, order=Order.desc)
+		.orderby(sle.creation, order=Order.desc)
+		.limit(1)
+		.run()
 	)
 
-	frappe.db.set_value(
-		"Bin",
-		bin_name,
-		{
-			"actual_qty": actual_qty,
-			"ordered_qty": ordered_qty,
-			"reserved_qty": reserved_qty,
-			"indented_qty": indented_qty,
-			"planned_qty": planned_qty,
-			"projected_qty": projected_qty,
-		},
-		update_modified=True,
-	)
+	return last_sle_qty[0][0] if last_sle_qty else 0.0
+
+
+def update_qty(bin_name, args):
+	bin_updater = BinQtyUpdater()
+	bin_updater.add(bin_name, args)
+	bin_updater.flush()
@@ -32,3 +32,80 @@ class TestBin(FrappeTestCase):
 		indexes = frappe.db.sql("show index from tabBin where Non_unique = 0", as_dict=1)
 		if not any(index.get("Key_name") == "unique_item_warehouse" for index in indexes):
 			self.fail("Expected unique index on item-warehouse")
+
+	def test_last_posting_datetime(self):
+		from erpnext.stock.doctype.stock_entry.stock_entry_utils import make_stock_entry
+		from erpnext.stock.utils import get_combine_datetime
+
+		item_code = make_item("_TestBinLastPostingDatetime", {"is_stock_item": 1}).name
+		warehouse = "_Test Warehouse - _TC"
+
+		se = make_stock_entry(item_code=item_code, target=warehouse, qty=5, rate=100)
+		last_posting_datetime = frappe.db.get_value(
+			"Bin", {"item_code": item_code, "warehouse": warehouse}, "last_posting_datetime"
+		)
+		self.assertEqual(last_posting_datetime, get_combine_datetime(se.posting_date, se.posting_time))
+
+		# backdated entries should not move the last posting datetime back
+		make_stock_entry(
+			item_code=item_code,
+			target=warehouse,
+			qty=5,
+			rate=100,
+			posting_date=frappe.utils.add_days(se.posting_date, -1),
+		)
+		self.assertEqual(
+			frappe.db.get_value(
+				"Bin", {"item_code": item_code, "warehouse": warehouse}, "last_posting_datetime"
+			),
+			last_posting_datetime,
+		)
+
+		frappe.db.rollback()
+
+	def test_bulk_bin_update(self):
+		from erpnext.stock.doctype.bin.bin import BinQtyUpdater, get_bin_details
+		from erpnext.stock.doctype.stock_entry.stock_entry_utils import make_stock_entry
+		from erpnext.stock.stock_balance import update_bins_qty
+		from erpnext.stock.utils import get_or_make_bin
+
+		item_code = make_item("_TestBulkBinUpdate", {"is_stock_item": 1}).name
+		warehouses = ["_Test Warehouse - _TC", "_Test Warehouse 1 - _TC"]
+		for warehouse in warehouses:
+			make_stock_entry(item_code=item_code, target=warehouse, qty=10, rate=100)
+
+		# valuation computed for the entries is written with the batched bin update
+		for warehouse in warehouses:
+			bin_details = frappe.db.get_value(
+				"Bin",
+				{"item_code": item_code, "warehouse": warehouse},
+				["actual_qty", "stock_value", "valuation_rate"],
+				as_dict=True,
+			)
+			self.assertEqual(bin_details.actual_qty, 10)
+			self.assertEqual(bin_details.stock_value, 1000)
+			self.assertEqual(bin_details.valuation_rate, 100)
+
+		update_bins_qty({(item_code, warehouse): {"reserved_qty": 4} for warehouse in warehouses})
+		for warehouse in warehouses:
+			bin_name = get_or_make_bin(item_code, warehouse)
+			self.assertEqual(get_bin_details(bin_name).reserved_qty, 4)
+			self.assertEqual(frappe.db.get_value("Bin", bin_name, "projected_qty"), 6)
+
+		# deltas of entries against the same bin are accumulated
+		bin_name = get_or_make_bin(item_code, warehouses[0])
+		bin_updater = BinQtyUpdater()
+		for qty in (2, 3):
+			bin_updater.add(
+				bin_name, frappe._dict(item_code=item_code, warehouse=warehouses[0], ordered_qty=qty)
+			)
+		bin_updater.flush()
+
+		bin_details = frappe.db.get_value(
+			"Bin", bin_name, ["actual_qty", "ordered_qty", "projected_qty"], as_dict=True
+		)
+		self.assertEqual(bin_details.actual_qty, 10)
+		self.assertEqual(bin_details.ordered_qty, 5)
+		self.assertEqual(bin_details.projected_qty, 11)
+
+		frappe.db.rollback()
@@ -11,7 +11,7 @@ from frappe.model.document import Document
 from frappe.utils import get_link_to_form, parse_json
 from frappe.utils.background_jobs import enqueue
 
-from erpnext.stock.report.stock_balance.stock_balance import execute
+from erpnext.stock.report.stock_balance.stock_balance import StockBalanceReport
 
 
 class ClosingStockBalance(Document):
@@ -100,13 +100,12 @@ class ClosingStockBalance(Document):
 		self.enqueue_job()
 
 	def clear_attachment(self):
-		if attachments := get_attachments(self.doctype, self.name):
-			attachment = attachments[0]
+		for attachment in get_attachments(self.doctype, self.name):
 			frappe.delete_doc("File", attachment.name)
 
 	def create_closing_stock_balance_entries(self):
-		columns, data = execute(
-			filters=frappe._dict(
+		report = StockBalanceReport(
+			frappe._dict(
 				{
 					"company": self.company,
 					"from_date": self.from_date,
@@ -121,14 +120,29 @@ class ClosingStockBalance(Document):
 				}
 			)
 		)
+		columns, data = report.run()
 
 		create_json_gz_file(
 			{"columns": columns, "data": data}, self.doctype, self.name, "closing-stock-balance"
 		)
 
+		# FIFO slots are complete only if the previous closing balance also had them (or there was none)
+		if report.fifo_checkpoints and (report.fifo_checkpoint or not report.start_from):
+			create_json_gz_file(
+				report.get_fifo_slots_checkpoint(self.to_date), self.doctype, self.name, "fifo-slots"
+			)
+
 	def get_prepared_data(self):
-		if attachments := get_attachments(self.doctype, self.name):
-			attachment = attachments[0]
+		return self.get_attached_data("closing_stock_balance")
+
+	def get_fifo_slots_checkpoint(self):
+		return self.get_attached_data("fifo_slots")
+
+	def get_attached_data(self, file_prefix):
+		for attachment in get_attachments(self.doctype, self.name):
+			if not (attachment.file_name or "").startswith(file_prefix):
+				continue
+
 			attached_file = frappe.get_doc("File", attachment.name)
 
 			data = gzip.decompress(attached_file.get_content())
@@ -29,6 +29,7 @@ from erpnext.controllers.item_variant import (
 	ItemVariantExistsError,
 	copy_attributes_to_variant,
 	get_variant,
+	get_variant_fields,
 	make_variant_item_code,
 	validate_item_variant_attributes,
 )
@@ -941,13 +942,13 @@ class Item(Document):
 				d.idx = i + 1
 				args[d.attribute] = d.attribute_value
 
-			variant = get_variant(self.variant_of, args, self.name)
+			variant = not self.flags.variant_exists_checked and get_variant(self.variant_of, args, self.name)
 			if variant:
 				frappe.throw(
 					_("Item variant {0} exists with same attributes").format(variant), ItemVariantExistsError
 				)
 
-			validate_item_variant_attributes(self, args)
+			validate_item_variant_attributes(self, args, self.flags.attribute_values)
 
 			# copy variant_of value for each attribute row
 			for d in self.attributes:
@@ -1367,9 +1368,10 @@ def get_item_attribute(parent, attribute_value=""):
 
 def update_variants(variants, template, publish_progress=True):
 	total = len(variants)
+	allow_fields = get_variant_fields()
 	for count, d in enumerate(variants, start=1):
 		variant = frappe.get_doc("Item", d)
-		copy_attributes_to_variant(template, variant)
+		copy_attributes_to_variant(template, variant, allow_fields)
 		variant.save()
 		if publish_progress:
 			frappe.publish_progress(count / total * 100, title=_("Updating Variants..."))
@@ -4,12 +4,19 @@
 
 import frappe
 from frappe import _
+from frappe.model import default_fields
 from frappe.model.document import Document
 from frappe.model.meta import get_field_precision
+from frappe.query_builder import Case
 from frappe.query_builder.custom import ConstantColumn
-from frappe.utils import flt
+from frappe.utils import cint, flt
 
 import erpnext
+from erpnext.controllers.stock_controller import (
+	create_item_wise_repost_entries_for_vouchers,
+	future_sle_exists,
+	repost_required_for_queue,
+)
 from erpnext.controllers.taxes_and_totals import init_landed_taxes_and_totals
 from erpnext.stock.doctype.serial_no.serial_no import get_serial_nos
 
@@ -150,6 +157,7 @@ class LandedCostVoucher(Document):
 			for item in self.get("items"):
 				total_item_cost += item.get(based_on_field)
 
+			precision = self.get("items")[0].precision("applicable_charges") if self.get("items") else None
 			for item in self.get("items"):
 				if not total_item_cost and not item.get(based_on_field):
 					frappe.throw(
@@ -161,7 +169,7 @@ class LandedCostVoucher(Document):
 				item.applicable_charges = flt(
 					flt(item.get(based_on_field))
 					* (flt(self.total_taxes_and_charges) / flt(total_item_cost)),
-					item.precision("applicable_charges"),
+					precision,
 				)
 				total_charges += item.applicable_charges
 				item_count += 1
@@ -220,11 +228,19 @@ class LandedCostVoucher(Document):
 		self.update_landed_cost()
 
 	def update_landed_cost(self):
-		for d in self.get("purchase_receipts"):
-			doc = frappe.get_doc(d.receipt_document_type, d.receipt_document)
-			# check if there are {qty} assets created and linked to this receipt document
-			if self.docstatus != 2:
-				self.validate_asset_qty_and_status(d.receipt_document_type, doc)
+		receipt_documents = [
+			frappe.get_doc(d.receipt_document_type, d.receipt_document) for d in self.get("purchase_receipts")
+		]
+
+		# check if there are {qty} assets created and linked to the receipt documents
+		if self.docstatus != 2:
+			self.validate_asset_qty_and_status()
+
+		for doc in receipt_documents:
+			# values as loaded from the database, to update only the columns changed below
+			values_before_update = {
+				item.name: item.get_valid_dict(ignore_virtual=True) for item in doc.get("items")
+			}
 
 			# set landed cost voucher amount in pr item
 			doc.set_landed_cost_voucher_amount()
@@ -232,17 +248,15 @@ class LandedCostVoucher(Document):
 			# set valuation amount in pr item
 			doc.update_valuation_rate(reset_outgoing_rate=False)
 
-			# db_update will update and save landed_cost_voucher_amount and voucher_amount in PR
-			for item in doc.get("items"):
-				item.db_update()
+			# save the changed item columns of the receipt in one update
+			update_receipt_item_valuation(doc, values_before_update)
 
 			# asset rate will be updated while creating asset gl entries from PI or PY
 
 			# update latest valuation rate in serial no
 			self.update_rate_in_serial_no_for_non_asset_items(doc)
 
-		for d in self.get("purchase_receipts"):
-			doc = frappe.get_doc(d.receipt_document_type, d.receipt_document)
+		for doc in receipt_documents:
 			# update stock & gl entries for cancelled state of PR
 			doc.docstatus = 2
 			doc.update_stock_ledger(allow_negative_stock=True, via_landed_cost_voucher=True)
@@ -252,13 +266,42 @@ class LandedCostVoucher(Document):
 			doc.docstatus = 1
 			doc.make_bundle_using_old_serial_batch_fields(via_landed_cost_voucher=True)
 			doc.update_stock_ledger(allow_negative_stock=True, via_landed_cost_voucher=True)
-			if d.receipt_document_type == "Purchase Receipt":
+			if doc.doctype == "Purchase Receipt":
 				doc.make_gl_entries(via_landed_cost_voucher=True)
 			else:
 				doc.make_gl_entries()
-			doc.repost_future_sle_and_gle(via_landed_cost_voucher=True)
 
-	def validate_asset_qty_and_status(self, receipt_document_type, receipt_document):
+		self.repost_future_sle_and_gle(receipt_documents)
+
+	def repost_future_sle_and_gle(self, receipt_documents):
+		"""
+		Reposts entries after all receipt documents together. With item based reposting, one Repost Item
+		Valuation is made per item and warehouse from its earliest posting in the receipt documents.
+		"""
+		if not cint(frappe.db.get_single_value("Stock Reposting Settings", "item_based_reposting")):
+			for doc in receipt_documents:
+				doc.repost_future_sle_and_gle(via_landed_cost_voucher=True)
+			return
+
+		vouchers = []
+		for doc in receipt_documents:
+			args = frappe._dict(
+				{
+					"posting_date": doc.posting_date,
+					"posting_time": doc.posting_time,
+					"voucher_type": doc.doctype,
+					"voucher_no": doc.name,
+					"company": doc.company,
+					"via_landed_cost_voucher": True,
+				}
+			)
+			if future_sle_exists(args) or repost_required_for_queue(doc):
+				vouchers.append((doc.doctype, doc.name))
+
+		if vouchers:
+			create_item_wise_repost_entries_for_vouchers(vouchers, via_landed_cost_voucher=True)
+
+	def validate_asset_qty_and_status(self):
 		for item in self.get("items"):
 			if item.is_fixed_asset:
 				receipt_document_type = (
@@ -299,6 +342,38 @@ class LandedCostVoucher(Document):
 					)
 
 
+def update_receipt_item_valuation(receipt_document, values_before_update):
+	"""
+	Updates the item columns of the receipt document changed since `values_before_update` in a single
+	query. The landed cost, the valuation rate, the floats rounded with it and anything set by the
+	regional valuation hook are all written back.
+	"""
+	items = receipt_document.get("items")
+	if not items:
+		return
+
+	updated_values = {item.name: item.get_valid_dict(ignore_virtual=True) for item in items}
+	changed_fields = {
+		fieldname
+		for name, values in updated_values.items()
+		for fieldname, value in values.items()
+		if fieldname not in default_fields and value != values_before_update.get(name, {}).get(fieldname)
+	}
+	if not changed_fields:
+		return
+
+	item_table = frappe.qb.DocType(receipt_document.doctype + " Item")
+	query = frappe.qb.update(item_table).where(item_table.name.isin(list(updated_values)))
+
+	for fieldname in sorted(changed_fields):
+		values = Case()
+		for name, item_values in updated_values.items():
+			values = values.when(item_table.name == name, item_values.get(fieldname))
+		query = query.set(item_table[fieldname], values)
+
+	query.run()
+
+
 def get_pr_items(purchase_receipt):
 	item = frappe.qb.DocType("Item")
 	pr_item = frappe.qb.DocType(purchase_receipt.receipt_document_type + " Item")
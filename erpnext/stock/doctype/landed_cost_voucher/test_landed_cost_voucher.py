@@ -498,6 +498,66 @@ class TestLandedCostVoucher(FrappeTestCase):
 		self.assertEqual(pr.items[0].landed_cost_voucher_amount, 100)
 		self.assertEqual(pr.items[1].landed_cost_voucher_amount, 100)
 
+	def test_landed_cost_voucher_against_multiple_receipts(self):
+		from erpnext.stock.doctype.stock_entry.stock_entry_utils import make_stock_entry
+
+		company = "_Test Company with perpetual inventory"
+		item_code = "_Test Item"
+		warehouse = "Stores - TCP1"
+
+		receipts = [
+			make_purchase_receipt(
+				company=company,
+				item_code=item_code,
+				warehouse=warehouse,
+				qty=5,
+				rate=100,
+				posting_date=add_days(today(), days),
+			)
+			for days in (-2, -1)
+		]
+
+		# stock entry after the receipts so that they need reposting
+		make_stock_entry(item_code=item_code, source=warehouse, qty=1, company=company)
+
+		lcv = make_landed_cost_voucher(
+			company=company,
+			receipt_document_type="Purchase Receipt",
+			receipt_document=receipts[0].name,
+			charges=200,
+			do_not_save=True,
+		)
+		lcv.append(
+			"purchase_receipts",
+			{
+				"receipt_document_type": "Purchase Receipt",
+				"receipt_document": receipts[1].name,
+				"supplier": receipts[1].supplier,
+				"posting_date": receipts[1].posting_date,
+				"grand_total": receipts[1].grand_total,
+			},
+		)
+		lcv.submit()
+
+		for pr in receipts:
+			pr.load_from_db()
+			self.assertEqual(pr.items[0].landed_cost_voucher_amount, 100)
+			self.assertEqual(pr.items[0].valuation_rate, 120)
+
+		# one repost entry for the item and warehouse from the earliest receipt
+		repost_entries = frappe.get_all(
+			"Repost Item Valuation",
+			filters={
+				"item_code": item_code,
+				"warehouse": warehouse,
+				"via_landed_cost_voucher": 1,
+				"creation": (">=", lcv.creation),
+			},
+			fields=["posting_date"],
+		)
+		self.assertEqual(len(repost_entries), 1)
+		self.assertEqual(repost_entries[0].posting_date, receipts[0].posting_date)
+
 	def test_multi_currency_lcv(self):
 		from erpnext.setup.doctype.currency_exchange.test_currency_exchange import (
 			save_new_records,
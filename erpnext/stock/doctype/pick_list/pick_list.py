@@ -474,23 +474,18 @@ class PickList(Document):
 		for row in reset_rows:
 			self.remove(row)
 
+		# fetch stock for all the items in one go (grouped by item type) instead of per row
+		self.item_location_map = get_available_item_locations_map(
+			self.item_count_map,
+			from_warehouses,
+			self.company,
+			picked_items_details=picked_items_details,
+			consider_rejected_warehouses=self.consider_rejected_warehouses,
+		)
+
 		updated_locations = frappe._dict()
 		len_idx = len(self.get("locations")) or 0
 		for item_doc in items:
-			item_code = item_doc.item_code
-
-			self.item_location_map.setdefault(
-				item_code,
-				get_available_item_locations(
-					item_code,
-					from_warehouses,
-					self.item_count_map.get(item_code),
-					self.company,
-					picked_item_details=picked_items_details.get(item_code),
-					consider_rejected_warehouses=self.consider_rejected_warehouses,
-				),
-			)
-
 			locations = get_items_with_location_and_quantity(item_doc, self.item_location_map, self.docstatus)
 
 			item_doc.idx = None
@@ -889,50 +884,256 @@ def get_available_item_locations(
 	picked_item_details=None,
 	consider_rejected_warehouses=False,
 ):
-	locations = []
+	return get_available_item_locations_map(
+		{item_code: required_qty},
+		from_warehouses,
+		company,
+		ignore_validation=ignore_validation,
+		picked_items_details={item_code: picked_item_details},
+		consider_rejected_warehouses=consider_rejected_warehouses,
+	)[item_code]
 
-	has_serial_no = frappe.get_cached_value("Item", item_code, "has_serial_no")
-	has_batch_no = frappe.get_cached_value("Item", item_code, "has_batch_no")
 
-	if has_batch_no and has_serial_no:
-		locations = get_available_item_locations_for_serial_and_batched_item(
-			item_code,
+def get_locations_for_required_qty(
+	item_code, locations, required_qty, ignore_validation=False, picked_item_details=None
+):
+	if picked_item_details:
+		locations = filter_locations_by_picked_materials(locations, picked_item_details)
+
+	if locations:
+		locations = get_locations_based_on_required_qty(locations, required_qty)
+
+	if not ignore_validation:
+		validate_picked_materials(item_code, required_qty, locations, picked_item_details)
+
+	return locations
+
+
+def get_available_item_locations_map(
+	item_qty_map,
+	from_warehouses,
+	company,
+	ignore_validation=False,
+	picked_items_details=None,
+	consider_rejected_warehouses=False,
+):
+	"""Returns available locations for multiple items as {item_code: locations}.
+
+	Stock is fetched in bulk per item type (plain, serialized, batched, serial + batched)
+	rather than with separate queries for every item.
+	"""
+	item_location_map = frappe._dict()
+	if not item_qty_map:
+		return item_location_map
+
+	picked_items_details = picked_items_details or {}
+	item_types = get_item_types_for_pick_list(list(item_qty_map))
+
+	serial_and_batched_items, serialized_items, batched_items, other_items = [], [], [], []
+	for item_code in item_qty_map:
+		has_serial_no, has_batch_no = item_types.get(item_code, (0, 0))
+		if has_batch_no and has_serial_no:
+			serial_and_batched_items.append(item_code)
+		elif has_serial_no:
+			serialized_items.append(item_code)
+		elif has_batch_no:
+			batched_items.append(item_code)
+		else:
+			other_items.append(item_code)
+
+	available_locations = frappe._dict()
+	available_locations.update(
+		get_available_locations_for_serial_and_batched_items(
+			serial_and_batched_items,
 			from_warehouses,
-			required_qty,
 			company,
 			consider_rejected_warehouses=consider_rejected_warehouses,
 		)
-	elif has_serial_no:
-		locations = get_available_item_locations_for_serialized_item(
-			item_code,
+	)
+	available_locations.update(
+		get_available_locations_for_serialized_items(
+			serialized_items,
 			from_warehouses,
 			company,
 			consider_rejected_warehouses=consider_rejected_warehouses,
 		)
-	elif has_batch_no:
-		locations = get_available_item_locations_for_batched_item(
-			item_code,
+	)
+	available_locations.update(
+		get_available_locations_for_batched_items(
+			batched_items,
 			from_warehouses,
 			consider_rejected_warehouses=consider_rejected_warehouses,
 		)
+	)
+	available_locations.update(
+		get_available_locations_for_other_items(
+			other_items,
+			from_warehouses,
+			company,
+			consider_rejected_warehouses=consider_rejected_warehouses,
+		)
+	)
+
+	for item_code, required_qty in item_qty_map.items():
+		item_location_map[item_code] = get_locations_for_required_qty(
+			item_code,
+			available_locations.get(item_code, []),
+			required_qty,
+			ignore_validation=ignore_validation,
+			picked_item_details=picked_items_details.get(item_code),
+		)
+
+	return item_location_map
+
+
+def get_item_types_for_pick_list(item_codes) -> dict[str, tuple[int, int]]:
+	items = frappe.get_all(
+		"Item",
+		filters={"name": ("in", item_codes)},
+		fields=["name", "has_serial_no", "has_batch_no"],
+	)
+
+	return {d.name: (cint(d.has_serial_no), cint(d.has_batch_no)) for d in items}
+
+
+def get_available_locations_for_serial_and_batched_items(
+	item_codes,
+	from_warehouses,
+	company,
+	consider_rejected_warehouses=False,
+) -> dict[str, list[dict]]:
+	if not item_codes:
+		return {}
+
+	# Get batch nos by FIFO
+	batch_locations = get_available_locations_for_batched_items(
+		item_codes,
+		from_warehouses,
+		consider_rejected_warehouses=consider_rejected_warehouses,
+	)
+
+	batch_nos = list({location.batch_no for locations in batch_locations.values() for location in locations})
+	if not batch_nos:
+		return batch_locations
+
+	sn = frappe.qb.DocType("Serial No")
+	serial_nos = (
+		frappe.qb.from_(sn)
+		.select(sn.name, sn.item_code, sn.batch_no, sn.warehouse)
+		.where((sn.item_code.isin(item_codes)) & (sn.company == company) & (sn.batch_no.isin(batch_nos)))
+		.orderby(sn.creation)
+	).run(as_dict=True)
+
+	batch_serial_nos_map = defaultdict(list)
+	for row in serial_nos:
+		batch_serial_nos_map[(row.item_code, row.batch_no, row.warehouse)].append(row.name)
+
+	for item_code, locations in batch_locations.items():
+		for location in locations:
+			location.serial_nos = batch_serial_nos_map.get(
+				(item_code, location.batch_no, location.warehouse), []
+			)
+			location.qty = len(location.serial_nos)
+
+	return batch_locations
+
+
+def get_available_locations_for_serialized_items(
+	item_codes,
+	from_warehouses,
+	company,
+	consider_rejected_warehouses=False,
+) -> dict[str, list[dict]]:
+	if not item_codes:
+		return {}
+
+	sn = frappe.qb.DocType("Serial No")
+	query = (
+		frappe.qb.from_(sn)
+		.select(sn.name, sn.item_code, sn.warehouse)
+		.where(sn.item_code.isin(item_codes))
+		.orderby(sn.creation)
+	)
+
+	if from_warehouses:
+		query = query.where(sn.warehouse.isin(from_warehouses))
 	else:
-		locations = get_available_item_locations_for_other_item(
+		query = query.where(Coalesce(sn.warehouse, "") != "")
+		query = query.where(sn.company == company)
+
+	if not consider_rejected_warehouses:
+		if rejected_warehouses := get_rejected_warehouses():
+			query = query.where(sn.warehouse.notin(rejected_warehouses))
+
+	warehouse_serial_nos_map = OrderedDict()
+	for row in query.run(as_dict=True):
+		warehouse_serial_nos_map.setdefault((row.item_code, row.warehouse), []).append(row.name)
+
+	item_locations = defaultdict(list)
+	for (item_code, warehouse), serial_nos in warehouse_serial_nos_map.items():
+		item_locations[item_code].append(
+			frappe._dict(
+				{
+					"qty": len(serial_nos),
+					"warehouse": warehouse,
+					"item_code": item_code,
+					"serial_nos": serial_nos,
+				}
+			)
+		)
+
+	return item_locations
+
+
+def get_available_locations_for_batched_items(
+	item_codes,
+	from_warehouses,
+	consider_rejected_warehouses=False,
+) -> dict[str, list[dict]]:
+	# Batch availability depends on reserved, picked and POS batches which are
+	# resolved by get_auto_batch_nos, so each item is still fetched separately.
+	return {
+		item_code: get_available_item_locations_for_batched_item(
 			item_code,
 			from_warehouses,
-			company,
 			consider_rejected_warehouses=consider_rejected_warehouses,
 		)
+		for item_code in item_codes
+	}
 
-	if picked_item_details:
-		locations = filter_locations_by_picked_materials(locations, picked_item_details)
 
-	if locations:
-		locations = get_locations_based_on_required_qty(locations, required_qty)
+def get_available_locations_for_other_items(
+	item_codes,
+	from_warehouses,
+	company,
+	consider_rejected_warehouses=False,
+) -> dict[str, list[dict]]:
+	if not item_codes:
+		return {}
 
-	if not ignore_validation:
-		validate_picked_materials(item_code, required_qty, locations, picked_item_details)
+	bin = frappe.qb.DocType("Bin")
+	query = (
+		frappe.qb.from_(bin)
+		.select(bin.item_code, bin.warehouse, bin.actual_qty.as_("qty"))
+		.where((bin.item_code.isin(item_codes)) & (bin.actual_qty > 0))
+		.orderby(bin.creation)
+	)
 
-	return locations
+	if from_warehouses:
+		query = query.where(bin.warehouse.isin(from_warehouses))
+	else:
+		wh = frappe.qb.DocType("Warehouse")
+		query = query.from_(wh).where((bin.warehouse == wh.name) & (wh.company == company))
+
+	if not consider_rejected_warehouses:
+		if rejected_warehouses := get_rejected_warehouses():
+			query = query.where(bin.warehouse.notin(rejected_warehouses))
+
+	item_locations = defaultdict(list)
+	for row in query.run(as_dict=True):
+		item_locations[row.pop("item_code")].append(row)
+
+	return item_locations
 
 
 def get_locations_based_on_required_qty(locations, required_qty):
@@ -1003,94 +1204,6 @@ def filter_locations_by_picked_materials(locations, picked_item_details) -> list
 	return filterd_locations
 
 
-def get_available_item_locations_for_serial_and_batched_item(
-	item_code,
-	from_warehouses,
-	required_qty,
-	company,
-	consider_rejected_warehouses=False,
-):
-	# Get batch nos by FIFO
-	locations = get_available_item_locations_for_batched_item(
-		item_code,
-		from_warehouses,
-		consider_rejected_warehouses=consider_rejected_warehouses,
-	)
-
-	if locations:
-		sn = frappe.qb.DocType("Serial No")
-		conditions = (sn.item_code == item_code) & (sn.company == company)
-
-		for location in locations:
-			location.qty = (
-				required_qty if location.qty > required_qty else location.qty
-			)  # if extra qty in batch
-
-			serial_nos = (
-				frappe.qb.from_(sn)
-				.select(sn.name)
-				.where(
-					(conditions) & (sn.batch_no == location.batch_no) & (sn.warehouse == location.warehouse)
-				)
-				.orderby(sn.creation)
-			).run(as_dict=True)
-
-			serial_nos = [sn.name for sn in serial_nos]
-			location.serial_nos = serial_nos
-			location.qty = len(serial_nos)
-
-	return locations
-
-
-def get_available_item_locations_for_serialized_item(
-	item_code,
-	from_warehouses,
-	company,
-	consider_rejected_warehouses=False,
-):
-	sn = frappe.qb.DocType("Serial No")
-	query = (
-		frappe.qb.from_(sn)
-		.select(sn.name, sn.warehouse)
-		.where(sn.item_code == item_code)
-		.orderby(sn.creation)
-	)
-
-	if from_warehouses:
-		query = query.where(sn.warehouse.isin(from_warehouses))
-	else:
-		query = query.where(Coalesce(sn.warehouse, "") != "")
-		query = query.where(sn.company == company)
-
-	if not consider_rejected_warehouses:
-		if rejected_warehouses := get_rejected_warehouses():
-			query = query.where(sn.warehouse.notin(rejected_warehouses))
-
-	serial_nos = query.run(as_list=True)
-
-	warehouse_serial_nos_map = frappe._dict()
-	for serial_no, warehouse in serial_nos:
-		warehouse_serial_nos_map.setdefault(warehouse, []).append(serial_no)
-
-	locations = []
-
-	for warehouse, serial_nos in warehouse_serial_nos_map.items():
-		qty = len(serial_nos)
-
-		locations.append(
-			frappe._dict(
-				{
-					"qty": qty,
-					"warehouse": warehouse,
-					"item_code": item_code,
-					"serial_nos": serial_nos,
-				}
-			)
-		)
-
-	return locations
-
-
 def get_available_item_locations_for_batched_item(
 	item_code,
 	from_warehouses,
@@ -1135,35 +1248,6 @@ def get_available_item_locations_for_batched_item(
 	return locations
 
 
-def get_available_item_locations_for_other_item(
-	item_code,
-	from_warehouses,
-	company,
-	consider_rejected_warehouses=False,
-):
-	bin = frappe.qb.DocType("Bin")
-	query = (
-		frappe.qb.from_(bin)
-		.select(bin.warehouse, bin.actual_qty.as_("qty"))
-		.where((bin.item_code == item_code) & (bin.actual_qty > 0))
-		.orderby(bin.creation)
-	)
-
-	if from_warehouses:
-		query = query.where(bin.warehouse.isin(from_warehouses))
-	else:
-		wh = frappe.qb.DocType("Warehouse")
-		query = query.from_(wh).where((bin.warehouse == wh.name) & (wh.company == company))
-
-	if not consider_rejected_warehouses:
-		if rejected_warehouses := get_rejected_warehouses():
-			query = query.where(bin.warehouse.notin(rejected_warehouses))
-
-	item_locations = query.run(as_dict=True)
-
-	return item_locations
-
-
 @frappe.whitelist()
 def create_delivery_note(source_name, target_doc=None):
 	pick_list = frappe.get_doc("Pick List", source_name)
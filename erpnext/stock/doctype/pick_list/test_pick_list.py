@@ -1307,3 +1307,39 @@ class TestPickList(FrappeTestCase):
 
 		for loc in pl.locations:
 			self.assertEqual(loc.batch_no, batch2)
+
+	def test_bulk_item_locations_match_item_wise_locations(self):
+		from erpnext.stock.doctype.pick_list.pick_list import (
+			get_available_item_locations,
+			get_available_item_locations_map,
+		)
+
+		warehouse = "_Test Warehouse - _TC"
+		item = make_item("Test Bulk Pick List Item", properties={"is_stock_item": 1}).name
+		serial_item = make_item(
+			"Test Bulk Pick List Serial Item",
+			properties={"is_stock_item": 1, "has_serial_no": 1, "serial_no_series": "BLK-PL-SN-.####"},
+		).name
+		batch_item = make_item(
+			"Test Bulk Pick List Batch Item",
+			properties={
+				"is_stock_item": 1,
+				"has_batch_no": 1,
+				"create_new_batch": 1,
+				"batch_number_series": "BLK-PL-BTH-.####",
+			},
+		).name
+
+		for item_code in (item, serial_item, batch_item):
+			make_stock_entry(item=item_code, to_warehouse=warehouse, qty=5, basic_rate=100)
+			make_stock_entry(item=item_code, to_warehouse=warehouse, qty=5, basic_rate=100)
+
+		item_qty_map = {item: 7, serial_item: 6, batch_item: 8}
+		bulk_locations = get_available_item_locations_map(item_qty_map, [warehouse], "_Test Company")
+
+		for item_code, required_qty in item_qty_map.items():
+			locations = get_available_item_locations(item_code, [warehouse], required_qty, "_Test Company")
+			self.assertEqual(
+				[(d.warehouse, d.get("batch_no"), d.qty) for d in bulk_locations[item_code]],
+				[(d.warehouse, d.get("batch_no"), d.qty) for d in locations],
+			)
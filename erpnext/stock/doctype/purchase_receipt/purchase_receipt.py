@@ -485,7 +485,11 @@ class PurchaseReceipt(BuyingController):
 
 			outgoing_amount = item.base_net_amount
 			if self.is_internal_transfer() and item.valuation_rate:
-				outgoing_amount = abs(get_stock_value_difference(self.name, item.name, item.from_warehouse))
+				outgoing_amount = abs(
+					get_stock_value_difference(
+						self.name, item.name, item.from_warehouse, self.flags.preview_sl_entries
+					)
+				)
 				credit_amount = outgoing_amount
 
 			if credit_amount:
@@ -691,7 +695,9 @@ class PurchaseReceipt(BuyingController):
 						flt(d.base_net_amount) + flt(d.item_tax_amount) + flt(d.landed_cost_voucher_amount)
 					)
 				elif warehouse_account.get(d.warehouse):
-					stock_value_diff = get_stock_value_difference(self.name, d.name, d.warehouse)
+					stock_value_diff = get_stock_value_difference(
+						self.name, d.name, d.warehouse, self.flags.preview_sl_entries
+					)
 					stock_asset_account_name = warehouse_account[d.warehouse]["account"]
 					supplier_warehouse_account = warehouse_account.get(self.supplier_warehouse, {}).get(
 						"account"
@@ -936,7 +942,18 @@ class PurchaseReceipt(BuyingController):
 		).run()
 
 
-def get_stock_value_difference(voucher_no, voucher_detail_no, warehouse):
+def get_stock_value_difference(voucher_no, voucher_detail_no, warehouse, preview_sl_entries=None):
+	if preview_sl_entries is not None:
+		# entries computed in memory for ledger previews
+		return next(
+			(
+				sle.stock_value_difference
+				for sle in preview_sl_entries
+				if sle.voucher_detail_no == voucher_detail_no and sle.warehouse == warehouse
+			),
+			None,
+		)
+
 	return frappe.db.get_value(
 		"Stock Ledger Entry",
 		{
@@ -336,6 +336,61 @@ class TestPurchaseReceipt(FrappeTestCase):
 		pr.cancel()
 		self.assertTrue(get_gl_entries("Purchase Receipt", pr.name))
 
+	def test_ledger_preview_matches_posted_entries(self):
+		from erpnext.controllers.stock_controller import (
+			get_gl_entries_for_preview,
+			get_sl_entries_for_preview,
+		)
+
+		pr = make_purchase_receipt(
+			company="_Test Company with perpetual inventory",
+			warehouse="Stores - TCP1",
+			supplier_warehouse="Work In Progress - TCP1",
+			get_multiple_items=True,
+			get_taxes_and_charges=True,
+			do_not_submit=1,
+		)
+
+		pr.docstatus = 1
+		pr.flags.ledger_preview = True
+		pr.update_stock_ledger()
+		preview_sl_entries = get_sl_entries_for_preview(pr)
+		preview_gl_entries = get_gl_entries_for_preview(pr)
+
+		# nothing is posted for previews
+		self.assertFalse(frappe.db.exists("Stock Ledger Entry", {"voucher_no": pr.name}))
+		self.assertFalse(frappe.db.exists("GL Entry", {"voucher_no": pr.name}))
+
+		pr = frappe.get_doc("Purchase Receipt", pr.name)
+		pr.submit()
+
+		sl_entries = frappe.get_all(
+			"Stock Ledger Entry",
+			filters={"voucher_type": pr.doctype, "voucher_no": pr.name, "is_cancelled": 0},
+			fields=["item_code", "warehouse", "qty_after_transaction", "stock_value_difference"],
+		)
+		self.assertEqual(
+			sorted(
+				(d.item_code, d.warehouse, flt(d.qty_after_transaction), flt(d.stock_value_difference))
+				for d in preview_sl_entries
+			),
+			sorted(
+				(d.item_code, d.warehouse, flt(d.qty_after_transaction), flt(d.stock_value_difference))
+				for d in sl_entries
+			),
+		)
+
+		def get_account_balances(gl_entries):
+			balances = {}
+			for gle in gl_entries:
+				balances[gle.account] = balances.get(gle.account, 0.0) + flt(gle.debit) - flt(gle.credit)
+			return {account: flt(balance, 2) for account, balance in balances.items()}
+
+		self.assertEqual(
+			get_account_balances(preview_gl_entries),
+			get_account_balances(get_gl_entries("Purchase Receipt", pr.name)),
+		)
+
 	def test_serial_no_warehouse(self):
 		pr = make_purchase_receipt(item_code="_Test Serialized Item With Series", qty=1)
 		pr_row_1_serial_no = get_serial_nos_from_bundle(pr.get("items")[0].serial_and_batch_bundle)[0]
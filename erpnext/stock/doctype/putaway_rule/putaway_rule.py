@@ -113,6 +113,9 @@ def apply_putaway_rule(doctype, items, company, sync=None, purpose=None):
 
 	items_not_accomodated, updated_table = [], []
 	item_wise_rules = defaultdict(list)
+	capacity_index = PutawayCapacityIndex(
+		company, [item.get("item_code") for item in items], [item.get("uom") for item in items]
+	)
 
 	for item in items:
 		if isinstance(item, dict):
@@ -122,13 +125,12 @@ def apply_putaway_rule(doctype, items, company, sync=None, purpose=None):
 		item.conversion_factor = flt(item.conversion_factor) or 1.0
 		pending_qty, item_code = flt(item.qty), item.item_code
 		pending_stock_qty = flt(item.transfer_qty) if doctype == "Stock Entry" else flt(item.stock_qty)
-		uom_must_be_whole_number = frappe.db.get_value("UOM", item.uom, "must_be_whole_number")
 
 		if not pending_qty or not item_code:
 			updated_table = add_row(item, pending_qty, source_warehouse or item.warehouse, updated_table)
 			continue
 
-		at_capacity, rules = get_ordered_putaway_rules(item_code, company, source_warehouse=source_warehouse)
+		at_capacity, rules = capacity_index.get_ordered_rules(item_code, source_warehouse=source_warehouse)
 
 		if not rules:
 			warehouse = source_warehouse or item.get("warehouse")
@@ -155,7 +157,7 @@ def apply_putaway_rule(doctype, items, company, sync=None, purpose=None):
 				)
 				qty_to_allocate = stock_qty_to_allocate / item.conversion_factor
 
-				if uom_must_be_whole_number:
+				if capacity_index.must_be_whole_number(item.uom):
 					qty_to_allocate = floor(qty_to_allocate)
 					stock_qty_to_allocate = qty_to_allocate * item.conversion_factor
 
@@ -226,38 +228,83 @@ def _items_changed(old, new, doctype: str) -> bool:
 	return False
 
 
-def get_ordered_putaway_rules(item_code, company, source_warehouse=None):
-	"""Returns an ordered list of putaway rules to apply on an item."""
-	filters = {"item_code": item_code, "company": company, "disable": 0}
-	if source_warehouse:
-		filters.update({"warehouse": ["!=", source_warehouse]})
-
-	rules = frappe.get_all(
-		"Putaway Rule",
-		fields=["name", "item_code", "stock_capacity", "priority", "warehouse"],
-		filters=filters,
-		order_by="priority asc, capacity desc",
-	)
+class PutawayCapacityIndex:
+	"""
+	Putaway Rules of items in a company with the free space left in their warehouses, loaded once
+	for all rows of a document along with the whole number UOMs of the rows. Free space of a rule is
+	shared by the rows allocated to it.
+	"""
+
+	def __init__(self, company, item_codes, uoms=None):
+		self.rules = defaultdict(list)
+		self.whole_number_uoms = set()
+
+		item_codes = list({item_code for item_code in item_codes if item_code})
+		if not item_codes:
+			return
+
+		rules = frappe.get_all(
+			"Putaway Rule",
+			fields=["name", "item_code", "stock_capacity", "priority", "warehouse"],
+			filters={"item_code": ("in", item_codes), "company": company, "disable": 0},
+			order_by="priority asc, capacity desc",
+		)
+		if not rules:
+			return
+
+		balance_qty = get_balance_qty(item_codes, list({rule.warehouse for rule in rules}))
+		for rule in rules:
+			rule["free_space"] = flt(rule.stock_capacity) - balance_qty.get(
+				(rule.item_code, rule.warehouse), 0
+			)
+			self.rules[rule.item_code].append(rule)
+
+		if uoms := list({uom for uom in uoms or [] if uom}):
+			self.whole_number_uoms = set(
+				frappe.get_all("UOM", filters={"name": ("in", uoms), "must_be_whole_number": 1}, pluck="name")
+			)
+
+	def must_be_whole_number(self, uom):
+		return uom in self.whole_number_uoms
+
+	def get_ordered_rules(self, item_code, source_warehouse=None):
+		"""
+		Returns whether the item has rules but no free space, and its rules with free space ordered
+		by priority and free space.
+		"""
+		rules = [rule for rule in self.rules.get(item_code, []) if rule.warehouse != source_warehouse]
+		if not rules:
+			return False, None
 
-	if not rules:
-		return False, None
+		vacant_rules = [rule for rule in rules if rule.free_space > 0]
+		if not vacant_rules:
+			# After iterating through rules, if no rules are left
+			# then there is not enough space left in any rule
+			return True, None
 
-	vacant_rules = []
-	for rule in rules:
-		balance_qty = get_stock_balance(rule.item_code, rule.warehouse, nowdate())
-		free_space = flt(rule.stock_capacity) - flt(balance_qty)
-		if free_space > 0:
-			rule["free_space"] = free_space
-			vacant_rules.append(rule)
+		vacant_rules = sorted(vacant_rules, key=lambda i: (i["priority"], -i["free_space"]))
 
-	if not vacant_rules:
-		# After iterating through rules, if no rules are left
-		# then there is not enough space left in any rule
-		return True, None
+		return False, vacant_rules
 
-	vacant_rules = sorted(vacant_rules, key=lambda i: (i["priority"], -i["free_space"]))
 
-	return False, vacant_rules
+def get_balance_qty(item_codes, warehouses):
+	"""Returns a map of (item, warehouse) to the qty in stock."""
+	return {
+		(item_code, warehouse): flt(actual_qty)
+		for item_code, warehouse, actual_qty in frappe.get_all(
+			"Bin",
+			filters={"item_code": ("in", item_codes), "warehouse": ("in", warehouses)},
+			fields=["item_code", "warehouse", "actual_qty"],
+			as_list=True,
+		)
+	}
+
+
+def get_ordered_putaway_rules(item_code, company, source_warehouse=None):
+	"""Returns an ordered list of putaway rules to apply on an item."""
+	return PutawayCapacityIndex(company, [item_code]).get_ordered_rules(
+		item_code, source_warehouse=source_warehouse
+	)
 
 
 def add_row(item, to_allocate, warehouse, updated_table, rule=None):
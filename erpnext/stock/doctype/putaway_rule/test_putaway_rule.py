@@ -217,6 +217,44 @@ class TestPutawayRule(FrappeTestCase):
 		pr.delete()
 		rule_1.delete()
 
+	def test_putaway_rules_across_many_rows(self):
+		"""Test if free space is shared by all rows of the item."""
+		rule_1 = create_putaway_rule(item_code="_Rice", warehouse=self.warehouse_1, capacity=200, uom="Kg")
+		rule_2 = create_putaway_rule(
+			item_code="_Rice", warehouse=self.warehouse_2, capacity=250, uom="Kg", priority=2
+		)
+
+		pr = make_purchase_receipt(item_code="_Rice", qty=100, apply_putaway_rule=1, do_not_submit=1)
+		for _i in range(4):
+			pr.append(
+				"items",
+				{
+					"item_code": "_Rice",
+					"warehouse": "_Test Warehouse - _TC",
+					"qty": 100,
+					"uom": "Kg",
+					"stock_uom": "Kg",
+					"stock_qty": 100,
+					"received_qty": 100,
+					"rate": 100,
+					"conversion_factor": 1.0,
+				},
+			)
+		pr.save()
+
+		allocated_qty = {}
+		for item in pr.items:
+			allocated_qty[item.warehouse] = allocated_qty.get(item.warehouse, 0) + item.qty
+
+		# 50 Kg of the last row can not be accomodated
+		self.assertEqual(allocated_qty, {self.warehouse_1: 200, self.warehouse_2: 250})
+		self.assertEqual(pr.items[-1].qty, 50)
+		self.assertEqual(pr.items[-1].putaway_rule, rule_2.name)
+
+		pr.delete()
+		rule_1.delete()
+		rule_2.delete()
+
 	def test_validate_over_receipt_in_warehouse(self):
 		"""Test if overreceipt is blocked in the presence of putaway rules."""
 		rule_1 = create_putaway_rule(item_code="_Rice", warehouse=self.warehouse_1, capacity=200, uom="Kg")
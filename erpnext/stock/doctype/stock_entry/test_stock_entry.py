@@ -1,6 +1,7 @@
 # Copyright (c) 2015, Frappe Technologies Pvt. Ltd. and Contributors
 # License: GNU General Public License v3. See license.txt
 
+from collections import defaultdict
 
 from frappe.permissions import add_user_permission, remove_user_permission
 from frappe.tests.utils import FrappeTestCase, change_settings
@@ -363,6 +364,55 @@ class TestStockEntry(FrappeTestCase):
 
 		mtn.cancel()
 
+	def test_material_issue_gl_entry_for_multiple_rows(self):
+		company = frappe.db.get_value("Warehouse", "Stores - TCP1", "company")
+		warehouses = ["Stores - TCP1", "Finished Goods - TCP1"]
+		for warehouse in warehouses:
+			make_stock_entry(
+				item_code="_Test Item",
+				target=warehouse,
+				company=company,
+				qty=100,
+				basic_rate=100,
+				expense_account="Stock Adjustment - TCP1",
+			)
+
+		mi = make_stock_entry(
+			item_code="_Test Item",
+			source=warehouses[0],
+			company=company,
+			qty=5,
+			expense_account="Stock Adjustment - TCP1",
+			do_not_save=True,
+		)
+		for idx in range(10):
+			row = frappe.copy_doc(mi.items[0])
+			row.s_warehouse = warehouses[idx % 2]
+			row.qty = idx + 1
+			mi.append("items", row)
+		mi.save()
+		mi.submit()
+
+		expected_gl_entries = defaultdict(float)
+		for sle in frappe.get_all(
+			"Stock Ledger Entry",
+			filters={"voucher_type": "Stock Entry", "voucher_no": mi.name},
+			fields=["warehouse", "stock_value_difference"],
+		):
+			expected_gl_entries[get_inventory_account(company, sle.warehouse)] += sle.stock_value_difference
+			expected_gl_entries["Stock Adjustment - TCP1"] -= sle.stock_value_difference
+
+		gl_entries = frappe.get_all(
+			"GL Entry",
+			filters={"voucher_type": "Stock Entry", "voucher_no": mi.name, "is_cancelled": 0},
+			fields=["account", "debit", "credit"],
+		)
+		self.assertEqual(len(gl_entries), len(expected_gl_entries))
+		for gle in gl_entries:
+			self.assertEqual(flt(gle.debit - gle.credit, 2), flt(expected_gl_entries[gle.account], 2))
+
+		mi.cancel()
+
 	def test_repack_multiple_fg(self):
 		"Test `is_finished_item` for one item repacked into two items."
 		make_stock_entry(item_code="_Test Item", target="_Test Warehouse - _TC", qty=100, basic_rate=100)
@@ -437,6 +487,33 @@ class TestStockEntry(FrappeTestCase):
 		)
 		self.assertFalse(gl_entries)
 
+	def test_ledger_preview_does_not_update_repack(self):
+		make_stock_entry(item_code="_Test Item", target="_Test Warehouse - _TC", qty=50, basic_rate=100)
+
+		repack = frappe.copy_doc(test_records[3])
+		repack.posting_date = nowdate()
+		repack.posting_time = nowtime()
+		repack.set_stock_entry_type()
+		repack.insert()
+
+		def get_modified():
+			return frappe.db.get_value("Stock Entry", repack.name, "modified"), frappe.get_all(
+				"Stock Entry Detail",
+				filters={"parent": repack.name},
+				fields=["name", "modified"],
+				order_by="name",
+			)
+
+		modified = get_modified()
+
+		repack.docstatus = 1
+		repack.flags.ledger_preview = True
+		repack.update_stock_ledger()
+
+		self.assertTrue(repack.flags.preview_sl_entries)
+		self.assertFalse(frappe.db.exists("Stock Ledger Entry", {"voucher_no": repack.name}))
+		self.assertEqual(get_modified(), modified)
+
 	def test_repack_with_additional_costs(self):
 		company = frappe.db.get_value("Warehouse", "Stores - TCP1", "company")
 
@@ -7,7 +7,9 @@ from operator import itemgetter
 
 import frappe
 from frappe import _
-from frappe.utils import cint, date_diff, flt, get_datetime
+from frappe.query_builder import Order
+from frappe.query_builder.functions import Coalesce
+from frappe.utils import cint, date_diff, flt, get_datetime, getdate
 
 from erpnext.stock.doctype.serial_no.serial_no import get_serial_nos
 
@@ -226,12 +228,13 @@ def add_column(range_columns: list, label: str, fieldname: str, fieldtype: str =
 class FIFOSlots:
 	"Returns FIFO computed slots of inwarded stock as per date."
 
-	def __init__(self, filters: dict | None = None, sle: list | None = None):
+	def __init__(self, filters: dict | None = None, sle: list | None = None, checkpoint: dict | None = None):
 		self.item_details = {}
 		self.transferred_item_details = {}
 		self.serial_no_batch_purchase_details = {}
 		self.filters = filters
 		self.sle = sle
+		self.checkpoint = checkpoint
 
 	def generate(self) -> dict:
 		"""
@@ -250,6 +253,13 @@ class FIFOSlots:
 
 		stock_ledger_entries = self.sle
 
+		if stock_ledger_entries is None and self.checkpoint is None:
+			# resume from the slots saved by the latest Closing Stock Balance instead of replaying all SLEs
+			self.checkpoint = get_fifo_slots_checkpoint(self.filters)
+
+		if self.checkpoint:
+			self.__restore_checkpoint()
+
 		bundle_wise_serial_nos = frappe._dict({})
 		if stock_ledger_entries is None:
 			bundle_wise_serial_nos = self.__get_bundle_wise_serial_nos()
@@ -289,6 +299,64 @@ class FIFOSlots:
 
 		return self.item_details
 
+	def get_checkpoint(self, to_date: str) -> dict:
+		"""
+		Returns warehouse wise FIFO slots in a JSON serialisable form,
+		to be saved and restored to resume FIFO computation after `to_date`.
+		"""
+		slots = []
+		for key, row in self.item_details.items():
+			if not isinstance(key, tuple):
+				continue
+
+			slots.append(
+				{
+					"item_code": key[0],
+					"warehouse": key[1],
+					"details": row["details"],
+					"fifo_queue": row["fifo_queue"],
+					"qty_after_transaction": row.get("qty_after_transaction", 0.0),
+					"total_qty": row.get("total_qty", 0.0),
+					"has_serial_no": row.get("has_serial_no"),
+				}
+			)
+
+		return {
+			"to_date": str(to_date),
+			"slots": slots,
+			"serial_no_purchase_details": self.serial_no_batch_purchase_details,
+		}
+
+	def __restore_checkpoint(self):
+		"Seed FIFO Queues with slots saved at the checkpoint."
+		items = {d.name: d for d in self.__get_item_query().run(as_dict=True)}
+		warehouses = self.__get_warehouses()
+
+		for row in self.checkpoint.get("slots") or []:
+			if row["item_code"] not in items:
+				continue
+
+			if warehouses is not None and row["warehouse"] not in warehouses:
+				continue
+
+			details = frappe._dict(row["details"])
+			details.update(items[row["item_code"]])
+			details.warehouse = row["warehouse"]
+
+			for slot in row["fifo_queue"]:
+				slot[1] = getdate(slot[1])
+
+			self.item_details[(row["item_code"], row["warehouse"])] = {
+				"details": details,
+				"fifo_queue": row["fifo_queue"],
+				"qty_after_transaction": flt(row["qty_after_transaction"]),
+				"total_qty": flt(row["total_qty"]),
+				"has_serial_no": row["has_serial_no"],
+			}
+
+		for serial_no, posting_date in (self.checkpoint.get("serial_no_purchase_details") or {}).items():
+			self.serial_no_batch_purchase_details[serial_no] = getdate(posting_date)
+
 	def __init_key_stores(self, row: dict) -> tuple:
 		"Initialise keys and FIFO Queue."
 
@@ -472,17 +540,12 @@ class FIFOSlots:
 			)
 		)
 
-		if self.filters.get("warehouse"):
-			sle_query = self.__get_warehouse_conditions(sle, sle_query)
-		elif self.filters.get("warehouse_type"):
-			warehouses = frappe.get_all(
-				"Warehouse",
-				filters={"warehouse_type": self.filters.get("warehouse_type"), "is_group": 0},
-				pluck="name",
-			)
+		if self.checkpoint:
+			sle_query = sle_query.where(sle.posting_date > self.checkpoint.get("to_date"))
 
-			if warehouses:
-				sle_query = sle_query.where(sle.warehouse.isin(warehouses))
+		warehouses = self.__get_warehouses()
+		if warehouses:
+			sle_query = sle_query.where(sle.warehouse.isin(warehouses))
 
 		sle_query = sle_query.orderby(sle.posting_datetime, sle.creation)
 
@@ -505,12 +568,15 @@ class FIFOSlots:
 			)
 		)
 
+		if self.checkpoint:
+			query = query.where(bundle.posting_date > self.checkpoint.get("to_date"))
+
 		for field in ["item_code"]:
 			if self.filters.get(field):
 				query = query.where(bundle[field] == self.filters.get(field))
 
 		if self.filters.get("warehouse"):
-			query = self.__get_warehouse_conditions(bundle, query)
+			query = query.where(bundle.warehouse.isin(self.__get_warehouses()))
 
 		bundle_wise_serial_nos = frappe._dict({})
 		for bundle_name, serial_no in query.run():
@@ -540,16 +606,55 @@ class FIFOSlots:
 
 		return item
 
-	def __get_warehouse_conditions(self, sle, sle_query) -> str:
-		warehouse = frappe.qb.DocType("Warehouse")
-		lft, rgt = frappe.db.get_value("Warehouse", self.filters.get("warehouse"), ["lft", "rgt"])
+	def __get_warehouses(self) -> list | None:
+		"Returns warehouses as per the warehouse filters, None if there are no such filters."
+		if self.filters.get("warehouse"):
+			warehouse = frappe.qb.DocType("Warehouse")
+			lft, rgt = frappe.db.get_value("Warehouse", self.filters.get("warehouse"), ["lft", "rgt"])
+
+			warehouse_results = (
+				frappe.qb.from_(warehouse)
+				.select("name")
+				.where((warehouse.lft >= lft) & (warehouse.rgt <= rgt))
+				.run()
+			)
+			return [x[0] for x in warehouse_results]
+
+		elif self.filters.get("warehouse_type"):
+			return frappe.get_all(
+				"Warehouse",
+				filters={"warehouse_type": self.filters.get("warehouse_type"), "is_group": 0},
+				pluck="name",
+			)
+
+		return None
+
 
-		warehouse_results = (
-			frappe.qb.from_(warehouse)
-			.select("name")
-			.where((warehouse.lft >= lft) & (warehouse.rgt <= rgt))
-			.run()
+def get_fifo_slots_checkpoint(filters: Filters) -> dict | None:
+	"Returns FIFO slots saved by the latest company wide Closing Stock Balance on or before `to_date`."
+	if filters.get("ignore_closing_balance") or not filters.get("company") or not filters.get("to_date"):
+		return None
+
+	table = frappe.qb.DocType("Closing Stock Balance")
+	query = (
+		frappe.qb.from_(table)
+		.select(table.name)
+		.where(
+			(table.docstatus == 1)
+			& (table.company == filters.get("company"))
+			& (table.to_date <= filters.get("to_date"))
+			& (table.status == "Completed")
 		)
-		warehouse_results = [x[0] for x in warehouse_results]
+		.orderby(table.to_date, order=Order.desc)
+		.limit(1)
+	)
+
+	# slots are restored by item and warehouse, so only unfiltered closing balances are usable
+	for fieldname in ["warehouse", "item_code", "item_group", "warehouse_type"]:
+		query = query.where(Coalesce(table[fieldname], "") == "")
+
+	closing_balance = query.run(as_dict=True)
+	if not closing_balance:
+		return None
 
-		return sle_query.where(sle.warehouse.isin(warehouse_results))
+	return frappe.get_doc("Closing Stock Balance", closing_balance[0].name).get_fifo_slots_checkpoint()
@@ -868,6 +868,47 @@ class TestStockAgeing(FrappeTestCase):
 		range_valuations = range_values[1::2]
 		self.assertEqual(range_valuations, [15, 7.5, 20, 5])
 
+	def test_resume_from_checkpoint(self):
+		"FIFO slots resumed from a checkpoint match slots replayed from the start."
+		from frappe.utils import getdate
+
+		from erpnext.stock.doctype.item.test_item import make_item
+
+		item_code = make_item("Test Stock Ageing Checkpoint Item", {"is_stock_item": 1}).name
+		sle = [
+			frappe._dict(
+				name=item_code,
+				actual_qty=qty,
+				qty_after_transaction=balance,
+				stock_value_difference=qty * 10,
+				warehouse="WH 1",
+				posting_date=getdate(posting_date),
+				voucher_type="Stock Entry",
+				voucher_no=voucher_no,
+				has_serial_no=False,
+				serial_no=None,
+			)
+			for qty, balance, posting_date, voucher_no in [
+				(30, 30, "2021-11-01", "001"),
+				(20, 50, "2021-11-15", "002"),
+				(-40, 10, "2021-12-02", "003"),
+				(15, 25, "2021-12-05", "004"),
+			]
+		]
+
+		self.filters.show_warehouse_wise_stock = True
+		fifo_slots = FIFOSlots(self.filters, sle[:2])
+		fifo_slots.generate()
+		checkpoint = frappe.parse_json(frappe.as_json(fifo_slots.get_checkpoint("2021-11-30")))
+
+		resumed_slots = FIFOSlots(self.filters, sle[2:], checkpoint=checkpoint).generate()
+		replayed_slots = FIFOSlots(self.filters, sle).generate()
+		self.filters.show_warehouse_wise_stock = False
+
+		key = (item_code, "WH 1")
+		self.assertEqual(resumed_slots[key]["fifo_queue"], replayed_slots[key]["fifo_queue"])
+		self.assertEqual(resumed_slots[key]["total_qty"], replayed_slots[key]["total_qty"])
+
 
 def generate_item_and_item_wh_wise_slots(filters, sle):
 	"Return results with and without 'show_warehouse_wise_stock'"
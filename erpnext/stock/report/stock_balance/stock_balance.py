@@ -2,13 +2,15 @@
 # License: GNU General Public License v3. See license.txt
 
 
+import hashlib
+from itertools import pairwise
 from operator import itemgetter
 from typing import Any, TypedDict
 
 import frappe
 from frappe import _
 from frappe.query_builder import Order
-from frappe.query_builder.functions import Coalesce
+from frappe.query_builder.functions import Coalesce, Max
 from frappe.utils import add_days, cint, date_diff, flt, getdate
 from frappe.utils.nestedset import get_descendants_of
 
@@ -34,9 +36,45 @@ class StockBalanceFilter(TypedDict):
 
 SLEntry = dict[str, Any]
 
+# number of items for which SLEs are loaded at a time
+ITEM_PARTITION_SIZE = 5000
+REPORT_CACHE_EXPIRY = 60 * 60 * 6
+
+# doctypes the report is computed from, the cached result is dropped when any of them changes
+REPORT_SOURCE_DOCTYPES = (
+	"Closing Stock Balance",
+	# SLEs are updated in place by reposts, which complete by updating their Repost Item Valuation
+	"Repost Item Valuation",
+	"Stock Reservation Entry",
+	"Item",
+	"Item Variant Attribute",
+)
+
 
 def execute(filters: StockBalanceFilter | None = None):
-	return StockBalanceReport(filters).run()
+	cache_key = get_report_cache_key(filters)
+	if result := frappe.cache().get_value(cache_key):
+		return result
+
+	result = StockBalanceReport(filters).run()
+	frappe.cache().set_value(cache_key, result, expires_in_sec=REPORT_CACHE_EXPIRY)
+
+	return result
+
+
+def get_report_cache_key(filters: StockBalanceFilter) -> str:
+	"""Returns cache key for the report result, from the filters, the last stock ledger entry
+	created or cancelled and the last change to the other doctypes the report is computed from.
+	"""
+	sle = frappe.qb.DocType("Stock Ledger Entry")
+	versions = [str(v) for v in frappe.qb.from_(sle).select(Max(sle.creation), Max(sle.modified)).run()[0]]
+
+	for doctype in REPORT_SOURCE_DOCTYPES:
+		table = frappe.qb.DocType(doctype)
+		versions.append(str(frappe.qb.from_(table).select(Max(table.modified)).run()[0][0]))
+
+	key = frappe.as_json([filters, versions])
+	return "stock_balance_report:" + hashlib.sha256(key.encode()).hexdigest()
 
 
 class StockBalanceReport:
@@ -46,6 +84,9 @@ class StockBalanceReport:
 		self.to_date = getdate(filters.get("to_date"))
 
 		self.start_from = None
+		self.fifo_checkpoint = None
+		self.fifo_checkpoints: list[dict] = []
+		self.item_wise_fifo_queue = {}
 		self.data = []
 		self.columns = []
 		self.sle_entries: list[SLEntry] = []
@@ -80,7 +121,11 @@ class StockBalanceReport:
 			return
 
 		self.start_from = add_days(closing_balance[0].to_date, 1)
-		res = frappe.get_doc("Closing Stock Balance", closing_balance[0].name).get_prepared_data()
+		closing_balance_doc = frappe.get_doc("Closing Stock Balance", closing_balance[0].name)
+		res = closing_balance_doc.get_prepared_data()
+
+		if self.filters.get("show_stock_ageing_data"):
+			self.fifo_checkpoint = closing_balance_doc.get_fifo_slots_checkpoint()
 
 		for entry in res.data:
 			entry = frappe._dict(entry)
@@ -91,15 +136,10 @@ class StockBalanceReport:
 
 	def prepare_new_data(self):
 		self.item_warehouse_map = self.get_item_warehouse_map()
-
-		if self.filters.get("show_stock_ageing_data"):
-			self.filters["show_warehouse_wise_stock"] = True
-			item_wise_fifo_queue = FIFOSlots(self.filters, self.sle_entries).generate()
+		item_wise_fifo_queue = self.item_wise_fifo_queue
 
 		_func = itemgetter(1)
 
-		del self.sle_entries
-
 		sre_details = self.get_sre_reserved_qty_details()
 
 		variant_values = {}
@@ -111,7 +151,8 @@ class StockBalanceReport:
 				report_data.update(variant_data)
 
 			if self.filters.get("show_stock_ageing_data"):
-				opening_fifo_queue = self.get_opening_fifo_queue(report_data) or []
+				# slots restored from the checkpoint already include the opening fifo queue
+				opening_fifo_queue = [] if self.fifo_checkpoint else self.get_opening_fifo_queue(report_data)
 
 				fifo_queue = []
 				if fifo_queue := item_wise_fifo_queue.get((report_data.item_code, report_data.warehouse)):
@@ -153,33 +194,96 @@ class StockBalanceReport:
 		self.opening_vouchers = self.get_opening_vouchers()
 
 		if self.filters.get("show_stock_ageing_data"):
-			self.sle_entries = self.sle_query.run(as_dict=True)
+			self.filters["show_warehouse_wise_stock"] = True
+
+		# partitions are processed one after another in the current transaction, so they read one snapshot
+		for item_range in self.get_item_partitions():
+			self.prepare_partition(item_warehouse_map, item_range)
+
+		for group_by_key, entry in self.opening_data.items():
+			if group_by_key not in item_warehouse_map:
+				self.initialize_data(item_warehouse_map, group_by_key, entry)
+
+		item_warehouse_map = filter_items_with_no_transactions(
+			item_warehouse_map, self.float_precision, self.inventory_dimensions
+		)
+
+		return item_warehouse_map
+
+	def prepare_partition(self, item_warehouse_map, item_range: tuple | None = None) -> None:
+		sle_query = self.sle_query
+		if item_range:
+			sle = frappe.qb.DocType("Stock Ledger Entry")
+			sle_query = sle_query.where(get_item_range_condition(sle.item_code, item_range))
 
 		# HACK: This is required to avoid causing db query in flt
 		_system_settings = frappe.get_cached_doc("System Settings")
+
+		sle_entries = []
+		if self.filters.get("show_stock_ageing_data"):
+			sle_entries = sle_query.run(as_dict=True)
+
 		with frappe.db.unbuffered_cursor():
 			if not self.filters.get("show_stock_ageing_data"):
-				self.sle_entries = self.sle_query.run(as_dict=True, as_iterator=True)
+				sle_entries = sle_query.run(as_dict=True, as_iterator=True)
 
-			for entry in self.sle_entries:
+			for entry in sle_entries:
 				group_by_key = self.get_group_by_key(entry)
 				if group_by_key not in item_warehouse_map:
 					self.initialize_data(item_warehouse_map, group_by_key, entry)
 
 				self.prepare_item_warehouse_map(item_warehouse_map, entry, group_by_key)
 
-				if self.opening_data.get(group_by_key):
-					del self.opening_data[group_by_key]
+		if self.filters.get("show_stock_ageing_data"):
+			fifo_slots = FIFOSlots(
+				self.filters, sle_entries, checkpoint=self.get_partition_checkpoint(item_range)
+			)
+			self.item_wise_fifo_queue.update(fifo_slots.generate())
+
+			# only the slots are kept, SLEs of the partition are released before the next one is loaded
+			self.fifo_checkpoints.append(fifo_slots.get_checkpoint(self.to_date))
+
+	def get_item_partitions(self) -> list[tuple | None]:
+		"""Returns item code ranges (start, end) for which SLEs are processed separately.
+
+		For large item masters SLEs are loaded range wise, so that the entries held in memory (all of them
+		for stock ageing) are bounded by the range. Balances and FIFO slots of an item never depend on
+		another item, so the results of each range are merged as is.
+		"""
+		if self.filters.get("item_code"):
+			return [None]
+
+		item_codes = frappe.get_all("Item", filters={"is_stock_item": 1}, pluck="name", order_by="name")
+		if len(item_codes) <= ITEM_PARTITION_SIZE:
+			return [None]
+
+		boundaries = [None, *item_codes[ITEM_PARTITION_SIZE::ITEM_PARTITION_SIZE], None]
+		return list(pairwise(boundaries))
+
+	def get_partition_checkpoint(self, item_range: tuple | None = None) -> dict | None:
+		if not self.fifo_checkpoint or not item_range:
+			return self.fifo_checkpoint
+
+		start, end = item_range
+		checkpoint = frappe._dict(self.fifo_checkpoint)
+		checkpoint.slots = [
+			d
+			for d in self.fifo_checkpoint.get("slots") or []
+			if (start is None or d["item_code"] >= start) and (end is None or d["item_code"] < end)
+		]
 
-		for group_by_key, entry in self.opening_data.items():
-			if group_by_key not in item_warehouse_map:
-				self.initialize_data(item_warehouse_map, group_by_key, entry)
+		return checkpoint
 
-		item_warehouse_map = filter_items_with_no_transactions(
-			item_warehouse_map, self.float_precision, self.inventory_dimensions
-		)
+	def get_fifo_slots_checkpoint(self, to_date) -> dict:
+		"Returns FIFO slots of all the partitions to be saved as a checkpoint."
+		checkpoint = {"to_date": str(to_date), "slots": [], "serial_no_purchase_details": {}}
+		for partition_checkpoint in self.fifo_checkpoints:
+			checkpoint["slots"].extend(partition_checkpoint["slots"])
+			checkpoint["serial_no_purchase_details"].update(
+				partition_checkpoint["serial_no_purchase_details"]
+			)
 
-		return item_warehouse_map
+		return checkpoint
 
 	def get_sre_reserved_qty_details(self) -> dict:
 		from erpnext.stock.doctype.stock_reservation_entry.stock_reservation_entry import (
@@ -610,6 +714,18 @@ class StockBalanceReport:
 		return opening_fifo_queue
 
 
+def get_item_range_condition(field, item_range: tuple):
+	start, end = item_range
+	condition = None
+	if start is not None:
+		condition = field >= start
+
+	if end is not None:
+		condition = (field < end) if condition is None else condition & (field < end)
+
+	return condition
+
+
 def filter_items_with_no_transactions(
 	iwb_map, float_precision: float, inventory_dimensions: list | None = None
 ):
@@ -168,3 +168,40 @@ class TestStockBalance(FrappeTestCase):
 		rows = stock_balance(self.filters.update({"show_variant_attributes": 1, "item_code": variant.name}))
 		self.assertPartialDictEq(attributes, rows[0])
 		self.assertInvariants(rows)
+
+	def test_item_partitions(self):
+		from unittest.mock import patch
+
+		from erpnext.stock.report.stock_balance.stock_balance import StockBalanceReport
+
+		self.generate_stock_ledger(self.item.name, [_dict(qty=5, rate=10), _dict(qty=3, rate=20)])
+
+		self.filters.pop("item_code", None)
+		self.filters.update({"warehouse": "_Test Warehouse - _TC"})
+
+		for show_stock_ageing_data in (0, 1):
+			filters = _dict(self.filters, show_stock_ageing_data=show_stock_ageing_data)
+
+			_columns, expected_rows = StockBalanceReport(_dict(filters)).run()
+			with patch("erpnext.stock.report.stock_balance.stock_balance.ITEM_PARTITION_SIZE", 2):
+				report = StockBalanceReport(_dict(filters))
+				self.assertTrue(len(report.get_item_partitions()) > 1)
+				_columns, rows = report.run()
+
+			self.assertEqual(
+				sorted((r.item_code, r.bal_qty, r.bal_val, r.get("average_age")) for r in rows),
+				sorted((r.item_code, r.bal_qty, r.bal_val, r.get("average_age")) for r in expected_rows),
+			)
+
+			if show_stock_ageing_data:
+				# each partition is reduced to its FIFO slots
+				self.assertEqual(len(report.fifo_checkpoints), len(report.get_item_partitions()))
+
+	def test_cached_result(self):
+		self.generate_stock_ledger(self.item.name, [_dict(qty=5, rate=10)])
+		self.assertEqual(stock_balance(self.filters)[0].bal_qty, 5)
+
+		# the cached result is used until a stock ledger entry is posted
+		self.assertEqual(stock_balance(self.filters)[0].bal_qty, 5)
+		self.generate_stock_ledger(self.item.name, [_dict(qty=3, rate=10)])
+		self.assertEqual(stock_balance(self.filters)[0].bal_qty, 8)
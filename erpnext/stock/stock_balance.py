@@ -209,20 +209,21 @@ def get_planned_qty(item_code, warehouse):
 
 
 def update_bin_qty(item_code, warehouse, qty_dict=None):
-	from erpnext.stock.utils import get_bin
-
-	bin = get_bin(item_code, warehouse)
-	mismatch = False
-	for field, value in qty_dict.items():
-		if flt(bin.get(field)) != flt(value):
-			bin.set(field, flt(value))
-			mismatch = True
-
-	bin.modified = now()
-	if mismatch:
-		bin.set_projected_qty()
-		bin.db_update()
-		bin.clear_cache()
+	update_bins_qty({(item_code, warehouse): qty_dict})
+
+
+def update_bins_qty(item_warehouse_qty):
+	"""Sets quantities of bins with one statement, `item_warehouse_qty` maps (item, warehouse) to a qty dict."""
+	from erpnext.stock.doctype.bin.bin import set_bin_qty
+	from erpnext.stock.utils import get_or_make_bin
+
+	set_bin_qty(
+		{
+			get_or_make_bin(item_code, warehouse): qty_dict
+			for (item_code, warehouse), qty_dict in item_warehouse_qty.items()
+			if qty_dict
+		}
+	)
 
 
 def set_stock_balance_as_per_serial_no(
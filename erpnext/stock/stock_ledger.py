@@ -23,7 +23,7 @@ from frappe.utils import (
 )
 
 import erpnext
-from erpnext.stock.doctype.bin.bin import update_qty as update_bin_qty
+from erpnext.stock.doctype.bin.bin import BinQtyUpdater
 from erpnext.stock.doctype.inventory_dimension.inventory_dimension import get_inventory_dimensions
 from erpnext.stock.doctype.serial_and_batch_bundle.serial_and_batch_bundle import (
 	get_available_batches,
@@ -66,6 +66,14 @@ def make_sl_entries(sl_entries, allow_negative_stock=False, via_landed_cost_vouc
 	from erpnext.controllers.stock_controller import future_sle_exists
 
 	if sl_entries:
+		# bins are locked before any entry is posted and written together after all entries are posted
+		bin_updater = BinQtyUpdater()
+		bin_updater.lock(
+			get_or_make_bin(sle.item_code, sle.warehouse)
+			for sle in sl_entries
+			if frappe.get_cached_value("Item", sle.item_code, "is_stock_item")
+		)
+
 		cancel = sl_entries[0].get("is_cancelled")
 		if cancel:
 			validate_cancellation(sl_entries)
@@ -107,15 +115,17 @@ def make_sl_entries(sl_entries, allow_negative_stock=False, via_landed_cost_vouc
 			if is_stock_item:
 				bin_name = get_or_make_bin(args.get("item_code"), args.get("warehouse"))
 				args.reserved_stock = flt(frappe.db.get_value("Bin", bin_name, "reserved_stock"))
-				repost_current_voucher(args, allow_negative_stock, via_landed_cost_voucher)
-				update_bin_qty(bin_name, args)
+				repost_current_voucher(args, allow_negative_stock, via_landed_cost_voucher, bin_updater)
+				bin_updater.add(bin_name, args)
 			else:
 				frappe.msgprint(
 					_("Item {0} ignored since it is not a stock item").format(args.get("item_code"))
 				)
 
+		bin_updater.flush()
 
-def repost_current_voucher(args, allow_negative_stock=False, via_landed_cost_voucher=False):
+
+def repost_current_voucher(args, allow_negative_stock=False, via_landed_cost_voucher=False, bin_updater=None):
 	if args.get("actual_qty") or args.get("voucher_type") == "Stock Reconciliation":
 		if not args.get("posting_date"):
 			args["posting_date"] = nowdate()
@@ -137,6 +147,7 @@ def repost_current_voucher(args, allow_negative_stock=False, via_landed_cost_vou
 				},
 				allow_negative_stock=allow_negative_stock,
 				via_landed_cost_voucher=via_landed_cost_voucher,
+				bin_updater=bin_updater,
 			)
 
 		# update qty in future sle and Validate negative qty
@@ -529,6 +540,9 @@ class update_entries_after:
 	        }
 	"""
 
+	# entries are computed without updating the ledger, bundles and transactions
+	dry_run = False
+
 	def __init__(
 		self,
 		args,
@@ -536,6 +550,7 @@ class update_entries_after:
 		allow_negative_stock=None,
 		via_landed_cost_voucher=False,
 		verbose=1,
+		bin_updater=None,
 	):
 		self.exceptions = {}
 		self.verbose = verbose
@@ -565,7 +580,12 @@ class update_entries_after:
 
 		self.data = frappe._dict()
 		self.initialize_previous_data(self.args)
+
+		# bin values are written by the caller's updater, or with one statement after the entries are fixed
+		self.bin_updater = bin_updater or BinQtyUpdater()
 		self.build()
+		if not bin_updater:
+			self.bin_updater.flush()
 
 	def get_reserved_stock(self):
 		sre = frappe.qb.DocType("Stock Reservation Entry")
@@ -904,6 +924,9 @@ class update_entries_after:
 				sle.item_code, sle.warehouse, sle.posting_date, sle.posting_time, sle.voucher_no
 			)
 
+		if self.dry_run:
+			return
+
 		sle.doctype = "Stock Ledger Entry"
 		frappe.get_doc(sle).db_update()
 
@@ -1021,8 +1044,8 @@ class update_entries_after:
 			)
 		else:
 			doc = frappe.get_doc("Serial and Batch Bundle", sle.serial_and_batch_bundle)
-			doc.set_incoming_rate(save=True, allow_negative_stock=self.allow_negative_stock)
-			doc.calculate_qty_and_amount(save=True)
+			doc.set_incoming_rate(save=not self.dry_run, allow_negative_stock=self.allow_negative_stock)
+			doc.calculate_qty_and_amount(save=not self.dry_run)
 
 		self.wh_data.stock_value = round_off_if_near_zero(self.wh_data.stock_value + doc.total_amount)
 		self.wh_data.qty_after_transaction += flt(doc.total_qty, self.flt_precision)
@@ -1084,8 +1107,8 @@ class update_entries_after:
 		rate = 0
 		# Material Transfer, Repack, Manufacturing
 		if sle.voucher_type == "Stock Entry":
-			self.recalculate_amounts_in_stock_entry(sle.voucher_no, sle.voucher_detail_no)
-			rate = frappe.db.get_value("Stock Entry Detail", sle.voucher_detail_no, "valuation_rate")
+			stock_entry = self.recalculate_amounts_in_stock_entry(sle.voucher_no, sle.voucher_detail_no)
+			rate = next((d.valuation_rate for d in stock_entry.items if d.name == sle.voucher_detail_no), 0)
 		# Sales and Purchase Return
 		elif sle.voucher_type in (
 			"Purchase Receipt",
@@ -1145,6 +1168,7 @@ class update_entries_after:
 					sle.get("serial_and_batch_bundle")
 					and rate > 0
 					and sle.voucher_type in ["Delivery Note", "Sales Invoice"]
+					and not self.dry_run
 				):
 					frappe.db.set_value(
 						sle.voucher_type + " Item",
@@ -1194,6 +1218,9 @@ class update_entries_after:
 		Update outgoing rate in Stock Entry, Delivery Note, Sales Invoice and Sales Return
 		In case of Stock Entry, also calculate FG Item rate and total incoming/outgoing amount
 		"""
+		if self.dry_run:
+			return
+
 		if sle.actual_qty and sle.voucher_detail_no:
 			outgoing_rate = abs(flt(sle.stock_value_difference)) / abs(sle.actual_qty)
 
@@ -1216,6 +1243,14 @@ class update_entries_after:
 			self.recalculate_amounts_in_stock_entry(sle.voucher_no, sle.voucher_detail_no)
 
 	def recalculate_amounts_in_stock_entry(self, voucher_no, voucher_detail_no):
+		if self.dry_run:
+			# the previewed voucher is recalculated on a copy and not saved
+			stock_entry = (
+				copy.deepcopy(self.voucher) if self.voucher else frappe.get_doc("Stock Entry", voucher_no)
+			)
+			stock_entry.calculate_rate_and_amount(reset_outgoing_rate=False, raise_error_if_no_rate=False)
+			return stock_entry
+
 		stock_entry = frappe.get_doc("Stock Entry", voucher_no, for_update=True)
 		stock_entry.calculate_rate_and_amount(reset_outgoing_rate=False, raise_error_if_no_rate=False)
 		stock_entry.db_update()
@@ -1224,6 +1259,8 @@ class update_entries_after:
 			if d.name == voucher_detail_no or (not d.s_warehouse and d.t_warehouse):
 				d.db_update()
 
+		return stock_entry
+
 	def update_rate_on_delivery_and_sales_return(self, sle, outgoing_rate):
 		# Update item's incoming rate on transaction
 		item_code = frappe.db.get_value(sle.voucher_type + " Item", sle.voucher_detail_no, "item_code")
@@ -1560,7 +1597,7 @@ class update_entries_after:
 		if sle.valuation_rate is not None:
 			values_to_update["valuation_rate"] = sle.valuation_rate
 
-		frappe.db.set_value("Bin", bin_name, values_to_update)
+		self.bin_updater.set_values(bin_name, values_to_update)
 
 	def update_bin(self):
 		# update bin for each warehouse
@@ -1570,7 +1607,85 @@ class update_entries_after:
 			updated_values = {"actual_qty": data.qty_after_transaction, "stock_value": data.stock_value}
 			if data.valuation_rate is not None:
 				updated_values["valuation_rate"] = data.valuation_rate
-			frappe.db.set_value("Bin", bin_name, updated_values, update_modified=True)
+			self.bin_updater.set_values(bin_name, updated_values)
+
+
+class StockLedgerPreview(update_entries_after):
+	"""
+	Computes stock ledger entries of a voucher in memory from the previous entry of each item and
+	warehouse, without writing to the database.
+
+	Rates of returns, repacks and internal transfers are fetched from the transaction as they would be on
+	submit, a Stock Entry is recalculated on a copy of `voucher` instead of being updated. Entries posted
+	after the voucher are not revalued. Computed entries are available in `sl_entries`.
+	"""
+
+	dry_run = True
+
+	def __init__(self, sl_entries, allow_negative_stock=False, voucher=None):
+		self.voucher = voucher
+		self.exceptions = {}
+		self.verbose = 1
+		self.allow_zero_rate = False
+		self.via_landed_cost_voucher = False
+		self.use_moving_avg_for_batch = frappe.db.get_single_value(
+			"Stock Settings", "do_not_use_batchwise_valuation"
+		)
+		self.allow_negative_stock_for_voucher = allow_negative_stock
+		self.affected_transactions: set[tuple[str, str]] = set()
+		self.set_precision()
+
+		self.item_warehouse_data = {}
+		self.sl_entries = []
+		for sle in sl_entries:
+			sle = frappe._dict(sle)
+			if sle.get("actual_qty") or sle.get("voucher_type") == "Stock Reconciliation":
+				self.process_sle(sle)
+				self.sl_entries.append(sle)
+
+		if self.exceptions:
+			self.raise_exceptions()
+
+	def process_sle(self, sle):
+		self.item_code = sle.item_code
+		self.args = frappe._dict(
+			{
+				"item_code": sle.item_code,
+				"warehouse": sle.warehouse,
+				"posting_date": sle.posting_date,
+				"posting_time": sle.posting_time,
+			}
+		)
+		self.valuation_method = get_valuation_method(sle.item_code)
+		self.allow_negative_stock = self.allow_negative_stock_for_voucher or is_negative_stock_allowed(
+			item_code=sle.item_code
+		)
+
+		key = (sle.item_code, sle.warehouse)
+		if key not in self.item_warehouse_data:
+			self.item_warehouse_data[key] = self.get_previous_data(sle)
+
+		self.data = frappe._dict({sle.warehouse: self.item_warehouse_data[key]})
+		self.reserved_stock = self.data[sle.warehouse].reserved_stock
+		super().process_sle(sle)
+
+	def get_previous_data(self, sle):
+		"""Returns state of the item and warehouse as of the last entry on or before the voucher."""
+		previous_sle = frappe._dict(get_previous_sle(self.args.copy()))
+
+		warehouse_dict = frappe._dict(
+			{
+				"previous_sle": previous_sle,
+				"prev_stock_value": previous_sle.stock_value or 0.0,
+				"stock_queue": json.loads(previous_sle.stock_queue or "[]"),
+				"stock_value_difference": 0.0,
+				"reserved_stock": self.get_reserved_stock(),
+			}
+		)
+		for key in ("qty_after_transaction", "valuation_rate", "stock_value"):
+			warehouse_dict[key] = flt(previous_sle.get(key))
+
+		return warehouse_dict
 
 
 def get_previous_sle_of_current_voucher(args, operator="<", exclude_current_voucher=False):
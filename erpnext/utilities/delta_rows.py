@@ -0,0 +1,90 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+"""
+Append only delta tables.
+
+Postings append their own row of deltas instead of incrementing a row shared with other postings, so
+concurrent postings never wait on each other's row lock. Readers sum the rows of a key and a scheduled
+job merges them periodically.
+"""
+
+import frappe
+from frappe import qb
+from frappe.query_builder import Tuple
+from frappe.query_builder.functions import Count, Sum
+from frappe.utils import add_to_date, create_batch, flt, now, now_datetime
+
+# rows younger than this may belong to transactions that are still open, they are merged in the next run
+COMPACTION_DELAY_MINUTES = 60
+
+
+def insert_delta_rows(doctype, key_fields, value_fields, rows: dict) -> None:
+	"""
+	Bulk inserts rows of `doctype` from a map of `key_fields` values to a dict of `value_fields` values.
+	Rows without any value are skipped.
+	"""
+	user = frappe.session.user
+	values = []
+	for key, row in rows.items():
+		row = {fieldname: flt(value) for fieldname, value in row.items() if flt(value)}
+		if not row:
+			continue
+
+		values.append(
+			(
+				frappe.generate_hash(length=10),
+				now(),
+				now(),
+				user,
+				user,
+				*key,
+				*[row.get(fieldname, 0) for fieldname in value_fields],
+			)
+		)
+
+	frappe.db.bulk_insert(
+		doctype,
+		fields=["name", "creation", "modified", "owner", "modified_by", *key_fields, *value_fields],
+		values=values,
+	)
+
+
+def compact_delta_rows(doctype, key_fields, value_fields, created_before=None) -> None:
+	"""
+	Merges rows of `doctype` sharing `key_fields` values into one row with the sum of `value_fields`.
+
+	Totals are read with one grouped query, the merged rows removed with one delete per batch of keys
+	and the totals written back with one bulk insert. Only rows created before `created_before` are
+	merged.
+	"""
+	created_before = created_before or add_to_date(now_datetime(), minutes=-COMPACTION_DELAY_MINUTES)
+
+	table = qb.DocType(doctype)
+	key_columns = [table[fieldname] for fieldname in key_fields]
+	totals = (
+		qb.from_(table)
+		.select(*key_columns, *[Sum(table[fieldname]).as_(fieldname) for fieldname in value_fields])
+		.where(table.creation < created_before)
+		.groupby(*key_columns)
+		.having(Count(table.name) > 1)
+	).run(as_dict=True)
+
+	if not totals:
+		return
+
+	keys = [tuple(row[fieldname] for fieldname in key_fields) for row in totals]
+	for batch in create_batch(keys, 1000):
+		qb.from_(table).delete().where(
+			(table.creation < created_before) & (Tuple(*key_columns).isin(batch))
+		).run()
+
+	insert_delta_rows(
+		doctype,
+		key_fields,
+		value_fields,
+		{
+			key: {fieldname: row[fieldname] for fieldname in value_fields}
+			for key, row in zip(keys, totals, strict=True)
+		},
+	)